@@ -33,4 +33,28 @@ celery_app.conf.beat_schedule = {
         'task': 'app.tasks.cleanup_old_cache',
         'schedule': 3600.0,  # 1시간마다 실행
     },
+    'expire-fortune-points': {
+        'task': 'app.tasks.expire_fortune_points',
+        'schedule': 3600.0,  # 1시간마다 만료 lot 스윕
+    },
+    'rebuild-review-stats': {
+        'task': 'app.tasks.rebuild_review_stats',
+        'schedule': 86400.0,  # 하루 1회 리뷰 통계 재계산 (증분 갱신 누락 복구)
+    },
+    'rebuild-user-counters': {
+        'task': 'app.tasks.rebuild_user_counters',
+        'schedule': 86400.0,  # 하루 1회 사용자 카운터 정합성 검사
+    },
+    'start-subscription-billing': {
+        'task': 'app.tasks.start_subscription_billing',
+        'schedule': 3600.0,  # 1시간마다 - 당일 실행 생성, 중단된 청크 재분배
+    },
+    'purge-idempotency-keys': {
+        'task': 'app.tasks.purge_idempotency_keys',
+        'schedule': 3600.0,  # 1시간마다 만료된 멱등성 키 정리 (DB 저장소)
+    },
+    'aggregate-llm-usage': {
+        'task': 'app.tasks.aggregate_llm_usage',
+        'schedule': 600.0,  # 10분마다 현재 / 직전 시간 LLM 사용량 재집계 (관리자 대시보드)
+    },
 }
\ No newline at end of file
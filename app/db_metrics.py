@@ -0,0 +1,196 @@
+"""
+DB 사용량 계측 유틸리티
+- 프로세스 단위 커넥션 풀 지표 (체크아웃 수, 오버플로, 대기 시간)
+- 요청 단위 쿼리 수 / SQL 누적 시간 (SQLAlchemy 이벤트 기반)
+"""
+
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# 요청 단위 카운터 - 미들웨어가 요청마다 새 dict를 설정한다.
+# dict를 직접 변경하므로 threadpool/별도 태스크로 복사된 컨텍스트에서도 집계가 공유된다.
+_request_stats: ContextVar[Optional[Dict[str, float]]] = ContextVar("db_request_stats", default=None)
+# 현재 체크아웃 중 새 커넥션 생성에 쓴 시간 - 대기 시간에서 뺀다
+_connect_seconds: ContextVar[Optional[list]] = ContextVar("db_connect_seconds", default=None)
+
+
+def begin_request_stats() -> Dict[str, float]:
+    """현재 요청의 DB 카운터 초기화
+
+    Returns:
+        요청 동안 누적될 카운터 dict (queries, writes, sql_time)
+    """
+    stats = {"queries": 0, "writes": 0, "sql_time": 0.0}
+    _request_stats.set(stats)
+    return stats
+
+
+def current_request_stats() -> Optional[Dict[str, float]]:
+    """현재 요청의 DB 카운터 (요청 컨텍스트 밖이면 None)"""
+    return _request_stats.get()
+
+
+class PoolMetrics:
+    """엔진 하나의 커넥션 풀 지표 (프로세스 단위)"""
+
+    def __init__(self, name: str, engine: Engine):
+        self.name = name
+        self.engine = engine
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.wait_count = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.queries = 0
+        self.sql_time = 0.0
+
+    def record_checkout(self) -> None:
+        with self._lock:
+            self.checkouts += 1
+
+    def record_connect(self) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def record_invalidation(self) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.wait_count += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def record_query(self, seconds: float) -> None:
+        with self._lock:
+            self.queries += 1
+            self.sql_time += seconds
+
+    def snapshot(self) -> Dict[str, Any]:
+        """현재 지표를 dict로 반환"""
+        pool = self.engine.pool
+        # QueuePool 계열에만 있는 값들 (SQLite 등 다른 풀은 None)
+        size = getattr(pool, "size", None)
+        checked_out = getattr(pool, "checkedout", None)
+        overflow = getattr(pool, "overflow", None)
+        with self._lock:
+            return {
+                "pool_class": getattr(pool, "_pool_class_name", type(pool).__name__),
+                "pool_size": size() if callable(size) else None,
+                "checked_out": checked_out() if callable(checked_out) else None,
+                "overflow": overflow() if callable(overflow) else None,
+                "checkouts": self.checkouts,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "wait_count": self.wait_count,
+                "wait_total_ms": round(self.wait_total * 1000, 2),
+                "wait_max_ms": round(self.wait_max * 1000, 2),
+                "wait_avg_ms": round(self.wait_total * 1000 / self.wait_count, 2) if self.wait_count else 0.0,
+                "queries": self.queries,
+                "sql_time_ms": round(self.sql_time * 1000, 2),
+            }
+
+
+_registry: Dict[str, PoolMetrics] = {}
+
+
+def _timed_pool_class(pool_class: type, metrics: PoolMetrics) -> type:
+    """체크아웃 대기 시간을 재는 풀 하위 클래스 (엔진마다 1개)
+
+    풀에는 "체크아웃 대기 시작" 이벤트가 없어 _do_get을 재정의한다.
+    engine.dispose()는 pool.recreate()로 같은 클래스의 새 풀을 만들므로 측정이 유지된다.
+    """
+
+    def _do_get(self):
+        connect_seconds = [0.0]
+        token = _connect_seconds.set(connect_seconds)
+        start = time.perf_counter()
+        try:
+            return pool_class._do_get(self)
+        finally:
+            # 빈 슬롯에서 새로 접속한 시간은 대기가 아니다
+            metrics.record_wait(max(time.perf_counter() - start - connect_seconds[0], 0.0))
+            _connect_seconds.reset(token)
+
+    def _create_connection(self):
+        start = time.perf_counter()
+        try:
+            return pool_class._create_connection(self)
+        finally:
+            connect_seconds = _connect_seconds.get()
+            if connect_seconds is not None:
+                connect_seconds[0] += time.perf_counter() - start
+
+    return type(f"Timed{pool_class.__name__}", (pool_class,), {
+        "_do_get": _do_get,
+        "_create_connection": _create_connection,
+        "_pool_class_name": pool_class.__name__,
+    })
+
+
+def instrument_engine(engine: Engine, name: str) -> PoolMetrics:
+    """엔진에 풀/쿼리 계측 이벤트 등록
+
+    Args:
+        engine: 동기 엔진 (비동기 엔진은 ``async_engine.sync_engine`` 전달)
+        name: 지표 이름 (metrics 응답의 키)
+
+    Returns:
+        등록된 PoolMetrics
+    """
+    if name in _registry:
+        return _registry[name]
+
+    metrics = PoolMetrics(name, engine)
+    pool = engine.pool
+
+    # 측정용 하위 클래스로 교체 - recreate()가 self.__class__로 새 풀을 만들어 dispose 후에도 유지
+    pool.__class__ = _timed_pool_class(type(pool), metrics)
+
+    # 풀 이벤트는 recreate() 시 새 풀로 이어진다
+    @event.listens_for(pool, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        metrics.record_connect()
+
+    @event.listens_for(pool, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.record_checkout()
+
+    @event.listens_for(pool, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.record_invalidation()
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_execute(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("query_start")
+        if not starts:
+            return
+        elapsed = time.perf_counter() - starts.pop()
+        metrics.record_query(elapsed)
+
+        stats = _request_stats.get()
+        if stats is not None:
+            stats["queries"] += 1
+            stats["sql_time"] += elapsed
+            if context is not None and (context.isinsert or context.isupdate or context.isdelete):
+                stats["writes"] += 1
+
+    _registry[name] = metrics
+    return metrics
+
+
+def pool_metrics_snapshot() -> Dict[str, Dict[str, Any]]:
+    """등록된 모든 엔진의 풀 지표"""
+    return {name: metrics.snapshot() for name, metrics in _registry.items()}
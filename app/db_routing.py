@@ -0,0 +1,238 @@
+"""
+읽기 전용 레플리카 라우팅
+- 읽기 전용 핸들러/서비스의 SELECT를 레플리카로 분산 (라운드로빈)
+- 같은 요청/세션에서 쓰기가 발생하면 이후 쿼리는 프라이머리로 고정
+- 레플리카 장애·복제 지연 시 프라이머리로 폴백하고 상태를 기록
+- 상태 확인(접속 + 복제 지연 조회)은 백그라운드 스레드에서만 실행 - 요청 경로는 기록된 상태만 본다
+"""
+
+import itertools
+import logging
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import TextClause, event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from app.db_metrics import current_request_stats
+
+logger = logging.getLogger(__name__)
+
+# 레플리카 상태 재확인 주기 / 허용 복제 지연 (초)
+REPLICA_CHECK_INTERVAL = float(os.getenv("DB_REPLICA_CHECK_INTERVAL", 5))
+REPLICA_MAX_LAG = float(os.getenv("DB_REPLICA_MAX_LAG", 10))
+
+# 레플리카로 보내도 되는 raw SQL - 잠금 읽기(FOR UPDATE / FOR SHARE)는 제외
+_READ_ONLY_SQL = re.compile(r"^\s*(SELECT|SHOW)\b", re.IGNORECASE)
+_LOCKING_READ_SQL = re.compile(r"\bFOR\s+(UPDATE|SHARE)\b|\bLOCK\s+IN\s+SHARE\s+MODE\b", re.IGNORECASE)
+
+
+def is_read_only(clause) -> bool:
+    """레플리카에서 실행해도 되는 문장인지 (SELECT / SHOW만, 잠금 읽기 제외)
+
+    DML, DDL, 알 수 없는 문장, 문장 없는 연결 요청(clause=None)은 모두 False.
+    """
+    if isinstance(clause, TextClause):
+        return bool(_READ_ONLY_SQL.match(clause.text)) and not _LOCKING_READ_SQL.search(clause.text)
+    return bool(getattr(clause, "is_select", False)) and getattr(clause, "_for_update_arg", None) is None
+
+
+class ReplicaSet:
+    """레플리카 엔진 묶음 - 상태 확인, 선택, 폴백 집계"""
+
+    def __init__(
+        self,
+        engines: List[Engine],
+        check_interval: float = REPLICA_CHECK_INTERVAL,
+        max_lag: float = REPLICA_MAX_LAG,
+        check_engines: Optional[List[Engine]] = None,
+    ):
+        """
+        Args:
+            engines: 쿼리를 보낼 레플리카 엔진
+            check_interval: 상태 확인 주기 (초)
+            max_lag: 허용 복제 지연 (초)
+            check_engines: 상태 확인용 동기 엔진 (engines와 같은 순서, None이면 engines 사용)
+                - 비동기 엔진의 sync_engine은 백그라운드 스레드에서 직접 접속할 수 없다
+        """
+        self.engines = list(engines)
+        self.check_engines = list(check_engines) if check_engines is not None else self.engines
+        self.check_interval = check_interval
+        self.max_lag = max_lag
+        self.fallbacks = 0
+        self._cycle = itertools.count()
+        self._lock = threading.Lock()
+        self._checker_pid = None
+        # 첫 확인 전에는 사용하지 않는다 (그동안은 프라이머리)
+        self._state = [
+            {"healthy": None, "checked_at": None, "lag": None, "error": None}
+            for _ in self.engines
+        ]
+        for index, engine in enumerate(self.engines):
+            self._watch_errors(index, engine)
+
+    def __bool__(self) -> bool:
+        return bool(self.engines)
+
+    def choose(self) -> Optional[Engine]:
+        """사용 가능한 레플리카 선택
+
+        Returns:
+            레플리카 엔진 (모두 사용 불가면 None → 프라이머리 사용)
+        """
+        if not self.engines:
+            return None
+
+        self._ensure_checker()
+        start = next(self._cycle)
+        for offset in range(len(self.engines)):
+            index = (start + offset) % len(self.engines)
+            if self._available(index):
+                return self.engines[index]
+
+        with self._lock:
+            self.fallbacks += 1
+        logger.warning("사용 가능한 레플리카 없음 - 프라이머리로 폴백")
+        return None
+
+    def mark_failed(self, index: int, error: str) -> None:
+        """레플리카를 다음 확인까지 사용 불가로 표시 (접속 끊김 감지 시 즉시)"""
+        with self._lock:
+            state = self._state[index]
+            if state["healthy"] is not False:
+                logger.warning(f"레플리카 비활성화: replica={index}, error={error}")
+            state.update(healthy=False, error=error, checked_at=time.monotonic())
+
+    def status(self) -> Dict[str, Any]:
+        """레플리카 상태 (/metrics/db 노출용)"""
+        now = time.monotonic()
+        replicas = []
+        for engine, state in zip(self.engines, self._state):
+            replicas.append({
+                "url": engine.url.render_as_string(hide_password=True),
+                "healthy": state["healthy"],
+                "lag_seconds": state["lag"],
+                "error": state["error"],
+                "checked_ago": round(now - state["checked_at"], 1) if state["checked_at"] else None,
+            })
+        return {"replicas": replicas, "fallbacks": self.fallbacks}
+
+    def check_all(self) -> None:
+        """모든 레플리카 상태 확인 (백그라운드 스레드 / 테스트에서 호출)"""
+        for index in range(len(self.engines)):
+            self._check(index)
+
+    def _ensure_checker(self) -> None:
+        # 프로세스마다 1개 (fork된 워커에는 부모의 스레드가 없으므로 pid로 확인)
+        if self._checker_pid == os.getpid():
+            return
+        with self._lock:
+            if self._checker_pid == os.getpid():
+                return
+            self._checker_pid = os.getpid()
+        threading.Thread(target=self._check_loop, name="replica-health", daemon=True).start()
+
+    def _check_loop(self) -> None:
+        while True:
+            try:
+                self.check_all()
+            except Exception as e:
+                logger.error(f"레플리카 상태 확인 오류: {e}")
+            time.sleep(self.check_interval)
+
+    def _available(self, index: int) -> bool:
+        return self._state[index]["healthy"] is True
+
+    def _check(self, index: int) -> None:
+        engine = self.check_engines[index]
+        try:
+            with engine.connect() as conn:
+                lag = self._replication_lag(conn)
+        except Exception as e:
+            self.mark_failed(index, str(e))
+            return
+
+        with self._lock:
+            state = self._state[index]
+            state.update(checked_at=time.monotonic(), lag=lag)
+            if lag is not None and lag > self.max_lag:
+                if state["healthy"] is not False:
+                    logger.warning(f"레플리카 복제 지연 초과: replica={index}, lag={lag}s")
+                state.update(healthy=False, error=f"replication lag {lag}s")
+            else:
+                if state["healthy"] is False:
+                    logger.info(f"레플리카 복구: replica={index}")
+                state.update(healthy=True, error=None)
+
+    @staticmethod
+    def _replication_lag(conn) -> Optional[float]:
+        """복제 지연(초) 조회 - MySQL 외에는 None"""
+        if conn.dialect.name != "mysql":
+            return None
+        for statement in ("SHOW REPLICA STATUS", "SHOW SLAVE STATUS"):
+            try:
+                row = conn.execute(text(statement)).mappings().first()
+            except DBAPIError:
+                continue
+            if row is None:
+                return None
+            lag = row.get("Seconds_Behind_Source", row.get("Seconds_Behind_Master"))
+            if lag is None:
+                # SQL 스레드 중단 - 복제가 멈춘 상태
+                return float("inf")
+            return float(lag)
+        return None
+
+    def _watch_errors(self, index: int, engine: Engine) -> None:
+        @event.listens_for(engine, "handle_error")
+        def _on_error(context):
+            if context.is_disconnect:
+                self.mark_failed(index, str(context.original_exception))
+
+
+class RoutingSession(Session):
+    """쓰기는 프라이머리, 읽기는 레플리카로 보내는 세션
+
+    세션에서 flush가 일어났거나 같은 요청에서 이미 쓰기가 실행됐다면
+    (read-your-writes 보장을 위해) 이후 쿼리도 프라이머리로 보낸다.
+    """
+
+    def __init__(self, primary: Engine = None, replicas: Optional[ReplicaSet] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.primary = primary
+        self.replicas = replicas
+        self._replica = None
+
+    def use_primary(self) -> None:
+        """이후 쿼리를 프라이머리로 고정"""
+        self.info["pinned_primary"] = True
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._needs_primary(clause):
+            if clause is not None and not is_read_only(clause):
+                # 쓰기 / 잠금 읽기 이후에는 같은 세션의 읽기도 프라이머리 (flush 없이 실행한 DML 포함)
+                self.use_primary()
+            return self.primary
+
+        # 한 세션 안에서는 같은 레플리카를 유지 (페이지네이션 count/목록 일관성)
+        if self._replica is None:
+            self._replica = self.replicas.choose() or self.primary
+        return self._replica
+
+    def _needs_primary(self, clause) -> bool:
+        if not self.replicas or self._flushing or self.info.get("pinned_primary"):
+            return True
+        if not is_read_only(clause):
+            return True
+        stats = current_request_stats()
+        return bool(stats and stats.get("writes"))
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _pin_after_flush(session, flush_context):
+    session.use_primary()
@@ -4,6 +4,7 @@ from app.exceptions import UnauthorizedError
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models import User
+from app.services.user_cache_service import UserCacheService
 
 def get_current_user(request: Request, db: Session = Depends(get_db)):
     """현재 로그인된 사용자 반환"""
@@ -11,7 +12,7 @@ def get_current_user(request: Request, db: Session = Depends(get_db)):
     if not user_id:
         raise UnauthorizedError("로그인이 필요합니다.")
     
-    user = db.query(User).filter(User.id == user_id).first()
+    user = UserCacheService.load(db, user_id)
     if not user:
         raise UnauthorizedError("유효하지 않은 사용자입니다.")
     
@@ -23,5 +24,4 @@ def get_current_user_optional(request: Request, db: Session = Depends(get_db)):
     if not user_id:
         return None
     
-    user = db.query(User).filter(User.id == user_id).first()
-    return user
\ No newline at end of file
+    return UserCacheService.load(db, user_id)
\ No newline at end of file
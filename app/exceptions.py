@@ -24,3 +24,17 @@ class NotFoundError(HTTPException):
 class InternalServerError(HTTPException):
     def __init__(self, detail: str = "서버 오류가 발생했습니다."):
         super().__init__(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=detail)
+
+
+class ConflictError(HTTPException):
+    def __init__(self, detail: str = "요청이 이미 처리 중입니다."):
+        super().__init__(status_code=status.HTTP_409_CONFLICT, detail=detail)
+
+
+class TooManyRequestsError(HTTPException):
+    def __init__(self, detail: str = "요청이 너무 많습니다. 잠시 후 다시 시도해주세요.", retry_after: int = 1):
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=detail,
+            headers={"Retry-After": str(retry_after)},
+        )
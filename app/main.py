@@ -5,15 +5,23 @@ from fastapi.responses import HTMLResponse
 from starlette.middleware.sessions import SessionMiddleware
 from sqlalchemy.orm import Session
 from app.template import templates
-from app.database import engine, get_db
+from app.database import engine, async_engine, async_replica_engines, get_db
+from app.db_metrics import begin_request_stats
+from app.utils.passwords import password_hasher
+from app.utils.report_files import ImmutableStaticFiles
+from app.report_utils import REPORT_ASSET_DIR
+from app.payments.kakaopay import kakaopay_client
 from app.models import Base, Post, Category
-from app.routers import auth, blog, admin, saju, order, shop, fortune, mypage, cart, product, subscription, review, referral, payment  # payment 추가
+from app.routers import auth, blog, admin, saju, order, shop, fortune, mypage, cart, product, subscription, review, referral, payment, metrics  # payment 추가
 from app.utils import get_flashed_messages
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from starlette.status import HTTP_404_NOT_FOUND, HTTP_500_INTERNAL_SERVER_ERROR
 from app.utils.error_handlers import register_exception_handlers
 import os
 
+# 요청별 쿼리 수 / SQL 시간 응답 헤더 - app.debug와 별개로 명시적으로 켤 때만 노출
+DB_DEBUG_HEADERS = os.getenv("DB_DEBUG_HEADERS", "false").lower() == "true"
+
 
 Base.metadata.create_all(bind=engine)
 
@@ -24,6 +32,9 @@ app.add_middleware(
     secret_key=os.getenv("SECRET_KEY", "your-super-secret-key-change-this-for-footjob")
 )
 
+# 리포트 차트 에셋 (내용 해시 파일명 → immutable 캐시), /static 보다 먼저 등록
+os.makedirs(REPORT_ASSET_DIR, exist_ok=True)
+app.mount("/static/report-assets", ImmutableStaticFiles(directory=REPORT_ASSET_DIR), name="report_assets")
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
 app.state.templates = templates  # Use the imported global instance
@@ -49,9 +60,33 @@ app.include_router(subscription.router)  # 구독 라우터 추가
 app.include_router(review.router)  # 리뷰 라우터 추가
 app.include_router(referral.router)  # 추천인 라우터 추가
 app.include_router(payment.router)  # 결제 콜백 라우터 추가
+app.include_router(metrics.router)  # 운영 지표 (관리자 전용)
 
 register_exception_handlers(app)
 
+
+@app.middleware("http")
+async def db_usage_middleware(request: Request, call_next):
+    """요청별 쿼리 수 / SQL 누적 시간 집계 (DB_DEBUG_HEADERS=true일 때 응답 헤더로 노출)"""
+    stats = begin_request_stats()
+    response = await call_next(request)
+    if DB_DEBUG_HEADERS:
+        response.headers["X-DB-Query-Count"] = str(stats["queries"])
+        response.headers["X-DB-Time-Ms"] = f"{stats['sql_time'] * 1000:.2f}"
+    return response
+
+
+@app.on_event("shutdown")
+async def dispose_async_engine():
+    """비동기 DB 커넥션 풀 / 외부 API 클라이언트 정리"""
+    await async_engine.dispose()
+    for replica in async_replica_engines:
+        await replica.dispose()
+    password_hasher.shutdown()
+    await kakaopay_client.aclose()
+    from app.services.report_progress_service import report_progress_hub
+    await report_progress_hub.close()
+
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request, db: Session = Depends(get_db)):
     recent_posts = db.query(Post).filter(
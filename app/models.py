@@ -1,6 +1,6 @@
 # app/models.py - 운세 커머스 플랫폼 완전 설계
 
-from sqlalchemy import Column, Integer, String, Boolean, Enum, DateTime, Date, Text, ForeignKey, UniqueConstraint, JSON, Numeric, Index
+from sqlalchemy import Column, Integer, String, Boolean, Enum, DateTime, Date, Text, ForeignKey, UniqueConstraint, JSON, Numeric, Index, Computed
 from sqlalchemy.orm import relationship
 from app.database import Base
 from datetime import datetime, timedelta
@@ -66,12 +66,45 @@ class FortuneTransaction(Base):
     amount = Column(Integer, nullable=False)  # 포인트 양 (양수/음수)
     balance_after = Column(Integer, nullable=False)  # 거래 후 잔액
     source = Column(String(100))  # 거래 소스 (예: 'purchase', 'daily_bonus', 'referral')
-    reference_id = Column(String(100))  # 참조 ID (주문번호, 상품코드 등)
+    reference_id = Column(String(100), index=True)  # 참조 ID (주문번호, 상품코드 등) - 일괄 적립 멱등성 검사
     description = Column(String(255))  # 거래 설명
     expires_at = Column(DateTime, nullable=True)  # 포인트 만료일 (적립된 경우)
     created_at = Column(DateTime, default=datetime.now)
+    # earn 거래만 reference_id, 나머지는 NULL - 적립 유니크 인덱스용 (사용/환불은 같은 참조 ID 허용)
+    earn_reference_id = Column(
+        String(100),
+        Computed("CASE WHEN transaction_type = 'earn' THEN reference_id END", persisted=False)
+    )
     
     user = relationship("User", back_populates="fortune_transactions")
+    
+    # 인덱스
+    __table_args__ = (
+        UniqueConstraint('user_id', 'source', 'earn_reference_id', name='uq_fortune_tx_earn_reference'),
+        Index('idx_fortune_tx_user_type_expires', 'user_id', 'transaction_type', 'expires_at'),
+        Index('idx_fortune_tx_user_created', 'user_id', 'created_at', 'id'),
+        Index('idx_fortune_tx_user_type_created', 'user_id', 'transaction_type', 'created_at', 'id'),
+    )
+
+class FortunePointLot(Base):
+    """포인트 적립 lot - 적립 건별 잔여량 (FIFO 차감 / 만료 처리 단위)"""
+    __tablename__ = "fortune_point_lots"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("blog_users.id"), nullable=False)
+    amount = Column(Integer, nullable=False)  # 적립량
+    remaining = Column(Integer, nullable=False)  # 잔여량
+    status = Column(Enum("open", "consumed", "expired", name="point_lot_status"), default="open", nullable=False)
+    source = Column(String(100))  # 적립 소스
+    reference_id = Column(String(100))  # 적립 참조 ID
+    expires_at = Column(DateTime, nullable=True)  # 만료일 (None이면 만료 없음)
+    created_at = Column(DateTime, default=datetime.now)
+    
+    # 인덱스 - 만료 스윕은 open lot만 expires_at 순으로 읽는다
+    __table_args__ = (
+        Index('idx_point_lot_status_expires', 'status', 'expires_at'),
+        Index('idx_point_lot_user_status_expires', 'user_id', 'status', 'expires_at'),
+    )
 
 class Product(Base):
     """상품 테이블 - 확장"""
@@ -185,6 +218,76 @@ class Subscription(Base):
         Index('idx_subscription_billing', 'next_billing_date', 'status'),
     )
 
+class IdempotencyKey(Base):
+    """결제 멱등성 키 (Redis 미사용 시 공유 저장소)"""
+    __tablename__ = "idempotency_keys"
+
+    # Redis 키(idem:{scope}:{key})와 같은 단위 - 같은 키라도 작업이 다르면 별도 행
+    scope = Column(String(50), primary_key=True)  # 'kakaopay_ready', 'kakaopay_approve' 등
+    key = Column(String(128), primary_key=True)
+    status = Column(Enum("in_progress", "completed", name="idempotency_status"), default="in_progress")
+    owner = Column(String(32), nullable=False)  # 처리 중인 요청 토큰
+    result = Column(JSON, nullable=True)
+    expires_at = Column(DateTime, nullable=False)  # in_progress: 점유 만료, completed: 결과 만료
+    created_at = Column(DateTime, default=datetime.now)
+
+    __table_args__ = (
+        Index('idx_idempotency_expires', 'expires_at'),
+    )
+
+class SubscriptionBillingRun(Base):
+    """1-1. 정기결제 실행 (결제일별 1건, 청크 체크포인트로 재개)"""
+    __tablename__ = "subscription_billing_runs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    billing_date = Column(Date, nullable=False, unique=True)  # 결제 기준일
+    status = Column(Enum("planning", "running", "completed", name="billing_run_status"), default="planning")
+    chunk_size = Column(Integer, nullable=False)
+
+    # 진행 지표 (청크 완료 시 합산)
+    total_chunks = Column(Integer, default=0)
+    completed_chunks = Column(Integer, default=0)
+    processed = Column(Integer, default=0)
+    succeeded = Column(Integer, default=0)
+    failed = Column(Integer, default=0)
+    points_granted = Column(Integer, default=0)
+
+    started_at = Column(DateTime, default=datetime.now)
+    finished_at = Column(DateTime, nullable=True)
+
+    chunks = relationship("SubscriptionBillingChunk", back_populates="run")
+
+class SubscriptionBillingChunk(Base):
+    """1-2. 정기결제 청크 (구독 id 구간, 청크 단위 커밋)"""
+    __tablename__ = "subscription_billing_chunks"
+
+    id = Column(Integer, primary_key=True, index=True)
+    run_id = Column(Integer, ForeignKey("subscription_billing_runs.id"), nullable=False)
+    chunk_index = Column(Integer, nullable=False)
+    start_id = Column(Integer, nullable=False)  # 구독 id 구간 (포함)
+    end_id = Column(Integer, nullable=False)
+
+    # pending -> running -> billed (결제 커밋, 포인트 지급 대기) -> granting (지급 중) -> done / failed
+    status = Column(Enum("pending", "running", "billed", "granting", "done", "failed", name="billing_chunk_status"), default="pending")
+    attempts = Column(Integer, default=0)
+    pending_grants = Column(JSON, nullable=True)  # billed 상태에서 지급할 포인트 (재개 시 재사용)
+
+    processed = Column(Integer, default=0)
+    succeeded = Column(Integer, default=0)
+    failed = Column(Integer, default=0)
+    points_granted = Column(Integer, default=0)
+    duration_ms = Column(Integer, nullable=True)
+    error = Column(Text, nullable=True)
+
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)  # running / granting 임대 (구독마다 갱신)
+
+    run = relationship("SubscriptionBillingRun", back_populates="chunks")
+
+    __table_args__ = (
+        UniqueConstraint('run_id', 'chunk_index', name='unique_billing_run_chunk'),
+        Index('idx_billing_chunk_run_status', 'run_id', 'status'),
+    )
+
 class SajuProduct(Base):
     """2. 운세 상품 전용"""
     __tablename__ = "saju_products"
@@ -253,6 +356,7 @@ class UserPurchase(Base):
     __table_args__ = (
         Index('idx_purchase_user_product', 'user_id', 'product_id'),
         Index('idx_purchase_saju_key', 'saju_key'),
+        Index('idx_purchase_user_created', 'user_id', 'created_at', 'id'),
     )
 
 class ReferralReward(Base):
@@ -376,9 +480,58 @@ class UserReview(Base):
     __table_args__ = (
         Index('idx_review_product_rating', 'product_id', 'rating'),
         Index('idx_review_user_product', 'user_id', 'product_id'),
+        Index('idx_review_product_visible_created', 'product_id', 'is_visible', 'created_at', 'id'),
         UniqueConstraint('user_id', 'product_id', 'order_id', name='unique_user_product_order_review'),
     )
 
+class ProductReviewStats(Base):
+    """7-1. 상품별 리뷰 통계 (노출 리뷰 기준, 리뷰 변경 시 증분 갱신)"""
+    __tablename__ = "product_review_stats"
+
+    product_id = Column(Integer, ForeignKey("products.id"), primary_key=True)
+    review_count = Column(Integer, nullable=False, default=0)  # 노출 리뷰 수
+    rating_sum = Column(Integer, nullable=False, default=0)  # 평점 합계
+    rating_1 = Column(Integer, nullable=False, default=0)  # 별점별 개수
+    rating_2 = Column(Integer, nullable=False, default=0)
+    rating_3 = Column(Integer, nullable=False, default=0)
+    rating_4 = Column(Integer, nullable=False, default=0)
+    rating_5 = Column(Integer, nullable=False, default=0)
+    helpful_total = Column(Integer, nullable=False, default=0)  # 도움됨 합계
+
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+
+    @property
+    def average_rating(self) -> float:
+        if not self.review_count:
+            return 0
+        return round(self.rating_sum / self.review_count, 1)
+
+    @property
+    def rating_distribution(self) -> dict:
+        return {i: getattr(self, f"rating_{i}") or 0 for i in range(1, 6)}
+
+class UserCounters(Base):
+    """7-2. 사용자별 대시보드 카운터 (마이페이지 / 추천인 통계, 원본 변경 시 증분 갱신)"""
+    __tablename__ = "user_counters"
+
+    user_id = Column(Integer, ForeignKey("blog_users.id"), primary_key=True)
+    purchases_count = Column(Integer, nullable=False, default=0)  # 구매 수
+    orders_count = Column(Integer, nullable=False, default=0)  # 주문 수
+    reviews_count = Column(Integer, nullable=False, default=0)  # 작성 리뷰 수
+    referrals_count = Column(Integer, nullable=False, default=0)  # 추천으로 가입한 사용자 수
+
+    # 추천 보상 포인트
+    referral_rewards_total = Column(Integer, nullable=False, default=0)
+    referral_rewards_signup = Column(Integer, nullable=False, default=0)
+    referral_rewards_purchase = Column(Integer, nullable=False, default=0)
+
+    # 이번 달 값 - month_key가 현재 달이 아니면 0으로 간주
+    month_key = Column(String(7), nullable=True)  # 'YYYY-MM'
+    referrals_this_month = Column(Integer, nullable=False, default=0)
+    referral_rewards_this_month = Column(Integer, nullable=False, default=0)
+
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+
 class DailyAttendance(Base):
     """8. 출석 체크"""
     __tablename__ = "daily_attendance"
@@ -453,6 +606,66 @@ class SajuAnalysisCache(Base):
     
     orders = relationship("Order", back_populates="analysis_cache")
 
+
+class LLMResponseCache(Base):
+    """LLM 응답 캐시 - (모델, 프롬프트 해시, 입력 해시, 샘플링 파라미터) 단위
+
+    saju_key가 달라도 사주팔자가 같으면 LLM 입력이 같으므로 응답을 재사용한다.
+    SajuAnalysisCache(saju_key 단위) 아래 단계 캐시.
+    """
+    __tablename__ = "llm_response_cache"
+
+    id = Column(Integer, primary_key=True)
+    cache_key = Column(String(64), unique=True, nullable=False)  # sha256(model, prompt_hash, content_hash, params)
+    model = Column(String(100), nullable=False)
+    prompt_hash = Column(String(64), nullable=False)
+    content_hash = Column(String(64), nullable=False)
+    response = Column(Text, nullable=False)
+    hits = Column(Integer, default=0, nullable=False)  # 재사용 횟수 = 절약한 LLM 호출 수
+    created_at = Column(DateTime, default=datetime.now)
+    last_hit_at = Column(DateTime, nullable=True)
+
+
+class LLMUsage(Base):
+    """LLM 호출 1건 기록 (토큰 / 지연 / 비용) - 시간별 집계 후 보존 기간이 지나면 삭제"""
+    __tablename__ = "llm_usage"
+    __table_args__ = (
+        Index("ix_llm_usage_created_at", "created_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    endpoint = Column(String(50), nullable=False)  # api_saju_ai_analysis, generate_full_report ...
+    model = Column(String(50), nullable=False)
+    status = Column(String(10), nullable=False, default="ok")  # ok, error, cached, fallback, blocked
+    prompt_tokens = Column(Integer, default=0, nullable=False)
+    completion_tokens = Column(Integer, default=0, nullable=False)
+    latency_ms = Column(Integer, default=0, nullable=False)
+    cost_usd = Column(Numeric(12, 6), default=0, nullable=False)
+    created_at = Column(DateTime, default=datetime.now, nullable=False)
+
+
+class LLMUsageHourly(Base):
+    """LLM 사용량 시간별 집계 (관리자 대시보드 / 장기 보관용)"""
+    __tablename__ = "llm_usage_hourly"
+    __table_args__ = (
+        UniqueConstraint("hour", "endpoint", "model", name="uniq_llm_usage_hour"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    hour = Column(DateTime, nullable=False)  # 구간 시작 (정각)
+    endpoint = Column(String(50), nullable=False)
+    model = Column(String(50), nullable=False)
+    calls = Column(Integer, default=0, nullable=False)  # 실제 LLM 호출 (캐시 적중 / 차단 제외)
+    cached = Column(Integer, default=0, nullable=False)
+    fallbacks = Column(Integer, default=0, nullable=False)
+    blocked = Column(Integer, default=0, nullable=False)
+    errors = Column(Integer, default=0, nullable=False)
+    prompt_tokens = Column(Integer, default=0, nullable=False)
+    completion_tokens = Column(Integer, default=0, nullable=False)
+    latency_ms_total = Column(Integer, default=0, nullable=False)  # calls 행만 (오류 제외)
+    latency_ms_max = Column(Integer, default=0, nullable=False)
+    cost_usd = Column(Numeric(12, 6), default=0, nullable=False)
+
 # 기타 기존 모델들 (Category, Post 등)도 유지...
 class Category(Base):
     __tablename__ = "blog_categories"
@@ -481,6 +694,11 @@ class Post(Base):
     
     author = relationship("User", back_populates="posts")
     category = relationship("Category", back_populates="posts")
+    
+    # 인덱스 - 목록 키셋 페이징
+    __table_args__ = (
+        Index('idx_post_published_created', 'is_published', 'created_at', 'id'),
+    )
 
 ################################################################################
 # 🆕 사주 위키 콘텐츠 모델 추가
@@ -3,19 +3,30 @@
 카카오페이 결제 API 모듈
 - 카카오페이 공식 API 스펙 100% 준수
 - ready → approve → verification 3단계 결제 플로우 구현
+- 프로세스 공용 HTTP 클라이언트 (keep-alive 풀, h2 설치 시 HTTP/2, 엔드포인트별 타임아웃 / 지연 분포)
 """
 
+import asyncio
 import os
+import random
+import threading
+import time
 import httpx
 import logging
 from typing import Dict, Any, Optional
 from datetime import datetime
 
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 # 로깅 설정
 logger = logging.getLogger(__name__)
 
 # 카카오페이 API 설정
-KAKAOPAY_API_HOST = "https://open-api.kakaopay.com"
+KAKAOPAY_API_HOST = os.getenv("KAKAOPAY_API_HOST", "https://open-api.kakaopay.com")
 SITE_URL = os.getenv("SITE_URL", "https://sazu.mp4korea.com")
 
 # 환경별 CID, SECRET_KEY 분기
@@ -37,6 +48,170 @@ class KakaoPayError(Exception):
         super().__init__(self.message)
 
 
+# 커넥션 풀 설정
+KAKAOPAY_MAX_CONNECTIONS = int(os.getenv("KAKAOPAY_MAX_CONNECTIONS", 20))
+KAKAOPAY_MAX_KEEPALIVE = int(os.getenv("KAKAOPAY_MAX_KEEPALIVE", 20))
+# 주문 조회(멱등) 실패 시 재시도 횟수 - ready / approve는 재시도하지 않음
+KAKAOPAY_INQUIRY_RETRIES = int(os.getenv("KAKAOPAY_INQUIRY_RETRIES", 2))
+KAKAOPAY_RETRY_BACKOFF = 0.2  # 초, 시도마다 2배 (full jitter)
+
+# 엔드포인트별 타임아웃 - 승인은 이미 사용자가 결제한 건이라 짧게 끊지 않는다
+ENDPOINT_TIMEOUTS = {
+    "ready": httpx.Timeout(10.0, connect=3.0),
+    "approve": httpx.Timeout(30.0, connect=3.0),
+    "order": httpx.Timeout(5.0, connect=3.0),
+}
+LATENCY_BUCKETS_MS = (25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class _EndpointStats:
+    """엔드포인트별 호출 수 / 오류 / 재시도 / 지연 분포"""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.time_total = 0.0
+        self.time_max = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def observe(self, elapsed: float, error: bool) -> None:
+        elapsed_ms = elapsed * 1000
+        self.calls += 1
+        self.errors += int(error)
+        self.time_total += elapsed
+        self.time_max = max(self.time_max, elapsed)
+        for index, bound in enumerate(LATENCY_BUCKETS_MS):
+            if elapsed_ms <= bound:
+                self.buckets[index] += 1
+                return
+        self.buckets[-1] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        labels = [f"le_{bound}ms" for bound in LATENCY_BUCKETS_MS] + ["inf"]
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "retries": self.retries,
+            "avg_ms": round(self.time_total * 1000 / self.calls, 2) if self.calls else 0,
+            "max_ms": round(self.time_max * 1000, 2),
+            "histogram": dict(zip(labels, self.buckets)),
+        }
+
+
+class KakaoPayClient:
+    """
+    카카오페이 API 공용 클라이언트
+
+    요청마다 AsyncClient를 만들면 매번 TCP/TLS 핸드셰이크를 새로 하므로
+    프로세스에서 하나를 재사용하고 앱 종료 시 aclose()로 정리한다.
+    클라이언트는 이벤트 루프에 묶이므로 루프가 바뀌면 이전 것을 닫고 새로 만든다.
+    """
+
+    def __init__(self, base_url: str = KAKAOPAY_API_HOST,
+                 max_connections: int = KAKAOPAY_MAX_CONNECTIONS,
+                 max_keepalive: int = KAKAOPAY_MAX_KEEPALIVE):
+        self.base_url = base_url
+        self.limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop = None
+        self._lock = threading.Lock()
+        self._stats: Dict[str, _EndpointStats] = {}
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            stale, stale_loop = self._client, self._loop
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                limits=self.limits,
+                http2=HTTP2_AVAILABLE,
+                timeout=ENDPOINT_TIMEOUTS["approve"],
+            )
+            self._loop = loop
+            if stale is not None and not stale.is_closed:
+                await self._close_stale(stale, stale_loop)
+        return self._client
+
+    @staticmethod
+    async def _close_stale(client: httpx.AsyncClient, loop) -> None:
+        """이전 루프에 묶인 클라이언트의 keep-alive 연결 정리"""
+        try:
+            if loop is not None and loop.is_running():
+                # 다른 스레드에서 아직 도는 루프 - 그 루프에서 닫는다
+                asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+            else:
+                await client.aclose()
+        except Exception as e:
+            # 루프가 이미 닫혀 전송 계층을 정리할 수 없는 경우 - 소켓은 GC에서 닫힘
+            logger.debug(f"이전 카카오페이 클라이언트 정리 실패 (무시): {e}")
+
+    def _observe(self, endpoint: str, elapsed: float, error: bool) -> None:
+        with self._lock:
+            self._stats.setdefault(endpoint, _EndpointStats()).observe(elapsed, error)
+
+    def _count_retry(self, endpoint: str) -> None:
+        with self._lock:
+            self._stats.setdefault(endpoint, _EndpointStats()).retries += 1
+
+    async def post(self, endpoint: str, payload: Dict[str, Any], headers: Dict[str, str],
+                   retries: int = 0) -> httpx.Response:
+        """
+        /online/v1/payment/{endpoint} 호출
+
+        Args:
+            endpoint: ready / approve / order
+            payload: 요청 본문
+            headers: 요청 헤더
+            retries: 네트워크 오류 / 5xx 재시도 횟수 (멱등 호출에만 지정)
+
+        Returns:
+            httpx.Response: 마지막 시도의 응답 (재시도 후에도 실패하면 예외 그대로 전달)
+        """
+        client = await self._get_client()
+        timeout = ENDPOINT_TIMEOUTS.get(endpoint, ENDPOINT_TIMEOUTS["approve"])
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                response = await client.post(
+                    f"/online/v1/payment/{endpoint}", json=payload, headers=headers, timeout=timeout
+                )
+            except (httpx.TimeoutException, httpx.RequestError):
+                self._observe(endpoint, time.perf_counter() - started, error=True)
+                if attempt >= retries:
+                    raise
+            else:
+                failed = response.status_code >= 500
+                self._observe(endpoint, time.perf_counter() - started, error=response.status_code != 200)
+                if not failed or attempt >= retries:
+                    return response
+
+            self._count_retry(endpoint)
+            await asyncio.sleep(random.uniform(0, KAKAOPAY_RETRY_BACKOFF * (2 ** attempt)))
+            attempt += 1
+            logger.warning(f"카카오페이 {endpoint} API 재시도: attempt={attempt}")
+
+    def stats(self) -> Dict[str, Any]:
+        """프로세스 단위 엔드포인트별 지표"""
+        with self._lock:
+            endpoints = {name: stats.snapshot() for name, stats in self._stats.items()}
+        return {
+            "http2": HTTP2_AVAILABLE,
+            "max_connections": self.limits.max_connections,
+            "max_keepalive": self.limits.max_keepalive_connections,
+            "endpoints": endpoints,
+        }
+
+    async def aclose(self) -> None:
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+
+
+kakaopay_client = KakaoPayClient()
+
+
 async def kakao_ready(
     order_id: int,
     amount: int,
@@ -93,26 +268,21 @@ async def kakao_ready(
         
         logger.info(f"카카오페이 결제 준비 요청: order_id={order_id}, amount={amount}")
         
-        # HTTP 요청
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                f"{KAKAOPAY_API_HOST}/online/v1/payment/ready",
-                json=payload,
-                headers=headers
+        # HTTP 요청 (공용 클라이언트)
+        response = await kakaopay_client.post("ready", payload, headers)
+        
+        if response.status_code != 200:
+            error_data = response.json() if response.headers.get("content-type", "").startswith("application/json") else {}
+            logger.error(f"카카오페이 ready API 실패: {response.status_code}, {error_data}")
+            raise KakaoPayError(
+                message=f"결제 준비 요청이 실패했습니다. (코드: {response.status_code})",
+                code=error_data.get("error_code"),
+                details=error_data
             )
-            
-            if response.status_code != 200:
-                error_data = response.json() if response.headers.get("content-type", "").startswith("application/json") else {}
-                logger.error(f"카카오페이 ready API 실패: {response.status_code}, {error_data}")
-                raise KakaoPayError(
-                    message=f"결제 준비 요청이 실패했습니다. (코드: {response.status_code})",
-                    code=error_data.get("error_code"),
-                    details=error_data
-                )
-            
-            result = response.json()
-            logger.info(f"카카오페이 결제 준비 성공: tid={result.get('tid')}")
-            return result
+        
+        result = response.json()
+        logger.info(f"카카오페이 결제 준비 성공: tid={result.get('tid')}")
+        return result
             
     except httpx.TimeoutException:
         logger.error("카카오페이 ready API 타임아웃")
@@ -167,26 +337,21 @@ async def kakao_approve(
         
         logger.info(f"카카오페이 결제 승인 요청: tid={tid}, order_id={order_id}")
         
-        # HTTP 요청
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                f"{KAKAOPAY_API_HOST}/online/v1/payment/approve",
-                json=payload,
-                headers=headers
+        # HTTP 요청 (공용 클라이언트)
+        response = await kakaopay_client.post("approve", payload, headers)
+        
+        if response.status_code != 200:
+            error_data = response.json() if response.headers.get("content-type", "").startswith("application/json") else {}
+            logger.error(f"카카오페이 approve API 실패: {response.status_code}, {error_data}")
+            raise KakaoPayError(
+                message=f"결제 승인이 실패했습니다. (코드: {response.status_code})",
+                code=error_data.get("error_code"),
+                details=error_data
             )
-            
-            if response.status_code != 200:
-                error_data = response.json() if response.headers.get("content-type", "").startswith("application/json") else {}
-                logger.error(f"카카오페이 approve API 실패: {response.status_code}, {error_data}")
-                raise KakaoPayError(
-                    message=f"결제 승인이 실패했습니다. (코드: {response.status_code})",
-                    code=error_data.get("error_code"),
-                    details=error_data
-                )
-            
-            result = response.json()
-            logger.info(f"카카오페이 결제 승인 성공: aid={result.get('aid')}")
-            return result
+        
+        result = response.json()
+        logger.info(f"카카오페이 결제 승인 성공: aid={result.get('aid')}")
+        return result
             
     except httpx.TimeoutException:
         logger.error("카카오페이 approve API 타임아웃")
@@ -230,26 +395,21 @@ async def kakao_order_inquiry(tid: str) -> Dict[str, Any]:
         
         logger.info(f"카카오페이 주문 조회 요청: tid={tid}")
         
-        # HTTP 요청
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                f"{KAKAOPAY_API_HOST}/online/v1/payment/order",
-                json=payload,
-                headers=headers
+        # HTTP 요청 (공용 클라이언트)
+        response = await kakaopay_client.post("order", payload, headers, retries=KAKAOPAY_INQUIRY_RETRIES)
+        
+        if response.status_code != 200:
+            error_data = response.json() if response.headers.get("content-type", "").startswith("application/json") else {}
+            logger.error(f"카카오페이 order inquiry API 실패: {response.status_code}, {error_data}")
+            raise KakaoPayError(
+                message=f"주문 조회가 실패했습니다. (코드: {response.status_code})",
+                code=error_data.get("error_code"),
+                details=error_data
             )
-            
-            if response.status_code != 200:
-                error_data = response.json() if response.headers.get("content-type", "").startswith("application/json") else {}
-                logger.error(f"카카오페이 order inquiry API 실패: {response.status_code}, {error_data}")
-                raise KakaoPayError(
-                    message=f"주문 조회가 실패했습니다. (코드: {response.status_code})",
-                    code=error_data.get("error_code"),
-                    details=error_data
-                )
-            
-            result = response.json()
-            logger.info(f"카카오페이 주문 조회 성공: status={result.get('status')}")
-            return result
+        
+        result = response.json()
+        logger.info(f"카카오페이 주문 조회 성공: status={result.get('status')}")
+        return result
             
     except httpx.TimeoutException:
         logger.error("카카오페이 order inquiry API 타임아웃")
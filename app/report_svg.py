@@ -0,0 +1,182 @@
+"""
+리포트 차트 SVG 렌더러
+- 오행 레이더 차트, 월별 운세 히트맵을 matplotlib 없이 SVG 마크업으로 직접 생성
+- 결과는 수 KB 텍스트 (HTML에 바로 삽입, gzip 압축 잘 됨, WeasyPrint PDF에서도 벡터로 출력)
+- 색상 / 라벨은 report_utils의 PNG 차트와 같게 유지
+"""
+
+import math
+from html import escape
+from typing import Dict, List, Optional
+
+FONT_FAMILY = "'Noto Sans KR','Nanum Gothic','Malgun Gothic','Apple SD Gothic Neo',sans-serif"
+
+ELEMENTS = ['목', '화', '토', '금', '수']
+ELEMENT_LABELS = ['목(木)', '화(火)', '토(土)', '금(金)', '수(水)']
+ELEMENT_COLORS = ['#10B981', '#EF4444', '#F59E0B', '#6B7280', '#3B82F6']
+
+# 월별 운세 히트맵 (month_heat_table과 공유)
+MONTHS = ['1월', '2월', '3월', '4월', '5월', '6월', '7월', '8월', '9월', '10월', '11월', '12월']
+HEAT_COLORS = {
+    'G': '#DCFCE7',   # 좋음 (연초록)
+    'Y': '#FEFCE8',   # 주의 (연노랑)
+    'R': '#FEE2E2',   # 조심 (연빨강)
+    '-': '#F9FAFB',   # 보통 (연회색)
+}
+HEAT_SYMBOLS = {'G': '●', 'Y': '▲', 'R': '■', '-': '○'}
+HEAT_CATEGORY_NAMES = {
+    'Love': '💕 애정운',
+    'Money': '💰 재물운',
+    'Career': '💼 직업운'
+}
+
+
+def _num(value: float) -> str:
+    """좌표 출력 (소수 1자리, 불필요한 0 제거 - 마크업 크기 절약)"""
+    return f"{value:.1f}".rstrip('0').rstrip('.')
+
+
+def _svg(width: int, height: int, label: str, body: List[str]) -> str:
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {width} {height}" width="100%" '
+        f'role="img" aria-label="{escape(label)}" font-family="{FONT_FAMILY}" '
+        f'style="max-width:{width}px;height:auto;display:block;margin:0 auto">'
+        f'<rect width="{width}" height="{height}" fill="#fff"/>'
+        + "".join(body) + "</svg>"
+    )
+
+
+def _element_values(elem_dict_kr: Dict[str, int]) -> List[int]:
+    return [elem_dict_kr.get(k, 0) for k in ELEMENTS]
+
+
+def radar_chart_svg(elem_dict_kr: Dict[str, int], with_explanation: bool = True) -> str:
+    """
+    오행 밸런스 레이더 차트 (enhanced_radar_chart_png와 같은 구성)
+
+    Args:
+        elem_dict_kr: 오행별 개수 {'목': 2, ...}
+        with_explanation: 오른쪽에 가장 강한 / 보완할 오행 설명 표시
+
+    Returns:
+        str: SVG 마크업
+    """
+    values = _element_values(elem_dict_kr)
+    plot_values = values if any(values) else [1] * 5
+    limit = max(plot_values) + 1
+
+    cx, cy, radius = 210, 225, 150
+    width, height = (720, 440) if with_explanation else (420, 440)
+
+    def point(index: int, value: float):
+        # matplotlib 극좌표와 같이 0도(오른쪽)에서 시작해 반시계 방향
+        angle = 2 * math.pi * index / 5
+        r = radius * value / limit
+        return cx + r * math.cos(angle), cy - r * math.sin(angle)
+
+    body = [
+        f'<text x="{cx}" y="36" text-anchor="middle" font-size="20" font-weight="bold" fill="#374151">오행 밸런스</text>',
+        f'<circle cx="{cx}" cy="{cy}" r="{radius}" fill="#FAFAFA"/>',
+    ]
+
+    # 격자 (동심원 + 축)
+    rings = min(int(limit), 5)
+    for i in range(1, rings + 1):
+        body.append(
+            f'<circle cx="{cx}" cy="{cy}" r="{_num(radius * i / rings)}" fill="none" stroke="#9CA3AF" stroke-opacity=".3"/>'
+        )
+    for i in range(5):
+        x, y = point(i, limit)
+        body.append(f'<line x1="{cx}" y1="{cy}" x2="{_num(x)}" y2="{_num(y)}" stroke="#9CA3AF" stroke-opacity=".3"/>')
+
+    # 데이터 영역
+    points = [point(i, v) for i, v in enumerate(plot_values)]
+    path = " ".join(f"{_num(x)},{_num(y)}" for x, y in points)
+    body.append(
+        f'<polygon points="{path}" fill="#8B5CF6" fill-opacity=".25" stroke="#7C3AED" '
+        f'stroke-width="3" stroke-linejoin="round"/>'
+    )
+    for x, y in points:
+        body.append(f'<circle cx="{_num(x)}" cy="{_num(y)}" r="5" fill="#7C3AED"/>')
+
+    # 라벨
+    for i, label in enumerate(ELEMENT_LABELS):
+        x, y = point(i, limit * 1.16)
+        cos = math.cos(2 * math.pi * i / 5)
+        anchor = "middle" if abs(cos) < 0.3 else ("start" if cos > 0 else "end")
+        body.append(
+            f'<text x="{_num(x)}" y="{_num(y + 5)}" text-anchor="{anchor}" font-size="15" '
+            f'font-weight="bold" fill="#1F2937">{label}</text>'
+        )
+
+    if with_explanation:
+        max_element = max(ELEMENTS, key=lambda k: elem_dict_kr.get(k, 0))
+        min_element = min(ELEMENTS, key=lambda k: elem_dict_kr.get(k, 0))
+        lines = [
+            (f"🔥 가장 강함: {max_element} ({elem_dict_kr.get(max_element, 0)}개)", True),
+            (f"💧 보완 필요: {min_element} ({elem_dict_kr.get(min_element, 0)}개)", True),
+            ("", False),
+            ("📊 해석:", True),
+            (f"• {max_element} 기운이 강해 관련 특성 부각", False),
+            (f"• {min_element} 에너지 보완으로 균형 개선", False),
+            ("• 전체적 조화로 운세 상승 가능", False),
+        ]
+        for i, (line, bold) in enumerate(lines):
+            if line:
+                weight = ' font-weight="bold"' if bold else ""
+                body.append(
+                    f'<text x="440" y="{110 + i * 34}" font-size="15"{weight} fill="#374151">{escape(line)}</text>'
+                )
+
+    return _svg(width, height, "오행 밸런스 차트", body)
+
+
+def month_heat_svg(status: Dict[str, List[str]], title: Optional[str] = None) -> str:
+    """
+    월별 운세 히트맵 (month_heat_table과 같은 색상 / 기호)
+
+    Args:
+        status: {'Love': ['G', 'R', '-', ...12개], 'Money': [...], 'Career': [...]}
+        title: 상단 제목 (선택)
+
+    Returns:
+        str: SVG 마크업
+    """
+    label_width, cell_width, cell_height = 96, 52, 36
+    header_top = 40 if title else 0
+    width = label_width + cell_width * 12 + 2
+    height = header_top + cell_height * (len(status) + 1) + 2
+
+    body = []
+    if title:
+        body.append(f'<text x="{width // 2}" y="26" text-anchor="middle" font-size="16" font-weight="bold" fill="#111827">{escape(title)}</text>')
+
+    # 공통 속성은 그룹에 한 번만 (셀 51개 - 마크업 크기 절약)
+    cells, labels = [], []
+
+    def cell(x: float, y: float, w: float, fill: str, text: str, size: int, bold: bool = False) -> None:
+        weight = ' font-weight="bold"' if bold else ""
+        cells.append(f'<rect x="{x}" y="{y}" width="{w}" height="{cell_height}" fill="{fill}"/>')
+        labels.append(
+            f'<text x="{_num(x + w / 2)}" y="{_num(y + cell_height / 2 + size / 3)}" '
+            f'font-size="{size}"{weight}>{escape(text)}</text>'
+        )
+
+    y = header_top + 1
+    cell(1, y, label_width, '#F3F4F6', '구분', 13, bold=True)
+    for i, month in enumerate(MONTHS):
+        cell(1 + label_width + cell_width * i, y, cell_width, '#F3F4F6', month, 11, bold=True)
+
+    for row, (category, values) in enumerate(status.items(), start=1):
+        y = header_top + 1 + cell_height * row
+        cell(1, y, label_width, '#F9FAFB', HEAT_CATEGORY_NAMES.get(category, category), 13, bold=True)
+        for i, value in enumerate(values):
+            cell(
+                1 + label_width + cell_width * i, y, cell_width,
+                HEAT_COLORS.get(value, '#FFFFFF'), HEAT_SYMBOLS.get(value, '○'), 14
+            )
+
+    body.append('<g stroke="#D1D5DB">' + "".join(cells) + '</g>')
+    body.append('<g text-anchor="middle" fill="#1F2937">' + "".join(labels) + '</g>')
+
+    return _svg(width, height, title or "월별 운세 히트맵", body)
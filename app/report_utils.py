@@ -11,6 +11,15 @@ from datetime import datetime
 import hashlib
 from typing import Tuple, List
 
+from app.report_svg import HEAT_CATEGORY_NAMES, HEAT_COLORS, HEAT_SYMBOLS, MONTHS, month_heat_svg
+
+# 리포트 차트 에셋 (static 아래, /static/report-assets 로 immutable 캐시 서빙)
+REPORT_ASSET_DIR = os.path.join('static', 'report-assets')
+REPORT_ASSET_URL = os.getenv('REPORT_ASSET_URL', '/static/report-assets').rstrip('/')
+CHART_VERSION = "1"  # 차트 모양을 바꾸면 올려서 새 URL로 (기존 URL은 영구 캐시됨)
+# 웹 리포트 차트 렌더러 - svg(기본, 본문에 벡터 마크업) / png(matplotlib 에셋 이미지)
+REPORT_CHART_RENDERER = os.getenv('REPORT_CHART_RENDERER', 'svg').lower()
+
 # 한글 폰트 설정
 def setup_korean_font():
     """
@@ -66,8 +75,13 @@ def setup_korean_font():
     mpl.rcParams["font.family"] = registered_font_name
     mpl.rcParams["axes.unicode_minus"] = False
 
-def radar_chart_base64(ratios: dict[str, int]) -> str:
-    """오행 분포를 레이더 차트로 생성하여 base64 반환"""
+def png_data_uri(png: bytes) -> str:
+    """PNG를 data URI로 (이메일 / PDF 내보내기처럼 외부 URL을 못 쓰는 경우)"""
+    return f"data:image/png;base64,{base64.b64encode(png).decode('utf-8')}" if png else ""
+
+
+def radar_chart_png(ratios: dict[str, int]) -> bytes:
+    """오행 분포 레이더 차트 PNG"""
     try:
         setup_korean_font()
         
@@ -112,17 +126,26 @@ def radar_chart_base64(ratios: dict[str, int]) -> str:
         fig.savefig(buf, format='png', bbox_inches='tight', dpi=150, facecolor='white')
         plt.close(fig)
         
-        buf.seek(0)
-        img_base64 = base64.b64encode(buf.read()).decode('utf-8')
-        return f"data:image/png;base64,{img_base64}"
+        return buf.getvalue()
         
     except Exception as e:
         print(f"레이더 차트 생성 실패: {e}")
         # 폴백: 간단한 막대 차트
-        return create_simple_bar_chart(ratios)
+        return simple_bar_chart_png(ratios)
+
+
+def radar_chart_base64(ratios: dict[str, int]) -> str:
+    """오행 분포를 레이더 차트로 생성하여 base64 반환"""
+    return png_data_uri(radar_chart_png(ratios))
+
 
 def create_simple_bar_chart(ratios: dict[str, int]) -> str:
-    """폴백용 간단한 막대 차트"""
+    """폴백용 간단한 막대 차트 (base64)"""
+    return png_data_uri(simple_bar_chart_png(ratios))
+
+
+def simple_bar_chart_png(ratios: dict[str, int]) -> bytes:
+    """폴백용 간단한 막대 차트 PNG"""
     try:
         setup_korean_font()
         
@@ -153,13 +176,11 @@ def create_simple_bar_chart(ratios: dict[str, int]) -> str:
         fig.savefig(buf, format='png', bbox_inches='tight', dpi=150)
         plt.close(fig)
         
-        buf.seek(0)
-        img_base64 = base64.b64encode(buf.read()).decode('utf-8')
-        return f"data:image/png;base64,{img_base64}"
+        return buf.getvalue()
         
     except Exception as e:
         print(f"막대 차트 생성도 실패: {e}")
-        return ""
+        return b""
 
 def month_heat_table(status: dict[str, list[str]]) -> str:
     """
@@ -172,40 +193,24 @@ def month_heat_table(status: dict[str, list[str]]) -> str:
         }
     """
     try:
-        months = ['1월', '2월', '3월', '4월', '5월', '6월',
-                  '7월', '8월', '9월', '10월', '11월', '12월']
-        
-        color_map = {
-            'G': '#DCFCE7',   # 좋음 (연초록)
-            'Y': '#FEFCE8',   # 주의 (연노랑)
-            'R': '#FEE2E2',   # 조심 (연빨강)
-            '-': '#F9FAFB',   # 보통 (연회색)
-        }
-        
-        category_names = {
-            'Love': '💕 애정운',
-            'Money': '💰 재물운',
-            'Career': '💼 직업운'
-        }
-        
         html = '<table class="mini-cal" style="width: 100%; border-collapse: collapse; margin: 15px 0;">'
         
         # 헤더 (월)
         html += '<tr style="background-color: #F3F4F6;">'
         html += '<th style="padding: 8px; border: 1px solid #D1D5DB; font-weight: bold;">구분</th>'
-        for month in months:
+        for month in MONTHS:
             html += f'<th style="padding: 6px; border: 1px solid #D1D5DB; font-size: 11px; font-weight: bold;">{month}</th>'
         html += '</tr>'
         
         # 각 카테고리별 행
         for category, values in status.items():
-            category_display = category_names.get(category, category)
+            category_display = HEAT_CATEGORY_NAMES.get(category, category)
             html += f'<tr>'
             html += f'<td style="padding: 8px; border: 1px solid #D1D5DB; font-weight: bold; background-color: #F9FAFB;">{category_display}</td>'
             
             for value in values:
-                bg_color = color_map.get(value, '#FFFFFF')
-                symbol = {'G': '●', 'Y': '▲', 'R': '■', '-': '○'}.get(value, '○')
+                bg_color = HEAT_COLORS.get(value, '#FFFFFF')
+                symbol = HEAT_SYMBOLS.get(value, '○')
                 html += f'<td style="padding: 6px; border: 1px solid #D1D5DB; text-align: center; background-color: {bg_color}; font-size: 14px;">{symbol}</td>'
             
             html += '</tr>'
@@ -320,12 +325,9 @@ def generate_fortune_summary(elem_dict_kr: dict) -> str:
         print(f"운세 요약 생성 실패: {e}")
         return ""
     
-def generate_2025_fortune_calendar(elem_dict_kr: dict) -> str:
-    """2025년 월별 운세 달력 생성 (오행 기반 알고리즘)"""
+def generate_2025_fortune_calendar(elem_dict_kr: dict, as_svg: bool = False) -> str:
+    """2025년 월별 운세 달력 생성 (오행 기반 알고리즘, as_svg=True면 SVG 히트맵)"""
     try:
-        months = ['1월', '2월', '3월', '4월', '5월', '6월', 
-                 '7월', '8월', '9월', '10월', '11월', '12월']
-        
         # 오행 기반 운세 생성 알고리즘
         def calculate_fortune_by_element(month_idx, category):
             """오행 분포를 기반으로 월별 운세 계산"""
@@ -368,6 +370,8 @@ def generate_2025_fortune_calendar(elem_dict_kr: dict) -> str:
             'Career': [calculate_fortune_by_element(i, 'career') for i in range(12)]
         }
         
+        if as_svg:
+            return month_heat_svg(fortune_data)
         return month_heat_table(fortune_data)
         
     except Exception as e:
@@ -736,65 +740,112 @@ def create_executive_summary(user_name: str, birthdate: str, pillars: dict, elem
         print(f"요약 정보 생성 실패: {e}")
         return f'<div class="executive-summary"><h2>{user_name} 님의 사주 리포트</h2></div>'
 
+ELEMENTS_KR = ['목', '화', '토', '금', '수']
+
+
+def _element_ratios(elem_dict_kr: dict) -> dict:
+    return {'Wood': elem_dict_kr.get('목', 0), 'Fire': elem_dict_kr.get('화', 0),
+            'Earth': elem_dict_kr.get('토', 0), 'Metal': elem_dict_kr.get('금', 0),
+            'Water': elem_dict_kr.get('수', 0)}
+
+
+def enhanced_radar_chart_png(elem_dict_kr: dict) -> bytes:
+    """향상된 레이더 차트 PNG (실패 시 예외 - 폴백은 호출하는 쪽에서)"""
+    setup_korean_font()
+    
+    # 기본 레이더 차트 생성
+    labels_kr = ['목(木)', '화(火)', '토(土)', '금(金)', '수(水)']
+    values = [elem_dict_kr.get(k, 0) for k in ['목', '화', '토', '금', '수']]
+    
+    if all(v == 0 for v in values):
+        values = [1] * 5
+    
+    values += values[:1]  # 원형으로 닫기
+    angles = np.linspace(0, 2 * np.pi, len(values))
+    
+    # 차트 생성
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6), 
+                                   gridspec_kw={'width_ratios': [2, 1]})
+    
+    # 레이더 차트
+    ax1 = plt.subplot(121, projection='polar')
+    ax1.fill(angles, values, alpha=0.25, color='#8B5CF6')
+    ax1.plot(angles, values, linewidth=3, color='#7C3AED', marker='o', markersize=8)
+    ax1.set_xticks(angles[:-1])
+    ax1.set_xticklabels(labels_kr, fontsize=12, fontweight='bold')
+    ax1.set_ylim(0, max(values[:-1]) + 1 if max(values[:-1]) > 0 else 5)
+    ax1.grid(True, alpha=0.3)
+    ax1.set_title('오행 밸런스', fontsize=16, fontweight='bold', pad=20)
+    
+    # 텍스트 설명
+    ax2.axis('off')
+    max_element = max(['목', '화', '토', '금', '수'], key=lambda x: elem_dict_kr.get(x, 0))
+    min_element = min(['목', '화', '토', '금', '수'], key=lambda x: elem_dict_kr.get(x, 0))
+    
+    explanation = [
+        f"🔥 가장 강함: {max_element} ({elem_dict_kr.get(max_element, 0)}개)",
+        f"💧 보완 필요: {min_element} ({elem_dict_kr.get(min_element, 0)}개)",
+        "",
+        "📊 해석:",
+        f"• {max_element} 기운이 강해 관련 특성 부각",
+        f"• {min_element} 에너지 보완으로 균형 개선",
+        "• 전체적 조화로 운세 상승 가능"
+    ]
+    
+    for i, line in enumerate(explanation):
+        ax2.text(0.05, 0.9 - i*0.12, line, fontsize=11, 
+                transform=ax2.transAxes, fontweight='bold' if line.startswith(('🔥', '💧', '📊')) else 'normal')
+    
+    # 이미지 저장
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', bbox_inches='tight', dpi=150, facecolor='white')
+    plt.close(fig)
+    
+    return buf.getvalue()
+
+
 def enhanced_radar_chart_base64(elem_dict_kr: dict) -> str:
-    """향상된 레이더 차트 (설명 포함)"""
+    """향상된 레이더 차트 (설명 포함) - data URI 인라인 (이메일 / PDF 내보내기용)"""
     try:
-        setup_korean_font()
-        
-        # 기본 레이더 차트 생성
-        labels_kr = ['목(木)', '화(火)', '토(土)', '금(金)', '수(水)']
-        values = [elem_dict_kr.get(k, 0) for k in ['목', '화', '토', '금', '수']]
-        
-        if all(v == 0 for v in values):
-            values = [1] * 5
-        
-        values += values[:1]  # 원형으로 닫기
-        angles = np.linspace(0, 2 * np.pi, len(values))
-        
-        # 차트 생성
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6), 
-                                       gridspec_kw={'width_ratios': [2, 1]})
-        
-        # 레이더 차트
-        ax1 = plt.subplot(121, projection='polar')
-        ax1.fill(angles, values, alpha=0.25, color='#8B5CF6')
-        ax1.plot(angles, values, linewidth=3, color='#7C3AED', marker='o', markersize=8)
-        ax1.set_xticks(angles[:-1])
-        ax1.set_xticklabels(labels_kr, fontsize=12, fontweight='bold')
-        ax1.set_ylim(0, max(values[:-1]) + 1 if max(values[:-1]) > 0 else 5)
-        ax1.grid(True, alpha=0.3)
-        ax1.set_title('오행 밸런스', fontsize=16, fontweight='bold', pad=20)
-        
-        # 텍스트 설명
-        ax2.axis('off')
-        max_element = max(['목', '화', '토', '금', '수'], key=lambda x: elem_dict_kr.get(x, 0))
-        min_element = min(['목', '화', '토', '금', '수'], key=lambda x: elem_dict_kr.get(x, 0))
-        
-        explanation = [
-            f"🔥 가장 강함: {max_element} ({elem_dict_kr.get(max_element, 0)}개)",
-            f"💧 보완 필요: {min_element} ({elem_dict_kr.get(min_element, 0)}개)",
-            "",
-            "📊 해석:",
-            f"• {max_element} 기운이 강해 관련 특성 부각",
-            f"• {min_element} 에너지 보완으로 균형 개선",
-            "• 전체적 조화로 운세 상승 가능"
-        ]
-        
-        for i, line in enumerate(explanation):
-            ax2.text(0.05, 0.9 - i*0.12, line, fontsize=11, 
-                    transform=ax2.transAxes, fontweight='bold' if line.startswith(('🔥', '💧', '📊')) else 'normal')
-        
-        # 이미지 저장
-        buf = io.BytesIO()
-        fig.savefig(buf, format='png', bbox_inches='tight', dpi=150, facecolor='white')
-        plt.close(fig)
-        
-        buf.seek(0)
-        img_base64 = base64.b64encode(buf.read()).decode('utf-8')
-        return f"data:image/png;base64,{img_base64}"
-        
+        return png_data_uri(enhanced_radar_chart_png(elem_dict_kr))
     except Exception as e:
         print(f"향상된 레이더 차트 생성 실패: {e}")
-        return radar_chart_base64({'Wood': elem_dict_kr.get('목', 0), 'Fire': elem_dict_kr.get('화', 0), 
-                                  'Earth': elem_dict_kr.get('토', 0), 'Metal': elem_dict_kr.get('금', 0), 
-                                  'Water': elem_dict_kr.get('수', 0)})
\ No newline at end of file
+        return radar_chart_base64(_element_ratios(elem_dict_kr))
+
+
+def chart_asset_url(kind: str, values: list, render) -> str:
+    """
+    차트를 static 에셋 파일로 한 번만 저장하고 URL 반환
+
+    파일명은 차트 종류 / 입력값 / CHART_VERSION의 해시라서 같은 오행 분포의 사용자는
+    같은 URL을 공유하고 (브라우저 캐시 재사용), 이미 있으면 다시 그리지 않는다.
+
+    Args:
+        kind: 차트 종류 (파일명 접두사)
+        values: 차트 입력값
+        render: PNG bytes를 반환하는 함수 (파일이 없을 때만 호출)
+
+    Returns:
+        str: 에셋 URL
+    """
+    key = hashlib.sha256(f"{CHART_VERSION}:{kind}:{values}".encode('utf-8')).hexdigest()[:24]
+    filename = f"{kind}-{key}.png"
+    path = os.path.join(REPORT_ASSET_DIR, "charts", filename)
+    if not os.path.exists(path):
+        png = render()
+        if not png:
+            raise ValueError(f"empty chart: {kind}")
+        from app.utils.report_files import atomic_write  # app.utils가 이 모듈을 import (순환 방지)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        atomic_write(path, png)
+    return f"{REPORT_ASSET_URL}/charts/{filename}"
+
+
+def enhanced_radar_chart_url(elem_dict_kr: dict) -> str:
+    """향상된 레이더 차트 - 캐시 가능한 에셋 URL (웹 리포트용, 실패 시 인라인으로 대체)"""
+    values = [elem_dict_kr.get(k, 0) for k in ELEMENTS_KR]
+    try:
+        return chart_asset_url("radar", values, lambda: enhanced_radar_chart_png(elem_dict_kr))
+    except Exception as e:
+        print(f"레이더 차트 에셋 생성 실패, 인라인 사용: {e}")
+        return enhanced_radar_chart_base64(elem_dict_kr)
\ No newline at end of file
@@ -516,6 +516,21 @@ async def admin_create_filtered_submit(
     return RedirectResponse("/admin/filtered", status_code=302)
 
 
+@router.get("/llm_usage", response_class=HTMLResponse)
+async def admin_llm_usage(
+    request: Request,
+    days: int = 7,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin),
+):
+    from app.services.llm_usage_service import LLMUsageService
+
+    usage = LLMUsageService.dashboard(db, days=max(1, min(days, 90)))
+    return templates.TemplateResponse(
+        "admin/llm_usage.html", {"request": request, "usage": usage}
+    )
+
+
 @router.get("/saju_users", response_class=HTMLResponse)
 async def admin_saju_users(
     request: Request,
@@ -4,7 +4,8 @@ from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models import User
 from app.forms import LoginForm, RegisterForm
-from app.utils import hash_password, verify_password, flash_message
+from app.utils import flash_message
+from app.utils.passwords import hash_password_async, verify_password_async
 from app.template import templates
 from app.utils.csrf import generate_csrf_token, validate_csrf_token
 from app.services.referral_service import ReferralService
@@ -33,7 +34,16 @@ async def login(
     validate_csrf_token(request, csrf_token)
     user = db.query(User).filter(User.username == username).first()
     
-    if user and verify_password(password, user.password):
+    verified, new_hash = (False, None)
+    if user:
+        verified, new_hash = await verify_password_async(password, user.password)
+
+    if verified:
+        # BCRYPT_ROUNDS가 바뀐 경우 현재 cost로 재해시
+        if new_hash:
+            user.password = new_hash
+            db.commit()
+
         request.session['user_id'] = user.id
         request.session['username'] = user.username
         request.session['is_admin'] = user.is_admin
@@ -78,7 +88,7 @@ async def register(
     if existing_user:
         flash_message(request, "이미 존재하는 사용자명 또는 이메일입니다.", "error")
     else:
-        hashed_password = hash_password(password)
+        hashed_password = await hash_password_async(password)
         new_user = User(
             username=username,
             email=email,
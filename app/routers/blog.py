@@ -1,17 +1,20 @@
 # app/routers/blog.py 수정본 - 라우터 순서 중요!
 
 from fastapi import APIRouter, Request, Depends
-from app.exceptions import NotFoundError
+from app.exceptions import NotFoundError, BadRequestError
 import logging
 
 logger = logging.getLogger(__name__)
 from fastapi.responses import HTMLResponse
 from sqlalchemy.orm import Session
 from urllib.parse import unquote
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models import Post, Category
 from app.template import templates
 from markupsafe import Markup
+from typing import Optional
+from app.utils.error_handlers import ValidationError
+from app.utils.pagination import keyset_page, cached_count
 
 router = APIRouter()
 
@@ -19,16 +22,23 @@ router = APIRouter()
 async def blog_list(
     request: Request, 
     page: int = 1,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db)
 ):
     per_page = 6
-    offset = (page - 1) * per_page
     
-    posts = db.query(Post).filter(
-        Post.is_published == True
-    ).order_by(Post.created_at.desc()).offset(offset).limit(per_page).all()
+    query = db.query(Post).filter(Post.is_published == True)
+    
+    # (created_at, id) 키셋 - 번호로 바로 이동한 경우만 OFFSET
+    try:
+        posts, next_cursor = keyset_page(
+            query, Post.created_at, Post.id, per_page,
+            cursor=cursor, offset=(page - 1) * per_page
+        )
+    except ValidationError as e:
+        raise BadRequestError(str(e))
     
-    total = db.query(Post).filter(Post.is_published == True).count()
+    total = cached_count("count:blog_posts:published", query.count)
     pages = (total + per_page - 1) // per_page
     
     categories = db.query(Category).all()
@@ -39,7 +49,8 @@ async def blog_list(
         "categories": categories,
         "page": page,
         "pages": pages,
-        "total": total
+        "total": total,
+        "next_cursor": next_cursor
     })
 
 # 🔥 중요! category 라우터를 먼저 정의
@@ -48,7 +59,7 @@ async def blog_category(
     request: Request,
     category_slug: str,
     page: int = 1,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     # 한국어 디코딩 지원
     decoded_slug = unquote(category_slug)
@@ -8,11 +8,13 @@ from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Request, Form, Query
 from fastapi.responses import HTMLResponse, RedirectResponse
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.database import get_db
 from app.models import User, UserFortunePoint
 from app.services.fortune_service import FortuneService, get_fortune_service
 from app.services.payment_service import PaymentService, get_payment_service
+from app.services.user_cache_service import UserCacheService
 from app.utils.csrf import generate_csrf_token, validate_csrf_token
 from app.utils.error_handlers import ValidationError, InsufficientPointsError
 from app.template import templates
@@ -28,7 +30,7 @@ def get_current_user(request: Request, db: Session = Depends(get_db)) -> User:
     if not user_id:
         raise HTTPException(status_code=401, detail="로그인이 필요합니다.")
     
-    user = db.query(User).filter(User.id == user_id).first()
+    user = UserCacheService.load(db, user_id)
     if not user:
         raise HTTPException(status_code=401, detail="유효하지 않은 사용자입니다.")
     
@@ -124,6 +126,7 @@ async def fortune_history(
     request: Request,
     page: int = Query(1, ge=1),
     transaction_type: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None),
     db: Session = Depends(get_db)
 ):
     """포인트 거래 내역 페이지"""
@@ -136,7 +139,8 @@ async def fortune_history(
             user_id=int(current_user.id),
             page=page,
             per_page=20,
-            transaction_type=transaction_type
+            transaction_type=transaction_type,
+            cursor=cursor
         )
         
         # CSRF 토큰 생성
@@ -209,8 +213,9 @@ async def api_prepare_charge(
             f"{int(current_user.id)}:{package_id}:{int(time.time() / 60)}".encode()
         ).hexdigest()
         
-        # 포인트 충전 준비
-        result = payment_service.prepare_point_charge(
+        # 포인트 충전 준비 - 카카오페이 호출 / 중복 요청 대기가 블로킹이라 스레드풀에서 실행
+        result = await run_in_threadpool(
+            payment_service.prepare_point_charge,
             package_id=package_id,
             user_id=int(current_user.id),
             idempotency_key=idempotency_key
@@ -279,9 +284,10 @@ async def api_get_transactions(
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=50),
     transaction_type: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None),
     db: Session = Depends(get_db)
 ):
-    """거래 내역 조회 API (페이징)"""
+    """거래 내역 조회 API (키셋 페이징 - 다음 페이지는 next_cursor 전달)"""
     try:
         current_user = get_current_user(request, db)
         fortune_service = FortuneService(db)
@@ -290,7 +296,8 @@ async def api_get_transactions(
             user_id=int(current_user.id),
             page=page,
             per_page=per_page,
-            transaction_type=transaction_type
+            transaction_type=transaction_type,
+            cursor=cursor
         )
         
         return {
@@ -298,6 +305,8 @@ async def api_get_transactions(
             "data": transactions_data
         }
         
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except HTTPException:
         raise
     except Exception as e:
@@ -0,0 +1,70 @@
+"""
+운영 지표 라우터 - 프로세스 단위 내부 지표 (관리자 전용)
+- DB 커넥션 풀 / 레플리카 상태
+- 비밀번호 해시 풀, Rate limit, 결제 멱등성 저장소
+- 카카오페이 API 호출, 리포트 진행 SSE, 정기결제 실행
+"""
+
+import os
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.database import get_db, replica_status
+from app.db_metrics import pool_metrics_snapshot
+from app.payments.kakaopay import kakaopay_client
+from app.utils import require_admin
+from app.utils.passwords import password_hasher
+from app.utils.rate_limit import rate_limit_stats
+
+# 풀 크기 / 결제 / 사용자 트래픽이 드러나므로 라우터 전체를 관리자 세션으로 제한
+router = APIRouter(prefix="/metrics", tags=["Metrics"], dependencies=[Depends(require_admin)])
+
+
+@router.get("/db")
+async def db_metrics():
+    """프로세스 단위 DB 커넥션 풀 지표"""
+    return {
+        "pid": os.getpid(),
+        "engines": pool_metrics_snapshot(),
+        "replicas": replica_status(),
+    }
+
+
+@router.get("/passwords")
+async def password_hasher_metrics():
+    """비밀번호 해시 풀 대기열 지표"""
+    return {"pid": os.getpid(), **password_hasher.stats()}
+
+
+@router.get("/rate-limit")
+async def rate_limit_metrics():
+    """Rate limiter 판정 지연 / 거부 지표"""
+    return {"pid": os.getpid(), **rate_limit_stats()}
+
+
+@router.get("/idempotency")
+async def idempotency_metrics():
+    """결제 멱등성 저장소 적중 지표"""
+    from app.services.idempotency_service import idempotency_store
+    return {"pid": os.getpid(), **idempotency_store.stats()}
+
+
+@router.get("/kakaopay")
+async def kakaopay_metrics():
+    """카카오페이 API 엔드포인트별 호출 / 재시도 / 지연 분포"""
+    return {"pid": os.getpid(), **kakaopay_client.stats()}
+
+
+@router.get("/report-progress")
+async def report_progress_metrics():
+    """리포트 진행 SSE 구독 / 이벤트 분배 지표"""
+    from app.services.report_progress_service import report_progress_hub
+    return {"pid": os.getpid(), **report_progress_hub.stats()}
+
+
+@router.get("/billing")
+async def billing_metrics(db: Session = Depends(get_db)):
+    """최근 정기결제 실행별 처리량 / 실패 지표"""
+    from app.services.billing_service import BillingRunService
+    return {"runs": BillingRunService(db).recent_runs()}
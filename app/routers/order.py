@@ -9,19 +9,25 @@ from app.exceptions import (
     NotFoundError,
     PermissionDeniedError,
     InternalServerError,
+    UnauthorizedError,
 )
 from app.utils import (
     generate_live_report_for_user,
     generate_live_report_from_db,
     get_flashed_messages
 )
-from fastapi.responses import JSONResponse, RedirectResponse, HTMLResponse
+from fastapi.responses import JSONResponse, RedirectResponse, HTMLResponse, StreamingResponse
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 
-from app.database import get_db
+from app.database import get_db, get_async_db, AsyncSessionLocal
 from app.models import Order, Product, User, SajuAnalysisCache, SajuUser
 from app.template import templates
+from app.utils.rate_limit import rate_limit
+from app.utils.report_files import report_file_response
+from app.services.report_progress_service import report_event, report_progress_hub
 from app.dependencies import get_current_user, get_current_user_optional
 from app.payments.kakaopay import (
     kakao_ready, kakao_approve, verify_payment, 
@@ -43,7 +49,8 @@ router = APIRouter(prefix="/order", tags=["Order"])
 ################################################################################
 # 1) 주문 생성 - 카카오페이 결제창 호출
 ################################################################################
-@router.post("/create")
+# 사용자당 1분에 5회 (결제창 호출 남용 방지)
+@router.post("/create", dependencies=[Depends(rate_limit("order_create", 5, 60))])
 async def create_order(
     request: Request,
     payload: dict = Body(...),
@@ -478,14 +485,16 @@ async def retry_report_generation(
 @router.get("/status/{order_id}")
 async def check_order_status(
     order_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user: User = Depends(get_current_user)
 ):
     """주문 및 리포트 생성 상태 확인 API"""
-    order = db.query(Order).filter(
-        Order.id == order_id,
-        Order.user_id == user.id
-    ).first()
+    order = (await db.execute(
+        select(Order).where(
+            Order.id == order_id,
+            Order.user_id == user.id
+        )
+    )).scalars().first()
     
     if not order:
         logger.warning(
@@ -522,23 +531,60 @@ async def check_order_status(
         "has_report": bool(order.report_html or order.report_pdf)
     })
 
+@router.get("/events/{order_id}")
+async def report_progress_events(order_id: int, request: Request):
+    """
+    리포트 생성 진행 상황 SSE 스트림 (/status 폴링 대체)
+
+    스트림 동안 DB 커넥션을 잡지 않도록 세션 의존성 대신 짧은 세션으로 한 번만 조회한다.
+    """
+    user_id = request.session.get("user_id")
+    if not user_id:
+        raise UnauthorizedError("로그인이 필요합니다.")
+
+    queue = report_progress_hub.subscribe(order_id)
+    try:
+        async with AsyncSessionLocal() as db:
+            row = (await db.execute(
+                select(Order.report_status).where(Order.id == order_id, Order.user_id == user_id)
+            )).first()
+        if row is None:
+            raise NotFoundError("주문을 찾을 수 없습니다.")
+
+        if row.report_status in ("completed", "failed"):
+            initial = report_event(order_id, row.report_status)
+        else:
+            initial = await report_progress_hub.last_event(order_id)
+    except Exception:
+        report_progress_hub.unsubscribe(order_id, queue)
+        raise
+
+    return StreamingResponse(
+        report_progress_hub.stream(order_id, queue, initial),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 ################################################################################
 # 9) 리포트 다운로드
 ################################################################################
 @router.get("/download/{order_id}")
 async def download_report(
     order_id: int,
+    request: Request,
     format: str = Query("html", regex="^(html|pdf)$"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user: User = Depends(get_current_user)
 ):
     """리포트 다운로드 (HTML 또는 PDF)"""
-    order = db.query(Order).filter(
-        Order.id == order_id,
-        Order.user_id == user.id,
-        Order.status == "paid",
-        Order.report_status == "completed"
-    ).first()
+    order = (await db.execute(
+        select(Order).where(
+            Order.id == order_id,
+            Order.user_id == user.id,
+            Order.status == "paid",
+            Order.report_status == "completed"
+        )
+    )).scalars().first()
     
     if not order:
         logger.warning(
@@ -546,25 +592,24 @@ async def download_report(
         )
         raise NotFoundError("리포트를 찾을 수 없습니다.")
     
-    if format == "html" and order.report_html:
-        from fastapi.responses import FileResponse
-        return FileResponse(
-            path=order.report_html,
-            filename=f"saju_report_{order_id}.html",
-            media_type="text/html"
-        )
-    elif format == "pdf" and order.report_pdf:
-        from fastapi.responses import FileResponse
-        return FileResponse(
-            path=order.report_pdf,
-            filename=f"saju_report_{order_id}.pdf",
-            media_type="application/pdf"
-        )
-    else:
-        logger.warning(
-            f"Requested report format not ready: order_id={order_id}, format={format}"
-        )
-        raise NotFoundError(f"{format.upper()} 리포트가 아직 생성되지 않았습니다.")
+    try:
+        if format == "html" and order.report_html:
+            return await report_file_response(
+                request, order.report_html, filename=f"saju_report_{order_id}.html"
+            )
+        elif format == "pdf" and order.report_pdf:
+            return await report_file_response(
+                request, order.report_pdf, media_type="application/pdf",
+                filename=f"saju_report_{order_id}.pdf", compress=False
+            )
+    except FileNotFoundError:
+        logger.warning(f"Report file missing: order_id={order_id}, format={format}")
+        raise NotFoundError("리포트 파일이 존재하지 않습니다.")
+
+    logger.warning(
+        f"Requested report format not ready: order_id={order_id}, format={format}"
+    )
+    raise NotFoundError(f"{format.upper()} 리포트가 아직 생성되지 않았습니다.")
 
 
 
@@ -574,16 +619,19 @@ async def download_report(
 @router.get("/report/{order_id}", response_class=HTMLResponse)
 async def view_report(
     order_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
     user: User = Depends(get_current_user)
 ):
-    """리포트 HTML을 브라우저에서 직접 보기"""
-    order = db.query(Order).filter(
-        Order.id == order_id,
-        Order.user_id == user.id,
-        Order.status == "paid",
-        Order.report_status == "completed"
-    ).first()
+    """리포트 HTML을 브라우저에서 직접 보기 (사전 압축본 / ETag 304)"""
+    order = (await db.execute(
+        select(Order).where(
+            Order.id == order_id,
+            Order.user_id == user.id,
+            Order.status == "paid",
+            Order.report_status == "completed"
+        )
+    )).scalars().first()
     
     if not order:
         logger.warning(
@@ -598,19 +646,12 @@ async def view_report(
         raise NotFoundError("HTML 리포트가 아직 생성되지 않았습니다.")
     
     try:
-        # HTML 파일 읽어서 직접 반환
-        import os
-        if not os.path.exists(order.report_html):
-            logger.warning(
-                f"Report file missing: order_id={order_id}, path={order.report_html}"
-            )
-            raise NotFoundError("리포트 파일이 존재하지 않습니다.")
-            
-        with open(order.report_html, 'r', encoding='utf-8') as f:
-            html_content = f.read()
-        
-        return HTMLResponse(content=html_content, status_code=200)
-        
+        return await report_file_response(request, order.report_html)
+    except FileNotFoundError:
+        logger.warning(
+            f"Report file missing: order_id={order_id}, path={order.report_html}"
+        )
+        raise NotFoundError("리포트 파일이 존재하지 않습니다.")
     except Exception as e:
         logger.error(f"리포트 HTML 읽기 실패: {e}")
         raise InternalServerError("리포트를 불러오는 중 오류가 발생했습니다.")
@@ -3,6 +3,8 @@ from fastapi.responses import HTMLResponse
 from app.services.product_service import ProductService
 from app.dependencies import get_db, get_current_user
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
 from app.template import templates
 from pydantic import BaseModel
 from typing import Optional
@@ -19,13 +21,13 @@ class ReviewRequest(BaseModel):
 
 # SSR: SEO 최적화된 상품 상세 페이지
 @router.get("/{slug}", response_class=HTMLResponse)
-def product_detail(request: Request, slug: str, db: Session = Depends(get_db), user=Depends(get_current_user)):
+async def product_detail(request: Request, slug: str, db: AsyncSession = Depends(get_async_db), user=Depends(get_current_user)):
     """
     SEO 최적화된 상품 상세 페이지 (canonical URL)
     - shop.py와 역할 분담: 정보 제공 중심
     - 구매는 shop.py로 연결
     """
-    product_data = ProductService.get_product_detail_seo(slug, user.id if user else None, db)
+    product_data = await ProductService.get_product_detail_seo_async(slug, user.id if user else None, db)
     if not product_data:
         raise HTTPException(status_code=404, detail="상품을 찾을 수 없습니다.")
     # seo_data가 없으면 빈 dict이라도 넘김
@@ -15,6 +15,7 @@ import logging
 from app.database import get_db
 from app.models import User
 from app.template import templates
+from app.utils.rate_limit import rate_limit
 from app.dependencies import get_current_user, get_current_user_optional
 from app.services.referral_service import ReferralService
 from app.exceptions import BadRequestError, NotFoundError, PermissionDeniedError
@@ -235,7 +236,8 @@ async def api_reactivate_referral_code(
             "error": "추천인 코드 재활성화 중 오류가 발생했습니다."
         }, status_code=500)
 
-@router.get("/api/v1/validate/{code}")
+# 코드 대입 방지 - IP당 1분에 20회
+@router.get("/api/v1/validate/{code}", dependencies=[Depends(rate_limit("referral_validate", 20, 60, scope="ip"))])
 async def api_validate_referral_code(
     request: Request,
     code: str,
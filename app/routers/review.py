@@ -11,13 +11,14 @@ from sqlalchemy.orm import Session
 from typing import Optional, Dict, Any
 import logging
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models import User, Product, UserReview
 from app.template import templates
 from app.dependencies import get_current_user, get_current_user_optional
 from app.services.review_service import ReviewService
 from app.services.shop_service import ShopService
 from app.exceptions import BadRequestError, NotFoundError, PermissionDeniedError
+from app.utils.error_handlers import ValidationError
 
 logger = logging.getLogger(__name__)
 
@@ -99,7 +100,8 @@ async def review_list(
     sort_by: str = Query("created_at", regex="^(created_at|rating|helpful)$"),
     sort_order: str = Query("desc", regex="^(asc|desc)$"),
     rating_filter: Optional[int] = Query(None, ge=1, le=5),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None),
+    db: Session = Depends(get_read_db),
     user: User = Depends(get_current_user_optional)
 ):
     """상품 리뷰 목록 페이지"""
@@ -117,7 +119,8 @@ async def review_list(
             per_page=10,
             sort_by=sort_by,
             sort_order=sort_order,
-            rating_filter=rating_filter
+            rating_filter=rating_filter,
+            cursor=cursor
         )
         
         return templates.TemplateResponse("review/list.html", {
@@ -132,6 +135,10 @@ async def review_list(
             "current_rating_filter": rating_filter
         })
         
+    except ValidationError as e:
+        raise BadRequestError(str(e))
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"리뷰 목록 조회 실패: product_slug={product_slug}, error={e}")
         raise HTTPException(status_code=500, detail="리뷰 목록을 불러오는 중 오류가 발생했습니다.")
@@ -394,7 +401,8 @@ async def api_get_product_reviews(
     sort_by: str = Query("created_at", regex="^(created_at|rating|helpful)$"),
     sort_order: str = Query("desc", regex="^(asc|desc)$"),
     rating_filter: Optional[int] = Query(None, ge=1, le=5),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None),
+    db: Session = Depends(get_read_db)
 ):
     """상품 리뷰 목록 API"""
     try:
@@ -406,7 +414,8 @@ async def api_get_product_reviews(
             per_page=10,
             sort_by=sort_by,
             sort_order=sort_order,
-            rating_filter=rating_filter
+            rating_filter=rating_filter,
+            cursor=cursor
         )
         
         return JSONResponse({
@@ -414,6 +423,11 @@ async def api_get_product_reviews(
             "data": reviews_data
         })
         
+    except ValidationError as e:
+        return JSONResponse({
+            "success": False,
+            "error": str(e)
+        }, status_code=400)
     except Exception as e:
         logger.error(f"상품 리뷰 목록 API 실패: product_id={product_id}, error={e}")
         return JSONResponse({
@@ -3,9 +3,13 @@
 from fastapi import APIRouter, Request, Form, Depends
 from app.exceptions import BadRequestError
 from fastapi.responses import HTMLResponse, RedirectResponse
-from app.database import get_db
+from app.database import get_db, get_async_db, get_read_db
 from app.models import Post, Category, SajuUser, SajuAnalysisCache, Product
 from app.template import templates
+from app.utils.rate_limit import rate_limit
+from app.services.llm_cache_service import LLMCacheService
+from app.services.llm_usage_service import LLMUsageService
+from app.utils.prompt_registry import prompt_registry
 from datetime import datetime, timedelta
 import uuid
 import hashlib
@@ -13,6 +17,7 @@ import re
 import sxtwl
 import os
 import secrets
+import time
 from markdown import markdown
 import requests
 # Use SQLAlchemy ORM to query saju_wiki_contents
@@ -21,7 +26,8 @@ from app.models import SajuWikiContent
 from app.saju_utils import SajuKeyManager
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text, select
 import logging
 # 환경 변수 로드
 from dotenv import load_dotenv
@@ -580,27 +586,51 @@ def get_ctext_match(day_pillar, hour_pillar):
 
         db.close()
 
+        return _dedupe_ctext_rows(rows)
+
+    except Exception as e:
+        print(f"⚠️ ctext.db 연결 오류: {e}")
+        return None
+
+async def get_ctext_match_async(db: AsyncSession, day_pillar, hour_pillar):
+    """삼명통회 원문 매칭 - 비동기 세션 버전 (우선순위는 get_ctext_match와 동일)"""
+    full_kw = f"{day_pillar}日{hour_pillar}"
+    stem_kw = f"{day_pillar[0]}日{hour_pillar}"
+
+    try:
+        rows = (await db.execute(
+            select(SajuWikiContent).where(SajuWikiContent.content.like(f"%{full_kw}%"))
+        )).scalars().all()
+
         if not rows:
-            return None
+            rows = (await db.execute(
+                select(SajuWikiContent).where(SajuWikiContent.content.like(f"%{stem_kw}%"))
+            )).scalars().all()
 
-        # 중복 content 제거 후 필요한 필드만 반환
-        seen = set()
-        result = []
-        for r in rows:
-            if r.content in seen:
-                continue
-            seen.add(r.content)
-            result.append({
-                "content": r.content,
-                "kr_literal": r.kr_literal,
-                "kr_explained": r.kr_explained
-            })
-        return result
+        return _dedupe_ctext_rows(rows)
 
     except Exception as e:
         print(f"⚠️ ctext.db 연결 오류: {e}")
         return None
 
+def _dedupe_ctext_rows(rows):
+    """중복 content 제거 후 필요한 필드만 반환"""
+    if not rows:
+        return None
+
+    seen = set()
+    result = []
+    for r in rows:
+        if r.content in seen:
+            continue
+        seen.add(r.content)
+        result.append({
+            "content": r.content,
+            "kr_literal": r.kr_literal,
+            "kr_explained": r.kr_explained
+        })
+    return result
+
 # ai 1차 사주 분석이후 포맷을 입히는 함수
 def format_fortune_text(text):
     """운세 텍스트 포맷팅"""
@@ -828,7 +858,7 @@ async def saju_page1_submit(
 
 # ai 사주 결과 페이지
 @router.get("/page2", response_class=HTMLResponse)
-async def saju_page2(request: Request, db: Session = Depends(get_db)):
+async def saju_page2(request: Request, db: AsyncSession = Depends(get_async_db)):
     """사주 결과 페이지 (글로벌 캐싱 버전)"""
     
     if "session_token" not in request.session:
@@ -840,7 +870,9 @@ async def saju_page2(request: Request, db: Session = Depends(get_db)):
         return RedirectResponse(url="/saju/page1", status_code=302)
     print("saju_key:", saju_key, flush=True)    
     # 🔄 글로벌 캐시 확인 (다른 사용자가 이미 계산했을 수도 있음)
-    cached_analysis = db.query(SajuAnalysisCache).filter_by(saju_key=saju_key).first()
+    cached_analysis = (await db.execute(
+        select(SajuAnalysisCache).filter_by(saju_key=saju_key)
+    )).scalars().first()
     
     name = request.session.get("name", "손님")
     
@@ -868,7 +900,7 @@ async def saju_page2(request: Request, db: Session = Depends(get_db)):
     )
 
     # 삼명통회 원문 해석
-    ctext_rows = get_ctext_match(pillars["day"], pillars["hour"])
+    ctext_rows = await get_ctext_match_async(db, pillars["day"], pillars["hour"])
     ctext_explanation = None
     ctext_kr_literal = None
     ctext_kr_explained = None
@@ -880,7 +912,9 @@ async def saju_page2(request: Request, db: Session = Depends(get_db)):
     # 환경변수에서 후원 링크 가져오기
     coffee_link = os.getenv("BUY_ME_A_COFFEE_LINK", "https://www.buymeacoffee.com/yourname")
     # 🎯 상품 정보 조회 (premium_saju 코드로) - 이 부분만 추가
-    product = db.query(Product).filter(Product.code == "premium_saju", Product.is_active == True).first()
+    product = (await db.execute(
+        select(Product).where(Product.code == "premium_saju", Product.is_active == True)
+    )).scalars().first()
 
     return templates.TemplateResponse("saju/page2.html", {
         "request": request,
@@ -904,22 +938,16 @@ async def saju_page2(request: Request, db: Session = Depends(get_db)):
 
     })
 
-# AI 사주 분석 초기버전 API
-@router.post("/api/saju_ai_analysis")
-async def api_saju_ai_analysis(request: Request, db: Session = Depends(get_db)):
-    """AI 사주 분석 API (글로벌 캐싱 버전)"""
-    
-    saju_key = request.session.get("saju_key")
-    if not saju_key:
-        logger.warning("Saju key missing in session")
-        raise BadRequestError("사주 정보가 없습니다.")
-    
-    # 🔄 글로벌 캐시 확인
-    cached_row = db.query(SajuAnalysisCache).filter_by(saju_key=saju_key).first()
-    if cached_row and cached_row.analysis_preview:
-        return {"result": safe_markdown(cached_row.analysis_preview)}
-    
-    # 캐시 미스 - 새로 계산
+def build_preview_prompt(saju_key: str) -> str:
+    """
+    미리보기 분석(analysis_preview) 프롬프트 구성 - API와 배치 워밍업이 공유
+
+    Args:
+        saju_key: 사주 키
+
+    Returns:
+        str: 일주 / 삼명통회 원문 / 오행·십성 해석을 담은 프롬프트
+    """
     calc_datetime, orig_date, gender = SajuKeyManager.get_birth_info_for_calculation(saju_key)
     
     # 사주팔자 계산
@@ -954,18 +982,38 @@ async def api_saju_ai_analysis(request: Request, db: Session = Depends(get_db)):
 
 이 정보를 종합하여, 이 사람의 인생 전반적 특성과 강점, 유의사항을 300자 내외로 종합 해석해주세요.
 """
+    return prompt
+
+
+# AI 사주 분석 초기버전 API
+@router.post("/api/saju_ai_analysis")
+async def api_saju_ai_analysis(request: Request, db: Session = Depends(get_db)):
+    """AI 사주 분석 API (글로벌 캐싱 버전)"""
     
+    saju_key = request.session.get("saju_key")
+    if not saju_key:
+        logger.warning("Saju key missing in session")
+        raise BadRequestError("사주 정보가 없습니다.")
+    
+    # 🔄 글로벌 캐시 확인
+    cached_row = db.query(SajuAnalysisCache).filter_by(saju_key=saju_key).first()
+    if cached_row and cached_row.analysis_preview:
+        return {"result": safe_markdown(cached_row.analysis_preview)}
+    
+    # 캐시 미스 - 새로 계산
+    prompt = build_preview_prompt(saju_key)
+    
+    system_prompt = "당신은 전문 사주 해석가입니다."
+    params = {"temperature": 0.8, "max_tokens": 600}
+
     try:
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "당신은 전문 사주 해석가입니다."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.8,
-            max_tokens=600
+        # LLM 캐시 → 일일 예산 확인 (초과 시 대체 모델) → 호출 / 사용량 기록
+        raw = LLMUsageService.chat(
+            client, "api_saju_ai_analysis", "gpt-3.5-turbo", system_prompt, prompt, params
         )
-        reply = format_fortune_text(response.choices[0].message.content)
+        if not raw:
+            return {"error": "AI 분석 요청이 많아 잠시 후 다시 시도해주세요."}
+        reply = format_fortune_text(raw)
         
         # 🔄 글로벌 캐시에 저장 (동시성 고려)
         try:
@@ -996,7 +1044,7 @@ async def api_saju_ai_analysis(request: Request, db: Session = Depends(get_db)):
 
 # 통계 API 추가 (선택사항)
 @router.get("/api/stats")
-async def saju_stats(request: Request, db: Session = Depends(get_db)):
+async def saju_stats(request: Request, db: Session = Depends(get_read_db)):
     """사주 서비스 통계"""
     try:
         total_keys = db.query(SajuAnalysisCache).count()
@@ -1016,7 +1064,10 @@ async def saju_stats(request: Request, db: Session = Depends(get_db)):
             "total_unique_saju": total_keys,
             "total_requests": total_users,
             "cache_hit_ratio": round((total_keys / max(total_users, 1)) * 100, 1),
-            "popular_birth_years": [{"year": row[0], "count": row[1]} for row in popular_years]
+            "popular_birth_years": [{"year": row[0], "count": row[1]} for row in popular_years],
+            # saju_key 캐시 아래 LLM 입력 단위 캐시 - avoided_calls가 절약한 LLM 호출 수
+            "llm_cache": LLMCacheService.stats(db),
+            "prompts": prompt_registry.stats()
         }
     except Exception as e:
         return {"error": str(e)}
@@ -1027,18 +1078,30 @@ async def saju_stats(request: Request, db: Session = Depends(get_db)):
 
 # 환경 변수에서 Ollama URL과 모델명 가져오기
 OLLAMA_URL = os.getenv('OLLAMA_URL', "")  # .env에서 URL 가져오기
-MODEL_NAME = os.getenv('gemma3:27b-it-q8_0',"gemma3:27b-it-q8_0")  # 사용할 모델명
-BATCH_SIZE = os.getenv('BATCH_SIZE', 10)  # 한 번에 처리할 레코드 수
-DELAY_BETWEEN_REQUESTS = os.getenv('DELAY_BETWEEN_REQUESTS', 2)  # 요청 간 딜레이 (초)
+MODEL_NAME = os.getenv('MODEL_NAME', "gemma3:27b-it-q8_0")  # 사용할 모델명
+BATCH_SIZE = int(os.getenv('BATCH_SIZE', 10))  # 한 번에 처리할 레코드 수
+DELAY_BETWEEN_REQUESTS = float(os.getenv('DELAY_BETWEEN_REQUESTS', 2))  # 요청 간 딜레이 (초)
 
-def load_prompt():
-    """improved_saju_prompt_v2.md 파일에서 프롬프트 로드"""
-    try:
-        with open('improved_saju_prompt_v5.md', 'r', encoding='utf-8') as f:
-            return f.read()
-    except FileNotFoundError:
-        print("❌ improved_saju_prompt_v4.md 파일을 찾을 수 없습니다.")
+# 배치 워밍업이 여러 스레드에서 호출 - 연결을 재사용 (요청마다 TCP 연결을 새로 맺지 않음)
+ollama_session = requests.Session()
+ollama_session.mount("http://", requests.adapters.HTTPAdapter(pool_maxsize=16))
+ollama_session.mount("https://", requests.adapters.HTTPAdapter(pool_maxsize=16))
+
+def load_prompt(saju_key: str = None):
+    """
+    사주 해석 프롬프트 (프롬프트 레지스트리 - 파일은 변경 시에만 다시 읽음)
+
+    Args:
+        saju_key: A/B 배정 키 (SAJU_PROMPT_AB 설정 시 같은 사주는 같은 버전)
+
+    Returns:
+        str: 프롬프트 내용, 파일이 없으면 None
+    """
+    prompt = prompt_registry.get("saju_full", sticky_key=saju_key)
+    if not prompt:
+        logger.error("사주 프롬프트 파일을 찾을 수 없습니다 (improved_saju_prompt_*.md)")
         return None
+    return prompt.text
     
 def test_ollama_connection():
     """ollama 서버 연결 테스트"""
@@ -1060,8 +1123,20 @@ def test_ollama_connection():
     except requests.exceptions.RequestException as e:
         print(f"❌ ollama 서버 연결 실패: {e}")
         return False
-def ai_sajupalja_with_ollama(prompt, content):
-    """ollama를 사용하여 프롬프트에 기반하여 사주팔자 추리"""
+def ai_sajupalja_with_ollama(prompt, content, endpoint="saju_warmup"):
+    """ollama를 사용하여 프롬프트에 기반하여 사주팔자 추리 (같은 입력은 LLM 캐시에서 재사용)"""
+    options = {
+        "temperature": 0.3,  # 창의성보다 정확성 우선
+        "num_predict": 3000,  # 최대 토큰 수
+        "top_p": 0.9
+    }
+    return LLMCacheService.cached_call(
+        MODEL_NAME, prompt, content, options,
+        lambda: _ollama_generate(prompt, content, options, endpoint)
+    )
+
+
+def _ollama_generate(prompt, content, options, endpoint):
     try:
         full_prompt = f"{prompt}\n\n다음 정보에 기반하여 사주팔자를 해석하세요:\n{content}"
         
@@ -1069,24 +1144,29 @@ def ai_sajupalja_with_ollama(prompt, content):
             "model": MODEL_NAME,
             "prompt": full_prompt,
             "stream": False,
-            "options": {
-                "temperature": 0.3,  # 창의성보다 정확성 우선
-                "num_predict": 3000,  # 최대 토큰 수
-                "top_p": 0.9
-            }
+            "options": options
         }
         
-        response = requests.post(
+        started = time.perf_counter()
+        response = ollama_session.post(
             f"{OLLAMA_URL}/api/generate",
             json=payload,
             timeout=120  # 2분 타임아웃
         )
+        latency_ms = int((time.perf_counter() - started) * 1000)
         
         if response.status_code == 200:
             result = response.json()
+            LLMUsageService.record(
+                endpoint, MODEL_NAME,
+                prompt_tokens=result.get('prompt_eval_count', 0),
+                completion_tokens=result.get('eval_count', 0),
+                latency_ms=latency_ms,
+            )
             return result.get('response', '').strip()
         else:
             print(f"❌ ollama API 오류: {response.status_code}")
+            LLMUsageService.record(endpoint, MODEL_NAME, "error", latency_ms=latency_ms)
             return None
             
     except requests.exceptions.RequestException as e:
@@ -1098,28 +1178,25 @@ def ai_sajupalja_with_ollama(prompt, content):
 
 
 # 기존 Ollama 함수 대신 OpenAI 함수 사용
-async def ai_sajupalja_with_chatgpt(prompt: str, content: str) -> str:
+async def ai_sajupalja_with_chatgpt(prompt: str, content: str, endpoint: str = "api_saju_ai_analysis_2") -> str:
     """GPT-4o를 사용하여 삼명통회 전문 번역 프롬프트 기반 사주팔자 해석"""
+    # 새 프롬프트(8섹션 상세 분석)에 최적화된 설정
+    params = {
+        "temperature": 0.4,        # 창의적 인사이트를 위해 약간 상향 (0.3→0.4)
+        "max_tokens": 8000,        # 8섹션 상세 분석을 위해 증가 (4000→6000)
+        "top_p": 0.9,              # 일관성 있는 품질
+        "frequency_penalty": 0.15, # 8섹션 반복 방지 강화 (0.1→0.15)
+        "presence_penalty": 0.2,   # 다양한 표현과 창의적 인사이트 (0.1→0.2)
+        # GPT-4o 추가 최적화 옵션
+        "seed": 42                 # 일관된 결과를 위한 시드값
+    }
+
     try:
-        # 명리학 고서 기반 시스템 프롬프트 (간소화 버전)
-        response = client.chat.completions.create(
-            # model="gpt-4o",  # GPT-3.5-turbo에서 GPT-4o로 업그레이드
-            model="gpt-4o",  # GPT-3.5-turbo에서 GPT-4o로 업그레이드
-            messages=[
-                {"role": "system", "content": prompt},
-                {"role": "user", "content": content}
-            ],
-            # 새 프롬프트(8섹션 상세 분석)에 최적화된 설정
-            temperature=0.4,      # 창의적 인사이트를 위해 약간 상향 (0.3→0.4)
-            max_tokens=8000,      # 8섹션 상세 분석을 위해 증가 (4000→6000)
-            top_p=0.9,           # 일관성 있는 품질
-            frequency_penalty=0.15, # 8섹션 반복 방지 강화 (0.1→0.15)
-            presence_penalty=0.2,  # 다양한 표현과 창의적 인사이트 (0.1→0.2)
-            # GPT-4o 추가 최적화 옵션
-            seed=42               # 일관된 결과를 위한 시드값
-        )
-        
-        result = response.choices[0].message.content.strip()
+        # 같은 사주팔자(같은 입력)는 saju_key가 달라도 LLM 캐시에서 재사용,
+        # 일일 예산 초과 시 대체 모델 / 한도 초과 시 None (endpoint별 사용량 기록)
+        result = LLMUsageService.chat(client, endpoint, "gpt-4o", prompt, content, params)
+        if not result:
+            return None
         
         # 결과 후처리 (한자 제거, 형식 정리)
         result = post_process_saju_result(result)
@@ -1162,8 +1239,32 @@ def post_process_saju_result(text: str) -> str:
     return text.strip()
 
 
+def build_analysis_content(pillars: dict) -> str:
+    """
+    전체 분석(analysis_full) 입력 텍스트 - 리포트 생성 태스크와 배치 워밍업이 공유
+
+    Args:
+        pillars: 사주팔자 {'year': '갑자', ...}
+
+    Returns:
+        str: 오행 분포 + 사주 구조 해석 텍스트
+    """
+    elem_dict_kr, result_text = analyze_four_pillars_to_string(
+        pillars['year'][0], pillars['year'][1],
+        pillars['month'][0], pillars['month'][1],
+        pillars['day'][0], pillars['day'][1],
+        pillars['hour'][0], pillars['hour'][1],
+    )
+    return "\n".join([
+        "오행 분포:",
+        ", ".join([f"{k}:{v}" for k, v in elem_dict_kr.items()]),
+        "",
+        result_text,
+    ])
+
+
 # tasks.py에서 사용할 때를 위한 동기 버전 래퍼
-def ai_sajupalja_with_chatgpt_sync(prompt: str, content: str) -> str:
+def ai_sajupalja_with_chatgpt_sync(prompt: str, content: str, endpoint: str = "generate_full_report") -> str:
     """tasks.py에서 사용할 동기 버전"""
     import asyncio
     
@@ -1173,13 +1274,14 @@ def ai_sajupalja_with_chatgpt_sync(prompt: str, content: str) -> str:
         # 이미 실행 중인 루프가 있다면 새 스레드에서 실행
         import concurrent.futures
         with concurrent.futures.ThreadPoolExecutor() as executor:
-            future = executor.submit(asyncio.run, ai_sajupalja_with_chatgpt(prompt, content))
+            future = executor.submit(asyncio.run, ai_sajupalja_with_chatgpt(prompt, content, endpoint))
             return future.result()
     except RuntimeError:
         # 실행 중인 루프가 없다면 직접 실행
-        return asyncio.run(ai_sajupalja_with_chatgpt(prompt, content))
+        return asyncio.run(ai_sajupalja_with_chatgpt(prompt, content, endpoint))
 
-@router.post("/api/saju_ai_analysis_2")
+# GPT 호출 비용 - 사용자(비로그인은 IP)당 5분에 3회
+@router.post("/api/saju_ai_analysis_2", dependencies=[Depends(rate_limit("saju_ai_analysis", 3, 300))])
 async def api_saju_ai_analysis_2(request: Request, db: Session = Depends(get_db)):
     """AI 사주 분석 API"""
     request.session.pop("cached_saju_analysis", None)
@@ -1197,7 +1299,7 @@ async def api_saju_ai_analysis_2(request: Request, db: Session = Depends(get_db)
         return {"result": safe_markdown(cached_row.analysis_full)}
 
     try:
-        prompt = load_prompt()
+        prompt = load_prompt(saju_key)
         if not prompt:
             return {"error": "프롬프트 로드 실패"}
             
@@ -1209,14 +1311,8 @@ async def api_saju_ai_analysis_2(request: Request, db: Session = Depends(get_db)
         from app.services.saju_service import SajuService
         pillars, elem_dict_kr = SajuService.get_or_calculate_saju(saju_key, db)
         
-        # Use string-based analysis for result_text
-        elem_dict_kr, result_text = analyze_four_pillars_to_string(
-            pillars['year'][0], pillars['year'][1],
-            pillars['month'][0], pillars['month'][1],
-            pillars['day'][0], pillars['day'][1],
-            pillars['hour'][0], pillars['hour'][1])
-
-        analysis_result = await ai_sajupalja_with_chatgpt(prompt=prompt, content=result_text)
+        # 리포트 태스크와 같은 입력 (LLM 캐시 공유)
+        analysis_result = await ai_sajupalja_with_chatgpt(prompt=prompt, content=build_analysis_content(pillars))
         
         if not analysis_result:
             return {"error": "AI 분석에 실패했습니다. 잠시 후 다시 시도해주세요."}
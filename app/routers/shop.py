@@ -8,11 +8,14 @@ from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Request, Form, Query
 from fastapi.responses import HTMLResponse, RedirectResponse
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
-from app.database import get_db
+from app.database import get_db, get_async_read_db
 from app.models import User
 from app.services.shop_service import ShopService, get_shop_service
 from app.services.fortune_service import FortuneService, get_fortune_service
+from app.services.user_cache_service import UserCacheService, UserSnapshot
 from app.utils.csrf import generate_csrf_token, validate_csrf_token
 from app.utils.error_handlers import ValidationError, InsufficientPointsError
 
@@ -25,9 +28,22 @@ def get_current_user(request: Request, db: Session = Depends(get_db)) -> Optiona
     """현재 로그인한 사용자 조회"""
     user_id = request.session.get("user_id")
     if user_id:
-        return db.query(User).filter(User.id == user_id).first()
+        return UserCacheService.load(db, user_id)
     return None
 
+async def get_current_user_async(request: Request, db: AsyncSession) -> Optional[User]:
+    """현재 로그인한 사용자 조회 (비동기 세션)"""
+    user_id = request.session.get("user_id")
+    if not user_id:
+        return None
+    snapshot = UserCacheService.get_snapshot(user_id)
+    if snapshot is not None:
+        return UserSnapshot(snapshot)
+    user = await db.get(User, user_id)
+    if user:
+        UserCacheService.store(user)
+    return user
+
 ################################################################################
 # 🛍️ 웹페이지 라우터 (SSR HTML)
 ################################################################################
@@ -39,15 +55,13 @@ async def shop_list(
     search: Optional[str] = Query(None),
     page: int = Query(1, ge=1),
     sort_by: str = Query("created_at"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
-    """상품 목록 페이지"""
+    """상품 목록 페이지 (비동기 세션 - 이벤트 루프 블로킹 없음)"""
     try:
-        shop_service = ShopService(db)
-        fortune_service = FortuneService(db)
-        
         # 상품 목록 조회
-        products_data = shop_service.get_products(
+        products_data = await ShopService.get_products_async(
+            db,
             category=category,
             search=search,
             page=page,
@@ -55,10 +69,10 @@ async def shop_list(
         )
         
         # 현재 사용자 정보
-        current_user = get_current_user(request, db)
+        current_user = await get_current_user_async(request, db)
         user_points = 0
         if current_user:
-            balance_info = fortune_service.get_user_balance(current_user.id)
+            balance_info = await FortuneService.get_user_balance_async(db, current_user.id)
             user_points = balance_info['points']
         
         # CSRF 토큰 생성
@@ -198,12 +212,12 @@ async def api_get_products(
     page: int = Query(1, ge=1),
     per_page: int = Query(12, ge=1, le=50),
     sort_by: str = Query("created_at"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """상품 목록 API"""
     try:
-        shop_service = ShopService(db)
-        products_data = shop_service.get_products(
+        products_data = await ShopService.get_products_async(
+            db,
             category=category,
             search=search,
             page=page,
@@ -280,8 +294,9 @@ async def api_create_purchase(
             }
             
         elif purchase_type == "cash":
-            # 현금 결제 준비
-            result = shop_service.prepare_cash_payment(
+            # 현금 결제 준비 - 카카오페이 호출 / 중복 요청 대기가 블로킹이라 스레드풀에서 실행
+            result = await run_in_threadpool(
+                shop_service.prepare_cash_payment,
                 user_id=current_user.id,
                 product_id=product_id,
                 saju_key=saju_key
@@ -331,9 +346,10 @@ async def api_get_user_purchases(
     request: Request,
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=50),
+    cursor: Optional[str] = Query(None),
     db: Session = Depends(get_db)
 ):
-    """사용자 구매 내역 API"""
+    """사용자 구매 내역 API (키셋 페이징 - 다음 페이지는 next_cursor 전달)"""
     try:
         # 로그인 체크
         current_user = get_current_user(request, db)
@@ -344,7 +360,8 @@ async def api_get_user_purchases(
         purchases_data = shop_service.get_user_purchases(
             user_id=current_user.id,
             page=page,
-            per_page=per_page
+            per_page=per_page,
+            cursor=cursor
         )
         
         return {
@@ -352,6 +369,8 @@ async def api_get_user_purchases(
             "data": purchases_data
         }
         
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except HTTPException:
         raise
     except Exception as e:
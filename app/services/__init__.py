@@ -0,0 +1,2 @@
+# 요약 / 카운터 테이블을 증분 갱신하는 flush 리스너 등록 (어느 서비스를 import해도 활성화)
+from app.services import review_stats_service, user_counter_service  # noqa: F401
@@ -0,0 +1,386 @@
+"""
+정기결제 실행 엔진
+- 결제 대상 구독을 id 순 청크로 나눠 계획 (id만 스트리밍, 전체 목록을 메모리에 올리지 않음)
+- 청크는 Celery 워커들이 병렬 처리, 구독마다 커밋 (구독 1건 실패는 savepoint로 격리)
+- 청크 상태 / 다음 결제일이 체크포인트 - 중단된 실행은 남은 구독 / 지급만 다시 처리
+- 결제(running) / 지급(granting)은 임대를 점유한 워커만 진행 (중복 분배돼도 한 번만)
+- 실행별 처리량 / 실패 지표 기록
+"""
+
+import logging
+import os
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import and_, func, or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models import Subscription, SubscriptionBillingChunk, SubscriptionBillingRun
+from app.services.fortune_service import FortuneService
+from app.services.subscription_service import SubscriptionService
+
+logger = logging.getLogger(__name__)
+
+BILLING_CHUNK_SIZE = int(os.getenv("BILLING_CHUNK_SIZE", 500))
+# running 상태로 이 시간(초) 넘게 갱신이 없으면 워커가 죽은 것으로 보고 다시 가져간다
+BILLING_CHUNK_LEASE_SECONDS = int(os.getenv("BILLING_CHUNK_LEASE_SECONDS", 600))
+
+
+def _due_filter(billing_date: date):
+    return and_(
+        Subscription.status == "active",
+        Subscription.next_billing_date <= billing_date,
+        Subscription.auto_renewal == True
+    )
+
+
+class BillingRunService:
+    """정기결제 실행 / 청크 처리 / 재개"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def start_run(self, billing_date: Optional[date] = None, chunk_size: int = BILLING_CHUNK_SIZE) -> SubscriptionBillingRun:
+        """
+        결제일 실행 생성 또는 기존 실행 반환 (중단된 계획 단계도 이어서 진행)
+
+        Args:
+            billing_date: 결제 기준일 (기본 오늘)
+            chunk_size: 청크당 구독 수
+
+        Returns:
+            SubscriptionBillingRun
+        """
+        billing_date = billing_date or date.today()
+        run = self.db.query(SubscriptionBillingRun).filter(
+            SubscriptionBillingRun.billing_date == billing_date
+        ).first()
+
+        if run is None:
+            run = SubscriptionBillingRun(billing_date=billing_date, chunk_size=chunk_size, status="planning")
+            self.db.add(run)
+            try:
+                self.db.commit()
+            except IntegrityError:
+                # 다른 스케줄러가 먼저 만든 경우
+                self.db.rollback()
+                return self.db.query(SubscriptionBillingRun).filter(
+                    SubscriptionBillingRun.billing_date == billing_date
+                ).one()
+
+        if run.status == "planning":
+            self._plan_chunks(run)
+        return run
+
+    def _plan_chunks(self, run: SubscriptionBillingRun) -> None:
+        """결제 대상 구독 id를 청크 단위로 스트리밍해 청크 행 생성 (청크마다 커밋)"""
+        last = self.db.query(SubscriptionBillingChunk).filter(
+            SubscriptionBillingChunk.run_id == run.id
+        ).order_by(SubscriptionBillingChunk.chunk_index.desc()).first()
+        chunk_index = last.chunk_index + 1 if last else 0
+        last_id = last.end_id if last else 0
+
+        while True:
+            ids = [
+                subscription_id for (subscription_id,) in self.db.query(Subscription.id).filter(
+                    _due_filter(run.billing_date),
+                    Subscription.id > last_id
+                ).order_by(Subscription.id).limit(run.chunk_size)
+            ]
+            if not ids:
+                break
+            self.db.add(SubscriptionBillingChunk(
+                run_id=run.id, chunk_index=chunk_index, start_id=ids[0], end_id=ids[-1]
+            ))
+            run.total_chunks = chunk_index + 1
+            self.db.commit()
+            chunk_index += 1
+            last_id = ids[-1]
+
+        run.status = "running"
+        self.db.commit()
+        logger.info(f"정기결제 계획 완료: run_id={run.id}, billing_date={run.billing_date}, chunks={run.total_chunks}")
+        if run.total_chunks == 0:
+            self._finalize(run.id)
+
+    def pending_chunk_ids(self, run_id: int) -> List[int]:
+        """아직 끝나지 않은 청크 (재개 / 디스패치 대상)"""
+        return [
+            chunk_id for (chunk_id,) in self.db.query(SubscriptionBillingChunk.id).filter(
+                SubscriptionBillingChunk.run_id == run_id,
+                SubscriptionBillingChunk.status != "done"
+            ).order_by(SubscriptionBillingChunk.chunk_index)
+        ]
+
+    def incomplete_runs(self) -> List[SubscriptionBillingRun]:
+        return self.db.query(SubscriptionBillingRun).filter(
+            SubscriptionBillingRun.status != "completed"
+        ).order_by(SubscriptionBillingRun.billing_date).all()
+
+    def _claim(self, chunk_id: int, claimable: List[str], lease_status: str) -> bool:
+        """
+        청크 점유 - 원자적 조건부 UPDATE (커밋 포함)
+
+        Args:
+            chunk_id: 청크 ID
+            claimable: 바로 가져갈 수 있는 상태
+            lease_status: 점유 중 상태 (이 상태로 임대가 만료된 청크도 가져간다)
+
+        Returns:
+            bool: 점유 성공 여부 (다른 워커가 임대 중이거나 이미 진행됐으면 False)
+        """
+        stale = datetime.now() - timedelta(seconds=BILLING_CHUNK_LEASE_SECONDS)
+        result = self.db.execute(
+            update(SubscriptionBillingChunk)
+            .where(
+                SubscriptionBillingChunk.id == chunk_id,
+                or_(
+                    SubscriptionBillingChunk.status.in_(claimable),
+                    and_(SubscriptionBillingChunk.status == lease_status, SubscriptionBillingChunk.updated_at < stale)
+                )
+            )
+            .values(
+                status=lease_status,
+                attempts=SubscriptionBillingChunk.attempts + 1,
+                updated_at=datetime.now()
+            )
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+        return result.rowcount == 1
+
+    def _renew_lease(self, chunk_id: int, attempt: int) -> bool:
+        """
+        running 임대 갱신 - 점유한 시도(attempts)가 그대로일 때만 (커밋은 호출자가 수행)
+
+        같은 트랜잭션에서 청크 행 락을 잡으므로 커밋 전에는 다른 워커가 청크를 가져갈 수 없다.
+        """
+        result = self.db.execute(
+            update(SubscriptionBillingChunk)
+            .where(
+                SubscriptionBillingChunk.id == chunk_id,
+                SubscriptionBillingChunk.status == "running",
+                SubscriptionBillingChunk.attempts == attempt
+            )
+            .values(updated_at=datetime.now())
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+
+    def process_chunk(self, chunk_id: int) -> Dict[str, Any]:
+        """
+        청크 하나 처리: 결제(구독마다 커밋) -> billed -> 포인트 일괄 지급(granting) -> done
+
+        결제 / 지급 단계 모두 임대를 점유한 워커만 진행하므로 같은 청크가 중복 분배돼도
+        한 번만 결제 / 지급된다.
+
+        Args:
+            chunk_id: 청크 ID
+
+        Returns:
+            Dict: 청크 처리 결과 (skipped면 다른 워커가 처리 중이거나 완료됨)
+        """
+        chunk = self.db.get(SubscriptionBillingChunk, chunk_id)
+        if chunk is None or chunk.status == "done":
+            return {"chunk_id": chunk_id, "skipped": True}
+
+        started = time.perf_counter()
+        if chunk.status not in ("billed", "granting"):
+            if not self._claim(chunk_id, ["pending", "failed"], "running"):
+                return {"chunk_id": chunk_id, "skipped": True}
+            self.db.refresh(chunk)
+            try:
+                if not self._bill_chunk(chunk):
+                    logger.warning(f"정기결제 청크 임대 만료, 다른 워커에 넘김: chunk_id={chunk_id}")
+                    return {"chunk_id": chunk_id, "skipped": True}
+            except Exception as e:
+                self.db.rollback()
+                chunk = self.db.get(SubscriptionBillingChunk, chunk_id)
+                chunk.status = "failed"
+                chunk.error = str(e)[:1000]
+                self.db.commit()
+                logger.error(f"정기결제 청크 실패: chunk_id={chunk_id}, error={e}")
+                raise
+
+        # 포인트 지급 - granting 임대 점유 후 (reference_id 유니크 인덱스로도 중복 지급 없음)
+        if not self._claim(chunk_id, ["billed"], "granting"):
+            return {"chunk_id": chunk_id, "skipped": True}
+        self.db.refresh(chunk)
+        grants = [tuple(grant) for grant in (chunk.pending_grants or [])]
+        if grants:
+            grant_result = FortuneService(self.db).grant_points_bulk(grants)
+            if grant_result["failed"]:
+                # 임대 반납 - 다음 분배 때 다시 지급
+                chunk.status = "billed"
+                self.db.commit()
+                logger.error(f"정기결제 포인트 지급 일부 실패: chunk_id={chunk_id}, result={grant_result}")
+                return {"chunk_id": chunk_id, "status": "billed", "grants": grant_result}
+            chunk.points_granted = sum(amount for _, amount, _, _ in grants)
+
+        chunk.status = "done"
+        chunk.pending_grants = None
+        chunk.error = None
+        chunk.duration_ms = int((time.perf_counter() - started) * 1000) + (chunk.duration_ms or 0)
+        self.db.commit()
+
+        result = {
+            "chunk_id": chunk_id,
+            "status": "done",
+            "processed": chunk.processed,
+            "succeeded": chunk.succeeded,
+            "failed": chunk.failed,
+        }
+        self._finalize(chunk.run_id)
+        return result
+
+    def _bill_chunk(self, chunk: SubscriptionBillingChunk) -> bool:
+        """
+        청크 구간의 결제 대상 구독 결제 + 다음 결제일 갱신 (구독마다 커밋)
+
+        구독마다 임대를 갱신하고 결제 결과 / 다음 결제일 / 지급할 포인트를 함께 커밋하므로
+        오래 걸리는 청크도 임대가 만료되지 않고, 중단 후 재개하면 남은 구독만 결제한다.
+
+        Returns:
+            bool: 청크 결제 완료 여부 (임대를 잃었으면 False - 남은 구독은 새로 점유한 워커가 처리)
+        """
+        billing_date = chunk.run.billing_date
+        chunk_id, attempt = chunk.id, chunk.attempts
+        subscription_ids = [
+            subscription_id for (subscription_id,) in self.db.query(Subscription.id).filter(
+                _due_filter(billing_date),
+                Subscription.id >= chunk.start_id,
+                Subscription.id <= chunk.end_id
+            ).order_by(Subscription.id)
+        ]
+
+        for subscription_id in subscription_ids:
+            if not self._renew_lease(chunk_id, attempt):
+                self.db.rollback()
+                return False
+
+            # 락을 잡고 결제 대상인지 다시 확인 (이전 시도에서 이미 결제된 구독은 제외)
+            subscription = self.db.query(Subscription).filter(
+                Subscription.id == subscription_id,
+                _due_filter(billing_date)
+            ).with_for_update().first()
+            if subscription is None:
+                self.db.commit()
+                continue
+
+            grant = None
+            savepoint = self.db.begin_nested()
+            try:
+                if SubscriptionService._process_subscription_payment(subscription, self.db):
+                    # 월간 포인트 지급 대상 (결제 주기별 reference_id로 중복 지급 방지)
+                    if subscription.monthly_fortune_points > 0:
+                        grant = [
+                            subscription.user_id,
+                            subscription.monthly_fortune_points,
+                            "subscription_monthly",
+                            f"sub_{subscription.id}_{subscription.next_billing_date:%Y%m%d}"
+                        ]
+
+                    # 다음 결제일 업데이트
+                    subscription.last_billing_date = subscription.next_billing_date
+                    subscription.next_billing_date = subscription.next_billing_date + timedelta(days=30)
+                    succeeded, failed = 1, 0
+                else:
+                    # 결제 실패 시 구독 상태 변경
+                    subscription.status = "expired"
+                    succeeded, failed = 0, 1
+                    logger.warning(f"구독 결제 실패: subscription_id={subscription.id}")
+                savepoint.commit()
+            except Exception as e:
+                savepoint.rollback()
+                grant = None
+                succeeded, failed = 0, 1
+                logger.error(f"구독 결제 처리 실패: subscription_id={subscription_id}, error={e}")
+
+            # 체크포인트 - 결제 결과와 함께 커밋
+            chunk.processed = (chunk.processed or 0) + 1
+            chunk.succeeded = (chunk.succeeded or 0) + succeeded
+            chunk.failed = (chunk.failed or 0) + failed
+            if grant:
+                chunk.pending_grants = list(chunk.pending_grants or []) + [grant]
+            self.db.commit()
+
+        chunk.status = "billed"
+        self.db.commit()
+        return True
+
+    def _finalize(self, run_id: int) -> None:
+        """모든 청크가 끝났으면 실행 지표 합산 후 completed 처리"""
+        remaining = self.db.query(func.count(SubscriptionBillingChunk.id)).filter(
+            SubscriptionBillingChunk.run_id == run_id,
+            SubscriptionBillingChunk.status != "done"
+        ).scalar()
+        totals = self.db.query(
+            func.count(SubscriptionBillingChunk.id),
+            func.coalesce(func.sum(SubscriptionBillingChunk.processed), 0),
+            func.coalesce(func.sum(SubscriptionBillingChunk.succeeded), 0),
+            func.coalesce(func.sum(SubscriptionBillingChunk.failed), 0),
+            func.coalesce(func.sum(SubscriptionBillingChunk.points_granted), 0),
+        ).filter(
+            SubscriptionBillingChunk.run_id == run_id,
+            SubscriptionBillingChunk.status == "done"
+        ).one()
+
+        values = {
+            "completed_chunks": totals[0],
+            "processed": totals[1],
+            "succeeded": totals[2],
+            "failed": totals[3],
+            "points_granted": totals[4],
+        }
+        if remaining == 0:
+            values.update(status="completed", finished_at=datetime.now())
+
+        self.db.execute(
+            update(SubscriptionBillingRun)
+            .where(SubscriptionBillingRun.id == run_id, SubscriptionBillingRun.status == "running")
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+
+        if remaining == 0:
+            metrics = self.run_metrics(run_id)
+            logger.info(f"정기결제 실행 완료: {metrics}")
+
+    def run_metrics(self, run_id: int) -> Dict[str, Any]:
+        """
+        실행별 처리량 / 실패 지표
+
+        Returns:
+            Dict: 진행률, 성공/실패 건수, 초당 처리량, 실패 청크 수
+        """
+        run = self.db.get(SubscriptionBillingRun, run_id)
+        self.db.refresh(run)
+        end = run.finished_at or datetime.now()
+        elapsed = max((end - run.started_at).total_seconds(), 0.001)
+        failed_chunks = self.db.query(func.count(SubscriptionBillingChunk.id)).filter(
+            SubscriptionBillingChunk.run_id == run_id,
+            SubscriptionBillingChunk.status == "failed"
+        ).scalar()
+        return {
+            "run_id": run.id,
+            "billing_date": run.billing_date.isoformat(),
+            "status": run.status,
+            "chunks": run.total_chunks,
+            "completed_chunks": run.completed_chunks,
+            "failed_chunks": failed_chunks,
+            "processed": run.processed,
+            "succeeded": run.succeeded,
+            "failed": run.failed,
+            "points_granted": run.points_granted,
+            "elapsed_sec": round(elapsed, 2),
+            "subscriptions_per_sec": round(run.processed / elapsed, 1),
+        }
+
+    def recent_runs(self, limit: int = 5) -> List[Dict[str, Any]]:
+        runs = self.db.query(SubscriptionBillingRun.id).order_by(
+            SubscriptionBillingRun.billing_date.desc()
+        ).limit(limit).all()
+        return [self.run_metrics(run_id) for (run_id,) in runs]
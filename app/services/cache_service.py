@@ -215,6 +215,7 @@ class CacheKeys:
     PRODUCT_DETAIL = "product:detail"
     PRODUCT_CATEGORIES = "product:categories"
     USER_POINTS = "user:points"
+    USER_SNAPSHOT = "user:snapshot"
     USER_PURCHASES = "user:purchases"
     FORTUNE_PACKAGES = "fortune:packages"
     SHOP_STATS = "shop:stats" 
\ No newline at end of file
@@ -4,22 +4,30 @@ Week 1: 핵심 인프라 - 포인트 시스템 완전 구현
 """
 
 import logging
+import os
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Iterable, Tuple
 from decimal import Decimal
 
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, func
+from sqlalchemy import and_, or_, desc, func, select, insert, update, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import Depends
 from app.database import get_db
 from app.models import (
-    User, UserFortunePoint, FortuneTransaction, 
+    User, UserFortunePoint, FortuneTransaction, FortunePointLot,
     FortunePackage, UserPurchase, Order
 )
 from app.utils.error_handlers import InsufficientPointsError, ValidationError
+from app.utils.pagination import keyset_page, cached_count, pagination_info
 
 logger = logging.getLogger(__name__)
 
+# 포인트 차감 방식: "atomic" (조건부 UPDATE) | "locking" (SELECT FOR UPDATE)
+POINT_SPEND_STRATEGY = os.getenv("POINT_SPEND_STRATEGY", "atomic")
+
 class FortuneService:
     """행운 포인트 관리 서비스 - SELECT FOR UPDATE 락으로 동시성 제어"""
     
@@ -60,12 +68,149 @@ class FortuneService:
             logger.error(f"Balance query error: user_id={user_id}, error={e}")
             raise ValidationError("포인트 잔액 조회 중 오류가 발생했습니다.")
     
+    @staticmethod
+    async def get_user_balance_async(db: AsyncSession, user_id: int) -> Dict[str, Any]:
+        """
+        사용자 포인트 잔액 조회 - 비동기 세션 버전
+        
+        Args:
+            db: 비동기 데이터베이스 세션
+            user_id: 사용자 ID
+        
+        Returns:
+            Dict: 포인트 잔액 및 통계 정보
+        """
+        try:
+            user_points = (await db.execute(
+                select(UserFortunePoint).where(UserFortunePoint.user_id == user_id)
+            )).scalars().first()
+            
+            if not user_points:
+                return {
+                    'points': 0,
+                    'total_earned': 0,
+                    'total_spent': 0,
+                    'last_updated': None
+                }
+            
+            return {
+                'points': user_points.points,
+                'total_earned': user_points.total_earned,
+                'total_spent': user_points.total_spent,
+                'last_updated': user_points.last_updated
+            }
+            
+        except Exception as e:
+            logger.error(f"Balance query error: user_id={user_id}, error={e}")
+            raise ValidationError("포인트 잔액 조회 중 오류가 발생했습니다.")
+    
     def use_points_safely(
         self,
         user_id: int,
         amount: int,
         source: str,
         reference_id: str
+    ) -> bool:
+        """
+        포인트 사용 - POINT_SPEND_STRATEGY에 따라 조건부 UPDATE 또는 행 락 방식
+        
+        Args:
+            user_id: 사용자 ID
+            amount: 사용할 포인트 양
+            source: 사용 소스 (purchase, subscription 등)
+            reference_id: 참조 ID
+        
+        Returns:
+            bool: 성공 여부
+        """
+        if POINT_SPEND_STRATEGY == "locking":
+            return self.use_points_locking(user_id, amount, source, reference_id)
+        return self.use_points_atomic(user_id, amount, source, reference_id)
+    
+    def use_points_atomic(
+        self,
+        user_id: int,
+        amount: int,
+        source: str,
+        reference_id: str
+    ) -> bool:
+        """
+        포인트 사용 - 단일 조건부 UPDATE (락 보유 구간 최소화)
+        
+        UPDATE ... SET points = points - :amount WHERE user_id = :user_id AND points >= :amount
+        한 문장으로 잔액 확인과 차감을 처리하고, 같은 짧은 트랜잭션에서 거래 내역을 남긴다.
+        
+        Args:
+            user_id: 사용자 ID
+            amount: 사용할 포인트 양
+            source: 사용 소스 (purchase, subscription 등)
+            reference_id: 참조 ID
+        
+        Returns:
+            bool: 성공 여부
+        """
+        if amount <= 0:
+            raise ValidationError("사용할 포인트는 0보다 커야 합니다.")
+        
+        try:
+            now = datetime.now()
+            stmt = update(UserFortunePoint).where(
+                UserFortunePoint.user_id == user_id,
+                UserFortunePoint.points >= amount
+            ).values(
+                points=UserFortunePoint.points - amount,
+                total_spent=UserFortunePoint.total_spent + amount,
+                last_updated=now
+            ).execution_options(synchronize_session=False)
+            
+            # RETURNING 지원 DB는 차감 후 잔액을 같은 문장에서 받는다 (MySQL은 별도 SELECT)
+            if self.db.get_bind().dialect.update_returning:
+                balance_after = self.db.execute(stmt.returning(UserFortunePoint.points)).scalar()
+                updated = balance_after is not None
+            else:
+                updated = self.db.execute(stmt).rowcount > 0
+                balance_after = self.db.execute(
+                    select(UserFortunePoint.points).where(UserFortunePoint.user_id == user_id)
+                ).scalar() if updated else None
+            
+            if not updated:
+                self.db.rollback()
+                current = self.db.execute(
+                    select(UserFortunePoint.points).where(UserFortunePoint.user_id == user_id)
+                ).scalar() or 0
+                raise InsufficientPointsError(f"포인트가 부족합니다. 필요: {amount}, 보유: {current}")
+            
+            self.consume_point_lots(user_id, amount)
+            self.db.execute(
+                insert(FortuneTransaction).values(
+                    user_id=user_id,
+                    transaction_type='spend',
+                    amount=-amount,  # 음수로 기록
+                    balance_after=balance_after,
+                    source=source,
+                    reference_id=reference_id,
+                    description=f"{source} 포인트 사용",
+                    created_at=now
+                )
+            )
+            self.db.commit()
+            
+            logger.info(f"Points used: user_id={user_id}, amount={amount}, source={source}")
+            return True
+            
+        except InsufficientPointsError:
+            raise
+        except Exception as e:
+            logger.error(f"Point usage error: {e}")
+            self.db.rollback()
+            raise ValidationError("포인트 사용 중 오류가 발생했습니다.")
+    
+    def use_points_locking(
+        self,
+        user_id: int,
+        amount: int,
+        source: str,
+        reference_id: str
     ) -> bool:
         """
         포인트 사용 - SELECT FOR UPDATE 락으로 동시성 제어
@@ -101,10 +246,11 @@ class FortuneService:
             if user_points.points < amount:
                 raise InsufficientPointsError(f"포인트가 부족합니다. 필요: {amount}, 보유: {user_points.points}")
             
-            # 3. 포인트 차감
+            # 3. 포인트 차감 (만료가 빠른 lot부터)
             user_points.points -= amount
             user_points.total_spent += amount
             user_points.last_updated = datetime.now()
+            self.consume_point_lots(user_id, amount)
             
             # 4. 거래 내역 생성
             transaction = FortuneTransaction(
@@ -190,6 +336,15 @@ class FortuneService:
             )
             
             self.db.add(transaction)
+            self.db.add(FortunePointLot(
+                user_id=user_id,
+                amount=amount,
+                remaining=amount,
+                status='open',
+                source=source,
+                reference_id=reference_id,
+                expires_at=expires_at
+            ))
             self.db.commit()
             
             logger.info(f"Points earned: user_id={user_id}, amount={amount}, source={source}")
@@ -200,28 +355,350 @@ class FortuneService:
             self.db.rollback()
             raise ValidationError("포인트 적립 중 오류가 발생했습니다.")
     
+    def grant_points_bulk(
+        self,
+        grants: Iterable[Tuple[int, int, str, str]],
+        expires_days: int = 365,
+        chunk_size: int = 1000
+    ) -> Dict[str, int]:
+        """
+        포인트 일괄 적립 - 구독 월간 지급, 추천 캠페인, 출석 보너스 등
+        
+        user_id 정렬 순서로 청크 단위 락을 잡아 데드락을 피하고,
+        잔액 갱신과 거래 내역은 청크마다 한 번에 반영 후 커밋한다.
+        (user_id, source, reference_id)가 이미 적립된 건은 건너뛴다.
+        
+        Args:
+            grants: (user_id, amount, source, reference_id) 목록
+            expires_days: 만료일 (일)
+            chunk_size: 청크당 적립 건수
+        
+        Returns:
+            Dict: granted / duplicates / failed / chunks 건수
+        """
+        # 입력 내 중복 제거 + user_id 정렬
+        unique = {}
+        for user_id, amount, source, reference_id in grants:
+            if amount > 0:
+                unique.setdefault((user_id, source, reference_id), amount)
+        ordered = sorted(unique.items(), key=lambda item: item[0])
+        
+        result = {'granted': 0, 'duplicates': 0, 'failed': 0, 'chunks': 0}
+        for start in range(0, len(ordered), chunk_size):
+            chunk = ordered[start:start + chunk_size]
+            try:
+                try:
+                    granted = self._grant_chunk(chunk, expires_days)
+                    self.db.commit()
+                except IntegrityError:
+                    # 동시 적립이 같은 키를 먼저 커밋 - 다시 확인하면 중복으로 제외된다
+                    self.db.rollback()
+                    granted = self._grant_chunk(chunk, expires_days)
+                    self.db.commit()
+                result['granted'] += granted
+                result['duplicates'] += len(chunk) - granted
+            except Exception as e:
+                self.db.rollback()
+                result['failed'] += len(chunk)
+                logger.error(f"Bulk point grant chunk error: offset={start}, error={e}")
+            result['chunks'] += 1
+        
+        logger.info(f"Bulk points granted: {result}")
+        return result
+    
+    def _grant_chunk(self, chunk: List[Tuple[Tuple[int, str, str], int]], expires_days: int) -> int:
+        """청크 하나 적립 (커밋은 호출자가 수행) - 적립 건수 반환"""
+        user_ids = sorted({key[0] for key, _ in chunk})
+        
+        def lock_balances():
+            rows = self.db.execute(
+                select(
+                    UserFortunePoint.id,
+                    UserFortunePoint.user_id,
+                    UserFortunePoint.points,
+                    UserFortunePoint.total_earned
+                ).where(
+                    UserFortunePoint.user_id.in_(user_ids)
+                ).order_by(UserFortunePoint.user_id, UserFortunePoint.id).with_for_update()
+            ).all()
+            balances = {}
+            for row in rows:
+                balances.setdefault(row.user_id, {
+                    'id': row.id,
+                    'points': row.points or 0,
+                    'total_earned': row.total_earned or 0
+                })
+            return balances
+        
+        # 1. 잔액 행 락 (user_id 순) - 같은 사용자에게 적립하는 다른 트랜잭션은 여기서 대기하므로
+        #    아래 중복 확인이 먼저 커밋된 적립을 본다
+        balances = lock_balances()
+        
+        # 2. 이미 적립된 reference_id 제외 (멱등성, uq_fortune_tx_earn_reference가 최종 보장)
+        keys = [key for key, _ in chunk]
+        existing = set(
+            self.db.execute(
+                select(
+                    FortuneTransaction.user_id,
+                    FortuneTransaction.source,
+                    FortuneTransaction.reference_id
+                ).where(
+                    FortuneTransaction.transaction_type == 'earn',
+                    tuple_(
+                        FortuneTransaction.user_id,
+                        FortuneTransaction.source,
+                        FortuneTransaction.reference_id
+                    ).in_(keys)
+                )
+            ).all()
+        )
+        pending = [(key, amount) for key, amount in chunk if key not in existing]
+        if not pending:
+            return 0
+        
+        # 잔액 행이 없는 사용자는 한 번에 생성 후 다시 락
+        missing = sorted({key[0] for key, _ in pending} - balances.keys())
+        if missing:
+            self.db.execute(
+                insert(UserFortunePoint),
+                [{'user_id': user_id, 'points': 0, 'total_earned': 0, 'total_spent': 0} for user_id in missing]
+            )
+            balances = lock_balances()
+        
+        # 3. 잔액 계산 + 거래 내역 생성
+        now = datetime.now()
+        expires_at = now + timedelta(days=expires_days) if expires_days > 0 else None
+        transactions = []
+        for (user_id, source, reference_id), amount in pending:
+            balance = balances[user_id]
+            balance['points'] += amount
+            balance['total_earned'] += amount
+            transactions.append({
+                'user_id': user_id,
+                'transaction_type': 'earn',
+                'amount': amount,
+                'balance_after': balance['points'],
+                'source': source,
+                'reference_id': reference_id,
+                'description': f"{source} 포인트 적립",
+                'expires_at': expires_at,
+                'created_at': now
+            })
+        
+        # 4. 잔액 일괄 갱신 (PK 기준 executemany) + 거래 내역 일괄 INSERT
+        granted_users = {t['user_id'] for t in transactions}
+        self.db.execute(
+            update(UserFortunePoint),
+            [
+                {
+                    'id': balance['id'],
+                    'points': balance['points'],
+                    'total_earned': balance['total_earned'],
+                    'last_updated': now
+                }
+                for user_id, balance in balances.items()
+                if user_id in granted_users
+            ]
+        )
+        self.db.execute(insert(FortuneTransaction), transactions)
+        self.db.execute(
+            insert(FortunePointLot),
+            [
+                {
+                    'user_id': t['user_id'],
+                    'amount': t['amount'],
+                    'remaining': t['amount'],
+                    'status': 'open',
+                    'source': t['source'],
+                    'reference_id': t['reference_id'],
+                    'expires_at': expires_at,
+                    'created_at': now
+                }
+                for t in transactions
+            ]
+        )
+        return len(transactions)
+    
+    def consume_point_lots(self, user_id: int, amount: int) -> int:
+        """
+        사용한 포인트만큼 lot 차감 - 만료가 빠른 lot부터 (FIFO, 만료 없는 lot은 마지막)
+        
+        잔액 행 락(또는 조건부 UPDATE) 이후 같은 트랜잭션에서 호출해야 한다.
+        lot이 부족하면 (lot 도입 이전 적립분 등) 남은 양은 lot 없이 차감된 것으로 본다.
+        
+        Args:
+            user_id: 사용자 ID
+            amount: 사용한 포인트 양
+        
+        Returns:
+            int: lot에서 차감된 포인트 양
+        """
+        lots = self.db.execute(
+            select(FortunePointLot.id, FortunePointLot.remaining).where(
+                FortunePointLot.user_id == user_id,
+                FortunePointLot.status == 'open'
+            ).order_by(
+                FortunePointLot.expires_at.is_(None),
+                FortunePointLot.expires_at,
+                FortunePointLot.id
+            ).with_for_update()
+        ).all()
+        
+        left = amount
+        updates = []
+        for lot in lots:
+            if left <= 0:
+                break
+            used = min(lot.remaining, left)
+            left -= used
+            remaining = lot.remaining - used
+            updates.append({
+                'id': lot.id,
+                'remaining': remaining,
+                'status': 'open' if remaining > 0 else 'consumed'
+            })
+        
+        if updates:
+            self.db.execute(update(FortunePointLot), updates)
+        return amount - left
+    
+    def expire_points(self, batch_size: int = 1000, max_batches: Optional[int] = None) -> Dict[str, Any]:
+        """
+        만료 스윕 - 만료일이 지난 open lot을 배치 단위로 만료 처리
+        
+        (status, expires_at) 인덱스로 대상 lot만 읽고, 배치마다 잔액 일괄 차감 +
+        expire 거래 내역 일괄 INSERT 후 커밋한다.
+        
+        Args:
+            batch_size: 배치당 lot 수
+            max_batches: 최대 배치 수 (None이면 대상이 없을 때까지)
+        
+        Returns:
+            Dict: 처리 lot/사용자/포인트 수, 소요 시간, 초당 처리 lot 수
+        """
+        started = time.perf_counter()
+        result = {'batches': 0, 'lots': 0, 'users': 0, 'points': 0, 'failed_batches': 0}
+        
+        while max_batches is None or result['batches'] < max_batches:
+            try:
+                expired = self._expire_batch(batch_size)
+                self.db.commit()
+            except Exception as e:
+                self.db.rollback()
+                result['failed_batches'] += 1
+                logger.error(f"Point expiry batch error: {e}")
+                break
+            
+            if not expired['lots']:
+                break
+            result['batches'] += 1
+            for key in ('lots', 'users', 'points'):
+                result[key] += expired[key]
+            if expired['lots'] < batch_size:
+                break
+        
+        elapsed = time.perf_counter() - started
+        result['seconds'] = round(elapsed, 3)
+        result['lots_per_sec'] = round(result['lots'] / elapsed, 1) if elapsed > 0 else 0.0
+        logger.info(f"Point expiry sweep: {result}")
+        return result
+    
+    def _expire_batch(self, batch_size: int) -> Dict[str, int]:
+        """만료 배치 하나 처리 (커밋은 호출자가 수행)"""
+        now = datetime.now()
+        
+        # 1. 대상 lot의 사용자 확인 (락 없이 인덱스 범위 스캔)
+        candidates = self.db.execute(
+            select(FortunePointLot.user_id).where(
+                FortunePointLot.status == 'open',
+                FortunePointLot.expires_at <= now
+            ).order_by(FortunePointLot.expires_at, FortunePointLot.id).limit(batch_size)
+        ).scalars().all()
+        if not candidates:
+            return {'lots': 0, 'users': 0, 'points': 0}
+        user_ids = sorted(set(candidates))
+        
+        # 2. 차감 경로와 같은 순서(잔액 → lot)로 락 - 잔액은 user_id 순
+        balances = {}
+        for row in self.db.execute(
+            select(UserFortunePoint.id, UserFortunePoint.user_id, UserFortunePoint.points).where(
+                UserFortunePoint.user_id.in_(user_ids)
+            ).order_by(UserFortunePoint.user_id, UserFortunePoint.id).with_for_update()
+        ).all():
+            balances.setdefault(row.user_id, {'id': row.id, 'points': row.points or 0})
+        
+        lots = self.db.execute(
+            select(
+                FortunePointLot.id,
+                FortunePointLot.user_id,
+                FortunePointLot.remaining,
+                FortunePointLot.source
+            ).where(
+                FortunePointLot.user_id.in_(user_ids),
+                FortunePointLot.status == 'open',
+                FortunePointLot.expires_at <= now
+            ).order_by(FortunePointLot.user_id, FortunePointLot.expires_at, FortunePointLot.id).with_for_update()
+        ).all()
+        
+        # 3. 잔액 차감 + expire 거래 내역 (잔액 이상으로는 차감하지 않음)
+        transactions = []
+        expired_points = 0
+        for lot in lots:
+            balance = balances.get(lot.user_id)
+            amount = min(lot.remaining, balance['points']) if balance else 0
+            if balance and amount > 0:
+                balance['points'] -= amount
+                expired_points += amount
+                transactions.append({
+                    'user_id': lot.user_id,
+                    'transaction_type': 'expire',
+                    'amount': -amount,
+                    'balance_after': balance['points'],
+                    'source': lot.source,
+                    'reference_id': f"lot_{lot.id}",
+                    'description': "포인트 유효기간 만료",
+                    'created_at': now
+                })
+        
+        # 4. 일괄 반영
+        self.db.execute(
+            update(FortunePointLot),
+            [{'id': lot.id, 'remaining': 0, 'status': 'expired'} for lot in lots]
+        )
+        if transactions:
+            self.db.execute(
+                update(UserFortunePoint),
+                [
+                    {'id': balance['id'], 'points': balance['points'], 'last_updated': now}
+                    for balance in balances.values()
+                ]
+            )
+            self.db.execute(insert(FortuneTransaction), transactions)
+        
+        return {'lots': len(lots), 'users': len(user_ids), 'points': expired_points}
+    
     def get_transactions(
         self,
         user_id: int,
         page: int = 1,
         per_page: int = 20,
-        transaction_type: Optional[str] = None
+        transaction_type: Optional[str] = None,
+        cursor: Optional[str] = None
     ) -> Dict[str, Any]:
         """
-        포인트 거래 내역 조회 (페이징)
+        포인트 거래 내역 조회 (키셋 페이징)
         
         Args:
             user_id: 사용자 ID
-            page: 페이지 번호
+            page: 페이지 번호 (커서 없이 번호로 이동할 때만 OFFSET 사용)
             per_page: 페이지당 항목 수
             transaction_type: 거래 타입 필터 (earn, spend, refund, expire)
+            cursor: 이전 응답의 next_cursor
         
         Returns:
             Dict: 거래 내역 및 페이징 정보
         """
         try:
-            offset = (page - 1) * per_page
-            
             # 쿼리 구성
             query = self.db.query(FortuneTransaction).filter(
                 FortuneTransaction.user_id == user_id
@@ -231,13 +708,21 @@ class FortuneService:
             if transaction_type:
                 query = query.filter(FortuneTransaction.transaction_type == transaction_type)
             
-            # 전체 개수 조회
-            total = query.count()
+            # 전체 개수 (캐시된 근사치)
+            total = cached_count(
+                f"count:fortune_tx:{user_id}:{transaction_type or 'all'}",
+                query.count
+            )
             
-            # 거래 내역 조회 (최신순)
-            transactions = query.order_by(
-                desc(FortuneTransaction.created_at)
-            ).offset(offset).limit(per_page).all()
+            # 거래 내역 조회 (최신순, (created_at, id) 키셋)
+            transactions, next_cursor = keyset_page(
+                query,
+                FortuneTransaction.created_at,
+                FortuneTransaction.id,
+                per_page,
+                cursor=cursor,
+                offset=(page - 1) * per_page
+            )
             
             return {
                 'transactions': [
@@ -253,14 +738,11 @@ class FortuneService:
                     }
                     for t in transactions
                 ],
-                'pagination': {
-                    'page': page,
-                    'per_page': per_page,
-                    'total': total,
-                    'pages': (total + per_page - 1) // per_page
-                }
+                'pagination': pagination_info(page, per_page, total, next_cursor)
             }
             
+        except ValidationError:
+            raise
         except Exception as e:
             logger.error(f"Transaction query error: user_id={user_id}, error={e}")
             raise ValidationError("거래 내역 조회 중 오류가 발생했습니다.")
@@ -381,25 +863,25 @@ class FortuneService:
         try:
             expiry_date = datetime.now() + timedelta(days=days)
             
-            transactions = self.db.query(FortuneTransaction).filter(
+            # 잔여량이 남은 lot 기준 (user_id, status, expires_at 인덱스)
+            lots = self.db.query(FortunePointLot).filter(
                 and_(
-                    FortuneTransaction.user_id == user_id,
-                    FortuneTransaction.transaction_type == 'earn',
-                    FortuneTransaction.expires_at.isnot(None),
-                    FortuneTransaction.expires_at <= expiry_date,
-                    FortuneTransaction.expires_at > datetime.now()
+                    FortunePointLot.user_id == user_id,
+                    FortunePointLot.status == 'open',
+                    FortunePointLot.expires_at <= expiry_date,
+                    FortunePointLot.expires_at > datetime.now()
                 )
-            ).order_by(FortuneTransaction.expires_at).all()
+            ).order_by(FortunePointLot.expires_at).all()
             
             return [
                 {
-                    'id': t.id,
-                    'amount': t.amount,
-                    'source': t.source,
-                    'expires_at': t.expires_at,
-                    'days_until_expiry': (t.expires_at - datetime.now()).days
+                    'id': lot.id,
+                    'amount': lot.remaining,
+                    'source': lot.source,
+                    'expires_at': lot.expires_at,
+                    'days_until_expiry': (lot.expires_at - datetime.now()).days
                 }
-                for t in transactions
+                for lot in lots
             ]
             
         except Exception as e:
@@ -0,0 +1,302 @@
+"""
+결제 멱등성 저장소
+- 워커 / 요청 간 공유 (Redis, 없으면 DB idempotency_keys 테이블)
+- 원자적 점유: 처음 온 요청만 실행, 완료된 키는 저장된 결과 반환
+- 처리 중 표시: 동시에 들어온 중복 요청은 재실행하지 않고 결과를 기다림
+- TTL 만료 (Redis EX / DB expires_at + 주기적 정리), 적중 지표
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import delete, tuple_, update
+from sqlalchemy.exc import IntegrityError
+
+from app.database import SessionLocal
+from app.exceptions import ConflictError
+from app.models import IdempotencyKey
+from app.services.cache_service import REDIS_AVAILABLE, redis_client
+
+logger = logging.getLogger(__name__)
+
+# 완료된 결과 보관 시간 (초)
+IDEMPOTENCY_TTL = int(os.getenv("IDEMPOTENCY_TTL", 300))
+# 처리 중 표시 유효 시간 (초) - 외부 결제 API 타임아웃보다 길게
+IDEMPOTENCY_LOCK_TTL = int(os.getenv("IDEMPOTENCY_LOCK_TTL", 30))
+# 중복 요청이 선행 요청 결과를 기다리는 최대 시간 (초)
+IDEMPOTENCY_WAIT_TIMEOUT = float(os.getenv("IDEMPOTENCY_WAIT_TIMEOUT", 10))
+IDEMPOTENCY_POLL_INTERVAL = 0.1
+# 점유 확인 사이에 키가 만료 / 해제된 경우 재시도 횟수 (넘으면 처리 중으로 간주하고 대기)
+IDEMPOTENCY_CLAIM_ATTEMPTS = 3
+
+# owner가 일치할 때만 결과 저장 / 해제 (다른 요청이 만료 후 가져간 키를 덮어쓰지 않도록)
+_REDIS_COMPLETE = """
+local current = redis.call('GET', KEYS[1])
+if current and cjson.decode(current)['owner'] == ARGV[1] then
+    redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+    return 1
+end
+return 0
+"""
+_REDIS_RELEASE = """
+local current = redis.call('GET', KEYS[1])
+if current and cjson.decode(current)['owner'] == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+@dataclass
+class Claim:
+    """점유 결과 - status: claimed(실행 권한 획득) / completed(저장된 결과) / in_progress(다른 요청 처리 중)"""
+    status: str
+    owner: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+
+
+class IdempotencyStore:
+    """Redis 우선, DB 대체 멱등성 저장소"""
+
+    def __init__(self, use_redis: bool = REDIS_AVAILABLE):
+        self.use_redis = use_redis
+        self._lock = threading.Lock()
+        self.counters = {"claimed": 0, "hits": 0, "waits": 0, "wait_hits": 0, "conflicts": 0, "released": 0, "redis_errors": 0}
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.counters[name] += 1
+
+    @staticmethod
+    def _redis_key(scope: str, key: str) -> str:
+        return f"idem:{scope}:{key}"
+
+    # ------------------------------------------------------------------ 점유 / 완료 / 해제
+
+    def claim(self, key: str, scope: str) -> Claim:
+        """
+        키 점유 시도 (원자적)
+
+        Args:
+            key: 멱등성 키
+            scope: 작업 구분
+
+        Returns:
+            Claim
+        """
+        owner = uuid.uuid4().hex
+        if self.use_redis:
+            try:
+                return self._claim_redis(key, scope, owner)
+            except Exception as e:
+                self._count("redis_errors")
+                logger.error(f"멱등성 Redis 점유 실패, DB 사용: key={key}, error={e}")
+        return self._claim_db(key, scope, owner)
+
+    def _claim_redis(self, key: str, scope: str, owner: str) -> Claim:
+        redis_key = self._redis_key(scope, key)
+        marker = json.dumps({"status": "in_progress", "owner": owner})
+        for _ in range(IDEMPOTENCY_CLAIM_ATTEMPTS):
+            if redis_client.set(redis_key, marker, nx=True, ex=IDEMPOTENCY_LOCK_TTL):
+                return Claim("claimed", owner=owner)
+
+            current = redis_client.get(redis_key)
+            if current is None:
+                # 확인 사이에 만료 / 해제 - 다시 시도
+                continue
+            data = json.loads(current)
+            if data["status"] == "completed":
+                return Claim("completed", result=data["result"])
+            return Claim("in_progress")
+        return Claim("in_progress")
+
+    def _claim_db(self, key: str, scope: str, owner: str) -> Claim:
+        db = SessionLocal()
+        try:
+            for _ in range(IDEMPOTENCY_CLAIM_ATTEMPTS):
+                now = datetime.now()
+                db.add(IdempotencyKey(
+                    scope=scope, key=key, status="in_progress", owner=owner,
+                    expires_at=now + timedelta(seconds=IDEMPOTENCY_LOCK_TTL)
+                ))
+                try:
+                    db.commit()
+                    return Claim("claimed", owner=owner)
+                except IntegrityError:
+                    db.rollback()
+
+                # 만료된 키는 조건부 UPDATE로 가져온다 (동시에 하나만 성공)
+                taken = db.execute(
+                    update(IdempotencyKey)
+                    .where(
+                        IdempotencyKey.scope == scope,
+                        IdempotencyKey.key == key,
+                        IdempotencyKey.expires_at < now
+                    )
+                    .values(
+                        status="in_progress", owner=owner, result=None,
+                        expires_at=now + timedelta(seconds=IDEMPOTENCY_LOCK_TTL), created_at=now
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                db.commit()
+                if taken.rowcount == 1:
+                    return Claim("claimed", owner=owner)
+
+                row = db.get(IdempotencyKey, {"scope": scope, "key": key}, populate_existing=True)
+                if row is None:
+                    # 확인 사이에 해제 / 정리됨 - 다시 시도
+                    continue
+                if row.status == "completed":
+                    return Claim("completed", result=row.result)
+                return Claim("in_progress")
+            return Claim("in_progress")
+        finally:
+            db.close()
+
+    def complete(self, key: str, scope: str, owner: str, result: Dict[str, Any], ttl: int = IDEMPOTENCY_TTL) -> None:
+        """결과 저장 - 점유한 요청(owner)만 가능"""
+        if self.use_redis:
+            try:
+                payload = json.dumps({"status": "completed", "owner": owner, "result": result})
+                redis_client.eval(_REDIS_COMPLETE, 1, self._redis_key(scope, key), owner, payload, ttl)
+                return
+            except Exception as e:
+                self._count("redis_errors")
+                logger.error(f"멱등성 Redis 결과 저장 실패, DB 사용: key={key}, error={e}")
+
+        db = SessionLocal()
+        try:
+            db.execute(
+                update(IdempotencyKey)
+                .where(IdempotencyKey.scope == scope, IdempotencyKey.key == key, IdempotencyKey.owner == owner)
+                .values(status="completed", result=result, expires_at=datetime.now() + timedelta(seconds=ttl))
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    def release(self, key: str, scope: str, owner: str) -> None:
+        """처리 실패 시 점유 해제 - 같은 키로 재시도 가능"""
+        self._count("released")
+        if self.use_redis:
+            try:
+                redis_client.eval(_REDIS_RELEASE, 1, self._redis_key(scope, key), owner)
+                return
+            except Exception as e:
+                self._count("redis_errors")
+                logger.error(f"멱등성 Redis 해제 실패, DB 사용: key={key}, error={e}")
+
+        db = SessionLocal()
+        try:
+            db.execute(
+                delete(IdempotencyKey)
+                .where(IdempotencyKey.scope == scope, IdempotencyKey.key == key, IdempotencyKey.owner == owner)
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    # ------------------------------------------------------------------ 실행
+
+    def run(self, key: str, func: Callable[[], Dict[str, Any]], scope: str, wait_timeout: float = IDEMPOTENCY_WAIT_TIMEOUT) -> Dict[str, Any]:
+        """
+        멱등 실행: 처음 온 요청만 func 실행, 중복 요청은 저장된 결과 반환
+
+        Args:
+            key: 멱등성 키
+            func: 실제 작업 (JSON 직렬화 가능한 dict 반환)
+            scope: 작업 구분
+            wait_timeout: 처리 중인 선행 요청을 기다릴 최대 시간
+
+        Returns:
+            Dict: func 결과 (또는 선행 요청의 결과)
+
+        Raises:
+            ConflictError: 선행 요청이 wait_timeout 안에 끝나지 않은 경우
+        """
+        claim = self.claim(key, scope)
+        if claim.status == "in_progress":
+            self._count("waits")
+            claim = self._wait(key, scope, wait_timeout)
+
+        if claim.status == "completed":
+            self._count("hits")
+            logger.info(f"Idempotency hit for key: {key}")
+            return claim.result
+
+        self._count("claimed")
+        try:
+            result = func()
+        except Exception:
+            self.release(key, scope, claim.owner)
+            raise
+        self.complete(key, scope, claim.owner, result)
+        return result
+
+    def _wait(self, key: str, scope: str, wait_timeout: float) -> Claim:
+        """
+        선행 요청이 끝날 때까지 폴링 (실패로 해제되면 이 요청이 점유)
+        - time.sleep 블로킹: async 핸들러는 run()을 포함한 호출 전체를 run_in_threadpool로 실행
+        """
+        deadline = time.monotonic() + wait_timeout
+        while time.monotonic() < deadline:
+            time.sleep(IDEMPOTENCY_POLL_INTERVAL)
+            claim = self.claim(key, scope)
+            if claim.status != "in_progress":
+                if claim.status == "completed":
+                    self._count("wait_hits")
+                return claim
+        self._count("conflicts")
+        raise ConflictError("동일한 결제 요청이 처리 중입니다. 잠시 후 다시 시도해주세요.")
+
+    # ------------------------------------------------------------------ 정리 / 지표
+
+    def purge_expired(self, batch_size: int = 1000) -> int:
+        """만료된 DB 키 삭제 (Redis는 EX로 자동 만료)"""
+        deleted = 0
+        db = SessionLocal()
+        try:
+            while True:
+                keys = [
+                    tuple(row) for row in db.query(IdempotencyKey.scope, IdempotencyKey.key)
+                    .filter(IdempotencyKey.expires_at < datetime.now())
+                    .limit(batch_size)
+                ]
+                if not keys:
+                    return deleted
+                db.execute(
+                    delete(IdempotencyKey)
+                    .where(
+                        tuple_(IdempotencyKey.scope, IdempotencyKey.key).in_(keys),
+                        IdempotencyKey.expires_at < datetime.now()
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                db.commit()
+                deleted += len(keys)
+        finally:
+            db.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """프로세스 단위 적중 지표"""
+        with self._lock:
+            counters = dict(self.counters)
+        lookups = counters["claimed"] + counters["hits"]
+        return {
+            "backend": "redis" if self.use_redis else "db",
+            **counters,
+            "hit_rate": round(counters["hits"] / lookups, 3) if lookups else 0,
+        }
+
+
+idempotency_store = IdempotencyStore()
@@ -0,0 +1,188 @@
+"""
+LLM 응답 캐시 (내용 주소 방식)
+- 키 = sha256(모델, 프롬프트 해시, 입력 해시, 샘플링 파라미터) - saju_key가 아니라 실제 LLM 입력 기준
+- 시간대 / 성별 / 양음력이 달라도 사주팔자가 같으면 같은 입력 → 유료 호출 없이 재사용
+- saju_key 단위 SajuAnalysisCache 아래 단계: 키 캐시 미스일 때만 조회
+- 적중 수(hits)가 곧 절약한 LLM 호출 수 - /saju/api/stats와 로그로 확인
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import func, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models import LLMResponseCache
+
+logger = logging.getLogger(__name__)
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class LLMCacheService:
+    """LLM 응답 조회 / 저장 / 통계 (호출 함수에 db 세션이 없어 자체 세션 사용)"""
+
+    _lock = threading.Lock()
+    # 프로세스 기동 이후 지표 (누적치는 테이블 hits)
+    _counters = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def make_key(model: str, prompt: str, content: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, str]:
+        """
+        캐시 키 계산
+
+        Args:
+            model: 모델명
+            prompt: 시스템 프롬프트 (프롬프트 파일 내용)
+            content: 사용자 입력 (사주 분석 텍스트)
+            params: 샘플링 파라미터 (temperature, max_tokens 등)
+
+        Returns:
+            Dict[str, str]: cache_key, prompt_hash, content_hash
+        """
+        prompt_hash = _sha256(prompt or "")
+        content_hash = _sha256(content or "")
+        params_json = json.dumps(params or {}, sort_keys=True, separators=(",", ":"))
+        cache_key = _sha256("\0".join([model, prompt_hash, content_hash, params_json]))
+        return {"cache_key": cache_key, "prompt_hash": prompt_hash, "content_hash": content_hash}
+
+    @classmethod
+    def _count(cls, name: str) -> None:
+        with cls._lock:
+            cls._counters[name] += 1
+
+    @classmethod
+    def get(cls, cache_key: str) -> Optional[str]:
+        """캐시 조회 (적중 시 hits 증가)"""
+        db = SessionLocal()
+        try:
+            response = db.query(LLMResponseCache.response).filter(
+                LLMResponseCache.cache_key == cache_key
+            ).scalar()
+            if response is None:
+                return None
+            db.execute(
+                update(LLMResponseCache)
+                .where(LLMResponseCache.cache_key == cache_key)
+                .values(hits=LLMResponseCache.hits + 1, last_hit_at=datetime.now())
+            )
+            db.commit()
+            return response
+        finally:
+            db.close()
+
+    @classmethod
+    def put(cls, model: str, key: Dict[str, str], response: str) -> None:
+        """캐시 저장 (동시에 같은 입력이 먼저 저장된 경우 무시)"""
+        db = SessionLocal()
+        try:
+            db.add(LLMResponseCache(model=model, response=response, **key))
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+        finally:
+            db.close()
+
+    @classmethod
+    def lookup(cls, model: str, prompt: str, content: str, params: Optional[Dict[str, Any]]) -> Optional[str]:
+        """
+        캐시 조회 - 오류는 미스로 처리
+
+        Returns:
+            Optional[str]: 저장된 LLM 원문 응답
+        """
+        if not LLM_CACHE_ENABLED:
+            return None
+        key = cls.make_key(model, prompt, content, params)
+        try:
+            cached = cls.get(key["cache_key"])
+        except Exception as e:
+            logger.warning(f"LLM 캐시 조회 실패 (무시): {e}")
+            cached = None
+        if cached is None:
+            cls._count("misses")
+            return None
+        cls._count("hits")
+        logger.info(f"LLM 캐시 적중: model={model}, content_hash={key['content_hash'][:12]}")
+        return cached
+
+    @classmethod
+    def store(cls, model: str, prompt: str, content: str, params: Optional[Dict[str, Any]], response: Optional[str]) -> None:
+        """응답 저장 (빈 응답 / 비활성 시 무시, 오류는 로그만)"""
+        if not LLM_CACHE_ENABLED or not response:
+            return
+        try:
+            cls.put(model, cls.make_key(model, prompt, content, params), response)
+        except Exception as e:
+            logger.warning(f"LLM 캐시 저장 실패 (무시): {e}")
+
+    @classmethod
+    def cached_call(
+        cls,
+        model: str,
+        prompt: str,
+        content: str,
+        params: Optional[Dict[str, Any]],
+        call: Callable[[], Optional[str]],
+    ) -> Optional[str]:
+        """
+        캐시를 거쳐 LLM 호출 - 캐시 오류는 호출을 막지 않는다
+
+        Args:
+            model: 모델명
+            prompt: 시스템 프롬프트
+            content: 사용자 입력
+            params: 샘플링 파라미터 (값이 다르면 다른 키)
+            call: 미스일 때 실행할 실제 LLM 호출 (원문 응답 반환, 실패 시 None)
+
+        Returns:
+            Optional[str]: LLM 원문 응답 (후처리 전)
+        """
+        cached = cls.lookup(model, prompt, content, params)
+        if cached is not None:
+            return cached
+        response = call()
+        cls.store(model, prompt, content, params, response)
+        return response
+
+    @classmethod
+    def stats(cls, db: Session) -> Dict[str, Any]:
+        """
+        캐시 통계
+
+        Returns:
+            Dict[str, Any]: 모델별 항목 수 / 절약한 호출 수, 프로세스 기동 이후 적중률
+        """
+        rows = db.query(
+            LLMResponseCache.model,
+            func.count(LLMResponseCache.id),
+            func.coalesce(func.sum(LLMResponseCache.hits), 0)
+        ).group_by(LLMResponseCache.model).all()
+
+        with cls._lock:
+            hits, misses = cls._counters["hits"], cls._counters["misses"]
+        return {
+            "enabled": LLM_CACHE_ENABLED,
+            "entries": sum(entries for _, entries, _ in rows),
+            "avoided_calls": sum(int(saved) for _, _, saved in rows),
+            "by_model": [
+                {"model": model, "entries": entries, "avoided_calls": int(saved)}
+                for model, entries, saved in rows
+            ],
+            "process": {
+                "hits": hits,
+                "misses": misses,
+                "hit_ratio": round(hits / (hits + misses) * 100, 1) if hits + misses else 0.0,
+            },
+        }
@@ -0,0 +1,364 @@
+"""
+LLM 사용량 / 비용 / 일일 예산
+- 호출마다 엔드포인트, 모델, 토큰 수, 지연, 비용을 llm_usage에 기록 (캐시 적중 / 차단도 기록)
+- Celery beat가 시간별로 llm_usage_hourly에 집계, 보존 기간이 지난 원본 행은 삭제
+- 일일 예산(전체 / 엔드포인트별) 초과 시: 캐시 → 저렴한 대체 모델 순으로 전환,
+  예산 × LLM_HARD_LIMIT_RATIO 초과 시 새 호출 차단 (캐시만 응답)
+- 당일 지출은 LLM_SPEND_REFRESH_SECONDS마다 DB에서 다시 읽고, 그 사이에는 이 프로세스 기록분을 더해 판단
+"""
+
+import logging
+import os
+import threading
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models import LLMUsage, LLMUsageHourly
+from app.services.llm_cache_service import LLMCacheService
+
+logger = logging.getLogger(__name__)
+
+# 100만 토큰당 USD (입력, 출력) - 표에 없는 모델(로컬 Ollama 등)은 0
+MODEL_PRICES_USD = {
+    "gpt-4o": (Decimal("2.50"), Decimal("10.00")),
+    "gpt-4o-mini": (Decimal("0.15"), Decimal("0.60")),
+    "gpt-3.5-turbo": (Decimal("0.50"), Decimal("1.50")),
+}
+
+
+def _parse_budgets(spec: str) -> Dict[str, float]:
+    """'generate_full_report:30,api_saju_ai_analysis:5' → {엔드포인트: USD}"""
+    budgets: Dict[str, float] = {}
+    for part in (spec or "").split(","):
+        endpoint, _, amount = part.strip().partition(":")
+        try:
+            if endpoint and amount:
+                budgets[endpoint] = float(amount)
+        except ValueError:
+            logger.warning(f"LLM 엔드포인트 예산 무시: {part}")
+    return budgets
+
+
+LLM_DAILY_BUDGET_USD = float(os.getenv("LLM_DAILY_BUDGET_USD", 0))  # 0이면 무제한
+LLM_ENDPOINT_BUDGETS_USD = _parse_budgets(os.getenv("LLM_ENDPOINT_BUDGETS_USD", ""))
+LLM_FALLBACK_MODEL = os.getenv("LLM_FALLBACK_MODEL", "gpt-4o-mini")
+LLM_HARD_LIMIT_RATIO = float(os.getenv("LLM_HARD_LIMIT_RATIO", 1.5))
+LLM_SPEND_REFRESH_SECONDS = float(os.getenv("LLM_SPEND_REFRESH_SECONDS", 30))
+LLM_USAGE_RETENTION_DAYS = int(os.getenv("LLM_USAGE_RETENTION_DAYS", 14))
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> Decimal:
+    """토큰 수 → USD"""
+    input_price, output_price = MODEL_PRICES_USD.get(model, (Decimal(0), Decimal(0)))
+    cost = (input_price * prompt_tokens + output_price * completion_tokens) / Decimal(1_000_000)
+    return cost.quantize(Decimal("0.000001"))
+
+
+class LLMUsageService:
+    """LLM 호출 기록 / 예산 판단 / 집계"""
+
+    _lock = threading.Lock()
+    # 당일 지출 스냅샷 (DB 합계 + 이후 이 프로세스 기록분)
+    _spend: Dict[str, Any] = {"day": None, "loaded_at": 0.0, "by_endpoint": {}}
+
+    @classmethod
+    def record(
+        cls,
+        endpoint: str,
+        model: str,
+        status: str = "ok",
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        latency_ms: int = 0,
+    ) -> Decimal:
+        """
+        호출 1건 기록 (실패해도 호출 흐름은 막지 않음)
+
+        Args:
+            endpoint: 호출한 API / 태스크 이름
+            model: 모델명
+            status: ok, fallback(대체 모델 호출), cached, blocked, error
+
+        Returns:
+            Decimal: 이번 호출 비용
+        """
+        cost = estimate_cost(model, prompt_tokens, completion_tokens)
+        with cls._lock:
+            by_endpoint = cls._spend["by_endpoint"]
+            by_endpoint[endpoint] = by_endpoint.get(endpoint, 0.0) + float(cost)
+
+        db = SessionLocal()
+        try:
+            db.add(LLMUsage(
+                endpoint=endpoint, model=model, status=status,
+                prompt_tokens=prompt_tokens, completion_tokens=completion_tokens,
+                latency_ms=latency_ms, cost_usd=cost,
+            ))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"LLM 사용량 기록 실패 (무시): {e}")
+        finally:
+            db.close()
+        return cost
+
+    @classmethod
+    def spend_today(cls) -> Dict[str, float]:
+        """엔드포인트별 당일 지출 (USD)"""
+        with cls._lock:
+            today = date.today()
+            stale = time.monotonic() - cls._spend["loaded_at"] >= LLM_SPEND_REFRESH_SECONDS
+            if cls._spend["day"] == today and not stale:
+                return dict(cls._spend["by_endpoint"])
+
+        db = SessionLocal()
+        try:
+            rows = db.query(LLMUsage.endpoint, func.coalesce(func.sum(LLMUsage.cost_usd), 0)).filter(
+                LLMUsage.created_at >= datetime.combine(today, datetime.min.time())
+            ).group_by(LLMUsage.endpoint).all()
+        except Exception as e:
+            logger.warning(f"LLM 당일 지출 조회 실패: {e}")
+            with cls._lock:
+                return dict(cls._spend["by_endpoint"])
+        finally:
+            db.close()
+
+        with cls._lock:
+            cls._spend = {
+                "day": today,
+                "loaded_at": time.monotonic(),
+                "by_endpoint": {endpoint: float(total) for endpoint, total in rows},
+            }
+            return dict(cls._spend["by_endpoint"])
+
+    @classmethod
+    def budget_state(cls, endpoint: str) -> str:
+        """
+        예산 판단
+
+        Returns:
+            str: "ok", "over"(대체 모델 사용), "blocked"(새 호출 차단)
+        """
+        if not LLM_DAILY_BUDGET_USD and not LLM_ENDPOINT_BUDGETS_USD:
+            return "ok"
+        spend = cls.spend_today()
+        usage: List[Tuple[float, float]] = []
+        if LLM_DAILY_BUDGET_USD:
+            usage.append((sum(spend.values()), LLM_DAILY_BUDGET_USD))
+        if endpoint in LLM_ENDPOINT_BUDGETS_USD:
+            usage.append((spend.get(endpoint, 0.0), LLM_ENDPOINT_BUDGETS_USD[endpoint]))
+
+        if any(spent >= budget * LLM_HARD_LIMIT_RATIO for spent, budget in usage):
+            return "blocked"
+        if any(spent >= budget for spent, budget in usage):
+            return "over"
+        return "ok"
+
+    @classmethod
+    def _complete(cls, client, endpoint: str, model: str, status: str, messages: List[Dict[str, str]],
+                  params: Dict[str, Any]) -> Optional[str]:
+        started = time.perf_counter()
+        try:
+            response = client.chat.completions.create(model=model, messages=messages, **params)
+        except Exception:
+            cls.record(endpoint, model, "error", latency_ms=int((time.perf_counter() - started) * 1000))
+            raise
+        latency_ms = int((time.perf_counter() - started) * 1000)
+        usage = getattr(response, "usage", None)
+        cls.record(
+            endpoint, model, status,
+            prompt_tokens=getattr(usage, "prompt_tokens", 0) or 0,
+            completion_tokens=getattr(usage, "completion_tokens", 0) or 0,
+            latency_ms=latency_ms,
+        )
+        return response.choices[0].message.content
+
+    @classmethod
+    def chat(
+        cls,
+        client,
+        endpoint: str,
+        model: str,
+        system_prompt: str,
+        content: str,
+        params: Dict[str, Any],
+    ) -> Optional[str]:
+        """
+        예산 / 캐시를 거친 Chat Completions 호출
+
+        순서: 캐시(요청 모델) → 예산 이내면 요청 모델 호출
+              예산 초과 시 캐시(대체 모델) → 대체 모델 호출, 한도 초과 시 호출 없이 None
+
+        Args:
+            client: OpenAI 클라이언트
+            endpoint: 사용량 집계용 이름
+            model: 요청 모델
+            system_prompt: 시스템 메시지 (캐시 키의 프롬프트)
+            content: 사용자 메시지 (캐시 키의 입력)
+            params: 샘플링 파라미터
+
+        Returns:
+            Optional[str]: LLM 원문 응답, 차단 시 None
+
+        Raises:
+            Exception: OpenAI 호출 오류 (기록 후 그대로 전달)
+        """
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": content},
+        ]
+        cached = LLMCacheService.lookup(model, system_prompt, content, params)
+        if cached is not None:
+            cls.record(endpoint, model, "cached")
+            return cached
+
+        state = cls.budget_state(endpoint)
+        call_model, status = model, "ok"
+        if state != "ok" and LLM_FALLBACK_MODEL and LLM_FALLBACK_MODEL != model:
+            cached = LLMCacheService.lookup(LLM_FALLBACK_MODEL, system_prompt, content, params)
+            if cached is not None:
+                cls.record(endpoint, LLM_FALLBACK_MODEL, "cached")
+                return cached
+            call_model, status = LLM_FALLBACK_MODEL, "fallback"
+
+        if state == "blocked":
+            logger.warning(f"LLM 일일 예산 한도 초과 - 호출 차단: endpoint={endpoint}, model={model}")
+            cls.record(endpoint, call_model, "blocked")
+            return None
+        if status == "fallback":
+            logger.info(f"LLM 일일 예산 초과 - 대체 모델 사용: endpoint={endpoint}, {model} → {call_model}")
+
+        result = cls._complete(client, endpoint, call_model, status, messages, params)
+        LLMCacheService.store(call_model, system_prompt, content, params, result)
+        return result
+
+    @staticmethod
+    def aggregate(db: Session, hours: int = 2, now: Optional[datetime] = None) -> int:
+        """
+        최근 N시간(현재 시각 포함)을 시간별로 다시 집계 (여러 번 실행해도 같은 결과)
+
+        Args:
+            db: 데이터베이스 세션
+            hours: 다시 집계할 시간 수
+            now: 기준 시각 (기본 현재)
+
+        Returns:
+            int: 갱신한 집계 행 수
+        """
+        current = (now or datetime.now()).replace(minute=0, second=0, microsecond=0)
+        updated = 0
+        for offset in range(hours):
+            start = current - timedelta(hours=offset)
+            end = start + timedelta(hours=1)
+            # 지연 합계 / 최대는 calls와 같은 행(ok / fallback)만 - 오류 행 지연이 평균을 부풀리지 않도록
+            completed = LLMUsage.status.in_(["ok", "fallback"])
+            rows = db.query(
+                LLMUsage.endpoint,
+                LLMUsage.model,
+                func.sum(case((completed, 1), else_=0)),
+                func.sum(case((LLMUsage.status == "cached", 1), else_=0)),
+                func.sum(case((LLMUsage.status == "fallback", 1), else_=0)),
+                func.sum(case((LLMUsage.status == "blocked", 1), else_=0)),
+                func.sum(case((LLMUsage.status == "error", 1), else_=0)),
+                func.sum(LLMUsage.prompt_tokens),
+                func.sum(LLMUsage.completion_tokens),
+                func.sum(case((completed, LLMUsage.latency_ms), else_=0)),
+                func.max(case((completed, LLMUsage.latency_ms), else_=0)),
+                func.sum(LLMUsage.cost_usd),
+            ).filter(
+                LLMUsage.created_at >= start,
+                LLMUsage.created_at < end
+            ).group_by(LLMUsage.endpoint, LLMUsage.model).all()
+
+            for (endpoint, model, calls, cached, fallbacks, blocked, errors,
+                 prompt_tokens, completion_tokens, latency_total, latency_max, cost) in rows:
+                bucket = db.query(LLMUsageHourly).filter_by(hour=start, endpoint=endpoint, model=model).first()
+                if bucket is None:
+                    bucket = LLMUsageHourly(hour=start, endpoint=endpoint, model=model)
+                    db.add(bucket)
+                bucket.calls = int(calls or 0)
+                bucket.cached = int(cached or 0)
+                bucket.fallbacks = int(fallbacks or 0)
+                bucket.blocked = int(blocked or 0)
+                bucket.errors = int(errors or 0)
+                bucket.prompt_tokens = int(prompt_tokens or 0)
+                bucket.completion_tokens = int(completion_tokens or 0)
+                bucket.latency_ms_total = int(latency_total or 0)
+                bucket.latency_ms_max = int(latency_max or 0)
+                bucket.cost_usd = Decimal(str(cost or 0)).quantize(Decimal("0.000001"))
+                updated += 1
+            db.commit()
+        return updated
+
+    @staticmethod
+    def purge(db: Session, retention_days: int = LLM_USAGE_RETENTION_DAYS) -> int:
+        """보존 기간이 지난 원본 행 삭제 (시간별 집계는 유지)"""
+        deleted = db.query(LLMUsage).filter(
+            LLMUsage.created_at < datetime.now() - timedelta(days=retention_days)
+        ).delete(synchronize_session=False)
+        db.commit()
+        return deleted
+
+    @classmethod
+    def dashboard(cls, db: Session, days: int = 7) -> Dict[str, Any]:
+        """
+        관리자 대시보드 데이터
+
+        Returns:
+            Dict[str, Any]: 예산 현황, 최근 N일 일별 / 엔드포인트별 합계, 최근 48시간 시간별 행
+        """
+        since = datetime.now().replace(minute=0, second=0, microsecond=0) - timedelta(days=days)
+        hourly = db.query(LLMUsageHourly).filter(
+            LLMUsageHourly.hour >= since
+        ).order_by(LLMUsageHourly.hour.desc(), LLMUsageHourly.endpoint).all()
+
+        by_endpoint: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        by_day: Dict[date, Dict[str, Any]] = {}
+        for row in hourly:
+            for key, bucket in (((row.endpoint, row.model), by_endpoint), (row.hour.date(), by_day)):
+                total = bucket.setdefault(key, {
+                    "calls": 0, "cached": 0, "fallbacks": 0, "blocked": 0, "errors": 0,
+                    "prompt_tokens": 0, "completion_tokens": 0, "latency_ms_total": 0, "cost_usd": Decimal(0),
+                })
+                for field in ("calls", "cached", "fallbacks", "blocked", "errors",
+                              "prompt_tokens", "completion_tokens", "latency_ms_total", "cost_usd"):
+                    total[field] += getattr(row, field) or 0
+        for total in list(by_endpoint.values()) + list(by_day.values()):
+            total["avg_latency_ms"] = round(total["latency_ms_total"] / total["calls"]) if total["calls"] else 0
+
+        spend = cls.spend_today()
+        budgets = [{
+            "endpoint": "전체",
+            "budget": LLM_DAILY_BUDGET_USD,
+            "spent": round(sum(spend.values()), 4),
+        }] if LLM_DAILY_BUDGET_USD else []
+        budgets += [
+            {"endpoint": endpoint, "budget": budget, "spent": round(spend.get(endpoint, 0.0), 4)}
+            for endpoint, budget in sorted(LLM_ENDPOINT_BUDGETS_USD.items())
+        ]
+        for item in budgets:
+            item["ratio"] = round(item["spent"] / item["budget"] * 100, 1) if item["budget"] else 0.0
+            item["state"] = (
+                "blocked" if item["spent"] >= item["budget"] * LLM_HARD_LIMIT_RATIO
+                else "over" if item["spent"] >= item["budget"] else "ok"
+            )
+
+        return {
+            "days": days,
+            "spend_today": {endpoint: round(amount, 4) for endpoint, amount in sorted(spend.items())},
+            "budgets": budgets,
+            "fallback_model": LLM_FALLBACK_MODEL,
+            "hard_limit_ratio": LLM_HARD_LIMIT_RATIO,
+            "by_endpoint": [
+                {"endpoint": endpoint, "model": model, **total}
+                for (endpoint, model), total in sorted(by_endpoint.items(), key=lambda item: -item[1]["cost_usd"])
+            ],
+            "by_day": [{"day": day, **total} for day, total in sorted(by_day.items(), reverse=True)],
+            "hourly": [row for row in hourly if row.hour >= datetime.now() - timedelta(hours=48)],
+        }
@@ -1,20 +1,20 @@
 from sqlalchemy.orm import Session
 from typing import Dict, Any, List
-from app.models import UserPurchase, Order, UserReview, ReferralReward, Subscription
+from app.models import UserPurchase, Subscription
+from app.services.user_counter_service import UserCounterService
 
 class MypageService:
     @staticmethod
     def get_dashboard(user_id: int, db: Session) -> Dict[str, Any]:
-        purchases_count = db.query(UserPurchase).filter(UserPurchase.user_id == user_id).count()
-        orders_count = db.query(Order).filter(Order.user_id == user_id).count()
-        reviews_count = db.query(UserReview).filter(UserReview.user_id == user_id).count()
-        referrals_count = db.query(ReferralReward).filter(ReferralReward.referrer_user_id == user_id).count()
+        # 카운터는 user_counters 1건 조회 (구매/주문/리뷰 변경 시 증분 갱신)
+        counters = UserCounterService.get(db, user_id)
         subscription = db.query(Subscription).filter(Subscription.user_id == user_id, Subscription.status == "active").first()
         return {
-            "purchases_count": purchases_count,
-            "orders_count": orders_count,
-            "reviews_count": reviews_count,
-            "referrals_count": referrals_count,
+            "purchases_count": counters["purchases_count"],
+            "orders_count": counters["orders_count"],
+            "reviews_count": counters["reviews_count"],
+            "referrals_count": counters["referrals_count"],
+            "points": counters["points"],
             "subscription": subscription,
         }
 
@@ -23,6 +23,9 @@ from app.models import (
 )
 from app.utils.csrf import verify_csrf_token
 from app.utils.error_handlers import PaymentError, InsufficientPointsError
+from app.utils.rate_limit import rate_limited
+from app.services.fortune_service import FortuneService
+from app.services.idempotency_service import IDEMPOTENCY_LOCK_TTL, idempotency_store
 
 # 로깅 설정
 logger = logging.getLogger(__name__)
@@ -32,17 +35,23 @@ KAKAO_ADMIN_KEY = "your_kakao_admin_key"  # 환경변수로 관리
 KAKAO_PAYMENT_URL = "https://kapi.kakao.com/v1/payment/ready"
 KAKAO_APPROVE_URL = "https://kapi.kakao.com/v1/payment/approve"
 KAKAO_CANCEL_URL = "https://kapi.kakao.com/v1/payment/cancel"
+# 카카오페이 API 타임아웃 (연결, 응답) - 멱등성 점유(IDEMPOTENCY_LOCK_TTL)가 먼저 만료되면
+# 기다리던 중복 요청이 결제를 다시 실행하므로 응답 대기는 점유 시간보다 짧게
+KAKAO_API_TIMEOUT = (3.0, min(20.0, IDEMPOTENCY_LOCK_TTL / 2))
 
 # Rate Limiting 설정
 RATE_LIMIT_WINDOW = 60  # 60초
-MAX_PAYMENT_ATTEMPTS = 5  # IP당 최대 결제 시도
+MAX_PAYMENT_ATTEMPTS = 5  # 사용자(비로그인은 IP)당 최대 결제 시도
+
+# Rate Limiting 데코레이터 (사용자당 RATE_LIMIT_WINDOW초에 MAX_PAYMENT_ATTEMPTS회, Redis 토큰 버킷)
+rate_limit_payment = rate_limited("payment", MAX_PAYMENT_ATTEMPTS, RATE_LIMIT_WINDOW)
 
 class PaymentService:
     """견고한 결제 서비스 - 멱등성, 트랜잭션 안전성 보장"""
     
     def __init__(self, db: Session):
         self.db = db
-        self._idempotency_cache = {}  # 메모리 캐시 (Redis로 확장 가능)
+        self.idempotency = idempotency_store  # 프로세스 / 워커 간 공유 저장소
     
     def _generate_idempotency_key(self, user_id: int, amount: int, order_type: str) -> str:
         """멱등성 키 생성"""
@@ -50,23 +59,7 @@ class PaymentService:
         data = f"{user_id}:{amount}:{order_type}:{timestamp}"
         return hashlib.sha256(data.encode()).hexdigest()
     
-    def _check_idempotency(self, idempotency_key: str) -> Optional[Dict]:
-        """멱등성 체크 - 중복 결제 방지"""
-        if idempotency_key in self._idempotency_cache:
-            cached_result = self._idempotency_cache[idempotency_key]
-            # 5분 이내 결과만 유효
-            if time.time() - cached_result.get('timestamp', 0) < 300:
-                logger.info(f"Idempotency hit for key: {idempotency_key}")
-                return cached_result.get('result')
-        return None
-    
-    def _store_idempotency_result(self, idempotency_key: str, result: Dict):
-        """멱등성 결과 저장"""
-        self._idempotency_cache[idempotency_key] = {
-            'result': result,
-            'timestamp': time.time()
-        }
-    
+    @rate_limit_payment
     def prepare_kakaopay_payment(
         self,
         amount: int,
@@ -90,15 +83,27 @@ class PaymentService:
         Returns:
             Dict: 카카오페이 결제 준비 응답
         """
+        # 1. 멱등성 - 같은 키의 중복 요청은 카카오페이를 다시 호출하지 않고 첫 결과 반환
+        if idempotency_key is None:
+            idempotency_key = self._generate_idempotency_key(user_id, amount, order_type)
+        
+        return self.idempotency.run(
+            idempotency_key,
+            lambda: self._request_kakaopay_ready(amount, item_name, user_id, order_type, idempotency_key, **kwargs),
+            scope="kakaopay_ready"
+        )
+    
+    def _request_kakaopay_ready(
+        self,
+        amount: int,
+        item_name: str,
+        user_id: int,
+        order_type: str,
+        idempotency_key: str,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """카카오페이 결제 준비 요청 + 주문 생성 (멱등성 키를 점유한 요청만 실행)"""
         try:
-            # 1. 멱등성 체크
-            if idempotency_key is None:
-                idempotency_key = self._generate_idempotency_key(user_id, amount, order_type)
-            
-            cached_result = self._check_idempotency(idempotency_key)
-            if cached_result:
-                return cached_result
-            
             # 2. 사용자 검증
             user = self.db.query(User).filter(User.id == user_id).first()
             if not user:
@@ -125,7 +130,7 @@ class PaymentService:
                 "Content-Type": "application/x-www-form-urlencoded;charset=utf-8"
             }
             
-            response = requests.post(KAKAO_PAYMENT_URL, data=payload, headers=headers)
+            response = requests.post(KAKAO_PAYMENT_URL, data=payload, headers=headers, timeout=KAKAO_API_TIMEOUT)
             response.raise_for_status()
             
             result = response.json()
@@ -147,7 +152,7 @@ class PaymentService:
             self.db.add(order)
             self.db.commit()
             
-            # 5. 멱등성 결과 저장
+            # 5. 결과 (멱등성 저장소에 보관)
             final_result = {
                 'tid': result.get('tid'),
                 'order_id': order.id,
@@ -155,8 +160,6 @@ class PaymentService:
                 'idempotency_key': idempotency_key
             }
             
-            self._store_idempotency_result(idempotency_key, final_result)
-            
             logger.info(f"Payment prepared: user_id={user_id}, amount={amount}, tid={result.get('tid')}")
             return final_result
             
@@ -185,13 +188,18 @@ class PaymentService:
         Returns:
             Dict: 결제 검증 결과
         """
+        # 1. 멱등성 - 같은 키의 중복 승인 요청은 첫 결과 반환
+        if idempotency_key:
+            return self.idempotency.run(
+                idempotency_key,
+                lambda: self._approve_kakaopay_payment(tid, pg_token),
+                scope="kakaopay_approve"
+            )
+        return self._approve_kakaopay_payment(tid, pg_token)
+    
+    def _approve_kakaopay_payment(self, tid: str, pg_token: str) -> Dict[str, Any]:
+        """카카오페이 결제 승인 요청 + 주문 / 구매 기록 반영"""
         try:
-            # 1. 멱등성 체크
-            if idempotency_key:
-                cached_result = self._check_idempotency(idempotency_key)
-                if cached_result:
-                    return cached_result
-            
             # 2. 주문 조회
             order = self.db.query(Order).filter(Order.kakao_tid == tid).first()
             if not order:
@@ -220,7 +228,7 @@ class PaymentService:
                 "Content-Type": "application/x-www-form-urlencoded;charset=utf-8"
             }
             
-            response = requests.post(KAKAO_APPROVE_URL, data=payload, headers=headers)
+            response = requests.post(KAKAO_APPROVE_URL, data=payload, headers=headers, timeout=KAKAO_API_TIMEOUT)
             response.raise_for_status()
             
             result = response.json()
@@ -244,9 +252,6 @@ class PaymentService:
                 'message': '결제가 완료되었습니다.'
             }
             
-            if idempotency_key:
-                self._store_idempotency_result(idempotency_key, final_result)
-            
             logger.info(f"Payment verified: order_id={order.id}, amount={order.amount}")
             return final_result
             
@@ -276,12 +281,7 @@ class PaymentService:
             Dict: 포인트 충전 준비 결과
         """
         try:
-            # 1. 멱등성 체크
-            cached_result = self._check_idempotency(idempotency_key)
-            if cached_result:
-                return cached_result
-            
-            # 2. 패키지 검증
+            # 패키지 검증 (멱등성은 prepare_kakaopay_payment에서 같은 키로 처리)
             package = self.db.query(FortunePackage).filter(
                 FortunePackage.id == package_id,
                 FortunePackage.is_active.is_(True)
@@ -290,7 +290,7 @@ class PaymentService:
             if not package:
                 raise PaymentError("유효하지 않은 포인트 패키지입니다.")
             
-            # 3. 카카오페이 결제 준비
+            # 카카오페이 결제 준비
             result = self.prepare_kakaopay_payment(
                 amount=int(package.price),
                 item_name=f"{package.name} 포인트 충전",
@@ -302,6 +302,8 @@ class PaymentService:
             
             return result
             
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Point charge preparation error: {e}")
             raise PaymentError("포인트 충전 준비 중 오류가 발생했습니다.")
@@ -347,10 +349,11 @@ class PaymentService:
             if user_points.points < amount:
                 raise InsufficientPointsError(f"포인트가 부족합니다. 필요: {amount}, 보유: {user_points.points}")
             
-            # 3. 포인트 차감
+            # 3. 포인트 차감 (만료가 빠른 lot부터)
             user_points.points -= amount
             user_points.total_spent += amount
             user_points.last_updated = datetime.now()
+            FortuneService(self.db).consume_point_lots(user_id, amount)
             
             # 4. 거래 내역 생성
             transaction = FortuneTransaction(
@@ -428,7 +431,7 @@ class PaymentService:
                 "Content-Type": "application/x-www-form-urlencoded;charset=utf-8"
             }
             
-            response = requests.post(KAKAO_CANCEL_URL, data=payload, headers=headers)
+            response = requests.post(KAKAO_CANCEL_URL, data=payload, headers=headers, timeout=KAKAO_API_TIMEOUT)
             response.raise_for_status()
             
             # 3. 주문 상태 업데이트
@@ -453,11 +456,3 @@ class PaymentService:
 # 의존성 주입
 def get_payment_service(db: Session = Depends(get_db)) -> PaymentService:
     return PaymentService(db)
-
-# Rate Limiting 데코레이터 (실제 구현시 Redis 사용)
-def rate_limit_payment(func):
-    """결제 API Rate Limiting"""
-    def wrapper(*args, **kwargs):
-        # TODO: Redis 기반 Rate Limiting 구현
-        return func(*args, **kwargs)
-    return wrapper 
\ No newline at end of file
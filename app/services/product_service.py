@@ -1,8 +1,10 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, asc
+from sqlalchemy import and_, or_, desc, asc, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Dict, Any, List, Optional
 from app.models import Product, UserReview, UserPurchase, Order, User
 from app.exceptions import BadRequestError, NotFoundError, PermissionDeniedError
+from app.services.review_stats_service import ReviewStatsService
 import logging
 from fastapi import Depends
 logger = logging.getLogger(__name__)
@@ -35,18 +37,16 @@ class ProductService:
             if not product:
                 return None
             
-            # 리뷰 통계 조회
-            reviews = db.query(UserReview).filter(
+            # 리뷰 통계 조회 (요약 행) + 최근 리뷰 3건
+            review_stats = ReviewStatsService.get(db, product.id)
+            avg_rating = review_stats["average_rating"]
+            review_count = review_stats["total_reviews"]
+            recent_reviews = db.query(UserReview).filter(
                 and_(
                     UserReview.product_id == product.id,
                     UserReview.is_visible == True
                 )
-            ).all()
-            
-            avg_rating = 0
-            if reviews:
-                total_rating = sum(review.rating for review in reviews)
-                avg_rating = round(total_rating / len(reviews), 1)
+            ).order_by(desc(UserReview.created_at), desc(UserReview.id)).limit(3).all()
             
             # 구매자 여부 확인
             is_purchaser = False
@@ -81,17 +81,104 @@ class ProductService:
             ).limit(4).all()
             
             # SEO 메타데이터 생성
-            seo_metadata = ProductService.generate_seo_metadata(product, avg_rating, len(reviews))
+            seo_metadata = ProductService.generate_seo_metadata(product, avg_rating, review_count)
             
             # JSON-LD 구조화 데이터
-            structured_data = ProductService.generate_structured_data(product, avg_rating, len(reviews))
+            structured_data = ProductService.generate_structured_data(product, avg_rating, review_count)
+            
+            return {
+                "product": product,
+                "reviews": {
+                    "count": review_count,
+                    "average_rating": avg_rating,
+                    "recent_reviews": recent_reviews
+                },
+                "is_purchaser": is_purchaser,
+                "related_products": related_products,
+                "seo_metadata": seo_metadata,
+                "structured_data": structured_data
+            }
+            
+        except Exception as e:
+            logger.error(f"상품 상세 SEO 조회 실패: slug={slug}, error={e}")
+            return None
+
+    @staticmethod
+    async def get_product_detail_seo_async(slug: str, user_id: int = None, db: AsyncSession = None) -> Optional[Dict[str, Any]]:
+        """
+        SEO 최적화된 상품 상세 정보 조회 - 비동기 세션 버전
+        
+        Args:
+            slug: 상품 슬러그
+            user_id: 사용자 ID (선택)
+            db: 비동기 데이터베이스 세션
+            
+        Returns:
+            Dict containing SEO optimized product information
+        """
+        try:
+            # 상품 조회
+            product = (await db.execute(
+                select(Product).where(
+                    Product.slug == slug,
+                    Product.is_active == True
+                )
+            )).scalars().first()
+            
+            if not product:
+                return None
+            
+            # 리뷰 통계 조회 (요약 행) + 최근 리뷰 3건
+            review_stats = await ReviewStatsService.get_async(db, product.id)
+            avg_rating = review_stats["average_rating"]
+            review_count = review_stats["total_reviews"]
+            recent_reviews = (await db.execute(
+                select(UserReview).where(
+                    UserReview.product_id == product.id,
+                    UserReview.is_visible == True
+                ).order_by(desc(UserReview.created_at), desc(UserReview.id)).limit(3)
+            )).scalars().all()
+            
+            # 구매자 여부 확인
+            is_purchaser = False
+            if user_id:
+                purchase_id = (await db.execute(
+                    select(UserPurchase.id).where(
+                        UserPurchase.user_id == user_id,
+                        UserPurchase.product_id == product.id
+                    ).limit(1)
+                )).scalar()
+                
+                if purchase_id is None:
+                    order_id = (await db.execute(
+                        select(Order.id).where(
+                            Order.user_id == user_id,
+                            Order.product_id == product.id,
+                            Order.status == "completed"
+                        ).limit(1)
+                    )).scalar()
+                    is_purchaser = order_id is not None
+                else:
+                    is_purchaser = True
+            
+            # 관련 상품 추천 (같은 카테고리)
+            related_products = (await db.execute(
+                select(Product).where(
+                    Product.category == product.category,
+                    Product.id != product.id,
+                    Product.is_active == True
+                ).limit(4)
+            )).scalars().all()
+            
+            seo_metadata = ProductService.generate_seo_metadata(product, avg_rating, review_count)
+            structured_data = ProductService.generate_structured_data(product, avg_rating, review_count)
             
             return {
                 "product": product,
                 "reviews": {
-                    "count": len(reviews),
+                    "count": review_count,
                     "average_rating": avg_rating,
-                    "recent_reviews": reviews[:3]
+                    "recent_reviews": recent_reviews
                 },
                 "is_purchaser": is_purchaser,
                 "related_products": related_products,
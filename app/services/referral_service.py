@@ -15,9 +15,11 @@ from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_, desc, asc, func
 from fastapi import Depends
 from app.models import (
-    User, UserReferral, UserReferralReward, UserFortunePoint
+    User, UserReferral, UserReferralReward
 )
 from app.exceptions import BadRequestError, NotFoundError, PermissionDeniedError
+from app.services.fortune_service import FortuneService
+from app.services.user_counter_service import UserCounterService
 
 logger = logging.getLogger(__name__)
 
@@ -159,6 +161,31 @@ class ReferralService:
                 "recent_referrals": []
             }
     
+    @staticmethod
+    def _grant_reward(reward: UserReferralReward, db: Session) -> bool:
+        """
+        추천 보상 기록 + 포인트 적립 후 커밋
+        
+        적립은 grant_points_bulk 경로로 처리해 잔액과 함께 거래 내역 / 포인트 lot이 생성된다.
+        (lot이 없으면 만료 sweep과 lot 차감에서 빠진다)
+        
+        Args:
+            reward: 추가할 보상 기록 (추천인 정보 변경 등 세션의 다른 변경도 함께 커밋)
+            db: 데이터베이스 세션
+            
+        Returns:
+            bool: 성공 여부 (실패 시 세션은 롤백된 상태)
+        """
+        db.add(reward)
+        db.flush()  # reference_id용 ID
+        if reward.points <= 0:
+            db.commit()
+            return True
+        result = FortuneService(db).grant_points_bulk(
+            [(reward.referrer_id, reward.points, "referral", f"referral_reward_{reward.id}")]
+        )
+        return result["granted"] == 1
+    
     @staticmethod
     def process_referral_signup(
         referral_code: str,
@@ -208,22 +235,9 @@ class ReferralService:
                 description="추천인 가입 보상"
             )
             
-            # 추천인 포인트 증가
-            referrer_points = db.query(UserFortunePoint).filter(
-                UserFortunePoint.user_id == referral.user_id
-            ).first()
-            
-            if referrer_points:
-                referrer_points.points += reward_points
-            else:
-                referrer_points = UserFortunePoint(
-                    user_id=referral.user_id,
-                    points=reward_points
-                )
-                db.add(referrer_points)
-            
-            db.add(reward)
-            db.commit()
+            # 추천인 포인트 적립 (보상 기록과 같은 트랜잭션)
+            if not ReferralService._grant_reward(reward, db):
+                return False, "추천인 보상 적립에 실패했습니다.", {}
             
             logger.info(f"추천인 가입 처리 성공: referrer_id={referral.user_id}, new_user_id={new_user_id}, points={reward_points}")
             
@@ -285,22 +299,9 @@ class ReferralService:
                 description=f"추천인 구매 보상 (구매금액: {purchase_amount:,}원)"
             )
             
-            # 추천인 포인트 증가
-            referrer_points = db.query(UserFortunePoint).filter(
-                UserFortunePoint.user_id == referred_user.referred_by
-            ).first()
-            
-            if referrer_points:
-                referrer_points.points += reward_points
-            else:
-                referrer_points = UserFortunePoint(
-                    user_id=referred_user.referred_by,
-                    points=reward_points
-                )
-                db.add(referrer_points)
-            
-            db.add(reward)
-            db.commit()
+            # 추천인 포인트 적립 (보상 기록과 같은 트랜잭션)
+            if not ReferralService._grant_reward(reward, db):
+                return False, "추천인 보상 적립에 실패했습니다.", {}
             
             logger.info(f"추천인 구매 보상 처리 성공: referrer_id={referred_user.referred_by}, referred_user_id={referred_user_id}, points={reward_points}")
             
@@ -377,55 +378,16 @@ class ReferralService:
             Dict containing referral statistics
         """
         try:
-            # 총 추천받은 사용자 수
-            total_referrals = db.query(User).filter(
-                User.referred_by == user_id
-            ).count()
-            
-            # 이번 달 추천받은 사용자 수
-            this_month = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-            this_month_referrals = db.query(User).filter(
-                and_(
-                    User.referred_by == user_id,
-                    User.referral_signup_date >= this_month
-                )
-            ).count()
-            
-            # 총 보상 포인트
-            total_rewards = db.query(func.sum(UserReferralReward.points)).filter(
-                UserReferralReward.referrer_id == user_id
-            ).scalar() or 0
-            
-            # 이번 달 보상 포인트
-            this_month_rewards = db.query(func.sum(UserReferralReward.points)).filter(
-                and_(
-                    UserReferralReward.referrer_id == user_id,
-                    UserReferralReward.created_at >= this_month
-                )
-            ).scalar() or 0
-            
-            # 보상 타입별 통계
-            signup_rewards = db.query(func.sum(UserReferralReward.points)).filter(
-                and_(
-                    UserReferralReward.referrer_id == user_id,
-                    UserReferralReward.reward_type == "signup"
-                )
-            ).scalar() or 0
-            
-            purchase_rewards = db.query(func.sum(UserReferralReward.points)).filter(
-                and_(
-                    UserReferralReward.referrer_id == user_id,
-                    UserReferralReward.reward_type == "purchase"
-                )
-            ).scalar() or 0
+            # user_counters 1건 조회 (추천 가입 / 보상 지급 시 증분 갱신)
+            counters = UserCounterService.get(db, user_id)
             
             return {
-                "total_referrals": total_referrals,
-                "this_month_referrals": this_month_referrals,
-                "total_rewards": total_rewards,
-                "this_month_rewards": this_month_rewards,
-                "signup_rewards": signup_rewards,
-                "purchase_rewards": purchase_rewards
+                "total_referrals": counters["referrals_count"],
+                "this_month_referrals": counters["referrals_this_month"],
+                "total_rewards": counters["referral_rewards_total"],
+                "this_month_rewards": counters["referral_rewards_this_month"],
+                "signup_rewards": counters["referral_rewards_signup"],
+                "purchase_rewards": counters["referral_rewards_purchase"]
             }
             
         except Exception as e:
@@ -0,0 +1,269 @@
+"""
+리포트 생성 진행 상황 푸시 채널
+- Celery 리포트 태스크가 단계별 이벤트를 Redis pub/sub로 발행 (마지막 이벤트는 키로 보관)
+- 웹 워커는 패턴 구독 1개로 받아 대기 중인 브라우저(SSE)들에 분배
+- 완료 / 실패 시 리포트 URL이 담긴 종료 이벤트 전송
+- 메시지 유실 대비: 대기 중인 주문들을 주기적으로 한 번에 조회해 종료 상태 보정 (Redis 없으면 이것만 사용)
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+from typing import Any, AsyncIterator, Dict, Optional, Set
+
+from sqlalchemy import select
+
+from app.database import AsyncSessionLocal
+from app.models import Order
+from app.services.cache_service import REDIS_AVAILABLE, redis_client
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "report:progress:"
+LAST_EVENT_PREFIX = "report:last:"
+TERMINAL_TYPES = ("completed", "failed")
+
+# 마지막 이벤트 보관 시간 (초) - 늦게 접속한 브라우저가 현재 단계를 바로 받도록
+REPORT_PROGRESS_EVENT_TTL = int(os.getenv("REPORT_PROGRESS_EVENT_TTL", 3600))
+# 연결 유지용 SSE 주석 전송 간격 (초) - 프록시 유휴 타임아웃보다 짧게
+REPORT_PROGRESS_HEARTBEAT = float(os.getenv("REPORT_PROGRESS_HEARTBEAT", 15))
+# 대기 주문 상태 보정 주기 (초) - Redis가 없으면 이 주기로만 종료를 감지
+REPORT_PROGRESS_RECONCILE_INTERVAL = float(
+    os.getenv("REPORT_PROGRESS_RECONCILE_INTERVAL", 30 if REDIS_AVAILABLE else 5)
+)
+
+
+def report_event(order_id: int, event_type: str, **fields) -> Dict[str, Any]:
+    """
+    진행 이벤트 생성
+
+    Args:
+        order_id: 주문 ID
+        event_type: progress / completed / failed
+        **fields: current, total, status, will_retry 등
+
+    Returns:
+        Dict: 이벤트 (종료 이벤트에는 리포트 URL 포함)
+    """
+    event = {"type": event_type, "order_id": order_id, **fields}
+    if event_type == "completed":
+        event["report_url"] = f"/order/report/{order_id}"
+        event["download_url"] = f"/order/download/{order_id}"
+    return event
+
+
+def publish_report_progress(order_id: int, event: Dict[str, Any]) -> None:
+    """
+    진행 이벤트 발행 (Celery 워커에서 호출, 실패해도 리포트 생성은 계속)
+
+    Args:
+        order_id: 주문 ID
+        event: report_event() 결과
+    """
+    if not REDIS_AVAILABLE:
+        return
+    payload = json.dumps(event, ensure_ascii=False)
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.setex(f"{LAST_EVENT_PREFIX}{order_id}", REPORT_PROGRESS_EVENT_TTL, payload)
+        pipe.publish(f"{CHANNEL_PREFIX}{order_id}", payload)
+        pipe.execute()
+    except Exception as e:
+        logger.error(f"리포트 진행 이벤트 발행 실패: order_id={order_id}, error={e}")
+
+
+def _is_terminal(event: Dict[str, Any]) -> bool:
+    # 자동 재시도가 남은 실패는 종료가 아님
+    return event["type"] in TERMINAL_TYPES and not event.get("will_retry")
+
+
+def _sse(event: Dict[str, Any]) -> str:
+    return f"event: {event['type']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+
+class ReportProgressHub:
+    """웹 워커 단위 진행 이벤트 분배기 (구독 1개 → 브라우저 N개)"""
+
+    def __init__(self, use_redis: bool = REDIS_AVAILABLE):
+        self.use_redis = use_redis
+        self._subscribers: Dict[int, Set[asyncio.Queue]] = {}
+        self._tasks: list = []
+        self._redis = None
+        self._lock = threading.Lock()
+        self.counters = {
+            "connections": 0, "events_received": 0, "events_delivered": 0,
+            "redis_ops": 0, "reconcile_queries": 0, "reconciled": 0, "listener_errors": 0,
+        }
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counters[name] += amount
+
+    # ------------------------------------------------------------------ 구독
+
+    def _ensure_started(self) -> None:
+        if any(not task.done() for task in self._tasks):
+            return
+        self._tasks = []
+        if self.use_redis:
+            import redis.asyncio as aioredis
+            if self._redis is not None:
+                # 이전 루프가 끝났거나 구독이 죽은 경우 - 남은 연결 정리 후 교체
+                asyncio.create_task(self._close_redis(self._redis))
+            self._redis = aioredis.Redis(
+                host=os.getenv("REDIS_HOST", "localhost"),
+                port=int(os.getenv("REDIS_PORT", 6379)),
+                db=int(os.getenv("REDIS_DB", 0)),
+                decode_responses=True,
+            )
+            self._tasks.append(asyncio.create_task(self._listen()))
+        self._tasks.append(asyncio.create_task(self._reconcile()))
+
+    @staticmethod
+    async def _close_redis(client) -> None:
+        try:
+            await client.close()
+        except Exception as e:
+            logger.warning(f"이전 Redis 연결 종료 실패: {e}")
+
+    def subscribe(self, order_id: int) -> asyncio.Queue:
+        """주문 이벤트 대기열 등록 (상태 확인보다 먼저 등록해야 사이에 끝난 이벤트를 놓치지 않는다)"""
+        self._ensure_started()
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.setdefault(order_id, set()).add(queue)
+        self._count("connections")
+        return queue
+
+    def unsubscribe(self, order_id: int, queue: asyncio.Queue) -> None:
+        queues = self._subscribers.get(order_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[order_id]
+
+    def _dispatch(self, order_id: int, event: Dict[str, Any]) -> None:
+        for queue in list(self._subscribers.get(order_id, ())):
+            queue.put_nowait(event)
+            self._count("events_delivered")
+
+    async def last_event(self, order_id: int) -> Optional[Dict[str, Any]]:
+        """마지막으로 발행된 이벤트 (없거나 Redis 미사용이면 None)"""
+        if not self.use_redis:
+            return None
+        try:
+            self._count("redis_ops")
+            payload = await self._redis.get(f"{LAST_EVENT_PREFIX}{order_id}")
+            return json.loads(payload) if payload else None
+        except Exception as e:
+            logger.error(f"리포트 진행 이벤트 조회 실패: order_id={order_id}, error={e}")
+            return None
+
+    # ------------------------------------------------------------------ 백그라운드 루프
+
+    async def _listen(self) -> None:
+        """패턴 구독 하나로 모든 주문 채널 수신 (끊기면 재연결)"""
+        while True:
+            pubsub = self._redis.pubsub()
+            try:
+                await pubsub.psubscribe(f"{CHANNEL_PREFIX}*")
+                self._count("redis_ops")
+                async for message in pubsub.listen():
+                    if message["type"] != "pmessage":
+                        continue
+                    self._count("events_received")
+                    order_id = int(message["channel"][len(CHANNEL_PREFIX):])
+                    self._dispatch(order_id, json.loads(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._count("listener_errors")
+                logger.error(f"리포트 진행 구독 오류, 재연결: {e}")
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.close()
+
+    async def _reconcile(self) -> None:
+        """
+        대기 중인 주문들의 종료 여부를 쿼리 1번으로 확인
+        - report_status failed는 재시도를 모두 소진한 뒤에만 기록된다 (tasks.generate_full_report)
+        """
+        while True:
+            await asyncio.sleep(REPORT_PROGRESS_RECONCILE_INTERVAL)
+            waiting = list(self._subscribers)
+            if not waiting:
+                continue
+            try:
+                async with AsyncSessionLocal() as db:
+                    rows = (await db.execute(
+                        select(Order.id, Order.report_status).where(
+                            Order.id.in_(waiting), Order.report_status.in_(TERMINAL_TYPES)
+                        )
+                    )).all()
+                self._count("reconcile_queries")
+                for order_id, report_status in rows:
+                    self._count("reconciled")
+                    self._dispatch(order_id, report_event(order_id, report_status))
+            except Exception as e:
+                logger.error(f"리포트 진행 상태 보정 실패: {e}")
+
+    # ------------------------------------------------------------------ SSE
+
+    async def stream(self, order_id: int, queue: asyncio.Queue,
+                     initial: Optional[Dict[str, Any]] = None) -> AsyncIterator[str]:
+        """
+        SSE 본문 생성 - 종료 이벤트를 보내면 끝난다
+
+        Args:
+            order_id: 주문 ID
+            queue: subscribe()로 받은 대기열
+            initial: 접속 직후 보낼 현재 상태
+        """
+        try:
+            yield "retry: 5000\n\n"
+            if initial is not None:
+                yield _sse(initial)
+                if _is_terminal(initial):
+                    return
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), REPORT_PROGRESS_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                yield _sse(event)
+                if _is_terminal(event):
+                    return
+        finally:
+            self.unsubscribe(order_id, queue)
+
+    # ------------------------------------------------------------------ 지표 / 종료
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self.counters)
+        return {
+            "backend": "redis" if self.use_redis else "poll",
+            "waiting_orders": len(self._subscribers),
+            "waiting_connections": sum(len(queues) for queues in self._subscribers.values()),
+            "reconcile_interval": REPORT_PROGRESS_RECONCILE_INTERVAL,
+            **counters,
+        }
+
+    async def close(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._tasks = []
+        if self._redis is not None:
+            await self._redis.close()
+            self._redis = None
+
+
+report_progress_hub = ReportProgressHub()
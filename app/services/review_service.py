@@ -11,11 +11,14 @@ from datetime import datetime
 from typing import Dict, Any, List, Optional, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_, desc, asc, func
-from fastapi import Depends
+from fastapi import Depends, HTTPException
 from app.models import (
     User, Product, UserReview, UserPurchase, Order
 )
 from app.exceptions import BadRequestError, NotFoundError, PermissionDeniedError
+from app.services.review_stats_service import ReviewStatsService
+from app.utils.error_handlers import ValidationError
+from app.utils.pagination import keyset_page, pagination_info
 
 logger = logging.getLogger(__name__)
 
@@ -30,26 +33,26 @@ class ReviewService:
         per_page: int = 10,
         sort_by: str = "created_at",
         sort_order: str = "desc",
-        rating_filter: Optional[int] = None
+        rating_filter: Optional[int] = None,
+        cursor: Optional[str] = None
     ) -> Dict[str, Any]:
         """
-        상품 리뷰 목록 조회
+        상품 리뷰 목록 조회 (키셋 페이징)
         
         Args:
             product_id: 상품 ID
             db: 데이터베이스 세션
-            page: 페이지 번호
+            page: 페이지 번호 (커서 없이 번호로 이동할 때만 OFFSET 사용)
             per_page: 페이지당 항목 수
             sort_by: 정렬 기준
             sort_order: 정렬 순서
             rating_filter: 평점 필터
+            cursor: 이전 응답의 next_cursor
             
         Returns:
             Dict containing reviews and statistics
         """
         try:
-            offset = (page - 1) * per_page
-            
             # 기본 쿼리
             query = db.query(UserReview).filter(
                 and_(
@@ -62,76 +65,41 @@ class ReviewService:
             if rating_filter:
                 query = query.filter(UserReview.rating == rating_filter)
             
-            # 정렬
+            # 정렬 (정렬 컬럼, id) 키셋
             if sort_by == "rating":
-                order_func = desc(UserReview.rating) if sort_order == "desc" else asc(UserReview.rating)
+                sort_column = UserReview.rating
             elif sort_by == "helpful":
-                order_func = desc(UserReview.helpful_count) if sort_order == "desc" else asc(UserReview.helpful_count)
+                sort_column = UserReview.helpful_count
             else:
-                order_func = desc(UserReview.created_at) if sort_order == "desc" else asc(UserReview.created_at)
-            
-            query = query.order_by(order_func)
+                sort_column = UserReview.created_at
             
-            # 리뷰 조회
-            reviews = query.offset(offset).limit(per_page).all()
-            
-            # 전체 개수 조회
-            total_query = db.query(UserReview).filter(
-                and_(
-                    UserReview.product_id == product_id,
-                    UserReview.is_visible == True
-                )
-            )
+            # 상품 리뷰 통계 (요약 행 1건) - 전체 개수도 여기서 사용
+            statistics = ReviewStatsService.get(db, product_id)
             if rating_filter:
-                total_query = total_query.filter(UserReview.rating == rating_filter)
-            
-            total = total_query.count()
+                total = statistics["rating_distribution"].get(rating_filter, 0)
+            else:
+                total = statistics["total_reviews"]
             
-            # 평점 통계 조회
-            stats_query = db.query(
-                func.avg(UserReview.rating).label('avg_rating'),
-                func.count(UserReview.id).label('total_reviews'),
-                func.sum(UserReview.helpful_count).label('total_helpful')
-            ).filter(
-                and_(
-                    UserReview.product_id == product_id,
-                    UserReview.is_visible == True
-                )
+            # 리뷰 조회
+            reviews, next_cursor = keyset_page(
+                query,
+                sort_column,
+                UserReview.id,
+                per_page,
+                cursor=cursor,
+                descending=sort_order == "desc",
+                offset=(page - 1) * per_page
             )
             
-            stats = stats_query.first()
-            
-            # 평점별 개수 조회
-            rating_counts = db.query(
-                UserReview.rating,
-                func.count(UserReview.id).label('count')
-            ).filter(
-                and_(
-                    UserReview.product_id == product_id,
-                    UserReview.is_visible == True
-                )
-            ).group_by(UserReview.rating).all()
-            
-            rating_distribution = {i: 0 for i in range(1, 6)}
-            for rating, count in rating_counts:
-                rating_distribution[rating] = count
-            
             return {
                 "reviews": reviews,
-                "pagination": {
-                    "page": page,
-                    "per_page": per_page,
-                    "total": total,
-                    "pages": (total + per_page - 1) // per_page
-                },
-                "statistics": {
-                    "average_rating": round(float(stats.avg_rating or 0), 1),
-                    "total_reviews": stats.total_reviews or 0,
-                    "total_helpful": stats.total_helpful or 0,
-                    "rating_distribution": rating_distribution
-                }
+                "pagination": pagination_info(page, per_page, total, next_cursor, approximate=False),
+                "statistics": statistics
             }
             
+        except (ValidationError, HTTPException):
+            # 잘못된 커서 등 - 빈 목록이 아니라 400으로 응답
+            raise
         except Exception as e:
             logger.error(f"상품 리뷰 조회 실패: product_id={product_id}, error={e}")
             return {
@@ -0,0 +1,239 @@
+"""
+상품 리뷰 통계 서비스
+- product_review_stats 요약 테이블을 리뷰 변경 시 증분 갱신 (flush 시점, 같은 트랜잭션)
+- 상품 페이지 / 리뷰 목록은 집계 쿼리 대신 요약 행 1건 조회
+- 요약이 어긋난 경우 rebuild()로 원본 리뷰에서 재계산 (Celery beat 복구 작업)
+"""
+
+import logging
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+
+from sqlalchemy import event, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, attributes
+
+from app.models import ProductReviewStats, UserReview
+from app.utils.upsert import insert_or_update
+
+logger = logging.getLogger(__name__)
+
+STATS_COLUMNS = (
+    "review_count", "rating_sum",
+    "rating_1", "rating_2", "rating_3", "rating_4", "rating_5",
+    "helpful_total",
+)
+
+
+def _empty_counts() -> Dict[str, int]:
+    return {column: 0 for column in STATS_COLUMNS}
+
+
+def _aggregate_statement(product_ids: Optional[Iterable[int]] = None):
+    stmt = select(
+        UserReview.product_id,
+        UserReview.rating,
+        func.count(UserReview.id),
+        func.coalesce(func.sum(UserReview.helpful_count), 0),
+    ).where(UserReview.is_visible == True).group_by(UserReview.product_id, UserReview.rating)
+    if product_ids is not None:
+        stmt = stmt.where(UserReview.product_id.in_(list(product_ids)))
+    return stmt
+
+
+def _fold_aggregate(rows) -> Dict[int, Dict[str, int]]:
+    """(product_id, rating, count, helpful) 행을 상품별 통계 dict로 변환"""
+    result: Dict[int, Dict[str, int]] = defaultdict(_empty_counts)
+    for product_id, rating, count, helpful in rows:
+        counts = result[product_id]
+        counts["review_count"] += count
+        counts["rating_sum"] += rating * count
+        counts["helpful_total"] += int(helpful or 0)
+        if 1 <= rating <= 5:
+            counts[f"rating_{rating}"] += count
+    return result
+
+
+def _to_statistics(counts: Dict[str, int]) -> Dict[str, Any]:
+    """요약 값 -> 기존 statistics 응답 형식"""
+    review_count = counts["review_count"]
+    return {
+        "average_rating": round(counts["rating_sum"] / review_count, 1) if review_count else 0,
+        "total_reviews": review_count,
+        "total_helpful": counts["helpful_total"],
+        "rating_distribution": {i: counts[f"rating_{i}"] for i in range(1, 6)},
+    }
+
+
+def _row_counts(row: ProductReviewStats) -> Dict[str, int]:
+    return {column: getattr(row, column) or 0 for column in STATS_COLUMNS}
+
+
+class ReviewStatsService:
+    """상품별 리뷰 통계 조회 / 증분 갱신 / 복구"""
+
+    @staticmethod
+    def get(db: Session, product_id: int) -> Dict[str, Any]:
+        """
+        상품 리뷰 통계 조회 (요약 행 1건)
+
+        Args:
+            product_id: 상품 ID
+            db: 데이터베이스 세션 (읽기 전용 세션 가능)
+
+        Returns:
+            Dict: average_rating, total_reviews, total_helpful, rating_distribution
+        """
+        row = db.get(ProductReviewStats, product_id)
+        if row is not None:
+            return _to_statistics(_row_counts(row))
+
+        # 요약 행이 아직 없는 상품 - 원본에서 계산 (저장은 복구 작업 / 첫 리뷰 flush가 담당)
+        counts = _fold_aggregate(db.execute(_aggregate_statement([product_id])).all())
+        return _to_statistics(counts.get(product_id) or _empty_counts())
+
+    @staticmethod
+    async def get_async(db: AsyncSession, product_id: int) -> Dict[str, Any]:
+        """상품 리뷰 통계 조회 - 비동기 세션 버전"""
+        row = await db.get(ProductReviewStats, product_id)
+        if row is not None:
+            return _to_statistics(_row_counts(row))
+
+        counts = _fold_aggregate((await db.execute(_aggregate_statement([product_id]))).all())
+        return _to_statistics(counts.get(product_id) or _empty_counts())
+
+    @staticmethod
+    def apply_deltas(session: Session, deltas: Dict[int, Counter]) -> None:
+        """
+        상품별 증감분을 요약 행에 원자적으로 반영 (col = col + delta)
+
+        요약 행이 없는 상품은 flush가 끝난 원본 리뷰로 행을 새로 만든다.
+        그 사이 다른 트랜잭션이 먼저 행을 만들었으면 upsert로 증감분만 더한다.
+        """
+        table = ProductReviewStats.__table__
+        now = datetime.now()
+        for product_id, delta in deltas.items():
+            values = [(column, table.c[column] + amount) for column, amount in delta.items()]
+            values.append(("updated_at", now))
+            result = session.execute(
+                update(table).where(table.c.product_id == product_id).values(dict(values))
+            )
+            if result.rowcount == 0:
+                counts = _fold_aggregate(session.execute(_aggregate_statement([product_id])).all())
+                insert_or_update(
+                    session,
+                    table,
+                    {"product_id": product_id, "updated_at": now, **(counts.get(product_id) or _empty_counts())},
+                    values,
+                    index_elements=["product_id"],
+                )
+
+    @staticmethod
+    def rebuild(db: Session, product_ids: Optional[Iterable[int]] = None, batch_size: int = 500) -> Dict[str, int]:
+        """
+        원본 리뷰에서 요약 테이블 재계산 (복구 작업)
+
+        Args:
+            db: 데이터베이스 세션
+            product_ids: 대상 상품 (None이면 전체)
+            batch_size: 커밋 단위
+
+        Returns:
+            Dict: checked, repaired, created 건수
+        """
+        if product_ids is not None:
+            product_ids = list(product_ids)
+
+        actual = _fold_aggregate(db.execute(_aggregate_statement(product_ids)).all())
+        stored_query = db.query(ProductReviewStats)
+        if product_ids is not None:
+            stored_query = stored_query.filter(ProductReviewStats.product_id.in_(product_ids))
+        stored = {row.product_id: row for row in stored_query}
+
+        checked = repaired = created = 0
+        pending = 0
+        for product_id in sorted(set(actual) | set(stored)):
+            counts = actual.get(product_id) or _empty_counts()
+            row = stored.get(product_id)
+            checked += 1
+
+            if row is None:
+                db.add(ProductReviewStats(product_id=product_id, **counts))
+                created += 1
+                pending += 1
+            elif _row_counts(row) != counts:
+                logger.warning(f"리뷰 통계 불일치 복구: product_id={product_id}, stored={_row_counts(row)}, actual={counts}")
+                for column, value in counts.items():
+                    setattr(row, column, value)
+                repaired += 1
+                pending += 1
+
+            if pending >= batch_size:
+                db.commit()
+                pending = 0
+
+        db.commit()
+        return {"checked": checked, "repaired": repaired, "created": created}
+
+
+REVIEW_STATS_ATTRIBUTES = ("product_id", "rating", "is_visible", "helpful_count")
+
+
+def _load_previous_value(target, value, oldvalue, initiator):
+    """active_history용 리스너 (동작 없음)"""
+
+
+# 커밋 후 만료된 리뷰에 값을 대입해도 이전 값을 먼저 로드 (get_history로 감소분 계산)
+for _key in REVIEW_STATS_ATTRIBUTES:
+    event.listen(getattr(UserReview, _key), "set", _load_previous_value, active_history=True)
+
+
+def _review_state(review: UserReview, committed: bool):
+    """리뷰의 통계 관련 값 (committed=True면 flush 이전 값)"""
+    values = []
+    for key in REVIEW_STATS_ATTRIBUTES:
+        value = getattr(review, key)
+        if committed:
+            history = attributes.get_history(review, key)
+            if history.deleted:
+                value = history.deleted[0]
+        values.append(value)
+    product_id, rating, is_visible, helpful_count = values
+    return product_id, rating, is_visible is not False, helpful_count or 0
+
+
+def _add_contribution(deltas: Dict[int, Counter], state, sign: int) -> None:
+    product_id, rating, is_visible, helpful_count = state
+    if not is_visible or product_id is None or rating is None:
+        return
+    delta = deltas[product_id]
+    delta["review_count"] += sign
+    delta["rating_sum"] += sign * rating
+    delta["helpful_total"] += sign * helpful_count
+    if 1 <= rating <= 5:
+        delta[f"rating_{rating}"] += sign
+
+
+@event.listens_for(Session, "after_flush")
+def _update_review_stats(session, flush_context):
+    deltas: Dict[int, Counter] = defaultdict(Counter)
+
+    for obj in session.new:
+        if isinstance(obj, UserReview):
+            _add_contribution(deltas, _review_state(obj, committed=False), 1)
+    for obj in session.dirty:
+        if isinstance(obj, UserReview) and session.is_modified(obj):
+            _add_contribution(deltas, _review_state(obj, committed=True), -1)
+            _add_contribution(deltas, _review_state(obj, committed=False), 1)
+    for obj in session.deleted:
+        if isinstance(obj, UserReview):
+            _add_contribution(deltas, _review_state(obj, committed=True), -1)
+
+    changed = {
+        product_id: Counter({column: amount for column, amount in delta.items() if amount})
+        for product_id, delta in deltas.items()
+    }
+    changed = {product_id: delta for product_id, delta in changed.items() if delta}
+    if changed:
+        ReviewStatsService.apply_deltas(session, changed)
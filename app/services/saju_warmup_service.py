@@ -0,0 +1,317 @@
+"""
+사주 AI 분석 배치 워밍업 (Ollama)
+- 방문이 많은 saju_key 중 SajuAnalysisCache에 분석이 없는 키를 수요 순으로 선별
+- 로컬 LLM(Ollama)에 제한된 동시성으로 요청, 전체 처리량은 분당 요청 예산으로 제한
+- 배치마다 체크포인트 파일 저장 - 완료 여부는 캐시 행이 기준, 파일은 실패 횟수 / 누적 지표 보관
+- 중단 후 다시 실행하면 남은 키부터 이어서 처리 (반복 실패한 키는 건너뜀)
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models import SajuAnalysisCache, SajuUser
+from app.saju_utils import SajuKeyManager
+
+logger = logging.getLogger(__name__)
+
+WARMUP_MODES = {
+    "full": "analysis_full",
+    "preview": "analysis_preview",
+}
+# 로컬 GPU 한 대 기준 - Ollama OLLAMA_NUM_PARALLEL과 맞춘다
+SAJU_WARMUP_CONCURRENCY = int(os.getenv("SAJU_WARMUP_CONCURRENCY", 2))
+# 분당 요청 예산 (0이면 DELAY_BETWEEN_REQUESTS 간격으로 환산)
+SAJU_WARMUP_RATE_PER_MINUTE = float(os.getenv("SAJU_WARMUP_RATE_PER_MINUTE", 0))
+SAJU_WARMUP_MAX_ATTEMPTS = int(os.getenv("SAJU_WARMUP_MAX_ATTEMPTS", 3))
+SAJU_WARMUP_CHECKPOINT = os.getenv("SAJU_WARMUP_CHECKPOINT", "saju_warmup_checkpoint.json")
+
+
+class RequestBudget:
+    """분당 요청 수 / 총 요청 수 제한 (스레드 간 공유, 요청 간격을 고르게 배분)"""
+
+    def __init__(self, per_minute: float, max_requests: Optional[int] = None):
+        self.interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self.max_requests = max_requests
+        self.used = 0
+        self._next_at = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, stop: Optional[threading.Event] = None) -> bool:
+        """
+        요청 슬롯 예약 후 차례가 될 때까지 대기
+
+        Returns:
+            bool: 예산 소진 또는 중단 요청이면 False
+        """
+        with self._lock:
+            if self.max_requests is not None and self.used >= self.max_requests:
+                return False
+            self.used += 1
+            now = time.monotonic()
+            start_at = max(now, self._next_at)
+            self._next_at = start_at + self.interval
+        wait = start_at - time.monotonic()
+        if wait > 0 and stop is not None:
+            return not stop.wait(wait)
+        if wait > 0:
+            time.sleep(wait)
+        return True
+
+
+class WarmupCheckpoint:
+    """모드별 진행 상황 파일 (배치마다 원자적으로 저장)"""
+
+    def __init__(self, path: str, mode: str):
+        self.path = path
+        self.mode = mode
+        self.data: Dict[str, Any] = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self.data = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"워밍업 체크포인트 읽기 실패, 새로 시작: path={path}, error={e}")
+        self.state = self.data.setdefault(mode, {
+            "started_at": datetime.now().isoformat(timespec="seconds"),
+            "generated": 0,
+            "skipped": 0,
+            "failed_total": 0,
+            "failures": {},
+        })
+
+    def failures(self, saju_key: str) -> int:
+        return self.state["failures"].get(saju_key, 0)
+
+    def record(self, saju_key: str, outcome: str) -> None:
+        if outcome == "generated":
+            self.state["generated"] += 1
+            self.state["failures"].pop(saju_key, None)
+        elif outcome == "skipped":
+            self.state["skipped"] += 1
+        else:
+            self.state["failed_total"] += 1
+            self.state["failures"][saju_key] = self.failures(saju_key) + 1
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        self.state["updated_at"] = datetime.now().isoformat(timespec="seconds")
+        from app.utils.report_files import atomic_write
+        atomic_write(self.path, json.dumps(self.data, ensure_ascii=False, indent=2).encode("utf-8"))
+
+
+class SajuWarmupService:
+    """인기 saju_key 분석 사전 생성"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def find_candidates(
+        self,
+        mode: str = "full",
+        limit: int = 10,
+        since_days: Optional[int] = None,
+        exclude: Optional[set] = None,
+    ) -> List[Tuple[str, int]]:
+        """
+        분석이 없는 saju_key를 수요(방문 수 합계) 순으로 조회
+
+        Args:
+            mode: "full"(analysis_full) 또는 "preview"(analysis_preview)
+            limit: 최대 개수
+            since_days: 지정 시 최근 N일 안에 방문한 사용자만 집계
+            exclude: 제외할 키 (이번 실행에서 실패했거나 재시도 한도를 넘긴 키)
+
+        Returns:
+            List[Tuple[str, int]]: (saju_key, 수요)
+        """
+        column = getattr(SajuAnalysisCache, WARMUP_MODES[mode])
+        exclude = exclude or set()
+        demand = func.sum(func.coalesce(SajuUser.visit_count, 1)).label("demand")
+
+        query = self.db.query(SajuUser.saju_key, demand).outerjoin(
+            SajuAnalysisCache, SajuAnalysisCache.saju_key == SajuUser.saju_key
+        ).filter(
+            SajuUser.saju_key.isnot(None),
+            column.is_(None)
+        )
+        if since_days:
+            query = query.filter(SajuUser.last_visit >= datetime.now() - timedelta(days=since_days))
+
+        # 제외 키는 DB 밖에서 거른다 (NOT IN 목록이 커지지 않도록 그만큼 더 조회)
+        rows = query.group_by(SajuUser.saju_key).order_by(
+            demand.desc(), SajuUser.saju_key
+        ).limit(limit + len(exclude)).all()
+        return [(key, int(count)) for key, count in rows if key not in exclude][:limit]
+
+    @staticmethod
+    def generate(saju_key: str, mode: str = "full", prompt: Optional[str] = None) -> Optional[str]:
+        """
+        Ollama로 분석 1건 생성 (리포트 태스크 / 미리보기 API와 같은 입력)
+
+        Args:
+            saju_key: 사주 키
+            mode: "full" 또는 "preview"
+            prompt: full 모드 시스템 프롬프트 (없으면 load_prompt로 saju_key별 A/B 버전 선택)
+
+        Returns:
+            Optional[str]: 후처리된 분석 결과, 실패 시 None
+
+        Raises:
+            ValueError: saju_key 형식이 잘못된 경우
+        """
+        from app.routers.saju import (
+            ai_sajupalja_with_ollama, build_analysis_content, build_preview_prompt,
+            calculate_four_pillars, format_fortune_text, load_prompt, post_process_saju_result
+        )
+
+        # 계산 함수들은 잘못된 키에 기본 사주를 돌려주므로 먼저 형식 검증 (잘못된 키는 실패 처리)
+        SajuKeyManager.parse_saju_key(saju_key)
+
+        if mode == "preview":
+            result = ai_sajupalja_with_ollama("당신은 전문 사주 해석가입니다.", build_preview_prompt(saju_key))
+            return format_fortune_text(result) if result else None
+
+        # SajuService 대신 직접 계산 (계산 실패 시 기본 사주로 대체하지 않도록)
+        calc_datetime, _, _ = SajuKeyManager.get_birth_info_for_calculation(saju_key)
+        pillars = calculate_four_pillars(calc_datetime)
+        prompt = prompt or load_prompt(saju_key)
+        if not prompt:
+            return None
+        result = ai_sajupalja_with_ollama(prompt, build_analysis_content(pillars))
+        return post_process_saju_result(result) if result else None
+
+    @staticmethod
+    def save(saju_key: str, mode: str, analysis: str) -> bool:
+        """
+        캐시 저장 (별도 세션 - 워커 스레드에서 호출)
+
+        Returns:
+            bool: 저장했으면 True, 그 사이 다른 경로에서 이미 채웠으면 False
+        """
+        field = WARMUP_MODES[mode]
+        db = SessionLocal()
+        try:
+            for _ in range(2):
+                row = db.query(SajuAnalysisCache).filter_by(saju_key=saju_key).first()
+                if row and getattr(row, field):
+                    return False
+                if row:
+                    setattr(row, field, analysis)
+                else:
+                    db.add(SajuAnalysisCache(saju_key=saju_key, **{field: analysis}))
+                try:
+                    db.commit()
+                    return True
+                except IntegrityError:
+                    # 동시에 다른 요청이 행을 만든 경우 - 다시 읽어 갱신
+                    db.rollback()
+            return False
+        finally:
+            db.close()
+
+    def run(
+        self,
+        mode: str = "full",
+        limit: int = 100,
+        batch_size: Optional[int] = None,
+        concurrency: int = SAJU_WARMUP_CONCURRENCY,
+        rate_per_minute: float = SAJU_WARMUP_RATE_PER_MINUTE,
+        max_requests: Optional[int] = None,
+        since_days: Optional[int] = None,
+        max_attempts: int = SAJU_WARMUP_MAX_ATTEMPTS,
+        checkpoint_path: Optional[str] = SAJU_WARMUP_CHECKPOINT,
+        stop: Optional[threading.Event] = None,
+    ) -> Dict[str, Any]:
+        """
+        워밍업 실행 - 후보를 배치 단위로 뽑아 병렬 생성, 배치마다 체크포인트
+
+        Args:
+            mode: "full" 또는 "preview"
+            limit: 이번 실행에서 처리할 최대 키 수
+            batch_size: 배치당 키 수 (기본 BATCH_SIZE)
+            concurrency: 동시 LLM 요청 수
+            rate_per_minute: 분당 요청 예산 (0이면 DELAY_BETWEEN_REQUESTS로 환산)
+            max_requests: 총 LLM 요청 한도
+            since_days: 최근 N일 방문자만 수요로 집계
+            max_attempts: 이 횟수 이상 실패한 키는 건너뜀 (체크포인트 누적)
+            checkpoint_path: 체크포인트 파일 (None이면 저장 안 함)
+            stop: 설정되면 진행 중인 요청만 마치고 종료
+
+        Returns:
+            Dict[str, Any]: 이번 실행 지표
+        """
+        from app.routers.saju import BATCH_SIZE, DELAY_BETWEEN_REQUESTS, load_prompt
+
+        if mode not in WARMUP_MODES:
+            raise ValueError(f"지원하지 않는 모드: {mode}")
+        if mode == "full" and not load_prompt():
+            raise RuntimeError("프롬프트 파일을 읽을 수 없습니다.")
+
+        batch_size = batch_size or BATCH_SIZE
+        if rate_per_minute <= 0 and DELAY_BETWEEN_REQUESTS > 0:
+            rate_per_minute = 60.0 / DELAY_BETWEEN_REQUESTS
+        budget = RequestBudget(rate_per_minute, max_requests)
+        checkpoint = WarmupCheckpoint(checkpoint_path, mode)
+        stop = stop or threading.Event()
+
+        stats = {"mode": mode, "generated": 0, "skipped": 0, "failed": 0, "batches": 0}
+        failed_now: set = set()
+        started = time.monotonic()
+
+        def work(saju_key: str) -> str:
+            if not budget.acquire(stop):
+                return "unstarted"
+            try:
+                analysis = self.generate(saju_key, mode)
+            except Exception as e:
+                logger.warning(f"워밍업 생성 실패: saju_key={saju_key}, error={e}")
+                return "failed"
+            if not analysis:
+                return "failed"
+            return "generated" if self.save(saju_key, mode, analysis) else "skipped"
+
+        with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="saju-warmup") as pool:
+            while not stop.is_set() and stats["generated"] + stats["skipped"] + stats["failed"] < limit:
+                exhausted = {
+                    key for key, count in checkpoint.state["failures"].items() if count >= max_attempts
+                }
+                remaining = limit - (stats["generated"] + stats["skipped"] + stats["failed"])
+                candidates = self.find_candidates(
+                    mode, min(batch_size, remaining), since_days, exclude=failed_now | exhausted
+                )
+                if not candidates:
+                    break
+
+                outcomes = list(pool.map(work, [key for key, _ in candidates]))
+                for (saju_key, _), outcome in zip(candidates, outcomes):
+                    if outcome == "unstarted":
+                        continue
+                    checkpoint.record(saju_key, outcome)
+                    stats[outcome] += 1
+                    if outcome == "failed":
+                        failed_now.add(saju_key)
+                stats["batches"] += 1
+                checkpoint.save()
+                logger.info(
+                    f"워밍업 배치 {stats['batches']}: generated={stats['generated']}, "
+                    f"skipped={stats['skipped']}, failed={stats['failed']}"
+                )
+                if "unstarted" in outcomes:
+                    break  # 요청 예산 소진 / 중단 요청
+
+        stats["requests"] = stats["generated"] + stats["skipped"] + stats["failed"]
+        stats["elapsed_seconds"] = round(time.monotonic() - started, 1)
+        stats["stopped"] = stop.is_set()
+        return stats
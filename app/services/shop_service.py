@@ -8,7 +8,8 @@ import logging
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, func
+from sqlalchemy import and_, or_, desc, func, select, Select
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import Depends
 from app.database import get_db
 from app.models import (
@@ -16,6 +17,7 @@ from app.models import (
     Order, UserFortunePoint, FortuneTransaction
 )
 from app.utils.error_handlers import ValidationError, InsufficientPointsError
+from app.utils.pagination import keyset_page, cached_count, pagination_info
 from app.services.fortune_service import FortuneService
 from app.services.payment_service import PaymentService
 
@@ -52,66 +54,117 @@ class ShopService:
         """
         try:
             offset = (page - 1) * per_page
+            stmt = self._products_statement(category, search, sort_by)
             
-            # 쿼리 구성
-            query = self.db.query(Product).filter(Product.is_active.is_(True))
+            # 전체 개수 조회
+            total = self.db.execute(
+                select(func.count()).select_from(stmt.order_by(None).subquery())
+            ).scalar()
             
-            # 카테고리 필터
-            if category:
-                query = query.filter(Product.category == category)
+            # 페이징
+            products = self.db.execute(stmt.offset(offset).limit(per_page)).scalars().all()
             
-            # 검색 필터
-            if search:
-                search_filter = or_(
-                    Product.name.contains(search),
-                    Product.description.contains(search)
-                )
-                query = query.filter(search_filter)
+            return self._products_page(products, page, per_page, total)
             
-            # 전체 개수 조회
-            total = query.count()
-            
-            # 정렬
-            if sort_by == "price_low":
-                query = query.order_by(Product.price.asc())
-            elif sort_by == "price_high":
-                query = query.order_by(Product.price.desc())
-            elif sort_by == "name":
-                query = query.order_by(Product.name.asc())
-            else:
-                query = query.order_by(desc(Product.created_at))
+        except Exception as e:
+            logger.error(f"Product query error: error={e}")
+            raise ValidationError("상품 목록 조회 중 오류가 발생했습니다.")
+    
+    @staticmethod
+    async def get_products_async(
+        db: AsyncSession,
+        category: Optional[str] = None,
+        search: Optional[str] = None,
+        page: int = 1,
+        per_page: int = 12,
+        sort_by: str = "created_at"
+    ) -> Dict[str, Any]:
+        """
+        상품 목록 조회 - 비동기 세션 버전 (get_products와 동일한 결과)
+        
+        Args:
+            db: 비동기 데이터베이스 세션
+            category: 카테고리 필터
+            search: 검색어
+            page: 페이지 번호
+            per_page: 페이지당 항목 수
+            sort_by: 정렬 기준
+        
+        Returns:
+            Dict: 상품 목록 및 페이징 정보
+        """
+        try:
+            offset = (page - 1) * per_page
+            stmt = ShopService._products_statement(category, search, sort_by)
             
-            # 페이징
-            products = query.offset(offset).limit(per_page).all()
+            total = (await db.execute(
+                select(func.count()).select_from(stmt.order_by(None).subquery())
+            )).scalar()
             
-            return {
-                'products': [
-                    {
-                        'id': p.id,
-                        'name': p.name,
-                        'description': p.description,
-                        'price': p.price,
-                        'fortune_cost': p.fortune_cost,
-                        'slug': p.slug,
-                        'thumbnail': p.thumbnail,
-                        'category': p.category,
-                        'is_featured': p.is_featured,
-                        'created_at': p.created_at
-                    }
-                    for p in products
-                ],
-                'pagination': {
-                    'page': page,
-                    'per_page': per_page,
-                    'total': total,
-                    'pages': (total + per_page - 1) // per_page
-                }
-            }
+            products = (await db.execute(stmt.offset(offset).limit(per_page))).scalars().all()
+            
+            return ShopService._products_page(products, page, per_page, total)
             
         except Exception as e:
             logger.error(f"Product query error: error={e}")
             raise ValidationError("상품 목록 조회 중 오류가 발생했습니다.")
     
+    @staticmethod
+    def _products_statement(
+        category: Optional[str],
+        search: Optional[str],
+        sort_by: str
+    ) -> Select:
+        """상품 목록 SELECT 구성 (동기/비동기 공용)"""
+        stmt = select(Product).where(Product.is_active.is_(True))
+        
+        # 카테고리 필터
+        if category:
+            stmt = stmt.where(Product.category == category)
+        
+        # 검색 필터
+        if search:
+            stmt = stmt.where(or_(
+                Product.name.contains(search),
+                Product.description.contains(search)
+            ))
+        
+        # 정렬
+        if sort_by == "price_low":
+            return stmt.order_by(Product.price.asc())
+        if sort_by == "price_high":
+            return stmt.order_by(Product.price.desc())
+        if sort_by == "name":
+            return stmt.order_by(Product.name.asc())
+        return stmt.order_by(desc(Product.created_at))
+    
+    @staticmethod
+    def _products_page(products, page: int, per_page: int, total: int) -> Dict[str, Any]:
+        """상품 목록 응답 직렬화"""
+        return {
+            'products': [
+                {
+                    'id': p.id,
+                    'name': p.name,
+                    'description': p.description,
+                    'price': p.price,
+                    'fortune_cost': p.fortune_cost,
+                    'slug': p.slug,
+                    'thumbnail': p.thumbnail,
+                    'category': p.category,
+                    'is_featured': p.is_featured,
+                    'created_at': p.created_at
+                }
+                for p in products
+            ],
+            'pagination': {
+                'page': page,
+                'per_page': per_page,
+                'total': total,
+                'pages': (total + per_page - 1) // per_page
+            }
+        }
+    
     def get_product_by_slug(self, slug: str) -> Optional[Dict[str, Any]]:
         """
         슬러그로 상품 상세 조회
@@ -412,32 +465,37 @@ class ShopService:
         self,
         user_id: int,
         page: int = 1,
-        per_page: int = 20
+        per_page: int = 20,
+        cursor: Optional[str] = None
     ) -> Dict[str, Any]:
         """
-        사용자 구매 내역 조회
+        사용자 구매 내역 조회 (키셋 페이징)
         
         Args:
             user_id: 사용자 ID
-            page: 페이지 번호
+            page: 페이지 번호 (커서 없이 번호로 이동할 때만 OFFSET 사용)
             per_page: 페이지당 항목 수
+            cursor: 이전 응답의 next_cursor
         
         Returns:
             Dict: 구매 내역 및 페이징 정보
         """
         try:
-            offset = (page - 1) * per_page
-            
             # 구매 내역 조회
             query = self.db.query(UserPurchase).filter(
                 UserPurchase.user_id == user_id
             )
             
-            total = query.count()
+            total = cached_count(f"count:purchases:{user_id}", query.count)
             
-            purchases = query.order_by(
-                desc(UserPurchase.created_at)
-            ).offset(offset).limit(per_page).all()
+            purchases, next_cursor = keyset_page(
+                query,
+                UserPurchase.created_at,
+                UserPurchase.id,
+                per_page,
+                cursor=cursor,
+                offset=(page - 1) * per_page
+            )
             
             result = []
             for purchase in purchases:
@@ -460,14 +518,11 @@ class ShopService:
             
             return {
                 'purchases': result,
-                'pagination': {
-                    'page': page,
-                    'per_page': per_page,
-                    'total': total,
-                    'pages': (total + per_page - 1) // per_page
-                }
+                'pagination': pagination_info(page, per_page, total, next_cursor)
             }
             
+        except ValidationError:
+            raise
         except Exception as e:
             logger.error(f"User purchases query error: user_id={user_id}, error={e}")
             raise ValidationError("구매 내역 조회 중 오류가 발생했습니다.")
@@ -262,71 +262,41 @@ class SubscriptionService:
             return False, "구독 재개 중 오류가 발생했습니다.", {}
     
     @staticmethod
-    def process_monthly_billing(db: Session) -> Dict[str, Any]:
+    def process_monthly_billing(db: Session, billing_date: Optional[date] = None) -> Dict[str, Any]:
         """
-        월간 결제 처리 (스케줄러에서 호출)
+        월간 결제 처리 - 같은 프로세스에서 청크를 순서대로 처리
+        
+        운영 스케줄은 app.tasks.start_subscription_billing이 청크를 Celery 워커로
+        분산한다. 둘 다 같은 실행/청크 체크포인트를 쓰므로 중단 후 어느 쪽으로 재개해도 된다.
         
         Args:
             db: 데이터베이스 세션
+            billing_date: 결제 기준일 (기본 오늘)
             
         Returns:
             Dict containing billing results
         """
+        from app.services.billing_service import BillingRunService
+        
         try:
-            today = date.today()
-            
-            # 결제 예정인 구독 조회
-            subscriptions = db.query(Subscription).filter(
-                and_(
-                    Subscription.status == "active",
-                    Subscription.next_billing_date <= today,
-                    Subscription.auto_renewal == True
-                )
-            ).all()
+            billing = BillingRunService(db)
+            run = billing.start_run(billing_date)
             
-            results = {
-                "total_subscriptions": len(subscriptions),
-                "successful_billings": 0,
-                "failed_billings": 0,
-                "errors": []
-            }
-            
-            for subscription in subscriptions:
+            errors = []
+            for chunk_id in billing.pending_chunk_ids(run.id):
                 try:
-                    # 결제 처리
-                    success = SubscriptionService._process_subscription_payment(subscription, db)
-                    
-                    if success:
-                        # 다음 결제일 업데이트
-                        subscription.last_billing_date = subscription.next_billing_date
-                        subscription.next_billing_date = subscription.next_billing_date + timedelta(days=30)
-                        
-                        # 월간 포인트 지급
-                        if subscription.monthly_fortune_points > 0:
-                            FortuneService.add_fortune_points(
-                                user_id=subscription.user_id,
-                                amount=subscription.monthly_fortune_points,
-                                source="subscription_monthly",
-                                reference_id=f"sub_{subscription.id}",
-                                db=db
-                            )
-                        
-                        results["successful_billings"] += 1
-                        logger.info(f"구독 결제 성공: subscription_id={subscription.id}")
-                        
-                    else:
-                        # 결제 실패 시 구독 상태 변경
-                        subscription.status = "expired"
-                        results["failed_billings"] += 1
-                        logger.warning(f"구독 결제 실패: subscription_id={subscription.id}")
-                        
+                    billing.process_chunk(chunk_id)
                 except Exception as e:
-                    results["failed_billings"] += 1
-                    results["errors"].append(f"subscription_id={subscription.id}: {str(e)}")
-                    logger.error(f"구독 결제 처리 실패: subscription_id={subscription.id}, error={e}")
+                    errors.append(f"chunk_id={chunk_id}: {str(e)}")
             
-            db.commit()
-            return results
+            metrics = billing.run_metrics(run.id)
+            return {
+                "total_subscriptions": metrics["processed"],
+                "successful_billings": metrics["succeeded"],
+                "failed_billings": metrics["failed"],
+                "errors": errors,
+                "run": metrics
+            }
             
         except Exception as e:
             logger.error(f"월간 결제 처리 실패: error={e}")
@@ -0,0 +1,142 @@
+"""
+로그인 사용자 스냅샷 캐시 - 인증 요청마다 blog_users 조회 제거
+- id/username/email/is_admin/is_active/points 투영을 짧은 TTL로 캐싱 (Redis 또는 메모리)
+- HMAC 서명으로 캐시 변조 방지
+- User 변경이 커밋되면 해당 스냅샷 무효화
+"""
+
+import hashlib
+import hmac
+import json
+import logging
+import os
+from typing import Any, Dict, Optional, Union
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models import User
+from app.services.cache_service import CacheService, CacheKeys
+
+logger = logging.getLogger(__name__)
+
+USER_SNAPSHOT_TTL = int(os.getenv("USER_SNAPSHOT_TTL", 60))
+SNAPSHOT_FIELDS = ("id", "username", "email", "is_admin", "is_active", "points")
+
+_SIGNING_KEY = os.getenv("SECRET_KEY", "your-super-secret-key-change-this-for-footjob").encode()
+
+
+class UserSnapshot:
+    """캐시에서 복원한 사용자 정보
+
+    스냅샷에 없는 속성(관계, created_at 등)에 접근하면 그때 DB에서
+    User를 로드해 위임한다. 수정이 필요한 경우에는 User를 직접 조회할 것.
+    """
+
+    def __init__(self, data: Dict[str, Any], db: Optional[Session] = None):
+        self.__dict__.update(data)
+        self._db = db
+        self._user = None
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        db = self.__dict__.get("_db")
+        if self._user is None and isinstance(db, Session):
+            self._user = db.get(User, self.id)
+        if self._user is None:
+            raise AttributeError(name)
+        return getattr(self._user, name)
+
+    def __repr__(self) -> str:
+        return f"<UserSnapshot id={self.id} username={self.username!r}>"
+
+
+class UserCacheService:
+    """사용자 스냅샷 캐시 서비스"""
+
+    @staticmethod
+    def cache_key(user_id: int) -> str:
+        return f"{CacheKeys.USER_SNAPSHOT}:{user_id}"
+
+    @staticmethod
+    def _sign(data: Dict[str, Any]) -> str:
+        payload = json.dumps(data, sort_keys=True, ensure_ascii=False).encode()
+        return hmac.new(_SIGNING_KEY, payload, hashlib.sha256).hexdigest()
+
+    @staticmethod
+    def get_snapshot(user_id: int) -> Optional[Dict[str, Any]]:
+        """
+        서명이 유효한 캐시 스냅샷 조회
+
+        Args:
+            user_id: 사용자 ID
+
+        Returns:
+            Dict: 스냅샷 데이터 (없거나 서명 불일치면 None)
+        """
+        cached = CacheService.get(UserCacheService.cache_key(user_id))
+        if not cached or not isinstance(cached, dict):
+            return None
+
+        data, signature = cached.get("data"), cached.get("sig", "")
+        if not isinstance(data, dict) or not hmac.compare_digest(UserCacheService._sign(data), signature):
+            logger.warning(f"사용자 스냅샷 서명 불일치: user_id={user_id}")
+            UserCacheService.invalidate(user_id)
+            return None
+        return data
+
+    @staticmethod
+    def store(user: User) -> Dict[str, Any]:
+        """User에서 스냅샷을 만들어 캐시에 저장"""
+        data = {field: getattr(user, field) for field in SNAPSHOT_FIELDS}
+        CacheService.set(
+            UserCacheService.cache_key(user.id),
+            {"data": data, "sig": UserCacheService._sign(data)},
+            USER_SNAPSHOT_TTL,
+        )
+        return data
+
+    @staticmethod
+    def invalidate(user_id: int) -> None:
+        CacheService.delete(UserCacheService.cache_key(user_id))
+
+    @staticmethod
+    def load(db: Session, user_id: int) -> Optional[Union[User, UserSnapshot]]:
+        """
+        로그인 사용자 조회 - 캐시 히트 시 DB 조회 없음
+
+        Args:
+            db: DB 세션 (스냅샷에 없는 속성 지연 로드용)
+            user_id: 세션의 사용자 ID
+
+        Returns:
+            캐시 히트면 UserSnapshot, 미스면 조회한 User (없으면 None)
+        """
+        data = UserCacheService.get_snapshot(user_id)
+        if data is not None:
+            return UserSnapshot(data, db)
+
+        user = db.query(User).filter(User.id == user_id).first()
+        if user:
+            UserCacheService.store(user)
+        return user
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(session, flush_context):
+    changed = session.info.setdefault("changed_user_ids", set())
+    for obj in list(session.dirty) + list(session.deleted):
+        if isinstance(obj, User) and obj.id is not None:
+            changed.add(obj.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session):
+    for user_id in session.info.pop("changed_user_ids", ()):
+        UserCacheService.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_users(session):
+    session.info.pop("changed_user_ids", None)
@@ -0,0 +1,310 @@
+"""
+사용자 대시보드 카운터 서비스
+- user_counters 행을 구매/주문/리뷰/추천/추천 보상 변경 시 증분 갱신 (flush 시점, 같은 트랜잭션)
+- 마이페이지 대시보드 / 추천인 통계는 COUNT·SUM 대신 user_id 기준 1건 조회
+- 이번 달 값은 month_key로 구분해 달이 바뀌면 첫 갱신 시 0부터 다시 센다
+- 행이 없는 사용자는 조회 시 원본에서 계산만 하고, 행 생성은 첫 변경 flush / rebuild()가 담당
+- rebuild()로 원본 테이블과 대조해 복구 (Celery beat 정합성 검사)
+"""
+
+import logging
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import case, event, func, select, update
+from sqlalchemy.orm import Session, attributes
+
+from app.models import (
+    Order, User, UserCounters, UserFortunePoint, UserPurchase, UserReferralReward, UserReview
+)
+from app.utils.upsert import insert_or_update
+
+logger = logging.getLogger(__name__)
+
+COUNTER_COLUMNS = (
+    "purchases_count", "orders_count", "reviews_count", "referrals_count",
+    "referral_rewards_total", "referral_rewards_signup", "referral_rewards_purchase",
+)
+MONTHLY_COLUMNS = ("referrals_this_month", "referral_rewards_this_month")
+
+
+def _month_start(now: Optional[datetime] = None) -> datetime:
+    return (now or datetime.now()).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _month_key(now: Optional[datetime] = None) -> str:
+    return (now or datetime.now()).strftime("%Y-%m")
+
+
+def _empty_counts() -> Dict[str, int]:
+    return {column: 0 for column in COUNTER_COLUMNS + MONTHLY_COLUMNS}
+
+
+def _source_counts(db: Session, user_ids: List[int]) -> Dict[int, Dict[str, int]]:
+    """원본 테이블에서 사용자별 카운터 계산"""
+    month_start = _month_start()
+    result: Dict[int, Dict[str, int]] = {user_id: _empty_counts() for user_id in user_ids}
+
+    for model, column in ((UserPurchase, "purchases_count"), (Order, "orders_count"), (UserReview, "reviews_count")):
+        rows = db.execute(
+            select(model.user_id, func.count(model.id))
+            .where(model.user_id.in_(user_ids))
+            .group_by(model.user_id)
+        ).all()
+        for user_id, count in rows:
+            result[user_id][column] = count
+
+    referral_rows = db.execute(
+        select(
+            User.referred_by,
+            func.count(User.id),
+            func.sum(case((User.referral_signup_date >= month_start, 1), else_=0)),
+        ).where(User.referred_by.in_(user_ids)).group_by(User.referred_by)
+    ).all()
+    for user_id, count, this_month in referral_rows:
+        result[user_id]["referrals_count"] = count
+        result[user_id]["referrals_this_month"] = int(this_month or 0)
+
+    reward_rows = db.execute(
+        select(
+            UserReferralReward.referrer_id,
+            func.sum(UserReferralReward.points),
+            func.sum(case((UserReferralReward.reward_type == "signup", UserReferralReward.points), else_=0)),
+            func.sum(case((UserReferralReward.reward_type == "purchase", UserReferralReward.points), else_=0)),
+            func.sum(case((UserReferralReward.created_at >= month_start, UserReferralReward.points), else_=0)),
+        ).where(UserReferralReward.referrer_id.in_(user_ids)).group_by(UserReferralReward.referrer_id)
+    ).all()
+    for user_id, total, signup, purchase, this_month in reward_rows:
+        counts = result[user_id]
+        counts["referral_rewards_total"] = int(total or 0)
+        counts["referral_rewards_signup"] = int(signup or 0)
+        counts["referral_rewards_purchase"] = int(purchase or 0)
+        counts["referral_rewards_this_month"] = int(this_month or 0)
+
+    return result
+
+
+def _row_counts(row: UserCounters) -> Dict[str, int]:
+    """저장된 행 값 (지난 달 month_key면 이번 달 값은 0)"""
+    counts = {column: getattr(row, column) or 0 for column in COUNTER_COLUMNS}
+    current = row.month_key == _month_key()
+    for column in MONTHLY_COLUMNS:
+        counts[column] = (getattr(row, column) or 0) if current else 0
+    return counts
+
+
+class UserCounterService:
+    """사용자 대시보드 카운터 조회 / 증분 갱신 / 정합성 검사"""
+
+    @staticmethod
+    def get(db: Session, user_id: int) -> Dict[str, Any]:
+        """
+        사용자 카운터 조회 (user_id 기준 1건 + 포인트 잔액)
+
+        Args:
+            user_id: 사용자 ID
+            db: 데이터베이스 세션
+
+        Returns:
+            Dict: 카운터 값 + points
+        """
+        points = select(UserFortunePoint.points).where(
+            UserFortunePoint.user_id == user_id
+        ).limit(1).scalar_subquery()
+        query = db.query(UserCounters, points).filter(UserCounters.user_id == user_id)
+
+        found = query.first()
+        if found is not None:
+            row, balance = found
+            return {**_row_counts(row), "points": balance or 0}
+
+        # 카운터 행이 아직 없는 사용자 - 원본에서 계산 (저장은 첫 변경 flush / 복구 작업이 담당,
+        # 조회 요청의 세션은 커밋하지 않는다)
+        balance = db.execute(select(points)).scalar()
+        return {**_source_counts(db, [user_id])[user_id], "points": balance or 0}
+
+    @staticmethod
+    def apply_deltas(session: Session, deltas: Dict[int, Dict[str, Counter]]) -> None:
+        """
+        사용자별 증감분을 카운터 행에 원자적으로 반영 (col = col + delta)
+
+        카운터 행이 없는 사용자는 flush가 끝난 원본 테이블로 행을 새로 만든다.
+        그 사이 다른 트랜잭션이 먼저 행을 만들었으면 upsert로 증감분만 더한다.
+        """
+        table = UserCounters.__table__
+        now = datetime.now()
+        month_key = _month_key(now)
+
+        for user_id, delta in deltas.items():
+            values = [(column, table.c[column] + amount) for column, amount in delta.items() if column in COUNTER_COLUMNS]
+            for column in MONTHLY_COLUMNS:
+                values.append((column, case(
+                    (table.c.month_key == month_key, table.c[column]), else_=0
+                ) + delta.get(column, 0)))
+            # MySQL은 SET을 왼쪽부터 대입 - 이번 달 값 식이 이전 month_key를 보도록 month_key는 마지막에
+            values.append(("month_key", month_key))
+            values.append(("updated_at", now))
+
+            result = session.execute(
+                update(table).where(table.c.user_id == user_id).ordered_values(*values)
+            )
+            if result.rowcount == 0:
+                counts = _source_counts(session, [user_id])[user_id]
+                insert_or_update(
+                    session,
+                    table,
+                    {"user_id": user_id, "month_key": month_key, "updated_at": now, **counts},
+                    values,
+                    index_elements=["user_id"],
+                )
+
+    @staticmethod
+    def rebuild(db: Session, user_ids: Optional[Iterable[int]] = None, batch_size: int = 500) -> Dict[str, int]:
+        """
+        원본 테이블에서 카운터 재계산 (정합성 검사)
+
+        Args:
+            db: 데이터베이스 세션
+            user_ids: 대상 사용자 (None이면 전체 사용자를 id 순으로)
+            batch_size: 배치 크기 (배치마다 커밋)
+
+        Returns:
+            Dict: checked, repaired, created 건수
+        """
+        if user_ids is not None:
+            ids = sorted(set(user_ids))
+            batches = (ids[i:i + batch_size] for i in range(0, len(ids), batch_size))
+        else:
+            batches = UserCounterService._all_user_batches(db, batch_size)
+
+        checked = repaired = created = 0
+        month_key = _month_key()
+        for batch in batches:
+            actual = _source_counts(db, batch)
+            stored = {
+                row.user_id: row
+                for row in db.query(UserCounters).filter(UserCounters.user_id.in_(batch))
+            }
+            for user_id in batch:
+                counts = actual[user_id]
+                row = stored.get(user_id)
+                checked += 1
+
+                if row is None:
+                    db.add(UserCounters(user_id=user_id, month_key=month_key, **counts))
+                    created += 1
+                elif _row_counts(row) != counts:
+                    logger.warning(f"사용자 카운터 불일치 복구: user_id={user_id}, stored={_row_counts(row)}, actual={counts}")
+                    for column, value in counts.items():
+                        setattr(row, column, value)
+                    row.month_key = month_key
+                    repaired += 1
+            db.commit()
+
+        return {"checked": checked, "repaired": repaired, "created": created}
+
+    @staticmethod
+    def _all_user_batches(db: Session, batch_size: int):
+        last_id = 0
+        while True:
+            batch = [
+                user_id for (user_id,) in db.query(User.id).filter(User.id > last_id)
+                .order_by(User.id).limit(batch_size)
+            ]
+            if not batch:
+                return
+            yield batch
+            last_id = batch[-1]
+
+
+def _value(obj, key: str, committed: bool):
+    """속성 값 (committed=True면 flush 이전 값)"""
+    value = getattr(obj, key)
+    if committed:
+        history = attributes.get_history(obj, key)
+        if history.deleted:
+            value = history.deleted[0]
+    return value
+
+
+def _in_this_month(value: Optional[datetime]) -> bool:
+    # rebuild()의 집계와 같은 기준 (NULL은 이번 달 아님)
+    return value is not None and value >= _month_start()
+
+
+def _contributions(obj, committed: bool):
+    """객체가 카운터에 기여하는 (user_id, {컬럼: 값}) 목록"""
+    if isinstance(obj, UserPurchase):
+        return [(_value(obj, "user_id", committed), {"purchases_count": 1})]
+    if isinstance(obj, Order):
+        return [(_value(obj, "user_id", committed), {"orders_count": 1})]
+    if isinstance(obj, UserReview):
+        return [(_value(obj, "user_id", committed), {"reviews_count": 1})]
+    if isinstance(obj, UserReferralReward):
+        points = _value(obj, "points", committed) or 0
+        reward_type = _value(obj, "reward_type", committed)
+        counts = {"referral_rewards_total": points}
+        if reward_type in ("signup", "purchase"):
+            counts[f"referral_rewards_{reward_type}"] = points
+        if _in_this_month(_value(obj, "created_at", committed)):
+            counts["referral_rewards_this_month"] = points
+        return [(_value(obj, "referrer_id", committed), counts)]
+    if isinstance(obj, User):
+        referrer_id = _value(obj, "referred_by", committed)
+        if referrer_id is None:
+            return []
+        counts = {"referrals_count": 1}
+        if _in_this_month(_value(obj, "referral_signup_date", committed)):
+            counts["referrals_this_month"] = 1
+        return [(referrer_id, counts)]
+    return []
+
+
+TRACKED_MODELS = (UserPurchase, Order, UserReview, UserReferralReward, User)
+TRACKED_ATTRIBUTES = (
+    UserPurchase.user_id, Order.user_id, UserReview.user_id,
+    UserReferralReward.referrer_id, UserReferralReward.points,
+    UserReferralReward.reward_type, UserReferralReward.created_at,
+    User.referred_by, User.referral_signup_date,
+)
+
+
+def _load_previous_value(target, value, oldvalue, initiator):
+    """active_history용 리스너 (동작 없음)"""
+
+
+# 커밋 후 만료된 객체에 값을 대입해도 이전 값을 먼저 로드 (get_history로 감소분 계산)
+for _attribute in TRACKED_ATTRIBUTES:
+    event.listen(_attribute, "set", _load_previous_value, active_history=True)
+
+
+@event.listens_for(Session, "after_flush")
+def _update_user_counters(session, flush_context):
+    deltas: Dict[int, Counter] = defaultdict(Counter)
+
+    def add(obj, committed: bool, sign: int):
+        for user_id, counts in _contributions(obj, committed):
+            if user_id is None:
+                continue
+            for column, amount in counts.items():
+                deltas[user_id][column] += sign * amount
+
+    for obj in session.new:
+        if isinstance(obj, TRACKED_MODELS):
+            add(obj, committed=False, sign=1)
+    for obj in session.dirty:
+        if isinstance(obj, TRACKED_MODELS) and session.is_modified(obj):
+            add(obj, committed=True, sign=-1)
+            add(obj, committed=False, sign=1)
+    for obj in session.deleted:
+        if isinstance(obj, TRACKED_MODELS):
+            add(obj, committed=True, sign=-1)
+
+    changed = {}
+    for user_id, delta in deltas.items():
+        delta = Counter({column: amount for column, amount in delta.items() if amount})
+        if delta:
+            changed[user_id] = delta
+    if changed:
+        UserCounterService.apply_deltas(session, changed)
@@ -9,11 +9,13 @@ from app.celery_app import celery_app
 from sqlalchemy.orm import Session
 from app.database import SessionLocal
 from app.models import Order, SajuAnalysisCache, SajuUser
+from app.services.report_progress_service import publish_report_progress, report_event
 from app.routers.saju import (
     load_prompt,
     test_ollama_connection,
     calculate_four_pillars,
     analyze_four_pillars_to_string,
+    build_analysis_content,
     ai_sajupalja_with_ollama,
     ai_sajupalja_with_chatgpt,
     ai_sajupalja_with_chatgpt_sync
@@ -29,6 +31,7 @@ from email.mime.application import MIMEApplication
 
 # ✅ utils.py에서 리포트 생성 함수들 import
 from app.utils import generate_enhanced_report_html,generate_live_report_from_db
+from app.utils.report_files import write_report_file
 
 # 로거 설정
 logging.basicConfig(level=logging.INFO)
@@ -57,6 +60,17 @@ def html_to_pdf_production(html_content: str, output_path: str) -> bool:
         logger.error(f"❌ PDF 생성 실패: {e}")
         return False
     
+REPORT_STEPS = 6
+REPORT_MAX_RETRIES = 3
+
+
+def update_report_progress(task, order_id: int, current: int, status: str):
+    """Celery 상태 갱신 + 진행 이벤트 발행 (/order/events 구독자에게 전달)"""
+    meta = {'current': current, 'total': REPORT_STEPS, 'status': status}
+    task.update_state(state='progress', meta=meta)
+    publish_report_progress(order_id, report_event(order_id, 'progress', **meta))
+
+
 @celery_app.task(bind=True, name='app.tasks.generate_full_report')
 def generate_full_report(self, order_id: int, saju_key: str):
     """완전한 AI 리포트 생성 태스크 (개선된 버전)"""
@@ -72,12 +86,12 @@ def generate_full_report(self, order_id: int, saju_key: str):
         db.commit()
 
         # 진행 상황 업데이트
-        self.update_state(state='progress', meta={'current': 1, 'total': 6, 'status': '주문 정보 확인 중...'})
+        update_report_progress(self, order_id, 1, '주문 정보 확인 중...')
         
         # 프롬프트 로드
-        self.update_state(state='progress', meta={'current': 2, 'total': 6, 'status': 'AI 모델 준비 중...'})
+        update_report_progress(self, order_id, 2, 'AI 모델 준비 중...')
         
-        prompt = load_prompt()
+        prompt = load_prompt(saju_key)
         if not prompt:
             raise Exception('Prompt file missing')
         
@@ -85,7 +99,7 @@ def generate_full_report(self, order_id: int, saju_key: str):
             raise Exception('OpenAI API key not configured')
 
         # 사주 계산
-        self.update_state(state='progress', meta={'current': 3, 'total': 6, 'status': '사주 분석 중...'})
+        update_report_progress(self, order_id, 3, '사주 분석 중...')
         from app.services.saju_service import SajuService
         pillars, elem_dict_kr = SajuService.get_or_calculate_saju(saju_key, db)
 
@@ -109,25 +123,14 @@ def generate_full_report(self, order_id: int, saju_key: str):
         # birth_year, birth_month, birth_day = map(int, birthdate_str.split('-'))
 
         # pillars = calculate_four_pillars(datetime(birth_year, birth_month, birth_day, birth_hour))
-        elem_dict_kr, result_text = analyze_four_pillars_to_string(
-            pillars['year'][0], pillars['year'][1],
-            pillars['month'][0], pillars['month'][1], 
-            pillars['day'][0], pillars['day'][1],
-            pillars['hour'][0], pillars['hour'][1],
-        )
 
         # AI 분석 실행
-        self.update_state(state='progress', meta={'current': 4, 'total': 6, 'status': 'AI 심층 분석 중...'})
+        update_report_progress(self, order_id, 4, 'AI 심층 분석 중...')
 
-        combined_text = "\n".join([
-            "오행 분포:",
-            ", ".join([f"{k}:{v}" for k, v in elem_dict_kr.items()]),
-            "",
-            result_text,
-        ])
+        combined_text = build_analysis_content(pillars)
 
         # 기존 asyncio.run 코드를 동기 함수로 교체
-        analysis_result = ai_sajupalja_with_chatgpt_sync(prompt=prompt, content=combined_text)
+        analysis_result = ai_sajupalja_with_chatgpt_sync(prompt=prompt, content=combined_text, endpoint="generate_full_report")
 
         if not analysis_result:
             raise Exception('Failed to generate AI analysis')
@@ -147,7 +150,7 @@ def generate_full_report(self, order_id: int, saju_key: str):
         user_name = saju_user.name if saju_user and getattr(saju_user, "name", None) else "고객"
 
         # 🎯 HTML & PDF 생성 - 새로운 방식 사용
-        self.update_state(state='progress', meta={'current': 5, 'total': 6, 'status': '리포트 파일 생성 중...'})
+        update_report_progress(self, order_id, 5, '리포트 파일 생성 중...')
         
         # ✅ 이미 계산된 데이터를 활용하여 HTML 생성
         # birthdate_str 추출 (리포트 생성용)
@@ -178,13 +181,13 @@ def generate_full_report(self, order_id: int, saju_key: str):
         html_path = os.path.join(output_dir, f'report_order_{order_id}.html')
         pdf_path = os.path.join(output_dir, f'report_order_{order_id}.pdf')
         
-        # HTML 저장
-        with open(html_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        # HTML 저장 (+ gzip / brotli 사전 압축본)
+        write_report_file(html_path, html_content)
         logger.info(f"📄 HTML 저장 완료: {html_path}")
         
         # PDF 생성 (선택사항)
-        # pdf_success = html_to_pdf_production(html_content, pdf_path)
+        # PDF는 외부 URL을 못 읽으므로 차트를 본문에 포함한 버전으로 생성
+        # pdf_success = html_to_pdf_production(generate_live_report_from_db(order_id, db, inline_assets=True), pdf_path)
         # print(pdf_success)
         # 파일 경로 업데이트
         order.report_html = html_path
@@ -196,6 +199,7 @@ def generate_full_report(self, order_id: int, saju_key: str):
         db.commit()
 
         logger.info(f"🎉 리포트 생성 완료: order_id={order_id}")
+        publish_report_progress(order_id, report_event(order_id, 'completed'))
         return {
             'status': 'SUCCESS', 
             'order_id': order_id, 
@@ -206,13 +210,17 @@ def generate_full_report(self, order_id: int, saju_key: str):
     except Exception as e:
         logger.error(f"💥 리포트 생성 실패: {e}")
         
-        # 🎯 실패 시 상태 업데이트
-        if 'order' in locals():
+        will_retry = self.request.retries < REPORT_MAX_RETRIES
+        db.rollback()
+
+        # 🎯 최종 실패일 때만 상태 업데이트 - 재시도가 남았으면 generating 유지
+        # (failed는 SSE 상태 보정 / 재접속 초기 상태에서 종료로 처리됨)
+        if not will_retry and locals().get('order') is not None:
             order.report_status = "failed"
             db.commit()
-        
-        db.rollback()
-        raise self.retry(countdown=60, max_retries=3, exc=e)
+
+        publish_report_progress(order_id, report_event(order_id, 'failed', will_retry=will_retry))
+        raise self.retry(countdown=60, max_retries=REPORT_MAX_RETRIES, exc=e)
     finally:
         db.close()
 
@@ -259,4 +267,116 @@ def send_email_improved(to_email: str, subject: str, body: str, attachments=None
         
     except Exception as e:
         logger.error(f"❌ 이메일 발송 실패: {e}")
-        return False
\ No newline at end of file
+        return False
+
+@celery_app.task(bind=True, name='app.tasks.expire_fortune_points')
+def expire_fortune_points(self, batch_size: int = 1000):
+    """만료일이 지난 포인트 lot 만료 처리 (beat 스케줄)"""
+    from app.services.fortune_service import FortuneService
+
+    db = SessionLocal()
+    try:
+        result = FortuneService(db).expire_points(batch_size=batch_size)
+        logger.info(
+            f"⏰ 포인트 만료 스윕: lots={result['lots']}, users={result['users']}, "
+            f"points={result['points']}, {result['lots_per_sec']} lots/s"
+        )
+        return result
+    finally:
+        db.close()
+
+@celery_app.task(bind=True, name='app.tasks.rebuild_review_stats')
+def rebuild_review_stats(self, product_ids=None):
+    """상품 리뷰 통계 요약 테이블 복구 (beat 스케줄)"""
+    from app.services.review_stats_service import ReviewStatsService
+
+    db = SessionLocal()
+    try:
+        result = ReviewStatsService.rebuild(db, product_ids=product_ids)
+        logger.info(
+            f"⭐ 리뷰 통계 복구: checked={result['checked']}, "
+            f"repaired={result['repaired']}, created={result['created']}"
+        )
+        return result
+    finally:
+        db.close()
+
+@celery_app.task(bind=True, name='app.tasks.rebuild_user_counters')
+def rebuild_user_counters(self, user_ids=None):
+    """사용자 대시보드 카운터 정합성 검사 / 복구 (beat 스케줄)"""
+    from app.services.user_counter_service import UserCounterService
+
+    db = SessionLocal()
+    try:
+        result = UserCounterService.rebuild(db, user_ids=user_ids)
+        logger.info(
+            f"🔢 사용자 카운터 검사: checked={result['checked']}, "
+            f"repaired={result['repaired']}, created={result['created']}"
+        )
+        return result
+    finally:
+        db.close()
+
+@celery_app.task(bind=True, name='app.tasks.start_subscription_billing')
+def start_subscription_billing(self, billing_date: str = None):
+    """정기결제 실행 시작 / 재개 - 끝나지 않은 청크를 워커들에 분배 (beat 스케줄)"""
+    from datetime import date
+    from app.services.billing_service import BillingRunService
+
+    db = SessionLocal()
+    try:
+        billing = BillingRunService(db)
+        # 이전에 중단된 실행부터 재개
+        runs = billing.incomplete_runs()
+        today_run = billing.start_run(date.fromisoformat(billing_date) if billing_date else None)
+        if today_run.id not in {run.id for run in runs}:
+            runs.append(today_run)
+
+        dispatched = 0
+        for run in runs:
+            if run.status == "planning":
+                billing.start_run(run.billing_date)
+            for chunk_id in billing.pending_chunk_ids(run.id):
+                bill_subscription_chunk.delay(chunk_id)
+                dispatched += 1
+
+        logger.info(f"💳 정기결제 청크 분배: runs={[run.id for run in runs]}, chunks={dispatched}")
+        return {"runs": [run.id for run in runs], "dispatched": dispatched}
+    finally:
+        db.close()
+
+@celery_app.task(bind=True, name='app.tasks.bill_subscription_chunk', max_retries=3)
+def bill_subscription_chunk(self, chunk_id: int):
+    """정기결제 청크 처리 (청크 단위 커밋, 실패 시 재시도)"""
+    from app.services.billing_service import BillingRunService
+
+    db = SessionLocal()
+    try:
+        return BillingRunService(db).process_chunk(chunk_id)
+    except Exception as e:
+        raise self.retry(exc=e, countdown=60 * (self.request.retries + 1))
+    finally:
+        db.close()
+
+@celery_app.task(bind=True, name='app.tasks.purge_idempotency_keys')
+def purge_idempotency_keys(self):
+    """만료된 결제 멱등성 키 정리 (beat 스케줄)"""
+    from app.services.idempotency_service import idempotency_store
+
+    deleted = idempotency_store.purge_expired()
+    logger.info(f"🧹 만료된 멱등성 키 정리: {deleted}건")
+    return deleted
+
+@celery_app.task(bind=True, name='app.tasks.aggregate_llm_usage')
+def aggregate_llm_usage(self, hours: int = 2):
+    """LLM 사용량 시간별 집계 + 보존 기간 지난 원본 정리 (beat 스케줄)"""
+    from app.services.llm_usage_service import LLMUsageService
+
+    db = SessionLocal()
+    try:
+        updated = LLMUsageService.aggregate(db, hours=hours)
+        purged = LLMUsageService.purge(db)
+        logger.info(f"📊 LLM 사용량 집계: buckets={updated}, purged={purged}")
+        return {"buckets": updated, "purged": purged}
+    finally:
+        db.close()
@@ -1,9 +1,10 @@
-from passlib.context import CryptContext
 from fastapi import Depends, Request, UploadFile
 from app.exceptions import UnauthorizedError, PermissionDeniedError
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models import User
+from app.services.user_cache_service import UserCacheService
+from app.utils.passwords import pwd_context, hash_password, verify_password
 import os
 import uuid
 import re
@@ -27,13 +28,15 @@ from app.report_utils import (
     generate_action_checklist,
     create_executive_summary,
     generate_fortune_summary,
-    enhanced_radar_chart_base64
+    enhanced_radar_chart_base64,
+    enhanced_radar_chart_url,
+    REPORT_CHART_RENDERER,
 )
+from app.report_svg import radar_chart_svg
 
 
 logger = logging.getLogger(__name__)
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 def hex_to_rgb(hex_code: str):
@@ -45,18 +48,12 @@ def contrast_text(hex_code: str) -> str:
     yiq = (r * 299 + g * 587 + b * 114) / 1000
     return "#ffffff" if yiq < 128 else "#000000"
 
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
-
 def get_current_user(request: Request, db: Session = Depends(get_db)) -> User:
     user_id = request.session.get('user_id')
     if not user_id:
         raise UnauthorizedError("로그인이 필요합니다.")
     
-    user = db.query(User).filter(User.id == user_id).first()
+    user = UserCacheService.load(db, user_id)
     if not user:
         raise UnauthorizedError("유효하지 않은 사용자입니다.")
     
@@ -115,17 +112,100 @@ def resize_image(image_path: str, max_width: int = 800):
     except Exception:
         pass
 
-def generate_enhanced_report_html(user_name, pillars, analysis_result, elem_dict_kr, birthdate_str=None):
-    """향상된 HTML 리포트 생성 (개선된 행운키워드 포함)"""
+def format_ai_analysis(text: str) -> str:
+    """
+    GPT‑4o가 줄바꿈을 제대로 넣지 못해 하나의 문장으로 붙여­나오는 문제를
+    완전히 해결한다.
+
+    1) ### 헤딩 앞뒤 줄바꿈 강제 ‑ 선행 공백 제거
+    2) '### n. 제목:' → '### n. 제목' + 본문 분리
+    3) 문단 내부 한국어 마침표 뒤에 <br> 삽입 (가독성↑)
+    4) **A. …** 패턴을 #### 서브헤딩으로 변환
+    5) 마크다운→HTML 변환 후, 기존 스타일 인라인 유지
+    """
+    if not text:
+        return ""
+
+    # 줄바꿈 종류 통일
+    text = text.replace("\r\n", "\n").replace("\r", "\n").strip()
+
+    # ① 헤딩 앞 공백 제거 + 두 줄바꿈 보장
+    #    ' … ### 2.' → '\n\n### 2.'
+    text = re.sub(r'\s*###\s*', r'\n\n### ', text)
+
+    # ② '### 1. 제목: 본문…' → '### 1. 제목\n\n본문…'
+    text = re.sub(
+        r'^(###\s*\d+\.\s*[^:\n]+):\s*',
+        r'\1\n\n',
+        text,
+        flags=re.MULTILINE
+    )
+
+    # ③ **A. 소제목** → #### A. 소제목
+    text = re.sub(r'\*\*([A-F])\.\s*([^*]+?)\*\*', r'#### \1. \2', text)
+
+    # ④ 가독성용 줄바꿈: 마침표 뒤 한글/영대문자 시작이면 <br>용 두 스페이스 + \n
+    text = re.sub(r'(?<!\d)\.\s+(?=[가-힣A-Z])', '.  \n', text)
+
+    # ⑤ 과잉 빈줄 정리(3줄→2줄)
+    text = re.sub(r'\n{3,}', '\n\n', text)
+
+    # ⑥ 마크다운 → HTML
+    html = markdown(
+        text,
+        extensions=[
+            "markdown.extensions.extra",
+            "markdown.extensions.nl2br",
+            "markdown.extensions.sane_lists",
+        ],
+    )
+
+    # ⑦ HTML 엔티티 디코드
+    html = html_module.unescape(html)
+
+    # ⑧ 스타일 주입
+    html = html.replace(
+        "<h3>",
+        '<h3 style="color: #7C3AED; margin-top: 2rem; margin-bottom: 1rem; font-size: 1.25rem; font-weight: 600;">',
+    )
+    html = html.replace(
+        "<h4>",
+        '<h4 style="color: #5B21B6; margin-top: 1.5rem; margin-bottom: 1rem; font-size: 1.1rem; font-weight: 600;">',
+    )
+    html = html.replace(
+        "<p>",
+        '<p style="margin-bottom: 1rem; line-height: 1.6;">',
+    )
+
+    return html
+
+
+def generate_enhanced_report_html(user_name, pillars, analysis_result, elem_dict_kr, birthdate_str=None,
+                                  inline_assets=False, chart_renderer=None):
+    """
+    향상된 HTML 리포트 생성 (개선된 행운키워드 포함)
+
+    chart_renderer가 svg(기본값 REPORT_CHART_RENDERER)면 차트를 SVG 마크업으로 본문에 넣는다
+    (에셋 파일 없음, PDF에서도 벡터). png면 matplotlib 이미지를 쓰며,
+    inline_assets=False(웹 리포트)면 /static/report-assets 에셋 URL로 참조하고,
+    True(이메일 - SVG 미지원 메일 클라이언트)면 data URI로 본문에 포함한다.
+    """
     try:
         # 1. 임원급 요약 정보
         executive_summary = create_executive_summary(user_name, birthdate_str or "1984-06-01", pillars, elem_dict_kr)
         
         # 2. 향상된 레이더 차트 (설명 포함)
-        radar_base64 = enhanced_radar_chart_base64(elem_dict_kr)
+        use_svg = (chart_renderer or REPORT_CHART_RENDERER) == "svg"
+        radar_svg = radar_chart_src = None
+        if use_svg:
+            radar_svg = radar_chart_svg(elem_dict_kr)
+        elif inline_assets:
+            radar_chart_src = enhanced_radar_chart_base64(elem_dict_kr)
+        else:
+            radar_chart_src = enhanced_radar_chart_url(elem_dict_kr)
         
         # 3. 오행 기반 월별 운세 달력
-        calendar_html = generate_2025_fortune_calendar(elem_dict_kr)
+        calendar_html = generate_2025_fortune_calendar(elem_dict_kr, as_svg=use_svg)
         
         # 4. 🆕 개선된 개인화 행운 키워드 (일관성 보장 + 설명 포함)
         birth_month = int(birthdate_str.split('-')[1]) if birthdate_str else 6
@@ -150,76 +230,6 @@ def generate_enhanced_report_html(user_name, pillars, analysis_result, elem_dict
         fortune_summary = generate_fortune_summary(elem_dict_kr)
         
         # 7. AI 심층 분석 결과를 HTML로 변환 (개선된 버전)
-        def format_ai_analysis(text: str) -> str:
-            """
-            GPT‑4o가 줄바꿈을 제대로 넣지 못해 하나의 문장으로 붙여­나오는 문제를
-            완전히 해결한다.
-
-            1) ### 헤딩 앞뒤 줄바꿈 강제 ‑ 선행 공백 제거
-            2) '### n. 제목:' → '### n. 제목' + 본문 분리
-            3) 문단 내부 한국어 마침표 뒤에 <br> 삽입 (가독성↑)
-            4) **A. …** 패턴을 #### 서브헤딩으로 변환
-            5) 마크다운→HTML 변환 후, 기존 스타일 인라인 유지
-            """
-            if not text:
-                return ""
-
-            import re, html as html_module
-            from markdown import markdown
-
-            # 줄바꿈 종류 통일
-            text = text.replace("\r\n", "\n").replace("\r", "\n").strip()
-
-            # ① 헤딩 앞 공백 제거 + 두 줄바꿈 보장
-            #    ' … ### 2.' → '\n\n### 2.'
-            text = re.sub(r'\s*###\s*', r'\n\n### ', text)
-
-            # ② '### 1. 제목: 본문…' → '### 1. 제목\n\n본문…'
-            text = re.sub(
-                r'^(###\s*\d+\.\s*[^:\n]+):\s*',
-                r'\1\n\n',
-                text,
-                flags=re.MULTILINE
-            )
-
-            # ③ **A. 소제목** → #### A. 소제목
-            text = re.sub(r'\*\*([A-F])\.\s*([^*]+?)\*\*', r'#### \1. \2', text)
-
-            # ④ 가독성용 줄바꿈: 마침표 뒤 한글/영대문자 시작이면 <br>용 두 스페이스 + \n
-            text = re.sub(r'(?<!\d)\.\s+(?=[가-힣A-Z])', '.  \n', text)
-
-            # ⑤ 과잉 빈줄 정리(3줄→2줄)
-            text = re.sub(r'\n{3,}', '\n\n', text)
-
-            # ⑥ 마크다운 → HTML
-            html = markdown(
-                text,
-                extensions=[
-                    "markdown.extensions.extra",
-                    "markdown.extensions.nl2br",
-                    "markdown.extensions.sane_lists",
-                ],
-            )
-
-            # ⑦ HTML 엔티티 디코드
-            html = html_module.unescape(html)
-
-            # ⑧ 스타일 주입
-            html = html.replace(
-                "<h3>",
-                '<h3 style="color: #7C3AED; margin-top: 2rem; margin-bottom: 1rem; font-size: 1.25rem; font-weight: 600;">',
-            )
-            html = html.replace(
-                "<h4>",
-                '<h4 style="color: #5B21B6; margin-top: 1.5rem; margin-bottom: 1rem; font-size: 1.1rem; font-weight: 600;">',
-            )
-            html = html.replace(
-                "<p>",
-                '<p style="margin-bottom: 1rem; line-height: 1.6;">',
-            )
-
-            return html
-
         analysis_result_html = format_ai_analysis(analysis_result)
 
         # Jinja2 환경 설정
@@ -244,7 +254,8 @@ def generate_enhanced_report_html(user_name, pillars, analysis_result, elem_dict
             user_name=user_name,
             pillars=pillars,
             executive_summary=executive_summary,
-            radar_base64=radar_base64,
+            radar_svg=radar_svg,
+            radar_chart_src=radar_chart_src,
             calendar_html=calendar_html,
             keyword_html=keyword_html,  # 개선된 키워드 HTML (설명 포함)
             checklist=checklist,
@@ -271,10 +282,12 @@ def generate_enhanced_report_html(user_name, pillars, analysis_result, elem_dict
         </div>
         """
 
-def generate_live_report_from_db(order_id: int, db: Session) -> str:
+def generate_live_report_from_db(order_id: int, db: Session, inline_assets: bool = False,
+                                 chart_renderer: str = None) -> str:
     """
     DB에서 직접 데이터를 조회해서 실시간 HTML 리포트 생성
     tasks.py와 order.py에서 공통으로 사용할 수 있는 함수
+    (inline_assets / chart_renderer: generate_enhanced_report_html 참고)
     """
     try:
         # 1. Order 조회
@@ -308,7 +321,9 @@ def generate_live_report_from_db(order_id: int, db: Session) -> str:
             pillars=pillars,
             analysis_result=cache.analysis_full,
             elem_dict_kr=elem_dict_kr,
-            birthdate_str=birthdate_str
+            birthdate_str=birthdate_str,
+            inline_assets=inline_assets,
+            chart_renderer=chart_renderer
         )
 
         return html_content
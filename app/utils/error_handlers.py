@@ -25,14 +25,16 @@ def prefers_json(request: Request) -> bool:
 def register_exception_handlers(app: FastAPI) -> None:
     @app.exception_handler(StarletteHTTPException)
     async def http_exception_handler(request: Request, exc: StarletteHTTPException):
+        headers = getattr(exc, "headers", None)  # Retry-After 등 유지
         if prefers_json(request):
-            return JSONResponse({"detail": exc.detail}, status_code=exc.status_code)
+            return JSONResponse({"detail": exc.detail}, status_code=exc.status_code, headers=headers)
         if exc.status_code == HTTP_404_NOT_FOUND:
             return templates.TemplateResponse("errors/404.html", {"request": request}, status_code=404)
         return templates.TemplateResponse(
             "errors/error.html",
             {"request": request, "code": exc.status_code},
             status_code=exc.status_code,
+            headers=headers,
         )
 
     @app.exception_handler(Exception)
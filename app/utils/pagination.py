@@ -0,0 +1,135 @@
+"""
+키셋(커서) 페이지네이션 유틸리티
+- (정렬 컬럼, id) 기준 커서로 OFFSET 없이 다음 페이지 조회
+- 커서는 응답에 불투명 문자열로 전달 (base64 JSON)
+- 전체 개수는 캐시된 근사치 사용 (페이지마다 COUNT(*) 방지)
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, asc, desc, or_
+
+from app.services.cache_service import CacheService
+from app.utils.error_handlers import ValidationError
+
+# 캐시된 전체 개수 유효 시간 (초)
+COUNT_CACHE_TTL = 300
+
+
+def encode_cursor(sort_value: Any, row_id: int) -> str:
+    """정렬 값 + id를 불투명 커서로 인코딩"""
+    if isinstance(sort_value, datetime):
+        value = {"t": "dt", "v": sort_value.isoformat()}
+    else:
+        value = {"t": "raw", "v": sort_value}
+    payload = json.dumps([value, row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, int]:
+    """
+    커서 디코딩
+
+    Args:
+        cursor: encode_cursor로 만든 문자열
+
+    Returns:
+        (정렬 값, id)
+
+    Raises:
+        ValidationError: 형식이 잘못된 커서
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        sort_value = datetime.fromisoformat(value["v"]) if value["t"] == "dt" else value["v"]
+        return sort_value, int(row_id)
+    except Exception:
+        raise ValidationError("유효하지 않은 페이지 커서입니다.")
+
+
+def keyset_page(
+    query,
+    sort_column,
+    id_column,
+    per_page: int,
+    cursor: Optional[str] = None,
+    descending: bool = True,
+    offset: int = 0,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    (sort_column, id) 키셋 조건으로 한 페이지 조회
+
+    커서가 없으면 offset부터 (1페이지는 offset=0, 번호로 바로 이동한 경우만 OFFSET 사용).
+
+    Args:
+        query: 필터가 적용된 ORM Query
+        sort_column: 정렬 컬럼 (created_at 등)
+        id_column: 동률 해소용 PK 컬럼
+        per_page: 페이지 크기
+        cursor: 이전 응답의 next_cursor
+        descending: 내림차순 여부
+        offset: 커서가 없을 때의 OFFSET
+
+    Returns:
+        (행 목록, 다음 페이지 커서 또는 None)
+    """
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor)
+        if descending:
+            condition = or_(sort_column < sort_value, and_(sort_column == sort_value, id_column < row_id))
+        else:
+            condition = or_(sort_column > sort_value, and_(sort_column == sort_value, id_column > row_id))
+        query = query.filter(condition)
+    elif offset:
+        query = query.offset(offset)
+
+    order = desc if descending else asc
+    rows = query.order_by(order(sort_column), order(id_column)).limit(per_page + 1).all()
+
+    next_cursor = None
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
+    return rows, next_cursor
+
+
+def cached_count(cache_key: str, count: Callable[[], int], ttl: int = COUNT_CACHE_TTL) -> int:
+    """
+    전체 개수 근사치 - ttl 동안 캐시된 COUNT 결과 재사용
+
+    Args:
+        cache_key: 필터 조합별 캐시 키
+        count: 캐시 미스 시 실행할 COUNT 함수
+
+    Returns:
+        int: 전체 개수 (최대 ttl 초 지난 값일 수 있음)
+    """
+    total = CacheService.get(cache_key)
+    if total is None:
+        total = count()
+        CacheService.set(cache_key, total, ttl)
+    return total
+
+
+def pagination_info(
+    page: int,
+    per_page: int,
+    total: int,
+    next_cursor: Optional[str],
+    approximate: bool = True,
+) -> Dict[str, Any]:
+    """기존 pagination dict + 커서 정보"""
+    return {
+        "page": page,
+        "per_page": per_page,
+        "total": total,
+        "total_is_approximate": approximate,
+        "pages": (total + per_page - 1) // per_page,
+        "has_next": next_cursor is not None,
+        "next_cursor": next_cursor,
+    }
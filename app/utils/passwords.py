@@ -0,0 +1,159 @@
+"""
+비밀번호 해시 유틸리티
+- bcrypt 연산을 전용 스레드 풀에서 실행해 이벤트 루프 블로킹 방지
+- 대기열 상한 / 대기열 지표 제공
+- BCRYPT_ROUNDS 변경 시 로그인 과정에서 투명하게 재해시
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+logger = logging.getLogger(__name__)
+
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+# bcrypt는 GIL을 해제하므로 스레드 풀로 코어 수만큼 병렬 처리 가능
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", min(4, os.cpu_count() or 1)))
+# 실행 중 + 대기 중 작업 상한 - 초과 시 503 (로그인 폭주가 워커를 잠식하지 않도록)
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", 64))
+
+# min/max를 같은 값으로 두면 다른 cost로 만든 해시는 needs_update 대상이 된다
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS,
+)
+
+
+class PasswordHasherBusy(HTTPException):
+    def __init__(self, detail: str = "요청이 많아 잠시 후 다시 시도해주세요."):
+        super().__init__(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=detail)
+
+
+class PasswordHasher:
+    """bcrypt 전용 bounded executor"""
+
+    def __init__(self, workers: int = PASSWORD_HASH_WORKERS, max_pending: int = PASSWORD_HASH_MAX_PENDING):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.active = 0
+        self.completed = 0
+        self.rejected = 0
+        self.queue_wait_total = 0.0
+        self.queue_wait_max = 0.0
+        self.run_time_total = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    async def run(self, func, *args):
+        """
+        bcrypt 연산을 풀에서 실행
+
+        Args:
+            func: pwd_context 메서드
+            *args: 인자
+
+        Returns:
+            func 결과
+
+        Raises:
+            PasswordHasherBusy: 대기열이 가득 찬 경우
+        """
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                logger.warning(f"비밀번호 해시 대기열 초과: pending={self.pending}")
+                raise PasswordHasherBusy()
+            self.pending += 1
+
+        submitted = time.perf_counter()
+
+        def task():
+            started = time.perf_counter()
+            with self._lock:
+                self.active += 1
+                wait = started - submitted
+                self.queue_wait_total += wait
+                self.queue_wait_max = max(self.queue_wait_max, wait)
+            try:
+                return func(*args)
+            finally:
+                with self._lock:
+                    self.active -= 1
+                    self.run_time_total += time.perf_counter() - started
+
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._get_executor(), task)
+        finally:
+            with self._lock:
+                self.pending -= 1
+                self.completed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """대기열 지표"""
+        with self._lock:
+            done = self.completed or 1
+            return {
+                "workers": self.workers,
+                "rounds": BCRYPT_ROUNDS,
+                "max_pending": self.max_pending,
+                "pending": self.pending,
+                "queued": self.pending - self.active,
+                "active": self.active,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "queue_wait_avg_ms": round(self.queue_wait_total * 1000 / done, 2),
+                "queue_wait_max_ms": round(self.queue_wait_max * 1000, 2),
+                "run_time_avg_ms": round(self.run_time_total * 1000 / done, 2),
+            }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+password_hasher = PasswordHasher()
+
+
+def hash_password(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+async def hash_password_async(password: str) -> str:
+    """비밀번호 해시 (전용 풀에서 실행)"""
+    return await password_hasher.run(pwd_context.hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    비밀번호 검증 + 필요 시 재해시 (전용 풀에서 실행)
+
+    Args:
+        plain_password: 입력 비밀번호
+        hashed_password: 저장된 해시
+
+    Returns:
+        (검증 성공 여부, 현재 cost로 다시 만든 해시 또는 None)
+    """
+    return await password_hasher.run(pwd_context.verify_and_update, plain_password, hashed_password)
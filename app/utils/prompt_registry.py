@@ -0,0 +1,201 @@
+"""
+프롬프트 레지스트리
+- 이름별 버전 프롬프트 파일을 한 번 읽어 메모리에 보관 (요청마다 파일을 열지 않음)
+- PROMPT_RELOAD_INTERVAL초마다 mtime 확인 - 수정 / 추가 / 삭제된 파일만 다시 읽음 (재시작 없이 반영)
+- 버전별 내용 해시 노출 - LLM 캐시 키 / 로그 / 통계에서 어떤 프롬프트가 쓰였는지 구분
+- A/B 선택: 가중치에 따라 버전 배정, sticky 키(saju_key)가 같으면 항상 같은 버전
+"""
+
+import glob
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+PROMPT_DIR = os.getenv("PROMPT_DIR") or PROJECT_ROOT
+PROMPT_RELOAD_INTERVAL = float(os.getenv("PROMPT_RELOAD_INTERVAL", 5))
+
+
+@dataclass(frozen=True)
+class Prompt:
+    name: str
+    version: str
+    text: str
+    hash: str  # 내용 sha256 앞 12자리
+    path: str
+
+
+def _version_key(version: str) -> Tuple:
+    """v3 < v5 < v13 (숫자는 숫자로 비교)"""
+    return tuple(int(part) if part.isdigit() else part for part in re.split(r"(\d+)", version))
+
+
+def parse_weights(spec: str) -> Dict[str, float]:
+    """'v3:50,v5:50' → {'v3': 50.0, 'v5': 50.0} (잘못된 항목은 무시)"""
+    weights: Dict[str, float] = {}
+    for part in (spec or "").split(","):
+        version, _, weight = part.strip().partition(":")
+        try:
+            if version and float(weight or 1) > 0:
+                weights[version] = float(weight or 1)
+        except ValueError:
+            logger.warning(f"프롬프트 A/B 가중치 무시: {part}")
+    return weights
+
+
+class PromptRegistry:
+    """이름별 버전 프롬프트 보관 / 변경 감지 / 버전 선택"""
+
+    def __init__(self, base_dir: str = PROMPT_DIR, reload_interval: float = PROMPT_RELOAD_INTERVAL):
+        self.base_dir = base_dir
+        self.reload_interval = reload_interval
+        self._patterns: Dict[str, str] = {}
+        self._pinned: Dict[str, Optional[str]] = {}
+        self._weights: Dict[str, Dict[str, float]] = {}
+        self._prompts: Dict[str, Dict[str, Prompt]] = {}
+        self._mtimes: Dict[str, float] = {}
+        self._checked_at: Dict[str, float] = {}
+        self._selections: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, pattern: str, version: Optional[str] = None, ab_weights: str = "") -> None:
+        """
+        프롬프트 등록
+
+        Args:
+            name: 프롬프트 이름
+            pattern: 파일명 패턴 ({version} 자리에 버전, base_dir 기준) 예: improved_saju_prompt_{version}.md
+            version: 고정 버전 (없으면 가장 높은 버전)
+            ab_weights: A/B 가중치 'v3:90,v5:10' (지정 시 version보다 우선)
+        """
+        with self._lock:
+            self._patterns[name] = pattern
+            self._pinned[name] = version or None
+            self._weights[name] = parse_weights(ab_weights)
+            self._prompts[name] = {}
+            self._checked_at[name] = 0.0
+
+    def _refresh(self, name: str) -> None:
+        """주기가 지났으면 파일 목록 / mtime 확인 후 바뀐 파일만 다시 읽기 (lock 안에서 호출)"""
+        now = time.monotonic()
+        if self._checked_at[name] and now - self._checked_at[name] < self.reload_interval:
+            return
+        self._checked_at[name] = now
+
+        pattern = self._patterns[name]
+        prefix, _, suffix = pattern.partition("{version}")
+        found: Dict[str, str] = {}
+        for path in glob.glob(os.path.join(self.base_dir, glob.escape(prefix) + "*" + glob.escape(suffix))):
+            filename = os.path.basename(path)
+            version = filename[len(os.path.basename(prefix)):len(filename) - len(suffix) or None]
+            if version:
+                found[version] = path
+
+        prompts = self._prompts[name]
+        for version in list(prompts):
+            if version not in found:
+                logger.info(f"프롬프트 제거됨: {name}/{version}")
+                self._mtimes.pop(prompts.pop(version).path, None)
+
+        for version, path in found.items():
+            try:
+                mtime = os.stat(path).st_mtime
+                if version in prompts and self._mtimes.get(path) == mtime:
+                    continue
+                with open(path, "r", encoding="utf-8") as f:
+                    text = f.read()
+            except OSError as e:
+                logger.error(f"프롬프트 읽기 실패: path={path}, error={e}")
+                continue
+            prompt = Prompt(name, version, text, hashlib.sha256(text.encode("utf-8")).hexdigest()[:12], path)
+            if version in prompts:
+                logger.info(f"프롬프트 변경 반영: {name}/{version} {prompts[version].hash} → {prompt.hash}")
+            prompts[version] = prompt
+            self._mtimes[path] = mtime
+
+        pinned = self._pinned[name]
+        if pinned and pinned not in prompts:
+            logger.warning(f"고정 프롬프트 버전 없음, 최신 버전 사용: {name}/{pinned}")
+
+    def _active_versions(self, name: str) -> List[Tuple[str, float]]:
+        prompts = self._prompts[name]
+        weighted = [(v, w) for v, w in self._weights[name].items() if v in prompts]
+        if weighted:
+            return weighted
+        pinned = self._pinned[name]
+        if pinned in prompts:
+            return [(pinned, 1.0)]
+        latest = max(prompts, key=_version_key, default=None)
+        return [(latest, 1.0)] if latest else []
+
+    def get(self, name: str, version: Optional[str] = None, sticky_key: Optional[str] = None) -> Optional[Prompt]:
+        """
+        프롬프트 조회
+
+        Args:
+            name: 프롬프트 이름
+            version: 특정 버전 (없으면 A/B 가중치 / 고정 버전 / 최신 순으로 선택)
+            sticky_key: A/B 배정 키 (같은 키는 같은 버전, 없으면 무작위)
+
+        Returns:
+            Optional[Prompt]: 등록되지 않았거나 파일이 없으면 None
+        """
+        with self._lock:
+            if name not in self._patterns:
+                return None
+            self._refresh(name)
+            if version:
+                return self._prompts[name].get(version)
+
+            candidates = self._active_versions(name)
+            if not candidates:
+                return None
+            chosen = candidates[0][0]
+            if len(candidates) > 1:
+                seed = sticky_key if sticky_key is not None else os.urandom(8).hex()
+                point = int(hashlib.md5(f"{name}:{seed}".encode("utf-8")).hexdigest()[:8], 16) / 0xFFFFFFFF
+                total = sum(weight for _, weight in candidates)
+                cumulative = 0.0
+                for candidate, weight in candidates:
+                    cumulative += weight / total
+                    chosen = candidate
+                    if point <= cumulative:
+                        break
+            self._selections[(name, chosen)] = self._selections.get((name, chosen), 0) + 1
+            return self._prompts[name][chosen]
+
+    def stats(self) -> Dict[str, Dict]:
+        """이름별 버전 / 해시 / 활성 가중치 / 프로세스 기동 이후 선택 횟수"""
+        with self._lock:
+            result = {}
+            for name in self._patterns:
+                self._refresh(name)
+                active = dict(self._active_versions(name))
+                result[name] = {
+                    "versions": {
+                        version: {
+                            "hash": prompt.hash,
+                            "active_weight": active.get(version, 0),
+                            "selected": self._selections.get((name, version), 0),
+                        }
+                        for version, prompt in sorted(self._prompts[name].items(), key=lambda item: _version_key(item[0]))
+                    },
+                }
+            return result
+
+
+prompt_registry = PromptRegistry()
+# 리포트 / 심층 분석용 사주 해석 프롬프트 (improved_saju_prompt_v3.md → 버전 "v3")
+prompt_registry.register(
+    "saju_full",
+    "improved_saju_prompt_{version}.md",
+    version=os.getenv("SAJU_PROMPT_VERSION"),
+    ab_weights=os.getenv("SAJU_PROMPT_AB", ""),
+)
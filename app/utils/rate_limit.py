@@ -0,0 +1,265 @@
+"""
+토큰 버킷 Rate Limiter
+- Redis Lua 스크립트로 원자적 판정 (여러 워커 / 서버가 같은 버킷 공유)
+- Redis가 없거나 오류면 프로세스 내 버킷으로 대체
+- FastAPI 의존성: 사용자 / IP / 라우트 단위 키, 초과 시 429 + Retry-After
+- 판정 지연 / 거부 건수 지표
+"""
+
+import asyncio
+import functools
+import inspect
+import logging
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import Request, Response
+
+from app.exceptions import TooManyRequestsError
+from app.services.cache_service import REDIS_AVAILABLE, redis_client
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+# 프록시 뒤에서만 true - X-Forwarded-For 첫 주소를 클라이언트 IP로 사용
+RATE_LIMIT_TRUST_PROXY = os.getenv("RATE_LIMIT_TRUST_PROXY", "false").lower() == "true"
+
+# KEYS[1]=버킷 키, ARGV: capacity, 초당 충전량, 비용
+# 반환: {허용 여부, 남은 토큰(정수), 재시도까지 ms}
+_TOKEN_BUCKET_LUA = """
+redis.replicate_commands()  -- TIME 이후 쓰기 허용 (Redis 5 미만)
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) * 1000 + math.floor(tonumber(now_parts[2]) / 1000)
+
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1])
+local ts = tonumber(bucket[2])
+if tokens == nil then
+    tokens = capacity
+    ts = now
+end
+
+tokens = math.min(capacity, tokens + (math.max(0, now - ts) / 1000) * rate)
+local allowed = 0
+local retry_after = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    retry_after = math.ceil((cost - tokens) / rate * 1000)
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000) + 1000)
+return {allowed, math.floor(tokens), retry_after}
+"""
+
+
+@dataclass
+class Decision:
+    allowed: bool
+    remaining: int
+    retry_after: float  # 초
+
+
+class _LocalBuckets:
+    """프로세스 내 토큰 버킷 (Redis 대체)"""
+
+    def __init__(self, max_keys: int = 100000):
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+        self.max_keys = max_keys
+
+    def take(self, key: str, capacity: int, rate: float, cost: int) -> Decision:
+        now = time.monotonic()
+        with self._lock:
+            tokens, ts = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - ts) * rate)
+            if tokens >= cost:
+                tokens -= cost
+                decision = Decision(True, int(tokens), 0)
+            else:
+                decision = Decision(False, int(tokens), (cost - tokens) / rate)
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._prune(now)
+        return decision
+
+    def _prune(self, now: float) -> None:
+        # 오래 갱신되지 않은 버킷부터 정리 (가득 찬 버킷은 지워도 동작 동일)
+        for key, (_, ts) in sorted(self._buckets.items(), key=lambda item: item[1][1])[: len(self._buckets) // 2]:
+            del self._buckets[key]
+
+
+_local_buckets = _LocalBuckets()
+_limiters: Dict[str, "RateLimiter"] = {}
+
+
+class RateLimiter:
+    """이름별 토큰 버킷 정책 (capacity개까지 버스트, per_seconds마다 capacity개 충전)"""
+
+    def __init__(self, name: str, capacity: int, per_seconds: float):
+        self.name = name
+        self.capacity = capacity
+        self.per_seconds = per_seconds
+        self.rate = capacity / per_seconds
+        self._lock = threading.Lock()
+        self.allowed = 0
+        self.rejected = 0
+        self.redis_errors = 0
+        self.decision_time_total = 0.0
+        self.decision_time_max = 0.0
+        _limiters[name] = self
+
+    def hit(self, identity: str, cost: int = 1) -> Decision:
+        """
+        토큰 차감 시도
+
+        Args:
+            identity: 사용자 / IP 등 버킷 구분 값
+            cost: 차감할 토큰 수
+
+        Returns:
+            Decision
+        """
+        key = f"rl:{self.name}:{identity}"
+        started = time.perf_counter()
+        decision = None
+        if REDIS_AVAILABLE:
+            try:
+                allowed, remaining, retry_after_ms = redis_client.eval(
+                    _TOKEN_BUCKET_LUA, 1, key, self.capacity, self.rate, cost
+                )
+                decision = Decision(bool(allowed), int(remaining), int(retry_after_ms) / 1000)
+            except Exception as e:
+                with self._lock:
+                    self.redis_errors += 1
+                logger.error(f"Rate limit Redis 판정 실패, 로컬 버킷 사용: limiter={self.name}, error={e}")
+        if decision is None:
+            decision = _local_buckets.take(key, self.capacity, self.rate, cost)
+
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            if decision.allowed:
+                self.allowed += 1
+            else:
+                self.rejected += 1
+            self.decision_time_total += elapsed
+            self.decision_time_max = max(self.decision_time_max, elapsed)
+        return decision
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            decisions = (self.allowed + self.rejected) or 1
+            return {
+                "capacity": self.capacity,
+                "per_seconds": self.per_seconds,
+                "allowed": self.allowed,
+                "rejected": self.rejected,
+                "redis_errors": self.redis_errors,
+                "decision_avg_ms": round(self.decision_time_total * 1000 / decisions, 3),
+                "decision_max_ms": round(self.decision_time_max * 1000, 3),
+            }
+
+
+def rate_limit_stats() -> Dict[str, Any]:
+    """프로세스 단위 limiter별 지표"""
+    return {
+        "backend": "redis" if REDIS_AVAILABLE else "memory",
+        "enabled": RATE_LIMIT_ENABLED,
+        "limiters": {name: limiter.stats() for name, limiter in _limiters.items()},
+    }
+
+
+def client_ip(request: Request) -> str:
+    if RATE_LIMIT_TRUST_PROXY:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+def _identity(request: Request, scope: str) -> str:
+    """버킷 구분 값 - user: 로그인 사용자는 사용자 단위, 비로그인은 IP / ip: 항상 IP"""
+    user_id = request.session.get("user_id") if "session" in request.scope else None
+    if scope == "user" and user_id:
+        return f"u{user_id}"
+    return f"ip{client_ip(request)}"
+
+
+def _enforce(decision: Decision, limiter: RateLimiter) -> None:
+    if not decision.allowed:
+        retry_after = max(1, math.ceil(decision.retry_after))
+        logger.warning(f"Rate limit 초과: limiter={limiter.name}, retry_after={retry_after}s")
+        raise TooManyRequestsError(retry_after=retry_after)
+
+
+def rate_limit(name: str, capacity: int, per_seconds: float, scope: str = "user") -> Callable:
+    """
+    FastAPI 의존성 생성
+
+    Args:
+        name: 라우트 / 정책 이름 (버킷 키에 포함)
+        capacity: 최대 버스트 요청 수
+        per_seconds: capacity개가 다시 채워지는 시간
+        scope: 'user' (비로그인은 IP) 또는 'ip'
+
+    Returns:
+        의존성 함수 - dependencies=[Depends(rate_limit(...))]
+    """
+    limiter = _limiters.get(name) or RateLimiter(name, capacity, per_seconds)
+
+    async def dependency(request: Request, response: Response) -> None:
+        if not RATE_LIMIT_ENABLED:
+            return
+        decision = limiter.hit(_identity(request, scope))
+        _enforce(decision, limiter)
+        response.headers["X-RateLimit-Limit"] = str(limiter.capacity)
+        response.headers["X-RateLimit-Remaining"] = str(decision.remaining)
+
+    return dependency
+
+
+def rate_limited(name: str, capacity: int, per_seconds: float, key_arg: str = "user_id") -> Callable:
+    """
+    함수 데코레이터 버전 - 인자 key_arg(기본 user_id) 또는 Request 인자로 버킷 구분
+
+    sync / async 함수 모두 지원.
+    """
+    limiter = _limiters.get(name) or RateLimiter(name, capacity, per_seconds)
+
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        def identity_from(args, kwargs) -> str:
+            arguments = signature.bind_partial(*args, **kwargs).arguments
+            if arguments.get(key_arg) is not None:
+                return f"{key_arg}:{arguments[key_arg]}"
+            for value in arguments.values():
+                if isinstance(value, Request):
+                    return _identity(value, "user")
+            return "global"
+
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if RATE_LIMIT_ENABLED:
+                    _enforce(limiter.hit(identity_from(args, kwargs)), limiter)
+                return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if RATE_LIMIT_ENABLED:
+                _enforce(limiter.hit(identity_from(args, kwargs)), limiter)
+            return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
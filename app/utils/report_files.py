@@ -0,0 +1,188 @@
+"""
+리포트 파일 저장 / 서빙
+- 생성 시 HTML과 함께 gzip(.gz), brotli(.br, 패키지 설치 시) 사전 압축본 저장
+- 서빙은 FileResponse로 청크 단위 비동기 전송 (이벤트 루프에서 파일 전체를 읽지 않음)
+- Accept-Encoding에 맞는 압축본 선택, 강한 ETag / Last-Modified로 재방문 시 304
+"""
+
+import gzip
+import hashlib
+import logging
+import os
+import tempfile
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.responses import FileResponse
+from fastapi.staticfiles import StaticFiles
+from starlette.concurrency import run_in_threadpool
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# 서버 측 선호 순서 (클라이언트 q값이 같으면 앞쪽 우선)
+ENCODINGS: List[Tuple[str, str]] = [("br", ".br"), ("gzip", ".gz")] if BROTLI_AVAILABLE else [("gzip", ".gz")]
+# 리포트는 사용자 전용 - 공유 캐시 금지, 매번 ETag로 재검증
+REPORT_CACHE_CONTROL = "private, no-cache"
+# 차트 등 리포트 에셋은 파일명에 내용 해시가 들어가므로 영구 캐시
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def atomic_write(path: str, data: bytes) -> None:
+    """임시 파일에 쓴 뒤 교체 (읽는 쪽이 쓰다 만 파일을 보지 않도록)"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp_path, 0o644)  # mkstemp 기본값 0600 대신 open()과 같은 권한
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _compress(encoding: str, data: bytes) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=11, mode=brotli.MODE_TEXT)
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def write_report_file(path: str, content: str) -> None:
+    """
+    리포트 HTML 저장 + 사전 압축본 생성 (Celery 워커에서 호출)
+
+    Args:
+        path: HTML 파일 경로
+        content: HTML 내용
+    """
+    data = content.encode("utf-8")
+    atomic_write(path, data)
+    # 압축본은 원본보다 나중에 써서 mtime으로 최신 여부를 판단한다
+    for encoding, suffix in ENCODINGS:
+        atomic_write(path + suffix, _compress(encoding, data))
+
+
+def _ensure_variant(path: str, encoding: str, suffix: str, source_mtime: float) -> Optional[str]:
+    """압축본 경로 (없거나 원본보다 오래됐으면 생성 - 기존 리포트 대비)"""
+    variant = path + suffix
+    try:
+        if os.stat(variant).st_mtime >= source_mtime:
+            return variant
+    except FileNotFoundError:
+        pass
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        atomic_write(variant, _compress(encoding, data))
+        return variant
+    except OSError as e:
+        logger.error(f"리포트 압축본 생성 실패: path={variant}, error={e}")
+        return None
+
+
+def _accepted_encodings(header: str) -> Dict[str, float]:
+    accepted: Dict[str, float] = {}
+    for part in header.split(","):
+        token, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        if token:
+            accepted[token.strip().lower()] = q
+    return accepted
+
+
+def _choose_encoding(accept_encoding: str) -> Optional[Tuple[str, str]]:
+    accepted = _accepted_encodings(accept_encoding)
+    best, best_q = None, 0.0
+    for encoding, suffix in ENCODINGS:
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = (encoding, suffix), q
+    return best
+
+
+def _not_modified(request: Request, etag: str, mtime: float) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match는 약한 비교 (RFC 9110 13.1.2)
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or etag in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+async def report_file_response(
+    request: Request,
+    path: str,
+    media_type: str = "text/html; charset=utf-8",
+    filename: Optional[str] = None,
+    compress: bool = True,
+) -> Response:
+    """
+    리포트 파일 응답 (조건부 요청 / 압축 협상 포함)
+
+    Args:
+        request: 요청 (If-None-Match, If-Modified-Since, Accept-Encoding 확인)
+        path: 원본 파일 경로
+        media_type: Content-Type
+        filename: 지정 시 첨부 파일로 다운로드
+        compress: 사전 압축본 사용 여부 (PDF 등 이미 압축된 형식은 False)
+
+    Returns:
+        Response: 304 또는 FileResponse
+
+    Raises:
+        FileNotFoundError: 원본 파일이 없는 경우
+    """
+    stat = os.stat(path)
+    base_etag = hashlib.md5(f"{stat.st_mtime_ns}-{stat.st_size}".encode()).hexdigest()
+
+    encoding = _choose_encoding(request.headers.get("accept-encoding", "")) if compress else None
+    # 강한 ETag는 표현(인코딩)마다 달라야 한다
+    etag = f'"{base_etag}-{encoding[0]}"' if encoding else f'"{base_etag}"'
+    headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(stat.st_mtime, usegmt=True),
+        "Cache-Control": REPORT_CACHE_CONTROL,
+    }
+    if compress:
+        headers["Vary"] = "Accept-Encoding"
+
+    if _not_modified(request, etag, stat.st_mtime):
+        return Response(status_code=304, headers=headers)
+
+    serve_path = path
+    if encoding:
+        variant = await run_in_threadpool(_ensure_variant, path, encoding[0], encoding[1], stat.st_mtime)
+        if variant:
+            serve_path = variant
+            headers["Content-Encoding"] = encoding[0]
+        else:
+            headers["ETag"] = f'"{base_etag}"'
+
+    return FileResponse(serve_path, media_type=media_type, filename=filename, headers=headers)
+
+
+class ImmutableStaticFiles(StaticFiles):
+    """내용 해시 파일명 전용 정적 파일 마운트 (Cache-Control: immutable)"""
+
+    def file_response(self, *args, **kwargs) -> Response:
+        response = super().file_response(*args, **kwargs)
+        if response.status_code in (200, 304):
+            response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        return response
@@ -0,0 +1,56 @@
+"""
+요약 / 카운터 테이블 upsert
+- 행이 없을 때 INSERT와 동시 트랜잭션의 INSERT가 겹쳐도 한쪽이 실패하지 않고 증분으로 합쳐진다
+- MySQL: INSERT ... ON DUPLICATE KEY UPDATE / SQLite·PostgreSQL: INSERT ... ON CONFLICT DO UPDATE
+"""
+
+from typing import Any, Dict, List, Sequence, Tuple
+
+from sqlalchemy import Table, and_, insert, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+
+def insert_or_update(
+    session: Session,
+    table: Table,
+    values: Dict[str, Any],
+    update_values: List[Tuple[str, Any]],
+    index_elements: Sequence[str],
+) -> None:
+    """
+    행 INSERT, 키가 이미 있으면 update_values로 갱신 (한 문장)
+
+    Args:
+        session: 세션 (현재 트랜잭션 연결의 dialect 기준, after_flush 안에서 호출 가능)
+        table: 대상 테이블
+        values: INSERT 값 (키 컬럼 포함)
+        update_values: 충돌 시 (컬럼명, 식) 목록 - 식의 table.c.<컬럼>은 기존 행 값.
+            MySQL은 앞에서 대입한 값이 뒤 식에 보이므로 다른 식이 참조하는 컬럼은 마지막에 둔다
+        index_elements: 충돌 판정 키 컬럼명 (PK / 유니크 키)
+    """
+    connection = session.connection()
+    dialect = connection.dialect.name
+
+    if dialect == "mysql":
+        stmt = mysql.insert(table).values(**values).on_duplicate_key_update(update_values)
+    elif dialect in ("sqlite", "postgresql"):
+        dialect_insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        stmt = dialect_insert(table).values(**values).on_conflict_do_update(
+            index_elements=list(index_elements), set_=dict(update_values)
+        )
+    else:
+        # 그 외 DB - 세이브포인트 안에서 INSERT, 키 충돌이면 UPDATE
+        try:
+            with connection.begin_nested():
+                connection.execute(insert(table).values(**values))
+        except IntegrityError:
+            connection.execute(
+                update(table)
+                .where(and_(*(table.c[key] == values[key] for key in index_elements)))
+                .ordered_values(*update_values)
+            )
+        return
+
+    connection.execute(stmt)
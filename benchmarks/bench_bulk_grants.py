@@ -0,0 +1,84 @@
+"""
+포인트 일괄 적립 벤치마크 - earn_points_safely 반복 vs grant_points_bulk
+
+사용법:
+    python benchmarks/bench_bulk_grants.py --grants 100000 --users 50000
+
+임시 SQLite DB에 포인트 테이블만 만들어 측정한다. 건별 적립은 느리므로
+--single 건수만 실행한 뒤 초당 처리량으로 비교한다.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_tmpdir = tempfile.mkdtemp(prefix="bench_grants_")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmpdir}/app.db")
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Base, UserFortunePoint, FortuneTransaction
+from app.services.fortune_service import FortuneService
+
+
+def make_session(path: str):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine, tables=[UserFortunePoint.__table__, FortuneTransaction.__table__])
+    return sessionmaker(bind=engine)()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--grants", type=int, default=100000)
+    parser.add_argument("--users", type=int, default=50000)
+    parser.add_argument("--single", type=int, default=2000, help="건별 적립 측정 건수")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    grants = [
+        (i % args.users + 1, 10, "bench", f"bench_{i}")
+        for i in range(args.grants)
+    ]
+
+    # 건별 적립 (기존 방식)
+    db = make_session(os.path.join(_tmpdir, "single.db"))
+    service = FortuneService(db)
+    started = time.perf_counter()
+    for user_id, amount, source, reference_id in grants[:args.single]:
+        service.earn_points_safely(user_id, amount, source, reference_id)
+    single_elapsed = time.perf_counter() - started
+    single_rate = args.single / single_elapsed
+    db.close()
+
+    # 일괄 적립
+    db = make_session(os.path.join(_tmpdir, "bulk.db"))
+    service = FortuneService(db)
+    started = time.perf_counter()
+    result = service.grant_points_bulk(grants, chunk_size=args.chunk_size)
+    bulk_elapsed = time.perf_counter() - started
+
+    # 같은 목록 재실행 - 전부 중복으로 건너뛰어야 함
+    started = time.perf_counter()
+    replay = service.grant_points_bulk(grants, chunk_size=args.chunk_size)
+    replay_elapsed = time.perf_counter() - started
+
+    total_points = db.execute(select(func.sum(UserFortunePoint.points))).scalar()
+    ledger_rows = db.execute(select(func.count(FortuneTransaction.id))).scalar()
+    db.close()
+
+    print({
+        "single": {"grants": args.single, "seconds": round(single_elapsed, 2), "grants_per_sec": round(single_rate)},
+        "bulk": {**result, "seconds": round(bulk_elapsed, 2), "grants_per_sec": round(args.grants / bulk_elapsed)},
+        "replay": {**replay, "seconds": round(replay_elapsed, 2)},
+        "check": {"total_points": total_points, "ledger_rows": ledger_rows},
+        "estimated_single_seconds_for_all": round(args.grants / single_rate, 1),
+    })
+
+
+if __name__ == "__main__":
+    main()
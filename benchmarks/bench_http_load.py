@@ -0,0 +1,425 @@
+"""
+HTTP 부하 테스트 - app.main:app 전체를 띄워 실제 사용자 시나리오로 라우트별 처리량 / 지연 측정
+
+사용법:
+    python benchmarks/bench_http_load.py --users 50 --duration 60
+    python benchmarks/bench_http_load.py --users 50 --duration 60 --app-workers 4 --compare benchmarks/results/이전.json
+    python benchmarks/bench_http_load.py --mix saju=1,order=1 --llm-latency-ms 1500
+
+준비 과정:
+- 임시 SQLite DB에 setup_db.py 샘플 데이터 + 부하용 사용자(--users 명) 생성
+- OpenAI / Ollama / 카카오페이는 benchmarks/fake_upstreams.py 가짜 서버로 대체 (별도 프로세스)
+- 앱은 uvicorn 별도 프로세스 (--app-workers), Celery는 메모리 브로커라 리포트 태스크는 실행되지 않고
+  이 스크립트의 가짜 워커가 --report-seconds 뒤 generating 주문을 completed로 바꾼다
+- 로그인은 SessionMiddleware와 같은 방식으로 서명한 세션 쿠키로 대신한다 (비밀번호 해시 비용 제외)
+
+시나리오 (가상 사용자마다 --mix 가중치로 골라 반복, 요청 사이 --think-ms 대기):
+- saju:   사주 입력 페이지 → 입력 제출 → 결과 페이지 → AI 미리보기 (--saju-keys 개 생년월일 중 선택 → 캐시 적중률 조절)
+- shop:   상품 목록 → 상품 상세 → 상품 API
+- order:  주문 생성(카카오페이 ready) → 승인 콜백 → 성공 페이지 → 리포트 완료까지 상태 폴링
+- mypage: 주문 내역 → 마이페이지
+
+결과는 라우트별 요청 수 / 오류 / 초당 처리량 / p50·p90·p95·p99·최대 지연으로 출력하고
+--out(기본 benchmarks/results/loadtest_<커밋>_<시각>.json)에 저장한다. --compare로 이전 결과와 비교.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import logging
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from base64 import b64encode
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+os.chdir(REPO_ROOT)
+
+SCENARIOS = ("saju", "shop", "order", "mypage")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=50, help="동시 가상 사용자 수")
+    parser.add_argument("--duration", type=float, default=60, help="측정 시간 (초)")
+    parser.add_argument("--ramp", type=float, default=5, help="가상 사용자 투입 시간 (초)")
+    parser.add_argument("--mix", default="saju=3,shop=4,order=2,mypage=1", help="시나리오 가중치")
+    parser.add_argument("--think-ms", type=float, default=200, help="요청 사이 평균 대기")
+    parser.add_argument("--app-workers", type=int, default=1)
+    parser.add_argument("--saju-keys", type=int, default=50, help="사주 시나리오에서 쓰는 서로 다른 생년월일 수")
+    parser.add_argument("--llm-latency-ms", type=float, default=800)
+    parser.add_argument("--kakao-latency-ms", type=float, default=30)
+    parser.add_argument("--report-seconds", type=float, default=5, help="가짜 워커의 리포트 생성 시간")
+    parser.add_argument("--poll-interval", type=float, default=1)
+    parser.add_argument("--max-polls", type=int, default=30)
+    parser.add_argument("--out", help="결과 JSON 경로")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON")
+    return parser.parse_args()
+
+
+ARGS = parse_args()
+UPSTREAM_PORT, APP_PORT = free_port(), free_port()
+_tmpdir = tempfile.mkdtemp(prefix="bench_http_load_")
+
+# 앱 / 시드 / 가짜 워커가 같은 설정을 쓰도록 import 전에 환경 변수 지정
+ENV = {
+    "DATABASE_URL": f"sqlite:///{_tmpdir}/app.db",
+    "SECRET_KEY": "loadtest-secret",
+    "OPENAI_API_KEY": "fake-openai-key",
+    "OPENAI_BASE_URL": f"http://127.0.0.1:{UPSTREAM_PORT}/v1",
+    "OLLAMA_URL": f"http://127.0.0.1:{UPSTREAM_PORT}",
+    "KAKAOPAY_API_HOST": f"http://127.0.0.1:{UPSTREAM_PORT}",
+    "KAKAO_SECRET_KEY": "fake-kakao-key",
+    "CELERY_BROKER_URL": "memory://",
+    "CELERY_RESULT_BACKEND": "cache+memory://",
+    "RATE_LIMIT_ENABLED": "false",
+    "DEV_MODE": "false",
+    "SKIP_PAYMENT": "false",
+}
+os.environ.update(ENV)
+
+import httpx
+from itsdangerous import TimestampSigner
+from sqlalchemy import text, update
+
+from app.database import SessionLocal, engine
+from app.models import Order, Product, User
+from app.saju_utils import SajuKeyManager
+
+
+# ---------------------------------------------------------------------- 준비
+
+def seed(users: int):
+    """setup_db.py 샘플 데이터 + 부하용 사용자"""
+    import setup_db
+    with contextlib.redirect_stdout(io.StringIO()):
+        setup_db.setup_database()
+    logging.getLogger("httpx").setLevel(logging.WARNING)  # setup_db의 basicConfig(INFO)
+    # WAL - 기본 저널 모드에서는 읽기 트랜잭션이 쓰기를 막아 await 중 잠금 대기가 이벤트 루프를 멈춘다
+    # (운영 MySQL과 다른 SQLite만의 병목이라 제외, 파일에 저장되므로 앱 프로세스에도 적용)
+    with engine.connect() as conn:
+        conn.execute(text("PRAGMA journal_mode=WAL"))
+    db = SessionLocal()
+    user_ids = []
+    for i in range(users):
+        user = User(username=f"load{i}", email=f"load{i}@example.com", password="x")
+        db.add(user)
+        db.flush()
+        user_ids.append(user.id)
+    db.commit()
+    slugs = [slug for (slug,) in db.query(Product.slug).filter(Product.is_active == True).all()]
+    db.close()
+    return user_ids, slugs
+
+
+def session_cookie(user_id: int) -> str:
+    """SessionMiddleware와 같은 방식으로 서명한 세션 쿠키"""
+    data = b64encode(json.dumps({"user_id": user_id}).encode("utf-8"))
+    return TimestampSigner(ENV["SECRET_KEY"]).sign(data).decode("utf-8")
+
+
+def admin_cookies() -> dict:
+    """/metrics는 관리자 전용 - setup_db가 만든 관리자 세션"""
+    db = SessionLocal()
+    try:
+        admin_id = db.query(User.id).filter(User.is_admin == True).order_by(User.id).limit(1).scalar()
+    finally:
+        db.close()
+    return {"session": session_cookie(admin_id)}
+
+
+def start_process(args, name):
+    log = open(os.path.join(_tmpdir, f"{name}.log"), "w")
+    return subprocess.Popen(args, cwd=REPO_ROOT, env=os.environ.copy(), stdout=log, stderr=subprocess.STDOUT)
+
+
+def wait_ready(url: str, timeout: float = 60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(url, timeout=2).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"서버 시작 실패: {url} (로그: {_tmpdir})")
+
+
+def fake_report_worker(stop: threading.Event, report_seconds: float):
+    """Celery 워커 대신 결제 완료 후 --report-seconds 지난 주문을 완료 처리"""
+    while not stop.wait(0.5):
+        db = SessionLocal()
+        try:
+            cutoff = datetime.now() - timedelta(seconds=report_seconds)
+            db.execute(
+                update(Order)
+                .where(Order.report_status == "generating", Order.created_at < cutoff)
+                .values(report_status="completed", report_completed_at=datetime.now())
+            )
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"가짜 워커 오류 (무시): {e}")
+        finally:
+            db.close()
+
+
+# ---------------------------------------------------------------------- 측정
+
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.scenarios = defaultdict(lambda: {"iterations": 0, "failed": 0})
+        self.report_ready = []
+
+    async def request(self, client, route, method, url, ok=None, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.latencies[route].append(time.perf_counter() - started)
+            self.errors[route] += 1
+            raise
+        self.latencies[route].append(time.perf_counter() - started)
+        if response.status_code >= 400 or (ok is not None and not ok(response)):
+            self.errors[route] += 1
+            raise ScenarioError(f"{route} → {response.status_code}")
+        return response
+
+
+class ScenarioError(Exception):
+    pass
+
+
+async def think():
+    await asyncio.sleep(random.uniform(0.5, 1.5) * ARGS.think_ms / 1000)
+
+
+def birth_dates(count: int):
+    rng = random.Random(42)
+    return [(rng.randint(1955, 2005), rng.randint(1, 12), rng.randint(1, 28), rng.choice(["male", "female"]))
+            for _ in range(count)]
+
+
+async def scenario_saju(client, rec: Recorder, ctx):
+    await rec.request(client, "GET /saju/page1", "GET", "/saju/page1")
+    await think()
+    year, month, day, gender = random.choice(ctx["birth_dates"])
+    await rec.request(client, "POST /saju/page1", "POST", "/saju/page1", data={
+        "name": "부하테스트", "gender": gender, "birth_year": year, "birth_month": month,
+        "birth_day": day, "birthhour": random.randint(0, 23), "calendar": "SOL", "timezone": "Asia/Seoul",
+    }, ok=lambda r: r.status_code == 302)
+    await rec.request(client, "GET /saju/page2", "GET", "/saju/page2")
+    await think()
+    await rec.request(client, "POST /saju/api/saju_ai_analysis", "POST", "/saju/api/saju_ai_analysis",
+                      ok=lambda r: "result" in r.json())
+
+
+async def scenario_shop(client, rec: Recorder, ctx):
+    await rec.request(client, "GET /shop/", "GET", "/shop/")
+    await think()
+    await rec.request(client, "GET /shop/{slug}", "GET", f"/shop/{random.choice(ctx['slugs'])}")
+    await think()
+    await rec.request(client, "GET /shop/api/v1/products", "GET", "/shop/api/v1/products")
+
+
+async def scenario_order(client, rec: Recorder, ctx):
+    # 주문마다 새 사주 (같은 사주 재구매는 중복 구매로 거절된다)
+    ctx["order_seq"] += 1
+    day = datetime(1950, 1, 1) + timedelta(days=ctx["order_seq"] % 20000)
+    saju_key = SajuKeyManager.build_saju_key(day.strftime("%Y-%m-%d"), ctx["order_seq"] % 24, "female")
+    response = await rec.request(client, "POST /order/create", "POST", "/order/create",
+                                 json={"saju_key": saju_key}, ok=lambda r: r.json().get("success"))
+    order_id = response.json()["order_id"]
+    paid_at = time.perf_counter()
+    await think()
+    await rec.request(client, "GET /order/approve", "GET", "/order/approve",
+                      params={"pg_token": "loadtest", "order_id": order_id},
+                      ok=lambda r: r.headers.get("location", "").startswith("/order/success"))
+    await rec.request(client, "GET /order/success", "GET", "/order/success", params={"order_id": order_id})
+    for _ in range(ARGS.max_polls):
+        await asyncio.sleep(ARGS.poll_interval)
+        status = await rec.request(client, "GET /order/status/{id}", "GET", f"/order/status/{order_id}")
+        if status.json().get("report_status") == "completed":
+            rec.report_ready.append(time.perf_counter() - paid_at)
+            return
+    raise ScenarioError(f"리포트 완료 대기 초과: order_id={order_id}")
+
+
+async def scenario_mypage(client, rec: Recorder, ctx):
+    await rec.request(client, "GET /order/mypage", "GET", "/order/mypage")
+    await think()
+    await rec.request(client, "GET /mypage", "GET", "/mypage")
+
+
+SCENARIO_FUNCS = {
+    "saju": scenario_saju, "shop": scenario_shop, "order": scenario_order, "mypage": scenario_mypage,
+}
+
+
+async def virtual_user(index, user_id, rec, ctx, weights, deadline):
+    await asyncio.sleep(ARGS.ramp * index / max(1, ARGS.users))
+    base_url = f"http://127.0.0.1:{APP_PORT}"
+    async with httpx.AsyncClient(base_url=base_url, timeout=60, follow_redirects=False) as client:
+        # 서버가 Set-Cookie로 갱신하는 세션과 같은 키(도메인 / 경로)로 넣어야 덮어써진다
+        client.cookies.set("session", session_cookie(user_id), domain="127.0.0.1", path="/")
+        names, values = zip(*weights.items())
+        while time.perf_counter() < deadline:
+            name = random.choices(names, values)[0]
+            try:
+                await SCENARIO_FUNCS[name](client, rec, ctx)
+            except (ScenarioError, httpx.HTTPError, ValueError, KeyError):
+                rec.scenarios[name]["failed"] += 1
+            rec.scenarios[name]["iterations"] += 1
+            await think()
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def summarize(rec: Recorder, elapsed: float):
+    routes = {}
+    for route, values in sorted(rec.latencies.items()):
+        routes[route] = {
+            "requests": len(values),
+            "errors": rec.errors[route],
+            "rps": round(len(values) / elapsed, 2),
+            **{f"p{p}_ms": round(percentile(values, p) * 1000, 1) for p in (50, 90, 95, 99)},
+            "max_ms": round(max(values) * 1000, 1),
+        }
+    total = sum(route["requests"] for route in routes.values())
+    result = {
+        "total_requests": total,
+        "total_errors": sum(route["errors"] for route in routes.values()),
+        "rps": round(total / elapsed, 2),
+        "routes": routes,
+        "scenarios": dict(rec.scenarios),
+    }
+    if rec.report_ready:
+        result["report_ready_p50_s"] = round(percentile(rec.report_ready, 50), 2)
+        result["report_ready_p95_s"] = round(percentile(rec.report_ready, 95), 2)
+    return result
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def print_result(result, previous=None):
+    print(f"{'route':34s} {'reqs':>6s} {'err':>4s} {'rps':>7s} {'p50':>7s} {'p90':>7s} "
+          f"{'p95':>7s} {'p99':>7s} {'max':>7s}")
+    for route, stats in result["routes"].items():
+        line = (f"{route:34s} {stats['requests']:6d} {stats['errors']:4d} {stats['rps']:7.2f} "
+                f"{stats['p50_ms']:7.1f} {stats['p90_ms']:7.1f} {stats['p95_ms']:7.1f} "
+                f"{stats['p99_ms']:7.1f} {stats['max_ms']:7.1f}")
+        before = (previous or {}).get("routes", {}).get(route)
+        if before and before["p95_ms"]:
+            line += (f"  p95 {(stats['p95_ms'] - before['p95_ms']) / before['p95_ms']:+.0%}"
+                     f" rps {(stats['rps'] - before['rps']) / max(before['rps'], 0.01):+.0%}")
+        print(line)
+    print(f"total: {result['total_requests']} requests, {result['total_errors']} errors, {result['rps']} rps")
+    for name, stats in result["scenarios"].items():
+        print(f"  scenario {name:7s} iterations={stats['iterations']} failed={stats['failed']}")
+    if "report_ready_p50_s" in result:
+        print(f"  order → report ready p50={result['report_ready_p50_s']}s p95={result['report_ready_p95_s']}s")
+    if previous:
+        print(f"compared with {previous['meta']['commit']} ({previous['meta']['started_at']}): "
+              f"rps {previous['rps']} → {result['rps']}")
+
+
+async def run_load(user_ids, slugs, weights):
+    rec = Recorder()
+    ctx = {"slugs": slugs, "birth_dates": birth_dates(ARGS.saju_keys), "order_seq": 0}
+    started = time.perf_counter()
+    deadline = started + ARGS.duration
+    await asyncio.gather(*(
+        virtual_user(i, user_id, rec, ctx, weights, deadline) for i, user_id in enumerate(user_ids)
+    ))
+    return rec, time.perf_counter() - started
+
+
+def main():
+    weights = {}
+    for part in ARGS.mix.split(","):
+        name, _, weight = part.partition("=")
+        if name not in SCENARIOS:
+            raise SystemExit(f"알 수 없는 시나리오: {name} (가능: {', '.join(SCENARIOS)})")
+        weights[name] = float(weight or 1)
+
+    user_ids, slugs = seed(ARGS.users)
+    upstream = start_process([
+        sys.executable, "benchmarks/fake_upstreams.py", "--port", str(UPSTREAM_PORT),
+        "--llm-latency-ms", str(ARGS.llm_latency_ms), "--kakao-latency-ms", str(ARGS.kakao_latency_ms),
+    ], "upstream")
+    app = start_process([
+        sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(APP_PORT),
+        "--workers", str(ARGS.app_workers), "--log-level", "warning", "--timeout-keep-alive", "75",
+    ], "app")
+    stop = threading.Event()
+    worker = threading.Thread(target=fake_report_worker, args=(stop, ARGS.report_seconds), daemon=True)
+    try:
+        wait_ready(f"http://127.0.0.1:{UPSTREAM_PORT}/_calls")
+        wait_ready(f"http://127.0.0.1:{APP_PORT}/metrics/db")
+        worker.start()
+        print(f"users={ARGS.users} duration={ARGS.duration}s app_workers={ARGS.app_workers} mix={ARGS.mix} "
+              f"llm_latency={ARGS.llm_latency_ms}ms kakao_latency={ARGS.kakao_latency_ms}ms")
+        started_at = datetime.now()
+        rec, elapsed = asyncio.run(run_load(user_ids, slugs, weights))
+        upstream_calls = httpx.get(f"http://127.0.0.1:{UPSTREAM_PORT}/_calls").json()
+        db_metrics = httpx.get(f"http://127.0.0.1:{APP_PORT}/metrics/db", cookies=admin_cookies()).json()
+    finally:
+        stop.set()
+        for process in (app, upstream):
+            process.terminate()
+            process.wait(timeout=30)
+
+    result = summarize(rec, elapsed)
+    result["upstream_calls"] = upstream_calls
+    result["db_metrics"] = db_metrics
+    result["meta"] = {
+        "commit": git_commit(),
+        "started_at": started_at.isoformat(timespec="seconds"),
+        "elapsed_s": round(elapsed, 1),
+        "args": vars(ARGS),
+    }
+
+    previous = None
+    if ARGS.compare:
+        with open(ARGS.compare, encoding="utf-8") as f:
+            previous = json.load(f)
+    print_result(result, previous)
+
+    out = ARGS.out or os.path.join(
+        REPO_ROOT, "benchmarks", "results",
+        f"loadtest_{result['meta']['commit']}_{started_at.strftime('%Y%m%d_%H%M%S')}.json",
+    )
+    os.makedirs(os.path.dirname(out), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    print(f"saved: {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+카카오페이 클라이언트 벤치마크 - 호출마다 새 클라이언트 vs 프로세스 공용 클라이언트
+
+사용법:
+    python benchmarks/bench_kakaopay_client.py --calls 500 --concurrency 20 --latency-ms 5
+
+로컬 목 서버(benchmarks/mock_kakaopay.py)를 띄우고 ready + order 조회를 반복한다.
+per_call 모드는 기존처럼 호출마다 AsyncClient를 만들고, pooled 모드는
+app.payments.kakaopay의 공용 클라이언트를 사용한다. p50/p99 지연과
+목 서버가 받은 TCP 커넥션 수를 출력한다. 목 서버는 평문 HTTP라
+실서버에서 추가로 절약되는 TLS 핸드셰이크 비용은 포함되지 않는다.
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+PORT = free_port()
+os.environ["KAKAOPAY_API_HOST"] = f"http://127.0.0.1:{PORT}"
+os.environ.setdefault("KAKAO_SECRET_KEY", "mock-secret")
+os.environ.setdefault("ENVIRONMENT", "production")
+
+import httpx
+import uvicorn
+
+from benchmarks.mock_kakaopay import build_app
+from app.payments import kakaopay
+from app.payments.kakaopay import KakaoPayError, kakao_order_inquiry, kakao_ready, kakaopay_client
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def start_mock(latency_ms: float, order_fail_rate: float):
+    app = build_app(latency_ms, order_fail_rate)
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=PORT, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    return app, server, thread
+
+
+async def per_call_flow(order_id: int):
+    """기존 방식 - 단계마다 새 AsyncClient"""
+    headers = {"Authorization": f"SECRET_KEY {kakaopay.SECRET_KEY}"}
+    async with httpx.AsyncClient(timeout=30.0) as client:
+        response = await client.post(
+            f"{kakaopay.KAKAOPAY_API_HOST}/online/v1/payment/ready",
+            json={"cid": kakaopay.KAKAO_CID, "partner_order_id": str(order_id), "total_amount": 1000},
+            headers=headers,
+        )
+        tid = response.json()["tid"]
+    async with httpx.AsyncClient(timeout=30.0) as client:
+        response = await client.post(
+            f"{kakaopay.KAKAOPAY_API_HOST}/online/v1/payment/order",
+            json={"cid": kakaopay.KAKAO_CID, "tid": tid},
+            headers=headers,
+        )
+        response.raise_for_status()
+
+
+async def pooled_flow(order_id: int):
+    ready = await kakao_ready(order_id=order_id, amount=1000)
+    await kakao_order_inquiry(ready["tid"])
+
+
+async def run_mode(flow, calls: int, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    failures = 0
+
+    async def one(order_id: int):
+        nonlocal failures
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await flow(order_id)
+            except (KakaoPayError, httpx.HTTPError):
+                failures += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(calls)))
+    elapsed = time.perf_counter() - started
+    return {
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "throughput": calls / elapsed,
+        "failures": failures,
+    }
+
+
+async def main(args):
+    mock_app, server, thread = start_mock(args.latency_ms, args.order_fail_rate)
+    try:
+        for name, flow in (("per_call", per_call_flow), ("pooled", pooled_flow)):
+            await run_mode(flow, min(20, args.calls), args.concurrency)  # 워밍업
+            mock_app.state.connections.clear()
+            result = await run_mode(flow, args.calls, args.concurrency)
+            print(
+                f"{name:9s} p50={result['p50_ms']:7.2f}ms p99={result['p99_ms']:7.2f}ms "
+                f"throughput={result['throughput']:7.1f} flows/s "
+                f"connections={len(mock_app.state.connections)} failures={result['failures']}"
+            )
+        stats = kakaopay_client.stats()
+        print(f"pooled client: http2={stats['http2']}")
+        for endpoint, values in stats["endpoints"].items():
+            print(f"  {endpoint:7s} calls={values['calls']} errors={values['errors']} retries={values['retries']} "
+                  f"avg={values['avg_ms']}ms max={values['max_ms']}ms")
+    finally:
+        await kakaopay_client.aclose()
+        server.should_exit = True
+        thread.join()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=5)
+    parser.add_argument("--order-fail-rate", type=float, default=0)
+    args = parser.parse_args()
+    asyncio.run(main(args))
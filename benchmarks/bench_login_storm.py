@@ -0,0 +1,106 @@
+"""
+로그인 폭주 벤치마크 - bcrypt 실행 위치에 따른 무관한 엔드포인트 지연 비교
+
+사용법:
+    python benchmarks/bench_login_storm.py --logins 200 --concurrency 50
+
+inline 모드는 기존처럼 이벤트 루프에서 bcrypt를 실행하고,
+pool 모드는 app.utils.passwords의 전용 풀을 사용한다.
+두 모드에서 로그인 폭주 중 /ping 의 p50/p99 지연과 ping 사이 최대 간격을 출력한다.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from fastapi import FastAPI
+
+from app.utils.passwords import hash_password, verify_password, verify_password_async, password_hasher
+
+
+def build_app(stored_hash: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/login/inline")
+    async def login_inline():
+        return {"ok": verify_password("correct-horse", stored_hash)}
+
+    @app.post("/login/pool")
+    async def login_pool():
+        verified, _ = await verify_password_async("correct-horse", stored_hash)
+        return {"ok": verified}
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return app
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_mode(app: FastAPI, mode: str, logins: int, concurrency: int) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        semaphore = asyncio.Semaphore(concurrency)
+        storm_done = asyncio.Event()
+        ping_latencies = []
+        ping_times = []
+
+        async def login():
+            async with semaphore:
+                await client.post(f"/login/{mode}")
+
+        async def pinger():
+            while not storm_done.is_set():
+                start = time.perf_counter()
+                await client.get("/ping")
+                ping_latencies.append((time.perf_counter() - start) * 1000)
+                ping_times.append(time.perf_counter())
+                await asyncio.sleep(0.005)
+
+        ping_task = asyncio.create_task(pinger())
+        started = time.perf_counter()
+        await asyncio.gather(*(login() for _ in range(logins)))
+        elapsed = time.perf_counter() - started
+        storm_done.set()
+        await ping_task
+
+    # 루프가 막히면 ping 자체가 발행되지 않으므로 ping 사이 최대 간격도 함께 본다
+    gaps = [(b - a) * 1000 for a, b in zip([started] + ping_times, ping_times + [started + elapsed])]
+
+    return {
+        "mode": mode,
+        "logins_per_sec": round(logins / elapsed, 1),
+        "ping_samples": len(ping_latencies),
+        "ping_p50_ms": round(statistics.median(ping_latencies), 2) if ping_latencies else None,
+        "ping_p99_ms": round(percentile(ping_latencies, 99), 2) if ping_latencies else None,
+        "ping_max_gap_ms": round(max(gaps), 2),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    app = build_app(hash_password("correct-horse"))
+    for mode in ("inline", "pool"):
+        print(await run_mode(app, mode, args.logins, args.concurrency))
+    print({"hasher": password_hasher.stats()})
+    password_hasher.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
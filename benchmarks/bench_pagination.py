@@ -0,0 +1,123 @@
+"""
+페이지네이션 벤치마크 - OFFSET/LIMIT + COUNT(*) vs (created_at, id) 키셋 + 캐시 개수
+
+사용법:
+    python benchmarks/bench_pagination.py --rows 200000 --pages 1 1000
+
+한 사용자에게 거래 내역 --rows 건, 한 상품에 리뷰 --rows 건을 만든 뒤
+각 페이지를 기존 방식과 키셋 방식으로 조회한 평균 시간을 출력한다.
+리뷰는 목록 쿼리만 비교한다 (평점 통계 집계는 양쪽에 동일하게 붙으므로 제외).
+키셋 측정에는 해당 페이지 직전 행으로 만든 커서를 사용한다 (실제로는 이전 응답의 next_cursor).
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_tmpdir = tempfile.mkdtemp(prefix="bench_pagination_")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmpdir}/app.db")
+
+from sqlalchemy import create_engine, desc, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Base, FortuneTransaction, UserReview
+from app.services.fortune_service import FortuneService
+from app.utils.pagination import cached_count, encode_cursor, keyset_page
+
+USER_ID = 1
+PRODUCT_ID = 1
+PER_PAGE = 20
+
+
+def seed(db, rows):
+    base = datetime.now() - timedelta(days=365)
+    chunk = 10000
+    for start in range(0, rows, chunk):
+        count = min(chunk, rows - start)
+        db.execute(insert(FortuneTransaction), [
+            {
+                "user_id": USER_ID, "transaction_type": "earn", "amount": 10, "balance_after": 10 * (start + i),
+                "source": "bench", "reference_id": f"b{start + i}", "created_at": base + timedelta(seconds=start + i),
+            }
+            for i in range(count)
+        ])
+        db.execute(insert(UserReview), [
+            {
+                "user_id": start + i + 1, "product_id": PRODUCT_ID, "rating": (start + i) % 5 + 1,
+                "content": "bench", "is_visible": True, "helpful_count": 0,
+                "created_at": base + timedelta(seconds=start + i),
+            }
+            for i in range(count)
+        ])
+    db.commit()
+
+
+def timed(func, repeat=5):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return round((time.perf_counter() - started) * 1000 / repeat, 2)
+
+
+def cursor_before(db, model, filter_clause, page):
+    """page 직전 행의 커서 (page 1은 None)"""
+    if page == 1:
+        return None
+    row = db.query(model).filter(filter_clause).order_by(
+        desc(model.created_at), desc(model.id)
+    ).offset((page - 1) * PER_PAGE - 1).first()
+    return encode_cursor(row.created_at, row.id)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 1000])
+    args = parser.parse_args()
+
+    engine = create_engine(f"sqlite:///{_tmpdir}/bench.db")
+    Base.metadata.create_all(engine, tables=[FortuneTransaction.__table__, UserReview.__table__])
+    db = sessionmaker(bind=engine)()
+    seed(db, args.rows)
+    service = FortuneService(db)
+
+    tx_filter = FortuneTransaction.user_id == USER_ID
+    review_filter = (UserReview.product_id == PRODUCT_ID) & (UserReview.is_visible == True)
+
+    def offset_transactions(page):
+        query = db.query(FortuneTransaction).filter(tx_filter)
+        query.count()
+        query.order_by(desc(FortuneTransaction.created_at)).offset((page - 1) * PER_PAGE).limit(PER_PAGE).all()
+
+    def offset_reviews(page):
+        query = db.query(UserReview).filter(review_filter)
+        query.count()
+        query.order_by(desc(UserReview.created_at)).offset((page - 1) * PER_PAGE).limit(PER_PAGE).all()
+
+    def keyset_reviews(page, cursor):
+        query = db.query(UserReview).filter(review_filter)
+        cached_count(f"count:reviews:{PRODUCT_ID}:all", query.count)
+        keyset_page(query, UserReview.created_at, UserReview.id, PER_PAGE,
+                    cursor=cursor, offset=(page - 1) * PER_PAGE)
+
+    for page in args.pages:
+        tx_cursor = cursor_before(db, FortuneTransaction, tx_filter, page)
+        review_cursor = cursor_before(db, UserReview, review_filter, page)
+        print({
+            "page": page,
+            "transactions_offset_ms": timed(lambda: offset_transactions(page)),
+            "transactions_keyset_ms": timed(lambda: service.get_transactions(
+                USER_ID, page=page, per_page=PER_PAGE, cursor=tx_cursor)),
+            "reviews_offset_ms": timed(lambda: offset_reviews(page)),
+            "reviews_keyset_ms": timed(lambda: keyset_reviews(page, review_cursor)),
+        })
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
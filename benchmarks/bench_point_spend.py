@@ -0,0 +1,120 @@
+"""
+포인트 차감 경합 벤치마크 - 행 락(SELECT FOR UPDATE) vs 조건부 UPDATE
+
+사용법:
+    python benchmarks/bench_point_spend.py --url mysql+pymysql://root:pw@localhost/bench_db
+    python benchmarks/bench_point_spend.py --threads 16 --spends 2000
+
+같은 사용자(프로모션 상황)에게 여러 스레드가 동시에 포인트를 차감한다.
+전략별 처리량, p50/p99 지연, 실패 건수, 최종 잔액 정합성을 출력한다.
+--url 미지정 시 임시 SQLite를 쓰지만 SQLite는 DB 단위로 쓰기를 직렬화하므로
+행 락 경합 비교는 MySQL에서 실행해야 의미가 있다.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_tmpdir = tempfile.mkdtemp(prefix="bench_spend_")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmpdir}/app.db")
+
+from sqlalchemy import create_engine, delete, select
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Base, UserFortunePoint, FortuneTransaction
+from app.services.fortune_service import FortuneService
+from app.utils.error_handlers import InsufficientPointsError
+
+BENCH_USER_ID = 999001
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def reset(Session, balance):
+    with Session() as db:
+        db.execute(delete(FortuneTransaction).where(FortuneTransaction.user_id == BENCH_USER_ID))
+        db.execute(delete(UserFortunePoint).where(UserFortunePoint.user_id == BENCH_USER_ID))
+        db.add(UserFortunePoint(user_id=BENCH_USER_ID, points=balance, total_earned=balance, total_spent=0))
+        db.commit()
+
+
+def run(Session, strategy, threads, spends, amount):
+    per_thread = spends // threads
+    latencies, errors, insufficient = [], [], []
+    lock = threading.Lock()
+
+    def worker(index):
+        with Session() as db:
+            service = FortuneService(db)
+            spend = service.use_points_atomic if strategy == "atomic" else service.use_points_locking
+            for i in range(per_thread):
+                start = time.perf_counter()
+                try:
+                    spend(BENCH_USER_ID, amount, "bench", f"bench_{index}_{i}")
+                except InsufficientPointsError:
+                    with lock:
+                        insufficient.append(1)
+                except Exception as e:
+                    with lock:
+                        errors.append(str(e))
+                with lock:
+                    latencies.append((time.perf_counter() - start) * 1000)
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    started = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    with Session() as db:
+        balance = db.execute(
+            select(UserFortunePoint.points).where(UserFortunePoint.user_id == BENCH_USER_ID)
+        ).scalar()
+        ledger = db.execute(
+            select(FortuneTransaction.amount).where(FortuneTransaction.user_id == BENCH_USER_ID)
+        ).scalars().all()
+
+    return {
+        "strategy": strategy,
+        "spends_per_sec": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "insufficient": len(insufficient),
+        "errors": len(errors),
+        "final_balance": balance,
+        "ledger_consistent": balance == spends * amount * 2 + sum(ledger),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=f"sqlite:///{_tmpdir}/bench.db")
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--spends", type=int, default=2000)
+    parser.add_argument("--amount", type=int, default=10)
+    args = parser.parse_args()
+
+    connect_args = {"timeout": 30, "check_same_thread": False} if args.url.startswith("sqlite") else {}
+    engine = create_engine(args.url, pool_size=args.threads, connect_args=connect_args)
+    Base.metadata.create_all(engine, tables=[UserFortunePoint.__table__, FortuneTransaction.__table__])
+    Session = sessionmaker(bind=engine)
+
+    for strategy in ("locking", "atomic"):
+        # 전체 차감액의 2배를 넣어 잔액 부족 없이 경합만 측정
+        reset(Session, args.spends * args.amount * 2)
+        print(run(Session, strategy, args.threads, args.spends, args.amount))
+
+
+if __name__ == "__main__":
+    main()
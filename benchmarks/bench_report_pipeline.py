@@ -0,0 +1,368 @@
+"""
+리포트 생성 파이프라인 벤치마크 - 가짜 LLM + SQLite, 함수별 시간 / 최대 RSS / 코어당 처리량
+
+사용법:
+    python benchmarks/bench_report_pipeline.py --reports 200 --workers 1
+    python benchmarks/bench_report_pipeline.py --reports 200 --save-baseline   # 기준값 저장
+    python benchmarks/bench_report_pipeline.py --reports 200 --renderer png --pdf
+
+고정된 saju_key 코퍼스(CORPUS)와 미리 정해둔 LLM 응답(fake_llm)으로 주문 --reports 건을 만들고
+generate_full_report 태스크와 같은 순서(사주 계산 → LLM → 분석 캐시 저장 → HTML 생성 → 파일 저장
+→ 선택적으로 WeasyPrint PDF)로 리포트를 생성한다. OpenAI / Celery / Redis 없이 CPU 작업만 잰다.
+
+출력:
+- 함수별 호출 수 / 평균 / p95 / 리포트 1건 대비 비중 (중첩 호출이라 비중 합은 100%를 넘는다)
+- 최대 RSS (워커 중 최대), 리포트/초/코어, CPU 초당 리포트
+- --baseline 파일이 있으면 비교해 --tolerance 이상 나빠진 항목을 표시하고 종료 코드 1
+  (기준값은 머신마다 다르므로 같은 머신 / CI 러너에서 --save-baseline으로 만든다)
+"""
+
+import argparse
+import json
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from functools import wraps
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+os.chdir(REPO_ROOT)  # 리포트 템플릿(templates/)과 차트 에셋 경로가 상대 경로
+
+_tmpdir = tempfile.mkdtemp(prefix="bench_report_pipeline_")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmpdir}/app.db")
+os.environ.setdefault("OPENAI_API_KEY", "bench")
+
+from app import report_utils, utils
+from app.database import SessionLocal, engine
+from app.models import Base, Order, SajuAnalysisCache, SajuUser, User
+from app.routers.saju import analyze_four_pillars_to_string
+from app.saju_utils import SajuKeyManager
+from app.services.saju_service import SajuService
+from app.utils.report_files import write_report_file
+
+DEFAULT_BASELINE = os.path.join(REPO_ROOT, "benchmarks", "baselines", "report_pipeline.json")
+
+# (생년월일, 시, 성별, 달력) - 오행 분포가 고르게 섞이도록 고른 고정 코퍼스
+CORPUS = [
+    ("1984-06-01", 12, "male", "SOL"), ("1990-01-15", 3, "female", "SOL"),
+    ("1975-11-30", None, "male", "SOL"), ("2001-07-07", 21, "female", "SOL"),
+    ("1968-03-21", 8, "male", "LUN"), ("1995-12-25", 0, "female", "SOL"),
+    ("1988-08-08", 16, "male", "SOL"), ("1979-04-02", None, "female", "LUN"),
+    ("2003-02-28", 5, "male", "SOL"), ("1960-10-10", 10, "female", "SOL"),
+    ("1992-05-17", 23, "male", "SOL"), ("1986-09-09", 14, "female", "LUN"),
+]
+NAMES = ["김민준", "이서연", "박지훈", "최수아", "정도윤", "강하은"]
+
+SECTIONS = [
+    ("타고난 성향", "목 기운이 뻗어 나가며 새로운 일을 시작하는 힘이 강합니다"),
+    ("재물운", "꾸준히 모으는 재물이 크게 불어나는 구조입니다"),
+    ("직업운", "사람을 이끄는 역할에서 능력이 돋보입니다"),
+    ("애정운", "진심을 천천히 보여줄 때 관계가 깊어집니다"),
+    ("건강운", "수 기운이 약해 신장과 순환 관리가 필요합니다"),
+    ("대인관계", "주변의 조언을 받아들이면 기회가 넓어집니다"),
+    ("2025년 흐름", "상반기에는 준비, 하반기에는 결실의 시기입니다"),
+    ("개운법", "푸른색 소품과 아침 산책이 균형을 돕습니다"),
+]
+
+
+def fake_llm(saju_key: str, content: str) -> str:
+    """ai_sajupalja_with_chatgpt_sync 대신 쓰는 고정 응답 (GPT 응답 형식 - ### 섹션 / **A.** 소제목)"""
+    offset = sum(map(ord, saju_key)) % len(SECTIONS)
+    parts = []
+    for i in range(len(SECTIONS)):
+        title, body = SECTIONS[(i + offset) % len(SECTIONS)]
+        sentences = " ".join(f"{body}. 이 흐름은 {j + 1}번째 시기에 특히 뚜렷합니다." for j in range(6))
+        parts.append(
+            f"### {i + 1}. {title}: {sentences} **A. 핵심 포인트** {body}. "
+            f"**B. 실천 방법** 작은 습관부터 바꾸어 보세요. 꾸준함이 가장 큰 힘이 됩니다."
+        )
+    return " ".join(parts) + f"\n\n분석 근거: {content[:80]}"
+
+
+class Timings:
+    """모듈 속성을 감싸 호출 시간 수집 (모듈 전역 이름으로 호출되는 함수만 잡힌다)"""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self.enabled = False
+
+    def wrap(self, owner, name, label=None, static=False):
+        original = getattr(owner, name)
+        label = label or name
+
+        @wraps(original)
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                if self.enabled:
+                    self.samples[label].append(time.perf_counter() - started)
+
+        setattr(owner, name, staticmethod(timed) if static else timed)
+        return timed
+
+    def measure(self, label, func, *args, **kwargs):
+        """직접 호출하는 함수 시간 측정"""
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            if self.enabled:
+                self.samples[label].append(time.perf_counter() - started)
+
+
+def instrument(timings: Timings):
+    timings.wrap(SajuService, "get_or_calculate_saju", static=True)
+    for name in (
+        "generate_live_report_from_db", "generate_enhanced_report_html", "format_ai_analysis",
+        "create_executive_summary", "radar_chart_svg", "enhanced_radar_chart_url",
+        "enhanced_radar_chart_base64", "generate_2025_fortune_calendar",
+        "generate_action_checklist", "generate_fortune_summary",
+    ):
+        timings.wrap(utils, name)
+    # generate_enhanced_report_html 안에서 함수 실행 시점에 import하는 함수들
+    for name in ("generate_lucky_keywords_with_explanation", "keyword_card_improved"):
+        timings.wrap(report_utils, name)
+
+
+def build_saju_key(entry) -> str:
+    birth_date, hour, gender, calendar = entry
+    return SajuKeyManager.build_saju_key(birth_date, hour, gender, calendar)
+
+
+def seed(reports: int):
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    user = User(username="bench", email="bench@example.com", password="x")
+    db.add(user)
+    db.flush()
+    keys = []
+    for i, entry in enumerate(CORPUS):
+        saju_key = build_saju_key(entry)
+        keys.append(saju_key)
+        db.add(SajuUser(name=NAMES[i % len(NAMES)], birthdate=entry[0], birthhour=entry[1],
+                        gender=entry[2], calendar=entry[3], saju_key=saju_key, user_id=user.id))
+    order_ids = []
+    for i in range(reports):
+        order = Order(user_id=user.id, amount=1000, kakao_tid=f"TBENCH{i}",
+                      saju_key=keys[i % len(keys)], status="paid", report_status="pending")
+        db.add(order)
+        db.flush()
+        order_ids.append(order.id)
+    db.commit()
+    db.close()
+    return order_ids
+
+
+def generate_report(db, order_id: int, timings: Timings, args, pdf) -> None:
+    """generate_full_report의 3~6단계 (Celery 상태 갱신 / 이벤트 발행 제외)"""
+    order = db.query(Order).filter(Order.id == order_id).first()
+    saju_key = order.saju_key
+
+    pillars, _ = SajuService.get_or_calculate_saju(saju_key, db)
+    elem_dict_kr, result_text = timings.measure(
+        "analyze_four_pillars_to_string", analyze_four_pillars_to_string,
+        pillars['year'][0], pillars['year'][1], pillars['month'][0], pillars['month'][1],
+        pillars['day'][0], pillars['day'][1], pillars['hour'][0], pillars['hour'][1],
+    )
+    combined_text = "오행 분포:\n" + ", ".join(f"{k}:{v}" for k, v in elem_dict_kr.items()) + "\n\n" + result_text
+    if args.llm_latency_ms:
+        time.sleep(args.llm_latency_ms / 1000)
+    analysis_result = fake_llm(saju_key, combined_text)
+
+    cache = db.query(SajuAnalysisCache).filter_by(saju_key=saju_key).first()
+    if cache:
+        cache.analysis_full = analysis_result
+    else:
+        cache = SajuAnalysisCache(saju_key=saju_key, analysis_full=analysis_result)
+        db.add(cache)
+    db.commit()
+
+    html_content = utils.generate_live_report_from_db(order_id, db, chart_renderer=args.renderer)
+    html_path = os.path.join(_tmpdir, "reports", f"report_order_{order_id}.html")
+    timings.measure("write_report_file", write_report_file, html_path, html_content)
+    if pdf is not None:
+        pdf_html = utils.generate_live_report_from_db(order_id, db, inline_assets=True, chart_renderer=args.renderer)
+        timings.measure("html_to_pdf", pdf, pdf_html, html_path[:-5] + ".pdf")
+    order.report_status = "completed"
+    db.commit()
+
+
+def load_pdf(enabled: bool):
+    if not enabled:
+        return None
+    try:
+        from app.tasks import html_to_pdf_production
+        return html_to_pdf_production
+    except (ImportError, OSError) as e:
+        print(f"WeasyPrint 사용 불가 - PDF 단계 제외: {e}")
+        return None
+
+
+def run_worker(order_ids, args):
+    """워커 1개 - 리포트 생성 후 함수별 시간 / 최대 RSS / CPU 시간 반환"""
+    engine.dispose()  # fork된 커넥션 풀을 물려받지 않도록
+    timings = Timings()
+    instrument(timings)
+    pdf = load_pdf(args.pdf)
+    os.makedirs(os.path.join(_tmpdir, "reports"), exist_ok=True)
+    db = SessionLocal()
+    try:
+        # 워밍업 (템플릿 / 폰트 / import 초기화 비용 제외)
+        for order_id in order_ids[:args.warmup]:
+            generate_report(db, order_id, timings, args, pdf)
+        timings.enabled = True
+        cpu_started = time.process_time()
+        wall_started = time.perf_counter()
+        per_report = []
+        for order_id in order_ids[args.warmup:]:
+            started = time.perf_counter()
+            generate_report(db, order_id, timings, args, pdf)
+            per_report.append(time.perf_counter() - started)
+        wall_seconds = time.perf_counter() - wall_started
+        cpu_seconds = time.process_time() - cpu_started
+    finally:
+        db.close()
+    return {
+        "samples": dict(timings.samples),
+        "per_report": per_report,
+        "wall_seconds": wall_seconds,
+        "cpu_seconds": cpu_seconds,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def summarize(results, workers):
+    samples = defaultdict(list)
+    per_report = []
+    for result in results:
+        per_report.extend(result["per_report"])
+        for name, values in result["samples"].items():
+            samples[name].extend(values)
+    reports = len(per_report)
+    report_mean = statistics.mean(per_report)
+    functions = {
+        name: {
+            "calls_per_report": round(len(values) / reports, 2),
+            "mean_ms": round(statistics.mean(values) * 1000, 3),
+            "p95_ms": round(percentile(values, 95) * 1000, 3),
+            "share": round(sum(values) / reports / report_mean, 3),
+        }
+        for name, values in samples.items()
+    }
+    return {
+        "reports": reports,
+        "workers": workers,
+        "report_mean_ms": round(report_mean * 1000, 2),
+        "report_p95_ms": round(percentile(per_report, 95) * 1000, 2),
+        # 워커들이 동시에 도므로 가장 늦게 끝난 워커의 측정 구간 기준
+        "reports_per_sec_per_core": round(reports / max(r["wall_seconds"] for r in results) / workers, 2),
+        "reports_per_cpu_sec": round(reports / sum(r["cpu_seconds"] for r in results), 2),
+        "peak_rss_mb": round(max(r["peak_rss_mb"] for r in results), 1),
+        "functions": dict(sorted(functions.items(), key=lambda item: -item[1]["share"])),
+    }
+
+
+def compare(summary, baseline, tolerance):
+    """기준값 대비 tolerance 이상 나빠진 항목 목록"""
+    regressions = []
+
+    def check(label, current, base, higher_is_better=False):
+        if not base:
+            return
+        change = (base - current) / base if higher_is_better else (current - base) / base
+        if change > tolerance:
+            regressions.append(f"{label}: {round(base, 3)} → {round(current, 3)} ({change:+.0%})")
+
+    check("reports_per_sec_per_core", summary["reports_per_sec_per_core"],
+          baseline.get("reports_per_sec_per_core"), higher_is_better=True)
+    check("report_mean_ms", summary["report_mean_ms"], baseline.get("report_mean_ms"))
+    check("peak_rss_mb", summary["peak_rss_mb"], baseline.get("peak_rss_mb"))
+    for name, values in summary["functions"].items():
+        base = baseline.get("functions", {}).get(name)
+        # 0.05ms 미만 함수는 측정 잡음이 커서 제외
+        if base and base["mean_ms"] >= 0.05:
+            check(f"{name}.mean_ms", values["mean_ms"], base["mean_ms"])
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--reports", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--warmup", type=int, default=5, help="워커별 측정 제외 리포트 수")
+    parser.add_argument("--renderer", choices=["svg", "png"], default=None,
+                        help="차트 렌더러 (기본 REPORT_CHART_RENDERER)")
+    parser.add_argument("--pdf", action="store_true", help="WeasyPrint PDF 생성 포함")
+    parser.add_argument("--llm-latency-ms", type=float, default=0, help="가짜 LLM 응답 지연")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="회귀로 볼 악화 비율")
+    parser.add_argument("--json", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    workers = max(1, args.workers)
+    order_ids = seed(args.reports + args.warmup * workers)
+    chunks = [order_ids[i::workers] for i in range(workers)]
+
+    if workers == 1:
+        results = [run_worker(chunks[0], args)]
+    else:
+        from multiprocessing import get_context
+        with get_context("fork").Pool(workers) as pool:
+            results = pool.starmap(run_worker, [(chunk, args) for chunk in chunks])
+    summary = summarize(results, workers)
+    summary["renderer"] = args.renderer or report_utils.REPORT_CHART_RENDERER
+    summary["pdf"] = bool(args.pdf)
+
+    print(f"reports={summary['reports']} workers={workers} renderer={summary['renderer']} pdf={summary['pdf']}")
+    print(f"report mean={summary['report_mean_ms']}ms p95={summary['report_p95_ms']}ms "
+          f"throughput={summary['reports_per_sec_per_core']} reports/s/core "
+          f"({summary['reports_per_cpu_sec']} per CPU-s) peak_rss={summary['peak_rss_mb']}MB")
+    print(f"{'function':42s} {'calls':>6s} {'mean_ms':>9s} {'p95_ms':>9s} {'share':>6s}")
+    for name, values in summary["functions"].items():
+        print(f"{name:42s} {values['calls_per_report']:6.2f} {values['mean_ms']:9.3f} "
+              f"{values['p95_ms']:9.3f} {values['share']:6.1%}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        print(f"기준값 저장: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"기준값 없음 ({args.baseline}) - --save-baseline으로 생성")
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if (baseline.get("renderer"), baseline.get("pdf"), baseline.get("workers")) != \
+            (summary["renderer"], summary["pdf"], workers):
+        print("기준값과 측정 조건(renderer / pdf / workers)이 달라 비교하지 않음")
+        return 0
+    regressions = compare(summary, baseline, args.tolerance)
+    if regressions:
+        print(f"회귀 감지 (허용 {args.tolerance:.0%}):")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print(f"기준값 대비 회귀 없음 (허용 {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+"""
+리포트 대기 부하 벤치마크 - /order/status 폴링 vs /order/events SSE
+
+사용법:
+    python benchmarks/bench_report_progress.py --users 200 --generation 6 --poll-interval 1
+
+--users 명이 각자 생성 중인 리포트를 기다린다. --generation 초 뒤 리포트가 완료된다
+(실제 30~90초 / 5초 폴링을 시간만 줄인 것). 두 방식에서 대기 사용자 1명당
+HTTP 요청 수, SQL 쿼리 수, 결과 백엔드(AsyncResult) 조회 수, Redis 명령 수와
+완료를 알게 되기까지 걸린 시간을 출력한다.
+폴링 방식의 AsyncResult 조회는 결과 백엔드 없이 돌리기 위해 celery_task_id를 비워두고
+요청 수로 계산한다 (운영에서는 폴링 1회당 1번). Redis가 없으면 SSE는 상태 보정 쿼리로만
+완료를 감지하므로 REPORT_PROGRESS_RECONCILE_INTERVAL을 폴링 간격과 같게 맞춘다.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from base64 import b64encode
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_tmpdir = tempfile.mkdtemp(prefix="bench_report_progress_")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmpdir}/app.db")
+os.environ.setdefault("OPENAI_API_KEY", "bench")
+os.environ.setdefault("SECRET_KEY", "bench-secret")
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--generation", type=float, default=6)
+    parser.add_argument("--poll-interval", type=float, default=1)
+    return parser.parse_args()
+
+
+ARGS = _parse_args()
+os.environ.setdefault("REPORT_PROGRESS_RECONCILE_INTERVAL", str(ARGS.poll_interval))
+
+import httpx
+import uvicorn
+from itsdangerous import TimestampSigner
+from sqlalchemy import update
+
+from app.database import SessionLocal
+from app.db_metrics import pool_metrics_snapshot
+from app.main import app
+from app.models import Order, User
+from app.services.report_progress_service import publish_report_progress, report_event, report_progress_hub
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def session_cookie(user_id: int) -> str:
+    """SessionMiddleware와 같은 방식으로 서명한 세션 쿠키"""
+    data = b64encode(json.dumps({"user_id": user_id}).encode("utf-8"))
+    return TimestampSigner(os.environ["SECRET_KEY"]).sign(data).decode("utf-8")
+
+
+def seed(users: int):
+    db = SessionLocal()
+    orders = []
+    for i in range(users):
+        user = User(username=f"bench{i}", email=f"bench{i}@example.com", password="x")
+        db.add(user)
+        db.flush()
+        order = Order(
+            user_id=user.id, amount=1000, kakao_tid=f"TBENCH{i}", saju_key="1990-01-01_12_M",
+            status="paid", report_status="generating",
+        )
+        db.add(order)
+        db.flush()
+        orders.append((user.id, order.id))
+    db.commit()
+    db.close()
+    return orders
+
+
+def reset(orders):
+    db = SessionLocal()
+    db.execute(update(Order).where(Order.id.in_([o for _, o in orders])).values(report_status="generating"))
+    db.commit()
+    db.close()
+
+
+def complete(orders):
+    """리포트 태스크 완료 흉내 - 상태 갱신 + 종료 이벤트 발행"""
+    db = SessionLocal()
+    db.execute(update(Order).where(Order.id.in_([o for _, o in orders])).values(report_status="completed"))
+    db.commit()
+    db.close()
+    for _, order_id in orders:
+        publish_report_progress(order_id, report_event(order_id, "completed"))
+
+
+def total_queries() -> int:
+    return sum(engine["queries"] for engine in pool_metrics_snapshot().values())
+
+
+async def wait_polling(client, user_id, order_id, interval, counters):
+    cookies = {"session": session_cookie(user_id)}
+    while True:
+        counters["requests"] += 1
+        response = await client.get(f"/order/status/{order_id}", cookies=cookies)
+        if response.json().get("report_status") == "completed":
+            return time.perf_counter()
+        await asyncio.sleep(interval)
+
+
+async def wait_sse(client, user_id, order_id, interval, counters):
+    cookies = {"session": session_cookie(user_id)}
+    counters["requests"] += 1
+    async with client.stream("GET", f"/order/events/{order_id}", cookies=cookies) as response:
+        async for line in response.aiter_lines():
+            if line == "event: completed":
+                return time.perf_counter()
+
+
+async def run_mode(base_url, orders, mode, generation, interval):
+    reset(orders)
+    counters = {"requests": 0}
+    hub_before = report_progress_hub.stats()
+    queries_before = total_queries()
+    waiter = wait_polling if mode == "polling" else wait_sse
+
+    limits = httpx.Limits(max_connections=len(orders) + 10)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        tasks = [asyncio.create_task(waiter(client, u, o, interval, counters)) for u, o in orders]
+        await asyncio.sleep(generation)
+        completed_at = time.perf_counter()
+        await asyncio.to_thread(complete, orders)
+        finished = await asyncio.gather(*tasks)
+
+    users = len(orders)
+    hub_after = report_progress_hub.stats()
+    requests = counters["requests"]
+    return {
+        "requests": requests / users,
+        "queries": (total_queries() - queries_before) / users,
+        "backend_lookups": (requests / users) if mode == "polling" else 0,
+        "redis_ops": (hub_after["redis_ops"] - hub_before["redis_ops"]) / users,
+        "notify_p50_ms": statistics.median(t - completed_at for t in finished) * 1000,
+    }
+
+
+def main():
+    orders = seed(ARGS.users)
+    port = free_port()
+    # keep-alive 만료와 다음 폴링이 겹쳐 끊기지 않도록 유휴 타임아웃을 넉넉히
+    config = uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", timeout_keep_alive=75)
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+
+    base_url = f"http://127.0.0.1:{port}"
+    print(f"users={ARGS.users} generation={ARGS.generation}s poll_interval={ARGS.poll_interval}s "
+          f"sse_backend={report_progress_hub.stats()['backend']}")
+    try:
+        for mode in ("polling", "sse"):
+            result = asyncio.run(run_mode(base_url, orders, mode, ARGS.generation, ARGS.poll_interval))
+            print(
+                f"{mode:8s} per user: requests={result['requests']:.1f} sql={result['queries']:.2f} "
+                f"result_backend={result['backend_lookups']:.1f} redis={result['redis_ops']:.2f} "
+                f"notify_p50={result['notify_p50_ms']:.0f}ms"
+            )
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+외부 API 가짜 서버 - OpenAI / Ollama / 카카오페이를 한 포트에서 흉내 (부하 테스트 / 로컬 개발용)
+
+사용법:
+    python benchmarks/fake_upstreams.py --port 8766 --llm-latency-ms 800 --kakao-latency-ms 30
+    OPENAI_BASE_URL=http://127.0.0.1:8766/v1 OLLAMA_URL=http://127.0.0.1:8766 \\
+    KAKAOPAY_API_HOST=http://127.0.0.1:8766 KAKAO_SECRET_KEY=mock uvicorn app.main:app
+
+- OpenAI: POST /v1/chat/completions (Chat Completions 응답 형식, 입력 길이에 비례한 usage)
+- Ollama: GET /api/tags, POST /api/generate (stream=false)
+- 카카오페이: benchmarks/mock_kakaopay.py의 ready / approve / order
+LLM 응답은 요청 내용에서 결정적으로 만든 고정 텍스트라 같은 입력이면 같은 출력이 나온다.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import time
+import uuid
+
+from fastapi import FastAPI, Request
+
+try:
+    from benchmarks.mock_kakaopay import build_app as build_kakaopay_app
+except ImportError:  # 스크립트로 직접 실행한 경우
+    from mock_kakaopay import build_app as build_kakaopay_app
+
+OLLAMA_MODEL = "gemma3:27b-it-q8_0"
+
+SECTIONS = ["타고난 성향", "재물운", "직업운", "애정운", "건강운", "2025년 흐름"]
+
+
+def fake_completion(text: str, sections: int = 3) -> str:
+    """입력 해시로 섹션 순서를 정하는 고정 사주 해석 (### 섹션 / **A.** 소제목 형식)"""
+    offset = int(hashlib.md5(text.encode("utf-8")).hexdigest()[:4], 16)
+    parts = []
+    for i in range(sections):
+        title = SECTIONS[(offset + i) % len(SECTIONS)]
+        parts.append(
+            f"### {i + 1}. {title}: 타고난 기운이 조화를 이루어 안정적인 흐름을 보입니다. "
+            f"**A. 핵심 포인트** 꾸준함이 가장 큰 힘이 됩니다. **B. 실천 방법** 작은 습관부터 바꾸어 보세요."
+        )
+    return "\n\n".join(parts)
+
+
+def build_app(llm_latency_ms: float = 0, kakao_latency_ms: float = 0, order_fail_rate: float = 0) -> FastAPI:
+    app = FastAPI()
+    # 카카오페이 경로는 목 서버 앱을 그대로 마운트 (지연은 목 서버 미들웨어가 처리)
+    kakaopay = build_kakaopay_app(kakao_latency_ms, order_fail_rate)
+    app.state.calls = {"openai": 0, "ollama": 0}
+
+    async def llm_delay():
+        if llm_latency_ms:
+            await asyncio.sleep(llm_latency_ms / 1000)
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        app.state.calls["openai"] += 1
+        await llm_delay()
+        prompt = "".join(str(message.get("content", "")) for message in body.get("messages", []))
+        content = fake_completion(prompt, sections=6 if body.get("max_tokens", 0) > 1000 else 2)
+        prompt_tokens, completion_tokens = len(prompt) // 2, len(content) // 2
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "gpt-4o"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    @app.get("/api/tags")
+    async def ollama_tags():
+        return {"models": [{"name": OLLAMA_MODEL}]}
+
+    @app.post("/api/generate")
+    async def ollama_generate(request: Request):
+        body = await request.json()
+        app.state.calls["ollama"] += 1
+        await llm_delay()
+        return {
+            "model": body.get("model", OLLAMA_MODEL),
+            "response": fake_completion(body.get("prompt", ""), sections=6),
+            "done": True,
+        }
+
+    @app.get("/_calls")
+    async def calls():
+        return app.state.calls
+
+    app.mount("/", kakaopay)
+    return app
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--llm-latency-ms", type=float, default=0)
+    parser.add_argument("--kakao-latency-ms", type=float, default=0)
+    parser.add_argument("--order-fail-rate", type=float, default=0)
+    args = parser.parse_args()
+    uvicorn.run(
+        build_app(args.llm_latency_ms, args.kakao_latency_ms, args.order_fail_rate),
+        host=args.host, port=args.port, log_level="warning",
+    )
@@ -0,0 +1,83 @@
+"""
+카카오페이 API 목 서버 - 결제 클라이언트 벤치마크 / 로컬 테스트용
+
+사용법:
+    python benchmarks/mock_kakaopay.py --port 8765 --latency-ms 30 --order-fail-rate 0.2
+    KAKAOPAY_API_HOST=http://127.0.0.1:8765 KAKAO_SECRET_KEY=mock uvicorn app.main:app
+
+ready / approve / order 엔드포인트를 흉내 내고, 응답 지연과
+주문 조회 5xx 비율(재시도 확인용)을 지정할 수 있다.
+"""
+
+import argparse
+import asyncio
+import random
+import uuid
+from datetime import datetime
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+
+def build_app(latency_ms: float = 0, order_fail_rate: float = 0) -> FastAPI:
+    app = FastAPI()
+    app.state.connections = set()
+    payments = {}
+
+    @app.middleware("http")
+    async def simulate(request: Request, call_next):
+        # 클라이언트 커넥션 재사용 여부 확인용 (host:port 단위)
+        if request.client:
+            app.state.connections.add(f"{request.client.host}:{request.client.port}")
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+        return await call_next(request)
+
+    @app.post("/online/v1/payment/ready")
+    async def ready(request: Request):
+        body = await request.json()
+        tid = f"T{uuid.uuid4().hex[:18]}"
+        payments[tid] = {**body, "status": "READY"}
+        return {
+            "tid": tid,
+            "next_redirect_pc_url": f"https://mock.kakaopay/pc/{tid}",
+            "next_redirect_mobile_url": f"https://mock.kakaopay/mobile/{tid}",
+            "created_at": datetime.now().isoformat(),
+        }
+
+    @app.post("/online/v1/payment/approve")
+    async def approve(request: Request):
+        body = await request.json()
+        payment = payments.get(body.get("tid"))
+        if payment is None:
+            return JSONResponse({"error_code": -780, "error_message": "invalid tid"}, status_code=400)
+        payment["status"] = "SUCCESS_PAYMENT"
+        return {
+            "aid": f"A{uuid.uuid4().hex[:18]}",
+            "tid": body["tid"],
+            "payment_method_type": "MONEY",
+            "amount": {"total": payment.get("total_amount", 0)},
+            "approved_at": datetime.now().isoformat(),
+        }
+
+    @app.post("/online/v1/payment/order")
+    async def order(request: Request):
+        body = await request.json()
+        if random.random() < order_fail_rate:
+            return JSONResponse({"error_code": -9798, "error_message": "service unavailable"}, status_code=503)
+        payment = payments.get(body.get("tid"), {"status": "READY"})
+        return {"tid": body.get("tid"), "status": payment["status"]}
+
+    return app
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--order-fail-rate", type=float, default=0)
+    args = parser.parse_args()
+    uvicorn.run(build_app(args.latency_ms, args.order_fail_rate), host=args.host, port=args.port, log_level="warning")
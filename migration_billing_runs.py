@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# migration_billing_runs.py
+"""
+정기결제 실행 엔진 도입: subscription_billing_runs / subscription_billing_chunks 테이블 생성
+
+결제일별 실행 1건과 구독 id 구간별 청크가 체크포인트 역할을 한다.
+기존 테이블에는 포인트 지급 임대 상태(granting)를 추가한다.
+여러 번 실행해도 안전하다.
+"""
+
+import os
+import sys
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import text
+
+from app.database import engine
+from app.models import SubscriptionBillingChunk, SubscriptionBillingRun
+
+
+def create_tables():
+    """실행 / 청크 테이블 생성"""
+    print("🔄 정기결제 실행 테이블 생성 중...")
+    for table in (SubscriptionBillingRun.__table__, SubscriptionBillingChunk.__table__):
+        table.create(bind=engine, checkfirst=True)
+        print(f"✅ {table.name} 테이블 준비됨")
+
+
+def add_granting_status():
+    """청크 상태 ENUM에 granting 추가 (MySQL만, 다른 DB는 문자열 컬럼)"""
+    if engine.dialect.name != "mysql":
+        print("⏭️  granting 상태: ENUM 변경 불필요")
+        return
+
+    print("\n🔄 청크 상태에 granting 추가 중...")
+    try:
+        with engine.begin() as conn:
+            conn.execute(text(
+                "ALTER TABLE subscription_billing_chunks MODIFY status "
+                "ENUM('pending', 'running', 'billed', 'granting', 'done', 'failed') DEFAULT 'pending'"
+            ))
+        print("✅ granting 상태 추가됨")
+    except Exception as e:
+        print(f"❌ granting 상태 추가 실패: {e}")
+
+
+def main():
+    """메인 마이그레이션 실행"""
+    print("🚀 정기결제 실행 엔진 마이그레이션 시작")
+    print("=" * 50)
+
+    create_tables()
+    add_granting_status()
+
+    print("\n" + "=" * 50)
+    print("🎉 정기결제 실행 엔진 마이그레이션 완료!")
+
+
+if __name__ == "__main__":
+    main()
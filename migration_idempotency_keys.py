@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# migration_idempotency_keys.py
+"""
+결제 멱등성 저장소 도입: idempotency_keys 테이블 생성
+
+Redis가 없는 환경에서 워커 간 공유 저장소로 사용한다.
+기존 테이블은 기본키를 key → (scope, key)로 바꾼다 (Redis idem:{scope}:{key}와 같은 단위).
+여러 번 실행해도 안전하다.
+"""
+
+import os
+import sys
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import inspect, text
+
+from app.database import engine
+from app.models import IdempotencyKey
+
+
+def create_table():
+    """멱등성 키 테이블 생성"""
+    print("🔄 idempotency_keys 테이블 생성 중...")
+    IdempotencyKey.__table__.create(bind=engine, checkfirst=True)
+    print("✅ idempotency_keys 테이블 준비됨")
+
+
+def migrate_primary_key():
+    """기본키를 (scope, key)로 변경 - 이미 바뀐 경우 건너뜀"""
+    columns = inspect(engine).get_pk_constraint("idempotency_keys").get("constrained_columns", [])
+    if columns != ["key"]:
+        print("⏭️  기본키: 이미 (scope, key)")
+        return
+
+    print("\n🔄 기본키를 (scope, key)로 변경 중...")
+    try:
+        if engine.dialect.name == "mysql":
+            with engine.begin() as conn:
+                conn.execute(text(
+                    "ALTER TABLE idempotency_keys DROP PRIMARY KEY, ADD PRIMARY KEY (scope, `key`)"
+                ))
+        else:
+            # SQLite 등은 기본키 변경 불가 - 키는 수 분짜리라 테이블을 다시 만든다
+            IdempotencyKey.__table__.drop(bind=engine)
+            IdempotencyKey.__table__.create(bind=engine)
+        print("✅ 기본키 변경됨")
+    except Exception as e:
+        print(f"❌ 기본키 변경 실패: {e}")
+
+
+def main():
+    """메인 마이그레이션 실행"""
+    print("🚀 멱등성 저장소 마이그레이션 시작")
+    print("=" * 50)
+
+    create_table()
+    migrate_primary_key()
+
+    print("\n" + "=" * 50)
+    print("🎉 멱등성 저장소 마이그레이션 완료!")
+
+
+if __name__ == "__main__":
+    main()
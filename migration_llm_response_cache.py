@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+# migration_llm_response_cache.py
+"""
+LLM 응답 캐시 도입: llm_response_cache 테이블 생성
+
+키는 (모델, 프롬프트 해시, 입력 해시, 샘플링 파라미터) - saju_key가 달라도 사주팔자가 같으면 응답을 재사용한다.
+기존 SajuAnalysisCache는 그대로 두고, 그 아래 단계 캐시로 동작한다.
+여러 번 실행해도 안전하다.
+"""
+
+import os
+import sys
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.database import engine
+from app.models import LLMResponseCache
+
+
+def create_table():
+    """캐시 테이블 생성"""
+    print("🔄 llm_response_cache 테이블 생성 중...")
+    LLMResponseCache.__table__.create(bind=engine, checkfirst=True)
+    print("✅ llm_response_cache 테이블 준비됨")
+
+
+def main():
+    """메인 마이그레이션 실행"""
+    print("🚀 LLM 응답 캐시 마이그레이션 시작")
+    print("=" * 50)
+
+    create_table()
+
+    print("\n" + "=" * 50)
+    print("🎉 LLM 응답 캐시 마이그레이션 완료!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+# migration_llm_usage.py
+"""
+LLM 사용량 / 예산 도입: llm_usage (호출별), llm_usage_hourly (시간별 집계) 테이블 생성
+
+호출별 행은 LLM_USAGE_RETENTION_DAYS 이후 삭제되고, aggregate_llm_usage Celery 작업이
+10분마다 시간별 집계를 갱신한다. 여러 번 실행해도 안전하다.
+"""
+
+import os
+import sys
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.database import engine
+from app.models import LLMUsage, LLMUsageHourly
+
+
+def create_tables():
+    """사용량 / 집계 테이블 생성"""
+    print("🔄 LLM 사용량 테이블 생성 중...")
+    for table in (LLMUsage.__table__, LLMUsageHourly.__table__):
+        table.create(bind=engine, checkfirst=True)
+        print(f"✅ {table.name} 테이블 준비됨")
+
+
+def main():
+    """메인 마이그레이션 실행"""
+    print("🚀 LLM 사용량 마이그레이션 시작")
+    print("=" * 50)
+
+    create_tables()
+
+    print("\n" + "=" * 50)
+    print("🎉 LLM 사용량 마이그레이션 완료!")
+
+
+if __name__ == "__main__":
+    main()
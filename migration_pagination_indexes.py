@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# migration_pagination_indexes.py
+"""
+키셋 페이지네이션용 복합 인덱스 추가 ((필터 컬럼, created_at, id))
+"""
+
+import os
+import sys
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import text
+
+from app.database import engine
+
+INDEXES = {
+    "idx_fortune_tx_user_created":
+        "CREATE INDEX idx_fortune_tx_user_created ON fortune_transactions (user_id, created_at, id)",
+    "idx_fortune_tx_user_type_created":
+        "CREATE INDEX idx_fortune_tx_user_type_created ON fortune_transactions (user_id, transaction_type, created_at, id)",
+    "idx_purchase_user_created":
+        "CREATE INDEX idx_purchase_user_created ON user_purchases (user_id, created_at, id)",
+    "idx_review_product_visible_created":
+        "CREATE INDEX idx_review_product_visible_created ON user_reviews (product_id, is_visible, created_at, id)",
+    "idx_post_published_created":
+        "CREATE INDEX idx_post_published_created ON blog_posts (is_published, created_at, id)",
+}
+
+
+def add_indexes():
+    """페이지네이션 인덱스 생성"""
+    print("🔄 페이지네이션 인덱스 추가 중...")
+
+    with engine.begin() as conn:
+        for name, statement in INDEXES.items():
+            try:
+                conn.execute(text(statement))
+                print(f"✅ {name} 인덱스 추가됨")
+            except Exception as e:
+                if "Duplicate key name" in str(e) or "already exists" in str(e):
+                    print(f"⏭️  {name} 인덱스 이미 존재")
+                else:
+                    print(f"❌ {name} 인덱스 추가 실패: {e}")
+
+
+if __name__ == "__main__":
+    add_indexes()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# migration_point_lots.py
+"""
+포인트 lot 원장 도입: fortune_point_lots 테이블 / 인덱스 생성 및 기존 잔액 backfill,
+earn 거래 (user_id, source, reference_id) 유니크 인덱스 추가
+
+FIFO 차감이므로 현재 잔액은 가장 최근 적립분에 남아 있다고 보고,
+최신 earn 거래부터 잔액을 채워 open lot을 만든다. 여러 번 실행해도
+이미 lot이 있는 사용자는 건너뛴다.
+"""
+
+import os
+import sys
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import desc, insert, text
+
+from app.database import SessionLocal, engine
+from app.models import FortunePointLot, FortuneTransaction, UserFortunePoint
+
+
+def create_tables_and_indexes():
+    """lot 테이블 및 만료 조회 인덱스 생성"""
+    print("🔄 fortune_point_lots 테이블 / 인덱스 생성 중...")
+    FortunePointLot.__table__.create(bind=engine, checkfirst=True)
+    print("✅ fortune_point_lots 테이블 준비됨")
+
+    statements = {
+        "idx_fortune_tx_user_type_expires":
+            "CREATE INDEX idx_fortune_tx_user_type_expires ON fortune_transactions (user_id, transaction_type, expires_at)",
+        "ix_fortune_transactions_reference_id":
+            "CREATE INDEX ix_fortune_transactions_reference_id ON fortune_transactions (reference_id)",
+    }
+    with engine.begin() as conn:
+        for name, statement in statements.items():
+            try:
+                conn.execute(text(statement))
+                print(f"✅ {name} 인덱스 추가됨")
+            except Exception as e:
+                if "Duplicate key name" in str(e) or "already exists" in str(e):
+                    print(f"⏭️  {name} 인덱스 이미 존재")
+                else:
+                    print(f"❌ {name} 인덱스 추가 실패: {e}")
+
+
+def add_earn_reference_unique():
+    """earn 거래 (user_id, source, reference_id) 유니크 인덱스 - 동시 일괄 적립의 중복 지급 방지"""
+    print("\n🔄 적립 참조 ID 유니크 인덱스 생성 중...")
+
+    with engine.begin() as conn:
+        try:
+            conn.execute(text(
+                "ALTER TABLE fortune_transactions ADD COLUMN earn_reference_id VARCHAR(100) "
+                "GENERATED ALWAYS AS (CASE WHEN transaction_type = 'earn' THEN reference_id END) VIRTUAL"
+            ))
+            print("✅ earn_reference_id 컬럼 추가됨")
+        except Exception as e:
+            if "Duplicate column" in str(e) or "duplicate column" in str(e):
+                print("⏭️  earn_reference_id 컬럼 이미 존재")
+            else:
+                print(f"❌ earn_reference_id 컬럼 추가 실패: {e}")
+                return
+
+    # 이미 중복 적립된 건이 있으면 인덱스를 만들 수 없다 - 목록만 출력하고 수동 정리
+    with engine.connect() as conn:
+        duplicates = conn.execute(text(
+            "SELECT user_id, source, reference_id, COUNT(*) FROM fortune_transactions "
+            "WHERE transaction_type = 'earn' AND reference_id IS NOT NULL "
+            "GROUP BY user_id, source, reference_id HAVING COUNT(*) > 1"
+        )).all()
+    if duplicates:
+        print(f"❌ 중복 적립 {len(duplicates)}건 - 정리 후 다시 실행하세요")
+        for user_id, source, reference_id, count in duplicates[:20]:
+            print(f"   user_id={user_id}, source={source}, reference_id={reference_id}: {count}건")
+        return
+
+    with engine.begin() as conn:
+        try:
+            conn.execute(text(
+                "CREATE UNIQUE INDEX uq_fortune_tx_earn_reference "
+                "ON fortune_transactions (user_id, source, earn_reference_id)"
+            ))
+            print("✅ uq_fortune_tx_earn_reference 인덱스 추가됨")
+        except Exception as e:
+            if "Duplicate key name" in str(e) or "already exists" in str(e):
+                print("⏭️  uq_fortune_tx_earn_reference 인덱스 이미 존재")
+            else:
+                print(f"❌ uq_fortune_tx_earn_reference 인덱스 추가 실패: {e}")
+
+
+def backfill_lots(batch_size: int = 500):
+    """기존 잔액을 최신 적립 거래 기준 open lot으로 변환"""
+    print("\n🔄 기존 잔액 lot backfill 중...")
+
+    db = SessionLocal()
+    try:
+        users_with_lots = {
+            user_id for (user_id,) in db.query(FortunePointLot.user_id).distinct()
+        }
+        balances = db.query(UserFortunePoint.user_id, UserFortunePoint.points).filter(
+            UserFortunePoint.points > 0
+        ).all()
+
+        created = 0
+        pending = []
+        for user_id, points in balances:
+            if user_id in users_with_lots:
+                continue
+
+            left = points
+            earns = db.query(FortuneTransaction).filter(
+                FortuneTransaction.user_id == user_id,
+                FortuneTransaction.transaction_type == "earn"
+            ).order_by(desc(FortuneTransaction.created_at), desc(FortuneTransaction.id)).all()
+
+            for earn in earns:
+                if left <= 0:
+                    break
+                remaining = min(earn.amount, left)
+                left -= remaining
+                pending.append({
+                    "user_id": user_id,
+                    "amount": earn.amount,
+                    "remaining": remaining,
+                    "status": "open",
+                    "source": earn.source,
+                    "reference_id": earn.reference_id,
+                    "expires_at": earn.expires_at,
+                    "created_at": earn.created_at,
+                })
+
+            # 거래 내역으로 설명되지 않는 잔액은 만료 없는 lot으로
+            if left > 0:
+                pending.append({
+                    "user_id": user_id,
+                    "amount": left,
+                    "remaining": left,
+                    "status": "open",
+                    "source": "migration",
+                    "reference_id": None,
+                    "expires_at": None,
+                })
+
+            if len(pending) >= batch_size:
+                db.execute(insert(FortunePointLot), pending)
+                db.commit()
+                created += len(pending)
+                pending = []
+
+        if pending:
+            db.execute(insert(FortunePointLot), pending)
+            db.commit()
+            created += len(pending)
+
+        print(f"✅ lot {created}개 생성")
+
+    except Exception as e:
+        print(f"❌ backfill 실패: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+def main():
+    """메인 마이그레이션 실행"""
+    print("🚀 포인트 lot 마이그레이션 시작")
+    print("=" * 50)
+
+    create_tables_and_indexes()
+    add_earn_reference_unique()
+    backfill_lots()
+
+    print("\n" + "=" * 50)
+    print("🎉 포인트 lot 마이그레이션 완료!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# migration_review_stats.py
+"""
+상품 리뷰 통계 요약 테이블 도입: product_review_stats 생성 및 기존 리뷰로 채우기
+
+이후에는 리뷰 작성/수정/삭제/노출 변경 시 flush 단계에서 증분 갱신되고,
+rebuild_review_stats Celery 작업이 하루 한 번 원본과 대조해 복구한다.
+여러 번 실행해도 안전하다 (어긋난 행만 다시 계산).
+"""
+
+import os
+import sys
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.database import SessionLocal, engine
+from app.models import ProductReviewStats
+from app.services.review_stats_service import ReviewStatsService
+
+
+def create_table():
+    """요약 테이블 생성"""
+    print("🔄 product_review_stats 테이블 생성 중...")
+    ProductReviewStats.__table__.create(bind=engine, checkfirst=True)
+    print("✅ product_review_stats 테이블 준비됨")
+
+
+def backfill_stats():
+    """기존 리뷰로 요약 행 계산"""
+    print("\n🔄 리뷰 통계 backfill 중...")
+
+    db = SessionLocal()
+    try:
+        result = ReviewStatsService.rebuild(db)
+        print(
+            f"✅ 상품 {result['checked']}개 확인 "
+            f"(생성 {result['created']}, 복구 {result['repaired']})"
+        )
+    except Exception as e:
+        print(f"❌ backfill 실패: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+def main():
+    """메인 마이그레이션 실행"""
+    print("🚀 리뷰 통계 마이그레이션 시작")
+    print("=" * 50)
+
+    create_table()
+    backfill_stats()
+
+    print("\n" + "=" * 50)
+    print("🎉 리뷰 통계 마이그레이션 완료!")
+
+
+if __name__ == "__main__":
+    main()
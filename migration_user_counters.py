@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# migration_user_counters.py
+"""
+사용자 대시보드 카운터 도입: user_counters 생성 및 원본 테이블로 채우기
+
+이후에는 구매/주문/리뷰/추천 가입/추천 보상 변경 시 flush 단계에서 증분 갱신되고,
+rebuild_user_counters Celery 작업이 하루 한 번 원본과 대조해 복구한다.
+여러 번 실행해도 안전하다 (어긋난 행만 다시 계산).
+"""
+
+import os
+import sys
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.database import SessionLocal, engine
+from app.models import UserCounters
+from app.services.user_counter_service import UserCounterService
+
+
+def create_table():
+    """카운터 테이블 생성"""
+    print("🔄 user_counters 테이블 생성 중...")
+    UserCounters.__table__.create(bind=engine, checkfirst=True)
+    print("✅ user_counters 테이블 준비됨")
+
+
+def backfill_counters():
+    """전체 사용자 카운터 계산"""
+    print("\n🔄 사용자 카운터 backfill 중...")
+
+    db = SessionLocal()
+    try:
+        result = UserCounterService.rebuild(db)
+        print(
+            f"✅ 사용자 {result['checked']}명 확인 "
+            f"(생성 {result['created']}, 복구 {result['repaired']})"
+        )
+    except Exception as e:
+        print(f"❌ backfill 실패: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+def main():
+    """메인 마이그레이션 실행"""
+    print("🚀 사용자 카운터 마이그레이션 시작")
+    print("=" * 50)
+
+    create_table()
+    backfill_counters()
+
+    print("\n" + "=" * 50)
+    print("🎉 사용자 카운터 마이그레이션 완료!")
+
+
+if __name__ == "__main__":
+    main()
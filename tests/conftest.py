@@ -2,13 +2,16 @@ import os
 import types
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
 
 # Ensure environment variables so importing app works
 os.environ.setdefault("OPENAI_API_KEY", "test")
 os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
 
 from app.main import app
-from app.database import get_db
+from app.database import get_db, get_async_db, get_read_db, get_async_read_db
+from app.models import Base
 
 class DummySession:
     def query(self, *args, **kwargs):
@@ -26,6 +29,32 @@ class DummySession:
     def close(self):
         pass
 
+class DummyResult:
+    def scalars(self):
+        return self
+
+    def first(self):
+        return None
+
+    def all(self):
+        return []
+
+    def scalar(self):
+        return None
+
+class DummyAsyncSession:
+    async def execute(self, *args, **kwargs):
+        return DummyResult()
+
+    async def get(self, *args, **kwargs):
+        return None
+
+    async def commit(self):
+        pass
+
+    async def close(self):
+        pass
+
 def override_get_db():
     db = DummySession()
     try:
@@ -33,9 +62,49 @@ def override_get_db():
     finally:
         db.close()
 
+async def override_get_async_db():
+    db = DummyAsyncSession()
+    try:
+        yield db
+    finally:
+        await db.close()
+
 @pytest.fixture()
 def client():
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    app.dependency_overrides[get_async_read_db] = override_get_async_db
     with TestClient(app, raise_server_exceptions=False) as c:
         yield c
     app.dependency_overrides.pop(get_db, None)
+    app.dependency_overrides.pop(get_async_db, None)
+    app.dependency_overrides.pop(get_read_db, None)
+    app.dependency_overrides.pop(get_async_read_db, None)
+
+@pytest.fixture()
+def sqlite_sessionmaker(tmp_path):
+    # Real schema in a throwaway SQLite file, for service tests that need actual rows
+    engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}", connect_args={"timeout": 30})
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture()
+def serial_sqlite_sessionmaker(tmp_path):
+    # SQLite has no SELECT ... FOR UPDATE: take the write lock at BEGIN instead, so concurrent
+    # transactions serialize the way the row locks serialize them on MySQL
+    engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}", connect_args={"timeout": 30})
+
+    @event.listens_for(engine, "connect")
+    def disable_pysqlite_begin(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def begin_immediate(connection):
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
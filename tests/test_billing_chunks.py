@@ -0,0 +1,131 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import update
+
+from app.models import FortuneTransaction, Order, Subscription, SubscriptionBillingChunk
+from app.services import billing_service
+from app.services.billing_service import BillingRunService
+from app.services.subscription_service import SubscriptionService
+
+TODAY = date.today()
+
+
+class WorkerKilled(BaseException):
+    """워커 프로세스 종료 (except Exception으로 잡히지 않음)"""
+
+
+@pytest.fixture()
+def chunk_id(sqlite_sessionmaker):
+    with sqlite_sessionmaker() as db:
+        for user_id in range(1, 5):
+            db.add(Subscription(user_id=user_id, plan_type='basic', monthly_price=9900,
+                                monthly_fortune_points=100, next_billing_date=TODAY))
+        db.commit()
+        run = BillingRunService(db).start_run(TODAY, chunk_size=10)
+        [chunk_id] = BillingRunService(db).pending_chunk_ids(run.id)
+        return chunk_id
+
+
+def expire_lease(db, chunk_id):
+    stale = datetime.now() - timedelta(seconds=billing_service.BILLING_CHUNK_LEASE_SECONDS + 1)
+    db.execute(update(SubscriptionBillingChunk).where(SubscriptionBillingChunk.id == chunk_id).values(updated_at=stale))
+    db.commit()
+
+
+def assert_billed_once(db):
+    assert db.query(Order).count() == 4
+    assert {s.next_billing_date for s in db.query(Subscription)} == {TODAY + timedelta(days=30)}
+    assert db.query(FortuneTransaction).filter(FortuneTransaction.transaction_type == 'earn').count() == 4
+
+
+def test_claim_is_exclusive_until_lease_expires(sqlite_sessionmaker, chunk_id):
+    with sqlite_sessionmaker() as db:
+        billing = BillingRunService(db)
+        assert billing._claim(chunk_id, ['pending', 'failed'], 'running') is True
+        assert billing._claim(chunk_id, ['pending', 'failed'], 'running') is False
+
+        expire_lease(db, chunk_id)
+        assert billing._claim(chunk_id, ['pending', 'failed'], 'running') is True
+        assert db.get(SubscriptionBillingChunk, chunk_id).attempts == 2
+
+
+def test_double_dispatch_bills_and_grants_once(sqlite_sessionmaker, chunk_id):
+    with sqlite_sessionmaker() as db:
+        first = BillingRunService(db).process_chunk(chunk_id)
+        second = BillingRunService(db).process_chunk(chunk_id)
+
+        assert (first['status'], first['processed'], first['succeeded']) == ('done', 4, 4)
+        assert second['skipped'] is True
+        assert_billed_once(db)
+
+
+def test_chunk_leased_by_another_worker_is_skipped(sqlite_sessionmaker, chunk_id):
+    with sqlite_sessionmaker() as db:
+        assert BillingRunService(db)._claim(chunk_id, ['pending', 'failed'], 'running')
+
+        assert BillingRunService(db).process_chunk(chunk_id)['skipped'] is True
+        assert db.query(Order).count() == 0
+
+
+def test_resume_after_worker_killed_bills_only_remaining(sqlite_sessionmaker, chunk_id, monkeypatch):
+    pay = SubscriptionService._process_subscription_payment
+    calls = []
+
+    def killed_on_third(subscription, db):
+        calls.append(subscription.id)
+        if len(calls) == 3:
+            raise WorkerKilled()
+        return pay(subscription, db)
+
+    monkeypatch.setattr(SubscriptionService, '_process_subscription_payment', staticmethod(killed_on_third))
+    with sqlite_sessionmaker() as db:
+        with pytest.raises(WorkerKilled):
+            BillingRunService(db).process_chunk(chunk_id)
+
+    monkeypatch.setattr(SubscriptionService, '_process_subscription_payment', staticmethod(pay))
+    with sqlite_sessionmaker() as db:
+        chunk = db.get(SubscriptionBillingChunk, chunk_id)
+        assert (chunk.status, chunk.processed, len(chunk.pending_grants)) == ('running', 2, 2)
+        assert db.query(Order).count() == 2
+
+        # 임대가 살아 있으면 재분배돼도 건너뜀, 만료 후 남은 구독만 결제
+        assert BillingRunService(db).process_chunk(chunk_id)['skipped'] is True
+        expire_lease(db, chunk_id)
+        result = BillingRunService(db).process_chunk(chunk_id)
+
+        assert (result['status'], result['processed'], result['succeeded']) == ('done', 4, 4)
+        assert_billed_once(db)
+
+
+def test_worker_stops_when_lease_is_taken_over(sqlite_sessionmaker, chunk_id, monkeypatch):
+    pay = SubscriptionService._process_subscription_payment
+
+    def taken_over_after_first(subscription, db):
+        # 첫 구독 결제 중 다른 워커가 만료된 임대를 가져간 상황
+        db.execute(update(SubscriptionBillingChunk).where(SubscriptionBillingChunk.id == chunk_id)
+                   .values(attempts=SubscriptionBillingChunk.attempts + 1))
+        return pay(subscription, db)
+
+    monkeypatch.setattr(SubscriptionService, '_process_subscription_payment', staticmethod(taken_over_after_first))
+    with sqlite_sessionmaker() as db:
+        assert BillingRunService(db).process_chunk(chunk_id)['skipped'] is True
+        assert db.query(Order).count() == 1
+        assert db.get(SubscriptionBillingChunk, chunk_id).status == 'running'
+
+
+def test_granting_lease_blocks_second_grant(sqlite_sessionmaker, chunk_id):
+    with sqlite_sessionmaker() as db:
+        billing = BillingRunService(db)
+        assert billing._claim(chunk_id, ['pending', 'failed'], 'running')
+        assert billing._bill_chunk(db.get(SubscriptionBillingChunk, chunk_id)) is True
+        assert db.get(SubscriptionBillingChunk, chunk_id).status == 'billed'
+
+        # 다른 워커가 지급 중 (granting 임대 유효)
+        assert billing._claim(chunk_id, ['billed'], 'granting')
+        assert BillingRunService(db).process_chunk(chunk_id)['skipped'] is True
+        assert db.query(FortuneTransaction).count() == 0
+
+        expire_lease(db, chunk_id)
+        assert BillingRunService(db).process_chunk(chunk_id)['status'] == 'done'
+        assert_billed_once(db)
@@ -0,0 +1,74 @@
+import threading
+import time
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.pool import QueuePool
+
+from app.db_metrics import instrument_engine
+
+
+def make_engine(tmp_path, name, connect_delay=0.0):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'metrics.db'}", poolclass=QueuePool, pool_size=1, max_overflow=0
+    )
+    if connect_delay:
+        @event.listens_for(engine, "connect")
+        def slow_connect(dbapi_connection, connection_record):
+            time.sleep(connect_delay)
+
+    return engine, instrument_engine(engine, name)
+
+
+def hold_connection(engine, seconds):
+    ready = threading.Event()
+
+    def hold():
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            ready.set()
+            time.sleep(seconds)
+
+    thread = threading.Thread(target=hold)
+    thread.start()
+    ready.wait(5)
+    return thread
+
+
+def test_wait_measured_when_pool_exhausted(tmp_path):
+    engine, metrics = make_engine(tmp_path, "test_wait")
+    thread = hold_connection(engine, 0.3)
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    thread.join()
+
+    snapshot = metrics.snapshot()
+    assert snapshot["pool_class"] == "QueuePool"
+    assert snapshot["checkouts"] == 2 and snapshot["connects"] == 1
+    assert snapshot["wait_max_ms"] >= 200
+
+
+def test_wait_measured_after_dispose(tmp_path):
+    engine, metrics = make_engine(tmp_path, "test_dispose")
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    engine.dispose()
+
+    thread = hold_connection(engine, 0.3)
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    thread.join()
+
+    snapshot = metrics.snapshot()
+    assert snapshot["checkouts"] == 3 and snapshot["connects"] == 2
+    assert snapshot["wait_count"] == 3
+    assert snapshot["wait_max_ms"] >= 200
+
+
+def test_connect_time_not_counted_as_wait(tmp_path):
+    engine, metrics = make_engine(tmp_path, "test_connect", connect_delay=0.3)
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+    snapshot = metrics.snapshot()
+    assert snapshot["connects"] == 1
+    assert snapshot["wait_max_ms"] < 100
@@ -0,0 +1,104 @@
+import os
+
+import pytest
+from sqlalchemy import Column, Integer, String, create_engine, select, text, update
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+from app.db_routing import ReplicaSet, RoutingSession, is_read_only
+
+RoutingBase = declarative_base()
+
+
+class Source(RoutingBase):
+    __tablename__ = "source"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(20))
+
+
+def make_sessionmaker(tmp_path, replica_url=None):
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    replica = create_engine(replica_url or f"sqlite:///{tmp_path / 'replica.db'}")
+    for engine, name in ((primary, "primary"), (replica, "replica")):
+        try:
+            RoutingBase.metadata.create_all(engine)
+            with engine.begin() as conn:
+                conn.execute(text("INSERT INTO source (name) VALUES (:name)"), {"name": name})
+        except Exception:
+            pass
+    replicas = ReplicaSet([replica], check_interval=60)
+    replicas.check_all()
+    return sessionmaker(class_=RoutingSession, primary=primary, replicas=replicas), replicas
+
+
+def names(db):
+    return sorted(db.execute(select(Source.name)).scalars())
+
+
+def test_reads_go_to_replica_until_write(tmp_path):
+    Session, _ = make_sessionmaker(tmp_path)
+    with Session() as db:
+        assert db.execute(text("SELECT name FROM source")).scalar() == "replica"
+
+        db.use_primary()
+        assert db.execute(text("SELECT name FROM source")).scalar() == "primary"
+
+
+def test_reads_pinned_to_primary_after_flush(tmp_path):
+    Session, _ = make_sessionmaker(tmp_path)
+    with Session() as db:
+        assert names(db) == ["replica"]
+
+        db.add(Source(name="new"))
+        db.flush()
+        assert names(db) == ["new", "primary"]
+
+
+@pytest.mark.parametrize("statement", [
+    update(Source).values(name="updated"),
+    text("UPDATE source SET name = 'updated'"),
+])
+def test_reads_pinned_to_primary_after_dml(tmp_path, statement):
+    Session, _ = make_sessionmaker(tmp_path)
+    with Session() as db:
+        assert names(db) == ["replica"]
+
+        db.execute(statement)
+        assert names(db) == ["updated"]
+        assert db.execute(text("SELECT name FROM source")).scalar() == "updated"
+
+
+@pytest.mark.parametrize("statement, expected", [
+    (select(Source), True),
+    (text("  select 1"), True),
+    (text("SHOW TABLES"), True),
+    (select(Source).with_for_update(), False),
+    (text("SELECT * FROM source FOR UPDATE"), False),
+    (text("SELECT * FROM source LOCK IN SHARE MODE"), False),
+    (text("DELETE FROM source"), False),
+    (text("WITH t AS (SELECT 1) UPDATE source SET name = 'x'"), False),
+    (None, False),
+])
+def test_is_read_only(statement, expected):
+    assert is_read_only(statement) is expected
+
+
+def test_unchecked_replica_not_used(tmp_path):
+    Session, replicas = make_sessionmaker(tmp_path)
+    fresh = ReplicaSet(replicas.engines, check_interval=60)
+    # 첫 상태 확인 전에는 요청 경로에서 접속하지 않고 프라이머리 사용
+    fresh._checker_pid = os.getpid()
+    assert fresh.choose() is None
+    fresh.check_all()
+    assert fresh.choose() is replicas.engines[0]
+
+
+def test_falls_back_to_primary_when_replica_unavailable(tmp_path):
+    missing = tmp_path / "missing" / "replica.db"
+    Session, replicas = make_sessionmaker(tmp_path, f"sqlite:///{missing}")
+    with Session() as db:
+        assert db.execute(text("SELECT name FROM source")).scalar() == "primary"
+
+    status = replicas.status()
+    assert status["fallbacks"] == 1
+    assert status["replicas"][0]["healthy"] is False
@@ -0,0 +1,162 @@
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.exceptions import ConflictError
+from app.models import IdempotencyKey
+from app.services import idempotency_service
+from app.services.cache_service import REDIS_AVAILABLE
+from app.services.idempotency_service import IdempotencyStore
+
+
+@pytest.fixture(params=['db', pytest.param('redis', marks=pytest.mark.skipif(not REDIS_AVAILABLE, reason='Redis 서버 없음'))])
+def store(request, sqlite_sessionmaker, monkeypatch):
+    monkeypatch.setattr(idempotency_service, 'SessionLocal', sqlite_sessionmaker)
+    return IdempotencyStore(use_redis=request.param == 'redis')
+
+
+@pytest.fixture()
+def key():
+    # Redis는 테스트 간 공유 - 키가 겹치지 않도록
+    return uuid.uuid4().hex
+
+
+def test_claim_once(store, key):
+    first = store.claim(key, 'test')
+    second = store.claim(key, 'test')
+
+    assert first.status == 'claimed' and first.owner
+    assert second.status == 'in_progress'
+
+
+def test_same_key_other_scope_is_separate(store, key):
+    assert store.claim(key, 'ready').status == 'claimed'
+    assert store.claim(key, 'approve').status == 'claimed'
+
+
+def test_complete_returns_result(store, key):
+    claim = store.claim(key, 'test')
+    store.complete(key, 'test', claim.owner, {'tid': 'T1'})
+
+    again = store.claim(key, 'test')
+    assert (again.status, again.result) == ('completed', {'tid': 'T1'})
+
+
+def test_complete_by_other_owner_ignored(store, key):
+    store.claim(key, 'test')
+    store.complete(key, 'test', 'someone-else', {'tid': 'T1'})
+
+    assert store.claim(key, 'test').status == 'in_progress'
+
+
+def test_release_allows_retry(store, key):
+    claim = store.claim(key, 'test')
+    store.release(key, 'test', claim.owner)
+
+    assert store.claim(key, 'test').status == 'claimed'
+
+
+def test_release_by_other_owner_ignored(store, key):
+    store.claim(key, 'test')
+    store.release(key, 'test', 'someone-else')
+
+    assert store.claim(key, 'test').status == 'in_progress'
+
+
+def test_run_executes_once(store, key):
+    calls = []
+
+    def func():
+        calls.append(1)
+        return {'n': len(calls)}
+
+    assert store.run(key, func, 'test') == {'n': 1}
+    assert store.run(key, func, 'test') == {'n': 1}
+    assert len(calls) == 1
+
+
+def test_run_failure_releases_key(store, key):
+    def fail():
+        raise RuntimeError('boom')
+
+    with pytest.raises(RuntimeError):
+        store.run(key, fail, 'test')
+
+    assert store.run(key, lambda: {'ok': True}, 'test') == {'ok': True}
+
+
+def test_wait_returns_result_of_first_request(store, key, monkeypatch):
+    monkeypatch.setattr(idempotency_service, 'IDEMPOTENCY_POLL_INTERVAL', 0.02)
+    claim = store.claim(key, 'test')
+
+    def finish():
+        time.sleep(0.2)
+        store.complete(key, 'test', claim.owner, {'tid': 'T1'})
+
+    worker = threading.Thread(target=finish)
+    worker.start()
+    result = store.run(key, lambda: pytest.fail('중복 요청이 다시 실행됨'), 'test', wait_timeout=5)
+    worker.join()
+
+    assert result == {'tid': 'T1'}
+    assert store.stats()['wait_hits'] == 1
+
+
+def test_wait_takes_over_released_key(store, key, monkeypatch):
+    monkeypatch.setattr(idempotency_service, 'IDEMPOTENCY_POLL_INTERVAL', 0.02)
+    claim = store.claim(key, 'test')
+
+    def fail():
+        time.sleep(0.2)
+        store.release(key, 'test', claim.owner)
+
+    worker = threading.Thread(target=fail)
+    worker.start()
+    result = store.run(key, lambda: {'retried': True}, 'test', wait_timeout=5)
+    worker.join()
+
+    assert result == {'retried': True}
+
+
+def test_wait_timeout_raises_conflict(store, key, monkeypatch):
+    monkeypatch.setattr(idempotency_service, 'IDEMPOTENCY_POLL_INTERVAL', 0.02)
+    store.claim(key, 'test')
+
+    with pytest.raises(ConflictError):
+        store.run(key, lambda: pytest.fail('중복 요청이 다시 실행됨'), 'test', wait_timeout=0.1)
+    assert store.stats()['conflicts'] == 1
+
+
+def test_db_expired_claim_taken_over(sqlite_sessionmaker, monkeypatch):
+    monkeypatch.setattr(idempotency_service, 'SessionLocal', sqlite_sessionmaker)
+    store = IdempotencyStore(use_redis=False)
+    first = store.claim('k1', 'test')
+    with sqlite_sessionmaker() as db:
+        db.query(IdempotencyKey).update({'expires_at': datetime.now() - timedelta(seconds=1)})
+        db.commit()
+
+    second = store.claim('k1', 'test')
+
+    assert second.status == 'claimed' and second.owner != first.owner
+    # 만료 후 가져간 키는 이전 요청이 덮어쓰지 못한다
+    store.complete('k1', 'test', first.owner, {'stale': True})
+    assert store.claim('k1', 'test').status == 'in_progress'
+
+
+def test_db_purge_expired(sqlite_sessionmaker, monkeypatch):
+    monkeypatch.setattr(idempotency_service, 'SessionLocal', sqlite_sessionmaker)
+    store = IdempotencyStore(use_redis=False)
+    store.claim('k1', 'ready')
+    store.claim('k1', 'approve')
+    with sqlite_sessionmaker() as db:
+        db.query(IdempotencyKey).filter(IdempotencyKey.scope == 'ready').update(
+            {'expires_at': datetime.now() - timedelta(seconds=1)}
+        )
+        db.commit()
+
+    assert store.purge_expired() == 1
+    with sqlite_sessionmaker() as db:
+        assert [row.scope for row in db.query(IdempotencyKey)] == ['approve']
@@ -0,0 +1,70 @@
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.payments.kakaopay import KakaoPayClient
+
+
+class _OkHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive - 연결이 풀에 남는다
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        self.send_response(200)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'{}')
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def kakaopay():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _OkHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield KakaoPayClient(base_url=f'http://127.0.0.1:{server.server_port}')
+    server.shutdown()
+    server.server_close()
+
+
+async def _post(client):
+    response = await client.post('order', {}, {})
+    return response.status_code, client._client
+
+
+def test_client_reused_within_loop(kakaopay):
+    async def twice():
+        return await _post(kakaopay), await _post(kakaopay)
+
+    (_, first), (_, second) = asyncio.run(twice())
+
+    assert first is second
+
+
+def test_loop_change_closes_previous_client(kakaopay):
+    status, first = asyncio.run(_post(kakaopay))
+    _, second = asyncio.run(_post(kakaopay))
+
+    assert status == 200
+    assert second is not first
+    assert first.is_closed
+
+
+def test_loop_change_closes_client_on_running_loop(kakaopay):
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        _, first = asyncio.run_coroutine_threadsafe(_post(kakaopay), loop).result(5)
+        asyncio.run(_post(kakaopay))
+        # 이전 루프에 예약된 aclose() 완료 대기
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0.1), loop).result(5)
+
+        assert first.is_closed
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(5)
+        loop.close()
@@ -0,0 +1,162 @@
+import types
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+from app.models import LLMUsage, LLMUsageHourly
+from app.services import llm_cache_service, llm_usage_service
+from app.services.llm_cache_service import LLMCacheService
+from app.services.llm_usage_service import LLMUsageService, estimate_cost
+
+
+class StubClient:
+    """chat.completions.create만 있는 OpenAI 클라이언트 대역"""
+
+    def __init__(self, error=None):
+        self.calls = []
+        self.error = error
+        self.chat = types.SimpleNamespace(completions=types.SimpleNamespace(create=self.create))
+
+    def create(self, model, messages, **params):
+        self.calls.append(model)
+        if self.error:
+            raise self.error
+        return types.SimpleNamespace(
+            usage=types.SimpleNamespace(prompt_tokens=1000, completion_tokens=1000),
+            choices=[types.SimpleNamespace(message=types.SimpleNamespace(content=f'answer from {model}'))],
+        )
+
+
+@pytest.fixture()
+def usage_db(sqlite_sessionmaker, monkeypatch):
+    monkeypatch.setattr(llm_usage_service, 'SessionLocal', sqlite_sessionmaker)
+    monkeypatch.setattr(llm_cache_service, 'SessionLocal', sqlite_sessionmaker)
+    monkeypatch.setattr(LLMUsageService, '_spend', {'day': None, 'loaded_at': 0.0, 'by_endpoint': {}})
+    monkeypatch.setattr(llm_usage_service, 'LLM_SPEND_REFRESH_SECONDS', 0)
+    monkeypatch.setattr(llm_usage_service, 'LLM_DAILY_BUDGET_USD', 1.0)
+    monkeypatch.setattr(llm_usage_service, 'LLM_ENDPOINT_BUDGETS_USD', {})
+    monkeypatch.setattr(llm_usage_service, 'LLM_FALLBACK_MODEL', 'gpt-4o-mini')
+    monkeypatch.setattr(llm_usage_service, 'LLM_HARD_LIMIT_RATIO', 1.5)
+    return sqlite_sessionmaker
+
+
+def spend(db_factory, endpoint, amount):
+    with db_factory() as db:
+        db.add(LLMUsage(endpoint=endpoint, model='seed', status='ok', cost_usd=Decimal(str(amount))))
+        db.commit()
+
+
+def statuses(db_factory):
+    with db_factory() as db:
+        return [(row.model, row.status) for row in db.query(LLMUsage).filter(LLMUsage.model != 'seed').order_by(LLMUsage.id)]
+
+
+def chat(client, content='사주', endpoint='report'):
+    return LLMUsageService.chat(client, endpoint, 'gpt-4o', 'prompt', content, {'temperature': 0.7})
+
+
+def test_estimate_cost():
+    assert estimate_cost('gpt-4o', 1000, 1000) == Decimal('0.012500')
+    assert estimate_cost('local-model', 1000, 1000) == Decimal('0')
+
+
+@pytest.mark.parametrize('spent, expected', [(0.5, 'ok'), (1.0, 'over'), (1.49, 'over'), (1.5, 'blocked')])
+def test_budget_state_thresholds(usage_db, spent, expected):
+    spend(usage_db, 'report', spent)
+    assert LLMUsageService.budget_state('report') == expected
+
+
+def test_endpoint_budget_applies_to_that_endpoint_only(usage_db, monkeypatch):
+    monkeypatch.setattr(llm_usage_service, 'LLM_DAILY_BUDGET_USD', 0)
+    monkeypatch.setattr(llm_usage_service, 'LLM_ENDPOINT_BUDGETS_USD', {'report': 0.2})
+    spend(usage_db, 'report', 0.25)
+    spend(usage_db, 'analysis', 5)
+
+    assert LLMUsageService.budget_state('report') == 'over'
+    assert LLMUsageService.budget_state('analysis') == 'ok'
+
+
+def test_under_budget_calls_requested_model(usage_db):
+    client = StubClient()
+
+    assert chat(client) == 'answer from gpt-4o'
+    assert client.calls == ['gpt-4o']
+    assert statuses(usage_db) == [('gpt-4o', 'ok')]
+
+    # 같은 입력은 캐시에서
+    assert chat(client) == 'answer from gpt-4o'
+    assert client.calls == ['gpt-4o']
+    assert statuses(usage_db)[-1] == ('gpt-4o', 'cached')
+
+
+def test_over_budget_switches_to_fallback_model(usage_db):
+    spend(usage_db, 'report', 1.2)
+    client = StubClient()
+
+    assert chat(client) == 'answer from gpt-4o-mini'
+    assert client.calls == ['gpt-4o-mini']
+    assert statuses(usage_db) == [('gpt-4o-mini', 'fallback')]
+
+
+def test_over_budget_prefers_cached_requested_model(usage_db):
+    client = StubClient()
+    chat(client)
+    spend(usage_db, 'report', 1.2)
+
+    assert chat(client) == 'answer from gpt-4o'
+    assert client.calls == ['gpt-4o']
+
+
+def test_blocked_returns_fallback_cache_only(usage_db):
+    spend(usage_db, 'report', 1.6)
+    client = StubClient()
+
+    assert chat(client) is None
+    assert client.calls == []
+    assert statuses(usage_db) == [('gpt-4o-mini', 'blocked')]
+
+    LLMCacheService.store('gpt-4o-mini', 'prompt', '사주', {'temperature': 0.7}, 'cached mini')
+    assert chat(client) == 'cached mini'
+    assert client.calls == []
+
+
+def test_error_recorded_and_raised(usage_db):
+    client = StubClient(error=RuntimeError('upstream down'))
+
+    with pytest.raises(RuntimeError):
+        chat(client)
+    assert statuses(usage_db) == [('gpt-4o', 'error')]
+
+
+def test_aggregate_hourly_and_dashboard_latency(usage_db):
+    now = datetime.now().replace(minute=30, second=0, microsecond=0)
+    rows = [
+        ('ok', 100, Decimal('0.01')),
+        ('fallback', 300, Decimal('0.002')),
+        ('cached', 0, Decimal('0')),
+        ('blocked', 0, Decimal('0')),
+        ('error', 30000, Decimal('0')),
+    ]
+    with usage_db() as db:
+        for status, latency, cost in rows:
+            db.add(LLMUsage(endpoint='report', model='gpt-4o', status=status, latency_ms=latency,
+                            prompt_tokens=10, completion_tokens=5, cost_usd=cost, created_at=now))
+        # 집계 범위 밖
+        db.add(LLMUsage(endpoint='report', model='gpt-4o', status='ok', created_at=now - timedelta(hours=3)))
+        db.commit()
+
+        assert LLMUsageService.aggregate(db, hours=2, now=now) == 1
+        # 다시 실행해도 같은 결과
+        assert LLMUsageService.aggregate(db, hours=2, now=now) == 1
+
+        [bucket] = db.query(LLMUsageHourly).all()
+        assert bucket.hour == now.replace(minute=0)
+        assert (bucket.calls, bucket.cached, bucket.fallbacks, bucket.blocked, bucket.errors) == (2, 1, 1, 1, 1)
+        assert (bucket.prompt_tokens, bucket.completion_tokens) == (50, 25)
+        # 오류 행의 지연은 평균 / 최대에 포함하지 않는다
+        assert (bucket.latency_ms_total, bucket.latency_ms_max) == (400, 300)
+        assert bucket.cost_usd == Decimal('0.012')
+
+        [endpoint] = LLMUsageService.dashboard(db)['by_endpoint']
+        assert endpoint['avg_latency_ms'] == 200
@@ -0,0 +1,36 @@
+import pytest
+
+from app.main import app
+from app.utils import require_admin
+
+METRICS_PATHS = [
+    '/metrics/db',
+    '/metrics/passwords',
+    '/metrics/rate-limit',
+    '/metrics/idempotency',
+    '/metrics/kakaopay',
+    '/metrics/report-progress',
+    '/metrics/billing',
+]
+
+
+@pytest.mark.parametrize('path', METRICS_PATHS)
+def test_metrics_require_login(client, path):
+    res = client.get(path, headers={'accept': 'application/json'})
+    assert res.status_code == 401
+
+
+def test_metrics_allowed_for_admin(client):
+    app.dependency_overrides[require_admin] = lambda: object()
+    try:
+        res = client.get('/metrics/db', headers={'accept': 'application/json'})
+        assert res.status_code == 200
+        assert 'engines' in res.json()
+    finally:
+        app.dependency_overrides.pop(require_admin, None)
+
+
+def test_db_debug_headers_off_by_default(client):
+    res = client.get('/metrics/db', headers={'accept': 'application/json'})
+    assert 'X-DB-Query-Count' not in res.headers
+    assert 'X-DB-Time-Ms' not in res.headers
@@ -28,3 +28,11 @@ def test_order_status_not_found(client):
     assert res.status_code == 404
     assert res.json()["detail"] == "주문을 찾을 수 없습니다."
     app.dependency_overrides.pop(get_current_user)
+
+
+def test_order_report_not_found(client):
+    app.dependency_overrides[get_current_user] = override_user
+    res = client.get("/order/report/1")
+    assert res.status_code == 404
+    assert res.json()["detail"] == "리포트를 찾을 수 없습니다."
+    app.dependency_overrides.pop(get_current_user)
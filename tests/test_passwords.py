@@ -0,0 +1,82 @@
+import asyncio
+import threading
+
+import pytest
+from passlib.hash import bcrypt
+
+from app.utils.passwords import (
+    BCRYPT_ROUNDS,
+    PasswordHasher,
+    PasswordHasherBusy,
+    hash_password,
+    verify_password_async,
+)
+
+
+def test_hasher_rejects_when_pending_limit_reached():
+    hasher = PasswordHasher(workers=1, max_pending=2)
+    release = threading.Event()
+
+    def blocked(value):
+        release.wait(5)
+        return value
+
+    async def main():
+        first = asyncio.create_task(hasher.run(blocked, 1))
+        second = asyncio.create_task(hasher.run(blocked, 2))
+        await asyncio.sleep(0.05)
+        busy = hasher.stats()
+
+        with pytest.raises(PasswordHasherBusy) as exc_info:
+            await hasher.run(blocked, 3)
+
+        release.set()
+        results = await asyncio.gather(first, second)
+        # 대기열이 비면 다시 받는다
+        results.append(await hasher.run(blocked, 4))
+        return busy, exc_info.value, results
+
+    try:
+        busy, error, results = asyncio.run(main())
+    finally:
+        release.set()
+        hasher.shutdown()
+
+    assert (busy['pending'], busy['active'], busy['queued']) == (2, 1, 1)
+    assert error.status_code == 503
+    assert results == [1, 2, 4]
+    stats = hasher.stats()
+    assert (stats['pending'], stats['completed'], stats['rejected']) == (0, 3, 1)
+
+
+def test_hasher_failure_frees_slot():
+    hasher = PasswordHasher(workers=1, max_pending=1)
+
+    def fail():
+        raise ValueError('boom')
+
+    async def main():
+        with pytest.raises(ValueError):
+            await hasher.run(fail)
+        return await hasher.run(lambda: 'ok')
+
+    try:
+        assert asyncio.run(main()) == 'ok'
+    finally:
+        hasher.shutdown()
+    assert hasher.stats()['pending'] == 0
+
+
+def test_verify_rehashes_outdated_cost():
+    old_hash = bcrypt.using(rounds=4).hash('secret')
+
+    ok, new_hash = asyncio.run(verify_password_async('secret', old_hash))
+
+    assert ok
+    assert new_hash and new_hash != old_hash
+    assert bcrypt.from_string(new_hash).rounds == BCRYPT_ROUNDS
+    assert asyncio.run(verify_password_async('secret', new_hash)) == (True, None)
+
+
+def test_verify_wrong_password_does_not_rehash():
+    assert asyncio.run(verify_password_async('wrong', hash_password('secret'))) == (False, None)
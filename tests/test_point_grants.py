@@ -0,0 +1,59 @@
+import threading
+
+from app.models import FortunePointLot, FortuneTransaction, UserFortunePoint
+from app.services.fortune_service import FortuneService
+
+GRANTS = [(1, 100, 'subscription_monthly', 'sub_1_2026-10'), (2, 50, 'subscription_monthly', 'sub_2_2026-10')]
+
+
+def ledger(db, user_id):
+    earns = db.query(FortuneTransaction).filter(
+        FortuneTransaction.user_id == user_id,
+        FortuneTransaction.transaction_type == 'earn'
+    ).count()
+    lots = db.query(FortunePointLot).filter(FortunePointLot.user_id == user_id).count()
+    balances = [points for (points,) in db.query(UserFortunePoint.points).filter(UserFortunePoint.user_id == user_id)]
+    return earns, lots, balances
+
+
+def test_replayed_grant_list_grants_once(sqlite_sessionmaker):
+    with sqlite_sessionmaker() as db:
+        first = FortuneService(db).grant_points_bulk(GRANTS)
+        second = FortuneService(db).grant_points_bulk(GRANTS)
+
+        assert first['granted'] == 2
+        assert second == {'granted': 0, 'duplicates': 2, 'failed': 0, 'chunks': 1}
+        assert ledger(db, 1) == (1, 1, [100])
+        assert ledger(db, 2) == (1, 1, [50])
+
+
+def test_concurrent_grant_lists_grant_once(sqlite_sessionmaker):
+    barrier = threading.Barrier(2)
+    results = []
+
+    def run():
+        with sqlite_sessionmaker() as db:
+            barrier.wait()
+            results.append(FortuneService(db).grant_points_bulk(GRANTS))
+
+    threads = [threading.Thread(target=run) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sum(result['granted'] for result in results) == 2
+    with sqlite_sessionmaker() as db:
+        assert ledger(db, 1) == (1, 1, [100])
+        assert ledger(db, 2) == (1, 1, [50])
+
+
+def test_spend_with_same_reference_is_allowed(sqlite_sessionmaker):
+    with sqlite_sessionmaker() as db:
+        FortuneService(db).grant_points_bulk(GRANTS[:1])
+        db.add(FortuneTransaction(
+            user_id=1, transaction_type='spend', amount=-100, balance_after=0,
+            source='subscription_monthly', reference_id='sub_1_2026-10'
+        ))
+        db.commit()
+        assert ledger(db, 1)[0] == 1
@@ -0,0 +1,153 @@
+import threading
+from datetime import datetime, timedelta
+
+from sqlalchemy import func
+
+from app.models import FortunePointLot, FortuneTransaction, UserFortunePoint
+from app.services.fortune_service import FortuneService
+from app.utils.error_handlers import InsufficientPointsError
+
+
+def seed(db, user_id, lots):
+    """lots: [(amount, expires_in_days or None)] - 잔액 = lot 합계"""
+    now = datetime.now()
+    total = sum(amount for amount, _ in lots)
+    db.add(UserFortunePoint(user_id=user_id, points=total, total_earned=total, total_spent=0))
+    for i, (amount, days) in enumerate(lots):
+        expires_at = now + timedelta(days=days) if days is not None else None
+        db.add(FortunePointLot(user_id=user_id, amount=amount, remaining=amount, status='open',
+                               source='test', reference_id=f'lot_{i}', expires_at=expires_at))
+        db.add(FortuneTransaction(user_id=user_id, transaction_type='earn', amount=amount, balance_after=total,
+                                  source='test', reference_id=f'lot_{i}', expires_at=expires_at))
+    db.commit()
+
+
+def lot_state(db, user_id):
+    return [
+        (lot.reference_id, lot.remaining, lot.status)
+        for lot in db.query(FortunePointLot).filter(FortunePointLot.user_id == user_id).order_by(FortunePointLot.id)
+    ]
+
+
+def assert_consistent(db, user_id):
+    points = db.query(UserFortunePoint.points).filter(UserFortunePoint.user_id == user_id).scalar()
+    open_lots = db.query(func.coalesce(func.sum(FortunePointLot.remaining), 0)).filter(
+        FortunePointLot.user_id == user_id, FortunePointLot.status == 'open'
+    ).scalar()
+    ledger = db.query(func.sum(FortuneTransaction.amount)).filter(FortuneTransaction.user_id == user_id).scalar()
+    assert points >= 0
+    assert points == open_lots == ledger
+
+
+def test_spend_continues_partially_consumed_lot(sqlite_sessionmaker):
+    with sqlite_sessionmaker() as db:
+        seed(db, 1, [(100, 10), (100, 20)])
+        service = FortuneService(db)
+
+        service.use_points_atomic(1, 150, 'purchase', 'order_1')
+        assert lot_state(db, 1) == [('lot_0', 0, 'consumed'), ('lot_1', 50, 'open')]
+
+        service.use_points_atomic(1, 30, 'purchase', 'order_2')
+        assert lot_state(db, 1) == [('lot_0', 0, 'consumed'), ('lot_1', 20, 'open')]
+        assert_consistent(db, 1)
+
+
+def test_lot_without_expiry_is_spent_last_and_never_expires(sqlite_sessionmaker):
+    with sqlite_sessionmaker() as db:
+        seed(db, 1, [(100, None), (100, 10), (100, -1)])
+        service = FortuneService(db)
+
+        service.use_points_atomic(1, 150, 'purchase', 'order_1')
+        assert lot_state(db, 1) == [('lot_0', 100, 'open'), ('lot_1', 50, 'open'), ('lot_2', 0, 'consumed')]
+
+        result = service.expire_points()
+        assert result['lots'] == 0
+        assert lot_state(db, 1) == [('lot_0', 100, 'open'), ('lot_1', 50, 'open'), ('lot_2', 0, 'consumed')]
+        assert_consistent(db, 1)
+
+
+def test_expire_sweep_skips_consumed_part_of_lot(sqlite_sessionmaker):
+    with sqlite_sessionmaker() as db:
+        seed(db, 1, [(100, -1), (100, None)])
+        service = FortuneService(db)
+
+        service.use_points_atomic(1, 40, 'purchase', 'order_1')
+        result = service.expire_points()
+
+        assert (result['lots'], result['points']) == (1, 60)
+        assert lot_state(db, 1) == [('lot_0', 0, 'expired'), ('lot_1', 100, 'open')]
+        assert_consistent(db, 1)
+
+
+def test_expiry_waits_for_concurrent_spend(serial_sqlite_sessionmaker, monkeypatch):
+    with serial_sqlite_sessionmaker() as db:
+        seed(db, 1, [(100, -1), (50, 10)])
+
+    spend_locked = threading.Event()
+    release_spend = threading.Event()
+    consume = FortuneService.consume_point_lots
+
+    def paused_consume(self, user_id, amount):
+        spend_locked.set()
+        release_spend.wait(5)
+        return consume(self, user_id, amount)
+
+    monkeypatch.setattr(FortuneService, 'consume_point_lots', paused_consume)
+    results = {}
+
+    def spend():
+        with serial_sqlite_sessionmaker() as db:
+            results['spend'] = FortuneService(db).use_points_atomic(1, 120, 'purchase', 'order_1')
+
+    def expire():
+        with serial_sqlite_sessionmaker() as db:
+            results['expire'] = FortuneService(db).expire_points()
+
+    spender = threading.Thread(target=spend)
+    spender.start()
+    assert spend_locked.wait(5)
+    expirer = threading.Thread(target=expire)
+    expirer.start()
+    expirer.join(0.3)
+    assert expirer.is_alive()  # 잔액 락을 가진 차감이 끝날 때까지 대기
+    release_spend.set()
+    spender.join()
+    expirer.join()
+
+    assert results['spend'] is True
+    assert results['expire']['lots'] == 0
+    with serial_sqlite_sessionmaker() as db:
+        assert lot_state(db, 1) == [('lot_0', 0, 'consumed'), ('lot_1', 30, 'open')]
+        assert_consistent(db, 1)
+
+
+def test_spend_after_concurrent_expiry_sees_expired_balance(serial_sqlite_sessionmaker):
+    with serial_sqlite_sessionmaker() as db:
+        seed(db, 1, [(100, -1), (50, 10)])
+
+    barrier = threading.Barrier(2)
+    outcomes = []
+
+    def spend():
+        with serial_sqlite_sessionmaker() as db:
+            barrier.wait()
+            try:
+                outcomes.append(FortuneService(db).use_points_atomic(1, 120, 'purchase', 'order_1'))
+            except InsufficientPointsError:
+                outcomes.append('insufficient')
+
+    def expire():
+        with serial_sqlite_sessionmaker() as db:
+            barrier.wait()
+            FortuneService(db).expire_points()
+
+    threads = [threading.Thread(target=spend), threading.Thread(target=expire)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    with serial_sqlite_sessionmaker() as db:
+        points = db.query(UserFortunePoint.points).filter(UserFortunePoint.user_id == 1).scalar()
+        assert (outcomes, points) in (([True], 30), (['insufficient'], 50))
+        assert_consistent(db, 1)
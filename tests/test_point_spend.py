@@ -0,0 +1,74 @@
+import pytest
+
+from app.models import FortunePointLot, FortuneTransaction, UserFortunePoint
+from app.services.fortune_service import FortuneService
+from app.utils.error_handlers import InsufficientPointsError
+
+
+@pytest.fixture(params=['returning', 'rowcount'])
+def db(request, sqlite_sessionmaker, monkeypatch):
+    with sqlite_sessionmaker() as session:
+        if request.param == 'rowcount':
+            # MySQL처럼 UPDATE ... RETURNING이 없는 dialect
+            monkeypatch.setattr(session.get_bind().dialect, 'update_returning', False)
+        yield session
+
+
+def grant(db, user_id, amount):
+    FortuneService(db).grant_points_bulk([(user_id, amount, 'test', f'grant_{user_id}_{amount}')])
+
+
+def balance(db, user_id):
+    return db.query(UserFortunePoint).filter(UserFortunePoint.user_id == user_id).one()
+
+
+def spends(db, user_id):
+    return db.query(FortuneTransaction).filter(
+        FortuneTransaction.user_id == user_id,
+        FortuneTransaction.transaction_type == 'spend'
+    ).all()
+
+
+def test_spend_exact_balance(db):
+    grant(db, 1, 100)
+
+    assert FortuneService(db).use_points_atomic(1, 100, 'purchase', 'order_1') is True
+
+    db.expire_all()
+    points = balance(db, 1)
+    assert (points.points, points.total_spent) == (0, 100)
+    [spend] = spends(db, 1)
+    assert (spend.amount, spend.balance_after, spend.reference_id) == (-100, 0, 'order_1')
+    lot = db.query(FortunePointLot).filter(FortunePointLot.user_id == 1).one()
+    assert (lot.remaining, lot.status) == (0, 'consumed')
+
+
+def test_spend_partial_records_balance_after(db):
+    grant(db, 1, 100)
+
+    FortuneService(db).use_points_atomic(1, 30, 'purchase', 'order_1')
+
+    db.expire_all()
+    assert balance(db, 1).points == 70
+    assert spends(db, 1)[0].balance_after == 70
+
+
+def test_spend_insufficient_points(db):
+    grant(db, 1, 50)
+
+    with pytest.raises(InsufficientPointsError):
+        FortuneService(db).use_points_atomic(1, 51, 'purchase', 'order_1')
+
+    db.expire_all()
+    points = balance(db, 1)
+    assert (points.points, points.total_spent) == (50, 0)
+    assert spends(db, 1) == []
+    assert db.query(FortunePointLot.remaining).filter(FortunePointLot.user_id == 1).scalar() == 50
+
+
+def test_spend_without_balance_row(db):
+    with pytest.raises(InsufficientPointsError):
+        FortuneService(db).use_points_atomic(2, 10, 'purchase', 'order_1')
+
+    assert db.query(UserFortunePoint).filter(UserFortunePoint.user_id == 2).count() == 0
+    assert spends(db, 2) == []
@@ -0,0 +1,125 @@
+import os
+from collections import Counter
+
+import pytest
+
+from app.utils.prompt_registry import PromptRegistry, _version_key, parse_weights
+
+
+def write(tmp_path, name, text, mtime=None):
+    path = tmp_path / name
+    path.write_text(text, encoding='utf-8')
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return path
+
+
+def v3_mtime(tmp_path):
+    return os.stat(tmp_path / 'prompt_v3.md').st_mtime
+
+
+@pytest.fixture()
+def registry(tmp_path):
+    write(tmp_path, 'prompt_v3.md', 'three')
+    write(tmp_path, 'prompt_v5.md', 'five')
+    write(tmp_path, 'prompt_v13.md', 'thirteen')
+    write(tmp_path, 'other_v99.md', 'other')
+    return PromptRegistry(base_dir=str(tmp_path), reload_interval=0)
+
+
+def test_version_key_orders_numbers_numerically():
+    versions = ['v13', 'v3', 'v5', 'v3a', 'v2']
+    assert sorted(versions, key=_version_key) == ['v2', 'v3', 'v3a', 'v5', 'v13']
+
+
+def test_parse_weights_ignores_invalid_entries():
+    assert parse_weights('v3:90, v5:10,v7:0,v8:x,v9') == {'v3': 90.0, 'v5': 10.0, 'v9': 1.0}
+    assert parse_weights('') == {}
+
+
+def test_latest_version_by_default(registry):
+    registry.register('saju', 'prompt_{version}.md')
+
+    prompt = registry.get('saju')
+    assert (prompt.version, prompt.text) == ('v13', 'thirteen')
+    assert registry.get('saju', version='v3').text == 'three'
+    assert registry.get('saju', version='v99') is None
+    assert registry.get('unknown') is None
+
+
+def test_pinned_version_and_fallback(registry, tmp_path):
+    registry.register('saju', 'prompt_{version}.md', version='v5')
+    assert registry.get('saju').version == 'v5'
+
+    # 고정 버전 파일이 사라지면 최신 버전
+    os.remove(tmp_path / 'prompt_v5.md')
+    assert registry.get('saju').version == 'v13'
+
+
+def test_modified_file_reloaded(registry, tmp_path):
+    registry.register('saju', 'prompt_{version}.md')
+    before = registry.get('saju', version='v3')
+
+    write(tmp_path, 'prompt_v3.md', 'three, revised', mtime=v3_mtime(tmp_path) + 10)
+    after = registry.get('saju', version='v3')
+
+    assert after.text == 'three, revised'
+    assert after.hash != before.hash
+
+
+def test_unchanged_file_not_reread(registry, tmp_path):
+    registry.register('saju', 'prompt_{version}.md')
+    first = registry.get('saju', version='v3')
+
+    # 같은 mtime이면 내용이 바뀌어도 다시 읽지 않는다
+    mtime = v3_mtime(tmp_path)
+    write(tmp_path, 'prompt_v3.md', 'changed', mtime=mtime)
+    assert registry.get('saju', version='v3') is first
+
+
+def test_added_and_removed_files(registry, tmp_path):
+    registry.register('saju', 'prompt_{version}.md')
+    assert registry.get('saju').version == 'v13'
+
+    write(tmp_path, 'prompt_v20.md', 'twenty')
+    assert registry.get('saju').version == 'v20'
+
+    os.remove(tmp_path / 'prompt_v20.md')
+    os.remove(tmp_path / 'prompt_v13.md')
+    assert registry.get('saju').version == 'v5'
+    assert set(registry.stats()['saju']['versions']) == {'v3', 'v5'}
+
+
+def test_reload_interval_defers_rescan(tmp_path):
+    write(tmp_path, 'prompt_v1.md', 'one')
+    registry = PromptRegistry(base_dir=str(tmp_path), reload_interval=60)
+    registry.register('saju', 'prompt_{version}.md')
+    assert registry.get('saju').version == 'v1'
+
+    write(tmp_path, 'prompt_v2.md', 'two')
+    assert registry.get('saju').version == 'v1'
+
+
+def test_ab_assignment_is_sticky(registry):
+    registry.register('saju', 'prompt_{version}.md', version='v13', ab_weights='v3:50,v5:50,v404:50')
+
+    for key in ('saju_a', 'saju_b', 'saju_c'):
+        versions = {registry.get('saju', sticky_key=key).version for _ in range(5)}
+        assert len(versions) == 1 and versions <= {'v3', 'v5'}
+
+
+def test_ab_weights_split_traffic(registry):
+    registry.register('saju', 'prompt_{version}.md', ab_weights='v3:90,v5:10')
+
+    counts = Counter(registry.get('saju', sticky_key=f'user{index}').version for index in range(2000))
+    assert set(counts) == {'v3', 'v5'}
+    assert 0.85 < counts['v3'] / 2000 < 0.95
+
+    versions = registry.stats()['saju']['versions']
+    assert versions['v3']['active_weight'] == 90 and versions['v13']['active_weight'] == 0
+    assert versions['v3']['selected'] + versions['v5']['selected'] == 2000
+
+
+def test_ab_falls_back_to_pinned_when_weighted_files_missing(registry):
+    registry.register('saju', 'prompt_{version}.md', version='v5', ab_weights='v7:50,v8:50')
+    assert registry.get('saju', sticky_key='x').version == 'v5'
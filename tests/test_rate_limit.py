@@ -0,0 +1,137 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import Depends, FastAPI, Request
+from fastapi.testclient import TestClient
+from starlette.middleware.sessions import SessionMiddleware
+
+from app.exceptions import TooManyRequestsError
+from app.utils import rate_limit as rate_limit_module
+from app.utils.rate_limit import RateLimiter, _LocalBuckets, rate_limit, rate_limited
+
+
+@pytest.fixture(autouse=True)
+def local_buckets(monkeypatch):
+    # Redis 없이 프로세스 내 버킷으로 판정, 테스트마다 새 버킷 / 정책
+    monkeypatch.setattr(rate_limit_module, 'REDIS_AVAILABLE', False)
+    monkeypatch.setattr(rate_limit_module, 'RATE_LIMIT_ENABLED', True)
+    monkeypatch.setattr(rate_limit_module, '_local_buckets', _LocalBuckets())
+    monkeypatch.setattr(rate_limit_module, '_limiters', {})
+
+
+@pytest.fixture()
+def limited_app():
+    app = FastAPI()
+    app.add_middleware(SessionMiddleware, secret_key='test')
+
+    @app.post('/login/{user_id}')
+    def login(user_id: int, request: Request):
+        request.session['user_id'] = user_id
+        return {}
+
+    @app.get('/user', dependencies=[Depends(rate_limit('test_user', 2, 60))])
+    def user_scoped():
+        return {}
+
+    @app.get('/ip', dependencies=[Depends(rate_limit('test_ip', 2, 60, scope='ip'))])
+    def ip_scoped():
+        return {}
+
+    return app
+
+
+def test_exhausted_bucket_returns_429_with_retry_after(limited_app):
+    client = TestClient(limited_app)
+    first = client.get('/user')
+    assert first.status_code == 200
+    assert first.headers['X-RateLimit-Limit'] == '2'
+    assert first.headers['X-RateLimit-Remaining'] == '1'
+    assert client.get('/user').status_code == 200
+
+    res = client.get('/user')
+    assert res.status_code == 429
+    # 1개 충전까지 30초 (60초에 2개)
+    assert 29 <= int(res.headers['Retry-After']) <= 30
+
+
+def test_user_scope_separates_logged_in_users(limited_app):
+    alice, bob = TestClient(limited_app), TestClient(limited_app)
+    alice.post('/login/1')
+    bob.post('/login/2')
+
+    assert [alice.get('/user').status_code for _ in range(3)] == [200, 200, 429]
+    # 같은 IP여도 다른 사용자는 별도 버킷
+    assert bob.get('/user').status_code == 200
+
+    # 비로그인 요청은 IP 버킷
+    anonymous = TestClient(limited_app)
+    assert [anonymous.get('/user').status_code for _ in range(3)] == [200, 200, 429]
+
+
+def test_ip_scope_shared_across_users(limited_app):
+    alice, bob = TestClient(limited_app), TestClient(limited_app)
+    alice.post('/login/1')
+    bob.post('/login/2')
+
+    assert [alice.get('/ip').status_code for _ in range(2)] == [200, 200]
+    assert bob.get('/ip').status_code == 429
+
+
+def test_disabled_limiter_allows_everything(limited_app, monkeypatch):
+    monkeypatch.setattr(rate_limit_module, 'RATE_LIMIT_ENABLED', False)
+    client = TestClient(limited_app)
+    assert {client.get('/user').status_code for _ in range(5)} == {200}
+
+
+def test_tokens_refill_over_time():
+    limiter = RateLimiter('test_refill', 2, 0.2)  # 0.1초에 1개 충전
+
+    assert [limiter.hit('a').allowed for _ in range(3)] == [True, True, False]
+    time.sleep(0.12)
+    assert limiter.hit('a').allowed is True
+    assert limiter.hit('a').allowed is False
+
+    time.sleep(0.25)
+    # 가득 차도 capacity까지만
+    assert [limiter.hit('a').allowed for _ in range(3)] == [True, True, False]
+    assert limiter.stats()['rejected'] == 3
+
+
+def test_local_bucket_retry_after():
+    buckets = _LocalBuckets()
+    assert buckets.take('k', 1, 0.5, 1).allowed is True
+
+    decision = buckets.take('k', 1, 0.5, 1)
+    assert decision.allowed is False
+    assert 1.9 <= decision.retry_after <= 2.0
+
+
+def test_local_bucket_prunes_oldest_keys():
+    buckets = _LocalBuckets(max_keys=4)
+    for index in range(5):
+        buckets.take(f'k{index}', 1, 1, 1)
+    assert len(buckets._buckets) <= 4
+    assert 'k4' in buckets._buckets
+
+
+def test_rate_limited_decorator_keys_by_argument():
+    @rate_limited('test_decorator', 1, 60)
+    def send(user_id, message):
+        return message
+
+    assert send(1, 'hi') == 'hi'
+    with pytest.raises(TooManyRequestsError) as error:
+        send(user_id=1, message='again')
+    assert 'Retry-After' in error.value.headers
+    assert send(2, 'other user') == 'other user'
+
+
+def test_rate_limited_decorator_async():
+    @rate_limited('test_decorator_async', 1, 60)
+    async def send(user_id):
+        return user_id
+
+    assert asyncio.run(send(1)) == 1
+    with pytest.raises(TooManyRequestsError):
+        asyncio.run(send(1))
@@ -0,0 +1,82 @@
+from app.models import FortunePointLot, FortuneTransaction, User, UserFortunePoint, UserReferral, UserReferralReward
+from app.services.fortune_service import FortuneService
+from app.services.referral_service import ReferralService
+
+
+def add_user(db, name, **kwargs):
+    user = User(username=name, email=f'{name}@example.com', password='x', **kwargs)
+    db.add(user)
+    db.commit()
+    return user.id
+
+
+def referral_setup(db):
+    referrer_id = add_user(db, 'referrer')
+    new_user_id = add_user(db, 'newbie')
+    db.add(UserReferral(user_id=referrer_id, referral_code='CODE1234'))
+    db.commit()
+    return referrer_id, new_user_id
+
+
+def point_state(db, user_id):
+    balance = db.query(UserFortunePoint).filter(UserFortunePoint.user_id == user_id).one()
+    lots = [
+        (lot.amount, lot.remaining, lot.status, lot.source)
+        for lot in db.query(FortunePointLot).filter(FortunePointLot.user_id == user_id).order_by(FortunePointLot.id)
+    ]
+    earns = [
+        (tx.amount, tx.balance_after, tx.reference_id)
+        for tx in db.query(FortuneTransaction).filter(FortuneTransaction.user_id == user_id).order_by(FortuneTransaction.id)
+    ]
+    return (balance.points, balance.total_earned), lots, earns
+
+
+def test_signup_reward_creates_point_lot(sqlite_sessionmaker):
+    with sqlite_sessionmaker() as db:
+        referrer_id, new_user_id = referral_setup(db)
+
+        success, _, result = ReferralService.process_referral_signup('CODE1234', new_user_id, db)
+
+        assert success and result['reward_points'] == 1000
+        reward = db.query(UserReferralReward).one()
+        assert point_state(db, referrer_id) == (
+            (1000, 1000),
+            [(1000, 1000, 'open', 'referral')],
+            [(1000, 1000, f'referral_reward_{reward.id}')],
+        )
+        assert db.get(User, new_user_id).referred_by == referrer_id
+
+
+def test_purchase_reward_adds_lot_to_existing_balance(sqlite_sessionmaker):
+    with sqlite_sessionmaker() as db:
+        referrer_id, new_user_id = referral_setup(db)
+        FortuneService(db).earn_points_safely(referrer_id, 500, 'daily_bonus', 'bonus_1')
+        ReferralService.process_referral_signup('CODE1234', new_user_id, db)
+
+        success, _, result = ReferralService.process_referral_purchase(new_user_id, 40000, db)
+
+        assert success and result['reward_points'] == 2000
+        balance, lots, earns = point_state(db, referrer_id)
+        assert balance == (3500, 3500)
+        assert [lot[:3] for lot in lots] == [(500, 500, 'open'), (1000, 1000, 'open'), (2000, 2000, 'open')]
+        assert [amount for amount, _, _ in earns] == [500, 1000, 2000]
+
+        # 적립된 보상도 lot에서 차감된다
+        FortuneService(db).use_points_atomic(referrer_id, 1200, 'purchase', 'order_1')
+        assert [lot[1:3] for lot in point_state(db, referrer_id)[1]] == [(0, 'consumed'), (300, 'open'), (2000, 'open')]
+
+
+def test_failed_grant_rolls_back_referral(sqlite_sessionmaker, monkeypatch):
+    def fail(self, grants, *args, **kwargs):
+        self.db.rollback()
+        return {'granted': 0, 'duplicates': 0, 'failed': 1, 'chunks': 1}
+
+    monkeypatch.setattr(FortuneService, 'grant_points_bulk', fail)
+    with sqlite_sessionmaker() as db:
+        _, new_user_id = referral_setup(db)
+
+        success, _, _ = ReferralService.process_referral_signup('CODE1234', new_user_id, db)
+
+        assert not success
+        assert db.get(User, new_user_id).referred_by is None
+        assert db.query(UserReferralReward).count() == 0
@@ -0,0 +1,126 @@
+import asyncio
+
+import pytest
+
+from app.services import report_progress_service
+from app.services.report_progress_service import ReportProgressHub, report_event
+
+
+@pytest.fixture(autouse=True)
+def no_reconcile(monkeypatch):
+    # 테스트 중 DB 보정 루프가 돌지 않도록
+    monkeypatch.setattr(report_progress_service, 'REPORT_PROGRESS_RECONCILE_INTERVAL', 3600)
+
+
+def run_with_hub(scenario, use_redis=False):
+    async def main():
+        hub = ReportProgressHub(use_redis=use_redis)
+        try:
+            return await scenario(hub)
+        finally:
+            await hub.close()
+
+    return asyncio.run(main())
+
+
+async def collect(hub, order_id, queue, initial=None):
+    return [chunk async for chunk in hub.stream(order_id, queue, initial)]
+
+
+def event_types(chunks):
+    return [chunk.split('\n')[0][len('event: '):] for chunk in chunks if chunk.startswith('event: ')]
+
+
+def test_dispatch_fans_out_to_order_subscribers():
+    async def scenario(hub):
+        first, second = hub.subscribe(1), hub.subscribe(1)
+        other = hub.subscribe(2)
+        hub._dispatch(1, report_event(1, 'progress', current=2))
+        return first, second, other, hub.stats()
+
+    first, second, other, stats = run_with_hub(scenario)
+
+    assert first.get_nowait()['current'] == 2
+    assert second.get_nowait()['current'] == 2
+    assert other.empty()
+    assert (stats['waiting_orders'], stats['waiting_connections']) == (2, 3)
+    assert stats['events_delivered'] == 2
+
+
+def test_stream_ends_on_completed():
+    async def scenario(hub):
+        queue = hub.subscribe(1)
+        hub._dispatch(1, report_event(1, 'progress', current=1))
+        hub._dispatch(1, report_event(1, 'completed'))
+        hub._dispatch(1, report_event(1, 'progress', current=5))
+        return await asyncio.wait_for(collect(hub, 1, queue), 5), hub.stats()
+
+    chunks, stats = run_with_hub(scenario)
+
+    assert chunks[0] == 'retry: 5000\n\n'
+    assert event_types(chunks) == ['progress', 'completed']
+    assert '/order/report/1' in chunks[-1]
+    assert stats['waiting_orders'] == 0
+
+
+def test_failed_with_retry_does_not_end_stream():
+    async def scenario(hub):
+        queue = hub.subscribe(1)
+        hub._dispatch(1, report_event(1, 'failed', will_retry=True))
+        hub._dispatch(1, report_event(1, 'progress', current=1))
+        hub._dispatch(1, report_event(1, 'failed', will_retry=False))
+        return await asyncio.wait_for(collect(hub, 1, queue), 5)
+
+    chunks = run_with_hub(scenario)
+
+    assert event_types(chunks) == ['failed', 'progress', 'failed']
+
+
+def test_terminal_initial_event_ends_stream():
+    async def scenario(hub):
+        queue = hub.subscribe(1)
+        hub._dispatch(1, report_event(1, 'progress', current=3))
+        return await asyncio.wait_for(collect(hub, 1, queue, report_event(1, 'completed')), 5)
+
+    assert event_types(run_with_hub(scenario)) == ['completed']
+
+
+def test_stream_sends_heartbeat_while_waiting(monkeypatch):
+    monkeypatch.setattr(report_progress_service, 'REPORT_PROGRESS_HEARTBEAT', 0.01)
+
+    async def scenario(hub):
+        queue = hub.subscribe(1)
+        asyncio.get_running_loop().call_later(0.1, hub._dispatch, 1, report_event(1, 'completed'))
+        return await asyncio.wait_for(collect(hub, 1, queue), 5)
+
+    chunks = run_with_hub(scenario)
+
+    assert ': ping\n\n' in chunks
+    assert event_types(chunks) == ['completed']
+
+
+def test_restart_closes_previous_redis_client(monkeypatch):
+    closed = []
+
+    async def finished(self):
+        return None
+
+    async def record_close(client):
+        closed.append(client)
+
+    monkeypatch.setattr(ReportProgressHub, '_listen', finished)
+    monkeypatch.setattr(ReportProgressHub, '_reconcile', finished)
+    monkeypatch.setattr(ReportProgressHub, '_close_redis', staticmethod(record_close))
+
+    async def scenario(hub):
+        hub.subscribe(1)
+        first = hub._redis
+        await asyncio.sleep(0)  # 백그라운드 루프 종료
+        hub.subscribe(1)
+        await asyncio.sleep(0)
+        return first, hub._redis
+
+    first, second = run_with_hub(scenario, use_redis=True)
+
+    assert second is not first
+    assert closed == [first]
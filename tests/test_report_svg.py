@@ -0,0 +1,67 @@
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from app.report_svg import MONTHS, month_heat_svg, radar_chart_svg
+
+SVG = '{http://www.w3.org/2000/svg}'
+
+
+def parse(markup):
+    root = ET.fromstring(markup)
+    assert root.tag == f'{SVG}svg'
+    return root
+
+
+def texts(root):
+    return [''.join(node.itertext()) for node in root.iter(f'{SVG}text')]
+
+
+@pytest.mark.parametrize('elements', [
+    {},
+    {'목': 0, '화': 0, '토': 0, '금': 0, '수': 0},
+    {'목': 3, '화': 1, '토': 0, '금': 2, '수': 8},
+])
+@pytest.mark.parametrize('with_explanation', [True, False])
+def test_radar_chart_is_well_formed(elements, with_explanation):
+    root = parse(radar_chart_svg(elements, with_explanation=with_explanation))
+
+    polygon = root.find(f'{SVG}polygon')
+    assert len(polygon.get('points').split()) == 5
+    labels = texts(root)
+    assert '목(木)' in labels and '수(水)' in labels
+    assert any(label.startswith('🔥 가장 강함') for label in labels) == with_explanation
+
+
+def test_radar_chart_explanation_uses_counts():
+    labels = texts(parse(radar_chart_svg({'목': 3, '화': 1, '토': 0, '금': 2, '수': 8})))
+
+    assert '🔥 가장 강함: 수 (8개)' in labels
+    assert '💧 보완 필요: 토 (0개)' in labels
+
+
+def test_month_heat_is_well_formed():
+    status = {'Love': ['G', 'Y', 'R', '-'] * 3, 'Money': ['-'] * 12, 'Career': ['G'] * 12}
+    root = parse(month_heat_svg(status, title='2025 월별 운세'))
+
+    assert len(list(root.iter(f'{SVG}rect'))) == 1 + 13 * 4
+    labels = texts(root)
+    assert labels[0] == '2025 월별 운세'
+    assert MONTHS[0] in labels and '💕 애정운' in labels
+    assert labels.count('●') == 3 + 12
+
+
+def test_month_heat_empty_status():
+    root = parse(month_heat_svg({}))
+
+    assert root.get('aria-label') == '월별 운세 히트맵'
+    assert texts(root)[0] == '구분'
+
+
+def test_month_heat_escapes_labels():
+    title = '<b>"A&B"</b>'
+    root = parse(month_heat_svg({'X<&>': ['G'] * 12}, title=title))
+
+    assert root.get('aria-label') == title
+    labels = texts(root)
+    assert labels[0] == title and 'X<&>' in labels
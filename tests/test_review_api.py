@@ -0,0 +1,35 @@
+import pytest
+
+from app.database import get_read_db
+from app.main import app
+from app.models import UserReview
+from app.services.review_service import ReviewService
+from app.utils.error_handlers import ValidationError
+
+
+@pytest.fixture()
+def review_db(client, sqlite_sessionmaker):
+    with sqlite_sessionmaker() as db:
+        for user_id, rating in ((1, 5), (2, 4), (3, 3)):
+            db.add(UserReview(user_id=user_id, product_id=10, rating=rating, content='good'))
+        db.commit()
+        app.dependency_overrides[get_read_db] = lambda: db
+        yield db
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "eyJ0YW1wZXJlZCI6IHRydWV9"])
+def test_review_api_bad_cursor(client, review_db, cursor):
+    res = client.get("/review/api/v1/product/10", params={"cursor": cursor})
+    assert res.status_code == 400
+    assert res.json() == {"success": False, "error": "유효하지 않은 페이지 커서입니다."}
+
+
+def test_review_service_keeps_cursor_error(review_db):
+    page = ReviewService.get_product_reviews(10, review_db, per_page=2)
+    assert [review.rating for review in page["reviews"]] == [3, 4]
+
+    rest = ReviewService.get_product_reviews(10, review_db, per_page=2, cursor=page["pagination"]["next_cursor"])
+    assert [review.rating for review in rest["reviews"]] == [5]
+
+    with pytest.raises(ValidationError):
+        ReviewService.get_product_reviews(10, review_db, cursor="not-a-cursor")
@@ -0,0 +1,70 @@
+from sqlalchemy import select
+
+from app.models import ProductReviewStats, UserReview
+from app.services.review_stats_service import ReviewStatsService
+from app.utils.upsert import insert_or_update
+
+
+def stored_stats(db, product_id):
+    db.expire_all()
+    return ReviewStatsService.get(db, product_id)
+
+
+def assert_matches_rebuild(db, product_id):
+    stored = stored_stats(db, product_id)
+    result = ReviewStatsService.rebuild(db, product_ids=[product_id])
+    assert result['repaired'] == 0 and result['created'] == 0
+    assert stored_stats(db, product_id) == stored
+
+
+def add_review(db, user_id, product_id, rating):
+    review = UserReview(user_id=user_id, product_id=product_id, rating=rating, content='good')
+    db.add(review)
+    db.commit()
+    return review
+
+
+def test_stats_follow_insert_hide_and_helpful_vote(sqlite_sessionmaker):
+    with sqlite_sessionmaker() as db:
+        first = add_review(db, 1, 10, 5)
+        second = add_review(db, 2, 10, 3)
+        assert stored_stats(db, 10)['total_reviews'] == 2
+        assert stored_stats(db, 10)['average_rating'] == 4.0
+        assert_matches_rebuild(db, 10)
+
+        first.helpful_count += 1
+        db.commit()
+        assert stored_stats(db, 10)['total_helpful'] == 1
+        assert_matches_rebuild(db, 10)
+
+        first.is_visible = False
+        db.commit()
+        stats = stored_stats(db, 10)
+        assert (stats['total_reviews'], stats['total_helpful']) == (1, 0)
+        assert stats['rating_distribution'][5] == 0
+        assert_matches_rebuild(db, 10)
+
+        db.delete(second)
+        db.commit()
+        assert stored_stats(db, 10)['total_reviews'] == 0
+        assert_matches_rebuild(db, 10)
+
+
+def test_upsert_adds_delta_when_row_was_created_concurrently(sqlite_sessionmaker):
+    table = ProductReviewStats.__table__
+    with sqlite_sessionmaker() as db:
+        # 다른 트랜잭션이 UPDATE(0건)와 INSERT 사이에 행을 먼저 만든 경우
+        db.add(ProductReviewStats(product_id=10, review_count=1, rating_sum=4, rating_4=1))
+        db.commit()
+
+        insert_or_update(
+            db, table,
+            {'product_id': 10, 'review_count': 1, 'rating_sum': 5, 'rating_5': 1},
+            [('review_count', table.c.review_count + 1), ('rating_sum', table.c.rating_sum + 5),
+             ('rating_5', table.c.rating_5 + 1)],
+            index_elements=['product_id'],
+        )
+        db.commit()
+
+        row = db.execute(select(table).where(table.c.product_id == 10)).one()
+        assert (row.review_count, row.rating_sum, row.rating_4, row.rating_5) == (2, 9, 1, 1)
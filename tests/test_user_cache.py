@@ -0,0 +1,112 @@
+import pytest
+
+from app.models import User
+from app.services.cache_service import CacheService
+from app.services.user_cache_service import UserCacheService, UserSnapshot
+
+
+@pytest.fixture()
+def db(sqlite_sessionmaker, monkeypatch):
+    # 메모리 캐시는 프로세스 공용 - 테스트마다 비운다
+    monkeypatch.setattr(CacheService, '_memory_cache', {})
+    with sqlite_sessionmaker() as session:
+        yield session
+
+
+def make_user(db, name='member', **kwargs):
+    user = User(username=name, email=f'{name}@example.com', password='x', **kwargs)
+    db.add(user)
+    db.commit()
+    return user
+
+
+def cached(db, user_id):
+    """첫 load()로 캐시를 채운 뒤 두 번째 load() 결과"""
+    UserCacheService.load(db, user_id)
+    return UserCacheService.load(db, user_id)
+
+
+def test_load_serves_snapshot_after_first_lookup(db):
+    user = make_user(db, is_admin=False)
+
+    first = UserCacheService.load(db, user.id)
+    second = UserCacheService.load(db, user.id)
+
+    assert isinstance(first, User)
+    assert isinstance(second, UserSnapshot)
+    assert (second.id, second.username, second.is_admin) == (user.id, 'member', False)
+
+
+@pytest.mark.parametrize('tamper', [
+    lambda entry: entry['data'].update(is_admin=True),
+    lambda entry: entry.update(sig='0' * 64),
+    lambda entry: entry.pop('sig'),
+    lambda entry: entry.update(data='not-a-dict'),
+])
+def test_tampered_snapshot_rejected(db, tamper):
+    user = make_user(db, is_admin=False)
+    UserCacheService.load(db, user.id)
+
+    key = UserCacheService.cache_key(user.id)
+    entry = CacheService.get(key)
+    tamper(entry)
+    CacheService.set(key, entry, 60)
+
+    assert UserCacheService.get_snapshot(user.id) is None
+    # 변조된 항목은 지워지고 다음 조회는 DB에서
+    assert CacheService.get(key) is None
+    loaded = UserCacheService.load(db, user.id)
+    assert isinstance(loaded, User) and loaded.is_admin is False
+
+
+def test_committed_update_invalidates_snapshot(db):
+    user = make_user(db)
+    assert isinstance(cached(db, user.id), UserSnapshot)
+
+    user.email = 'changed@example.com'
+    db.commit()
+
+    assert UserCacheService.get_snapshot(user.id) is None
+    assert UserCacheService.load(db, user.id).email == 'changed@example.com'
+
+
+def test_rolled_back_update_keeps_snapshot(db):
+    user = make_user(db)
+    assert isinstance(cached(db, user.id), UserSnapshot)
+
+    user.email = 'changed@example.com'
+    db.flush()
+    db.rollback()
+    # 롤백된 변경은 다음 커밋에서도 무효화 대상이 아니다
+    db.commit()
+
+    snapshot = UserCacheService.get_snapshot(user.id)
+    assert snapshot is not None and snapshot['email'] == 'member@example.com'
+
+
+@pytest.mark.parametrize('field, before, after', [
+    ('is_active', True, False),
+    ('is_admin', True, False),
+])
+def test_deactivated_or_demoted_user_not_served_from_cache(db, field, before, after):
+    user = make_user(db, **{field: before})
+    assert getattr(cached(db, user.id), field) is before
+
+    setattr(user, field, after)
+    db.commit()
+
+    loaded = UserCacheService.load(db, user.id)
+    assert isinstance(loaded, User)
+    assert getattr(loaded, field) is after
+    assert getattr(UserCacheService.load(db, user.id), field) is after
+
+
+def test_deleted_user_invalidated(db):
+    user = make_user(db)
+    user_id = user.id
+    cached(db, user_id)
+
+    db.delete(user)
+    db.commit()
+
+    assert UserCacheService.load(db, user_id) is None
@@ -0,0 +1,107 @@
+from datetime import datetime, timedelta
+
+from app.models import Order, User, UserCounters, UserReferralReward
+from app.services.user_counter_service import UserCounterService, _month_key, _month_start
+
+
+def make_user(db, name, **kwargs):
+    user = User(username=name, email=f'{name}@example.com', password='x', **kwargs)
+    db.add(user)
+    db.commit()
+    return user
+
+
+def make_order(db, user_id, tid):
+    order = Order(user_id=user_id, amount=1000, kakao_tid=tid, saju_key='key')
+    db.add(order)
+    db.commit()
+    return order
+
+
+def counters(db, user_id):
+    db.expire_all()
+    return {key: value for key, value in UserCounterService.get(db, user_id).items() if key != 'points'}
+
+
+def assert_matches_rebuild(db, *user_ids):
+    stored = {user_id: counters(db, user_id) for user_id in user_ids}
+    result = UserCounterService.rebuild(db, user_ids=user_ids)
+    assert result['repaired'] == 0 and result['created'] == 0
+    assert {user_id: counters(db, user_id) for user_id in user_ids} == stored
+
+
+def test_referrer_change_moves_referral(sqlite_sessionmaker):
+    with sqlite_sessionmaker() as db:
+        first = make_user(db, 'first')
+        second = make_user(db, 'second')
+        assert counters(db, first.id)['referrals_count'] == 0
+        assert counters(db, second.id)['referrals_count'] == 0
+
+        referred = make_user(db, 'referred', referred_by=first.id, referral_signup_date=datetime.now())
+        assert counters(db, first.id)['referrals_this_month'] == 1
+
+        referred.referred_by = second.id
+        db.commit()
+        assert counters(db, first.id)['referrals_count'] == 0
+        assert counters(db, second.id)['referrals_count'] == 1
+        assert counters(db, second.id)['referrals_this_month'] == 1
+        assert_matches_rebuild(db, first.id, second.id)
+
+
+def test_delete_decrements_counters(sqlite_sessionmaker):
+    with sqlite_sessionmaker() as db:
+        user = make_user(db, 'buyer')
+        make_order(db, user.id, 'T1')
+        order = make_order(db, user.id, 'T2')
+        assert counters(db, user.id)['orders_count'] == 2
+
+        db.delete(order)
+        db.commit()
+        assert counters(db, user.id)['orders_count'] == 1
+        assert_matches_rebuild(db, user.id)
+
+
+def test_month_rollover_restarts_monthly_counters(sqlite_sessionmaker):
+    last_month = _month_start() - timedelta(days=1)
+    with sqlite_sessionmaker() as db:
+        referrer = make_user(db, 'referrer')
+        old = make_user(db, 'old', referred_by=referrer.id, referral_signup_date=last_month)
+        db.add(UserReferralReward(referrer_id=referrer.id, referred_user_id=old.id, points=100,
+                                  reward_type='signup', created_at=last_month))
+        db.commit()
+
+        # 지난 달에 마지막으로 갱신된 행
+        row = db.get(UserCounters, referrer.id)
+        row.month_key = _month_key(last_month)
+        row.referrals_this_month = 1
+        row.referral_rewards_this_month = 100
+        db.commit()
+
+        new = make_user(db, 'new', referred_by=referrer.id, referral_signup_date=datetime.now())
+        db.add(UserReferralReward(referrer_id=referrer.id, referred_user_id=new.id, points=50, reward_type='signup'))
+        db.commit()
+
+        stats = counters(db, referrer.id)
+        assert (stats['referrals_count'], stats['referrals_this_month']) == (2, 1)
+        assert (stats['referral_rewards_total'], stats['referral_rewards_this_month']) == (150, 50)
+        assert db.get(UserCounters, referrer.id).month_key == _month_key()
+        assert_matches_rebuild(db, referrer.id)
+
+
+
+def test_first_view_computes_without_writing(sqlite_sessionmaker):
+    with sqlite_sessionmaker() as db:
+        user = make_user(db, 'viewer')
+        user_id = user.id
+        make_order(db, user_id, 'T1')
+        db.query(UserCounters).delete()
+        db.commit()
+
+        # 조회 요청 세션에 남아 있던 변경은 get()이 커밋하지 않는다
+        user.email = 'changed@example.com'
+        assert UserCounterService.get(db, user_id)['orders_count'] == 1
+        db.rollback()
+
+    with sqlite_sessionmaker() as db:
+        assert db.get(User, user_id).email == 'viewer@example.com'
+        assert db.query(UserCounters).count() == 0
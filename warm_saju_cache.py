@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# warm_saju_cache.py
+"""
+사주 AI 분석 배치 워밍업: 방문이 많은데 분석 캐시가 없는 saju_key를 Ollama로 미리 생성
+
+사용법:
+    python warm_saju_cache.py --mode full --limit 200
+    python warm_saju_cache.py --mode preview --rate-per-minute 20 --max-requests 100
+    python warm_saju_cache.py --dry-run          # 대상 키만 확인
+
+중단(Ctrl+C)해도 진행 중인 요청만 마치고 체크포인트를 저장하며, 다시 실행하면 남은 키부터 이어서 처리한다.
+"""
+
+import argparse
+import os
+import signal
+import sys
+import threading
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.database import SessionLocal
+from app.routers.saju import BATCH_SIZE, OLLAMA_URL, test_ollama_connection
+from app.services.saju_warmup_service import (
+    SAJU_WARMUP_CHECKPOINT, SAJU_WARMUP_CONCURRENCY, SAJU_WARMUP_MAX_ATTEMPTS,
+    SAJU_WARMUP_RATE_PER_MINUTE, WARMUP_MODES, SajuWarmupService
+)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="사주 AI 분석 캐시 워밍업 (Ollama)")
+    parser.add_argument("--mode", choices=sorted(WARMUP_MODES), default="full",
+                        help="full: analysis_full (리포트용), preview: analysis_preview (미리보기)")
+    parser.add_argument("--limit", type=int, default=100, help="이번 실행에서 처리할 최대 키 수")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="배치당 키 수 (체크포인트 단위)")
+    parser.add_argument("--concurrency", type=int, default=SAJU_WARMUP_CONCURRENCY, help="동시 LLM 요청 수")
+    parser.add_argument("--rate-per-minute", type=float, default=SAJU_WARMUP_RATE_PER_MINUTE,
+                        help="분당 요청 예산 (0이면 DELAY_BETWEEN_REQUESTS로 환산)")
+    parser.add_argument("--max-requests", type=int, default=None, help="총 LLM 요청 한도")
+    parser.add_argument("--since-days", type=int, default=None, help="최근 N일 방문자만 수요로 집계")
+    parser.add_argument("--max-attempts", type=int, default=SAJU_WARMUP_MAX_ATTEMPTS,
+                        help="이 횟수 이상 실패한 키는 건너뜀")
+    parser.add_argument("--checkpoint", default=SAJU_WARMUP_CHECKPOINT, help="체크포인트 파일 경로")
+    parser.add_argument("--dry-run", action="store_true", help="대상 키만 출력")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    print(f"🚀 사주 분석 워밍업 시작 (mode={args.mode}, limit={args.limit})")
+    print("=" * 50)
+
+    db = SessionLocal()
+    try:
+        service = SajuWarmupService(db)
+
+        if args.dry_run:
+            candidates = service.find_candidates(args.mode, args.limit, args.since_days)
+            print(f"📋 대상 키 {len(candidates)}개 (수요 순)")
+            for saju_key, demand in candidates:
+                print(f"   • {saju_key}: {demand}")
+            return
+
+        if not OLLAMA_URL:
+            print("❌ OLLAMA_URL이 설정되지 않았습니다.")
+            sys.exit(1)
+        if not test_ollama_connection():
+            sys.exit(1)
+
+        # 첫 Ctrl+C는 정상 종료 요청 (진행 중인 요청 완료 후 체크포인트 저장)
+        stop = threading.Event()
+
+        def request_stop(signum, frame):
+            if stop.is_set():
+                raise KeyboardInterrupt
+            print("\n⏸️ 중단 요청 - 진행 중인 요청을 마치고 종료합니다 (한 번 더 누르면 즉시 종료)")
+            stop.set()
+
+        signal.signal(signal.SIGINT, request_stop)
+        signal.signal(signal.SIGTERM, request_stop)
+
+        try:
+            stats = service.run(
+                mode=args.mode,
+                limit=args.limit,
+                batch_size=args.batch_size,
+                concurrency=args.concurrency,
+                rate_per_minute=args.rate_per_minute,
+                max_requests=args.max_requests,
+                since_days=args.since_days,
+                max_attempts=args.max_attempts,
+                checkpoint_path=args.checkpoint,
+                stop=stop,
+            )
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+    finally:
+        db.close()
+
+    print("\n" + "=" * 50)
+    print(f"✅ 생성: {stats['generated']}개")
+    print(f"⏭️ 이미 캐시됨: {stats['skipped']}개")
+    print(f"❌ 실패: {stats['failed']}개")
+    print(f"⏱️ 소요 시간: {stats['elapsed_seconds']}초 (배치 {stats['batches']}개)")
+    print(f"💾 체크포인트: {args.checkpoint}")
+    print("⏸️ 중단됨 - 다시 실행하면 이어서 처리합니다." if stats["stopped"] else "🎉 워밍업 완료!")
+
+
+if __name__ == "__main__":
+    main()